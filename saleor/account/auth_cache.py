@@ -0,0 +1,104 @@
+import hashlib
+from typing import TYPE_CHECKING, FrozenSet, Optional, Tuple
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+if TYPE_CHECKING:
+    from .models import User
+
+USER_AUTH_VERSION_CACHE_KEY = "user_auth_version"
+USER_AUTH_CACHE_KEY = "user_auth_{version}_{user_key}"
+USER_AUTH_CACHE_TIMEOUT = 60
+
+# Active user and names of its effective permissions in the
+# "app_label.codename" format used by the authentication backends
+UserAuth = Tuple["User", FrozenSet[str]]
+
+
+def _get_user_key(email: str, jwt_token_key: str) -> str:
+    return hashlib.md5(f"{email}:{jwt_token_key}".encode("utf-8")).hexdigest()
+
+
+def get_user_auth_version() -> str:
+    return cache.get_or_set(
+        USER_AUTH_VERSION_CACHE_KEY, lambda: uuid4().hex, timeout=None
+    )
+
+
+def _get_user_auth_cache_key(email: str, jwt_token_key: str) -> str:
+    return USER_AUTH_CACHE_KEY.format(
+        version=get_user_auth_version(),
+        user_key=_get_user_key(email, jwt_token_key),
+    )
+
+
+def fetch_user_auth(email: str, jwt_token_key: str) -> Optional[UserAuth]:
+    from .models import User
+
+    user = User.objects.filter(
+        email=email, jwt_token_key=jwt_token_key, is_active=True
+    ).first()
+    if not user:
+        return None
+    permissions = user.effective_permissions.values_list(
+        "content_type__app_label", "codename"
+    ).order_by()
+    permission_names = frozenset(
+        f"{app_label}.{codename}" for app_label, codename in permissions
+    )
+    # Drop the queryset so it isn't evaluated when the user is pickled
+    user._effective_permissions = None
+    return user, permission_names
+
+
+def get_user_auth(email: str, jwt_token_key: str) -> Optional[UserAuth]:
+    """Return the active user with the given token key and its permissions.
+
+    The result is shared between processes for `USER_AUTH_CACHE_TIMEOUT` seconds
+    or until the user auth version changes. Every call returns a separate user
+    instance, so it can be modified by the caller. Disabled by default, as it
+    requires a cache backend shared by all processes, see `SHARED_CACHE`.
+    """
+    if not settings.CACHE_USER_AUTH:
+        return fetch_user_auth(email, jwt_token_key)
+
+    cache_key = _get_user_auth_cache_key(email, jwt_token_key)
+    user_auth = cache.get(cache_key)
+    if user_auth is None:
+        user_auth = fetch_user_auth(email, jwt_token_key)
+        if user_auth is not None:
+            cache.set(cache_key, user_auth, timeout=USER_AUTH_CACHE_TIMEOUT)
+    return user_auth
+
+
+def invalidate_user_auth_for_token(email: str, jwt_token_key: str):
+    """Force all processes to refetch the user authenticated with the token key.
+
+    Called every time a user is saved or deleted. The entry is dropped again
+    after the current transaction is committed.
+    """
+
+    def invalidate():
+        cache.delete(_get_user_auth_cache_key(email, jwt_token_key))
+
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+def invalidate_user_auth():
+    """Force all processes to refetch users authenticated with tokens.
+
+    Must be called every time groups of users, permissions of users or groups,
+    or many users at once change. The version is changed again after the current
+    transaction is committed, so the users fetched in the meantime from the
+    uncommitted data are not used.
+    """
+
+    def invalidate():
+        cache.set(USER_AUTH_VERSION_CACHE_KEY, uuid4().hex, timeout=None)
+
+    invalidate()
+    transaction.on_commit(invalidate)
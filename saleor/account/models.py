@@ -22,6 +22,7 @@ from ..core.models import ModelWithMetadata
 from ..core.permissions import AccountPermissions, BasePermissionEnum, get_permissions
 from ..core.utils.json_serializer import CustomJsonEncoder
 from . import CustomerEvents
+from .auth_cache import invalidate_user_auth_for_token
 from .validators import validate_possible_number
 
 
@@ -167,6 +168,12 @@ class User(PermissionsMixin, ModelWithMetadata, AbstractBaseUser):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._effective_permissions = None
+        # Values the user can be authenticated with, used to drop the auth cache
+        # entry also when they change. Deferred fields aren't loaded here.
+        self._auth_token_key = (
+            self.__dict__.get("email"),
+            self.__dict__.get("jwt_token_key"),
+        )
 
     @property
     def effective_permissions(self) -> "QuerySet[Permission]":
@@ -184,6 +191,25 @@ class User(PermissionsMixin, ModelWithMetadata, AbstractBaseUser):
         # Drop cache for authentication backend
         self._effective_permissions_cache = None
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._invalidate_auth()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self._invalidate_auth()
+        return result
+
+    def _invalidate_auth(self):
+        auth_token_key = (
+            self.__dict__.get("email"),
+            self.__dict__.get("jwt_token_key"),
+        )
+        for email, jwt_token_key in {self._auth_token_key, auth_token_key}:
+            if email and jwt_token_key:
+                invalidate_user_auth_for_token(email, jwt_token_key)
+        self._auth_token_key = auth_token_key
+
     def get_full_name(self):
         if self.first_name or self.last_name:
             return ("%s %s" % (self.first_name, self.last_name)).strip()
@@ -33,7 +33,7 @@ from ..payment.models import Payment, Transaction
 from ..payment.utils import store_customer_id
 from ..product.models import ProductTranslation, ProductVariantTranslation
 from ..warehouse.availability import check_stock_quantity_bulk
-from ..warehouse.management import allocate_stock
+from ..warehouse.management import allocate_stocks
 from . import AddressType, models
 from .checkout_cleaner import clean_checkout_payment, clean_checkout_shipping
 from .models import Checkout
@@ -363,10 +363,14 @@ def _create_order(*, checkout: Checkout, order_data: dict, user: User) -> Order:
     order_lines = OrderLine.objects.bulk_create(order_lines)
 
     # allocate stocks from the lines
-    for line in order_lines:  # type: OrderLine
-        variant = line.variant
-        if variant and variant.track_inventory:
-            allocate_stock(line, checkout.get_country(), line.quantity)
+    lines_to_allocate = [
+        line for line in order_lines if line.variant and line.variant.track_inventory
+    ]
+    allocate_stocks(
+        lines_to_allocate,
+        checkout.get_country(),
+        [line.quantity for line in lines_to_allocate],
+    )
 
     # Add gift cards to the order
     for gift_card in checkout.gift_cards.select_for_update():
@@ -30,6 +30,7 @@ from ..giftcard.utils import (
 from ..plugins.manager import PluginsManager, get_plugins_manager
 from ..product import models as product_models
 from ..shipping.models import ShippingMethod
+from ..shipping.rules import get_shipping_rules_table
 from ..warehouse.availability import check_stock_quantity, check_stock_quantity_bulk
 from . import AddressType, CheckoutLineInfo
 from .models import Checkout, CheckoutLine
@@ -550,7 +551,12 @@ def get_valid_shipping_methods_for_checkout(
     discounts: Iterable[DiscountInfo],
     country_code: Optional[str] = None,
     subtotal: Optional["TaxedMoney"] = None,
-):
+) -> Optional[List[ShippingMethod]]:
+    """Return shipping methods applicable for the checkout ordered by price.
+
+    The methods are evaluated against the shipping rules table of the checkout
+    channel, which is shared between requests until shipping configuration changes.
+    """
     if not is_shipping_required(lines):
         return None
     if not checkout.shipping_address:
@@ -562,12 +568,13 @@ def get_valid_shipping_methods_for_checkout(
         subtotal = manager.calculate_checkout_subtotal(
             checkout, lines, checkout.shipping_address, discounts
         )
-    return ShippingMethod.objects.applicable_shipping_methods_for_instance(
-        checkout,
-        channel_id=checkout.channel_id,
+    shipping_rules_table = get_shipping_rules_table(checkout.channel_id)
+    return shipping_rules_table.applicable_shipping_methods(
         price=subtotal.gross,
-        country_code=country_code,
-        lines=lines,
+        weight=checkout.get_total_weight(lines),
+        country_code=country_code or checkout.shipping_address.country.code,
+        product_ids={line.product.id for line in lines},
+        shipping_address=checkout.shipping_address,
     )
 
 
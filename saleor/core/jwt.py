@@ -6,12 +6,13 @@ import jwt
 from django.conf import settings
 from django.core.handlers.wsgi import WSGIRequest
 
+from ..account.auth_cache import UserAuth, get_user_auth
 from ..account.models import User
 from ..app.models import App
 from .permissions import (
     get_permission_names,
+    get_permissions_enum_dict,
     get_permissions_from_codenames,
-    get_permissions_from_names,
 )
 
 JWT_ALGORITHM = "HS256"
@@ -121,18 +122,30 @@ def get_token_from_request(request: WSGIRequest) -> Optional[str]:
     return auth[1]
 
 
-def get_user_from_payload(payload: Dict[str, Any]) -> Optional[User]:
-    user = User.objects.filter(email=payload["email"], is_active=True).first()
+def _get_user_auth_from_payload(payload: Dict[str, Any]) -> UserAuth:
     user_jwt_token = payload.get("token")
-    if not user_jwt_token or not user:
+    user_auth = None
+    if user_jwt_token:
+        user_auth = get_user_auth(payload["email"], user_jwt_token)
+    if not user_auth:
         raise jwt.InvalidTokenError(
             "Invalid token. Create new one by using tokenCreate mutation."
         )
-    if user.jwt_token_key != user_jwt_token:
+    return user_auth
+
+
+def get_user_from_payload(payload: Dict[str, Any]) -> Optional[User]:
+    user, _ = _get_user_auth_from_payload(payload)
+    return user
+
+
+def is_saleor_payload(payload: Dict[str, Any]) -> bool:
+    owner = payload.get(JWT_OWNER_FIELD)
+    if not owner:
         raise jwt.InvalidTokenError(
             "Invalid token. Create new one by using tokenCreate mutation."
         )
-    return user
+    return owner == JWT_SALEOR_OWNER_NAME
 
 
 def is_saleor_token(token: str) -> bool:
@@ -141,20 +154,20 @@ def is_saleor_token(token: str) -> bool:
         payload = jwt.decode(token, options={"verify_signature": False})
     except jwt.PyJWTError:
         return False
-    owner = payload.get(JWT_OWNER_FIELD)
-    if not owner:
-        raise jwt.InvalidTokenError(
-            "Invalid token. Create new one by using tokenCreate mutation."
-        )
-    if owner != JWT_SALEOR_OWNER_NAME:
-        return False
-    return True
+    return is_saleor_payload(payload)
 
 
 def get_user_from_access_token(token: str) -> Optional[User]:
-    if not is_saleor_token(token):
+    try:
+        payload = jwt_decode(token)
+    except jwt.PyJWTError:
+        # Tokens generated by plugins can't be verified with the Saleor key, so
+        # the token is decoded again only when it's invalid
+        if not is_saleor_token(token):
+            return None
+        raise
+    if not is_saleor_payload(payload):
         return None
-    payload = jwt_decode(token)
     return get_user_from_access_payload(payload)
 
 
@@ -165,12 +178,19 @@ def get_user_from_access_payload(payload: dict) -> Optional[User]:
             "Invalid token. Create new one by using tokenCreate mutation."
         )
     permissions = payload.get(PERMISSIONS_FIELD, None)
-    user = get_user_from_payload(payload)
-    if user and permissions is not None:
-        token_permissions = get_permissions_from_names(permissions)
-        token_codenames = [perm.codename for perm in token_permissions]
-        user.effective_permissions = get_permissions_from_codenames(token_codenames)
-        user.is_staff = True if user.effective_permissions else False
+    user, permission_names = _get_user_auth_from_payload(payload)
+    if permissions is not None:
+        permission_enums = get_permissions_enum_dict()
+        token_permissions = [permission_enums[name] for name in permissions]
+        user.effective_permissions = get_permissions_from_codenames(
+            [permission.codename for permission in token_permissions]
+        )
+        permission_names = frozenset(
+            permission.value for permission in token_permissions
+        )
+        user.is_staff = True if permission_names else False
+    # Use the snapshot of permissions instead of querying them in the backend
+    user._effective_permissions_cache = set(permission_names)
     return user
 
 
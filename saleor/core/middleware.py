@@ -9,8 +9,8 @@ from django.utils.functional import SimpleLazyObject
 from django.utils.translation import get_language
 from django_countries.fields import Country
 
-from ..discount.utils import fetch_discounts
-from ..plugins.manager import get_plugins_manager
+from ..discount.utils import fetch_cached_discounts
+from ..plugins.manager import get_cached_plugins_manager
 from . import analytics
 from .jwt import JWT_REFRESH_TOKEN_COOKIE_NAME, jwt_decode_with_exception_handler
 from .utils import get_client_ip, get_country_by_ip, get_currency_for_country
@@ -53,7 +53,7 @@ def discounts(get_response):
 
     def _discounts_middleware(request):
         request.discounts = SimpleLazyObject(
-            lambda: fetch_discounts(request.request_time)
+            lambda: fetch_cached_discounts(request.request_time)
         )
         return get_response(request)
 
@@ -109,7 +109,7 @@ def plugins(get_response):
     """Assign plugins manager."""
 
     def _get_manager():
-        return get_plugins_manager(plugins=settings.PLUGINS)
+        return get_cached_plugins_manager(plugins=settings.PLUGINS)
 
     def _plugins_middleware(request):
         request.plugins = SimpleLazyObject(lambda: _get_manager())
@@ -1,9 +1,10 @@
 import jwt
 import pytest
-from django.contrib.auth.models import Permission
+from django.contrib.auth.models import Group, Permission
 from freezegun import freeze_time
 from jwt import ExpiredSignatureError, InvalidSignatureError, InvalidTokenError
 
+from ...account.auth_cache import invalidate_user_auth
 from ..auth_backend import JSONWebTokenBackend
 from ..jwt import (
     JWT_ACCESS_TYPE,
@@ -196,3 +197,102 @@ def test_user_payload_doesnt_have_user_token(rf, staff_user, settings):
     backend = JSONWebTokenBackend()
     with pytest.raises(InvalidTokenError):
         backend.authenticate(request)
+
+
+def test_user_authenticated_from_cache(
+    rf, staff_user, permission_manage_orders, settings, django_assert_num_queries
+):
+    # given
+    settings.CACHE_USER_AUTH = True
+    staff_user.user_permissions.add(permission_manage_orders)
+    access_token = create_access_token(staff_user)
+    request = rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}")
+    backend = JSONWebTokenBackend()
+    backend.authenticate(request)
+
+    # when
+    with django_assert_num_queries(0):
+        user = backend.authenticate(request)
+        has_manage_orders = user.has_perm("order.manage_orders")
+        has_manage_users = user.has_perm("account.manage_users")
+
+    # then
+    assert user == staff_user
+    assert has_manage_orders
+    assert not has_manage_users
+
+
+def test_cached_user_deactivated(rf, staff_user, settings):
+    # given
+    settings.CACHE_USER_AUTH = True
+    access_token = create_access_token(staff_user)
+    request = rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}")
+    backend = JSONWebTokenBackend()
+    backend.authenticate(request)
+
+    # when
+    staff_user.is_active = False
+    staff_user.save(update_fields=["is_active"])
+
+    # then
+    with pytest.raises(InvalidTokenError):
+        backend.authenticate(request)
+
+
+def test_cached_user_email_changed(rf, staff_user, settings):
+    # given
+    settings.CACHE_USER_AUTH = True
+    access_token = create_access_token(staff_user)
+    request = rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}")
+    backend = JSONWebTokenBackend()
+    backend.authenticate(request)
+
+    # when
+    staff_user.email = "new_email@example.com"
+    staff_user.save(update_fields=["email"])
+
+    # then
+    with pytest.raises(InvalidTokenError):
+        backend.authenticate(request)
+
+
+def test_cached_user_group_permissions_changed(
+    rf, staff_user, permission_manage_orders, settings
+):
+    # given
+    settings.CACHE_USER_AUTH = True
+    group = Group.objects.create(name="Orders")
+    group.user_set.add(staff_user)
+    access_token = create_access_token(staff_user)
+    request = rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}")
+    backend = JSONWebTokenBackend()
+    assert not backend.authenticate(request).has_perm("order.manage_orders")
+
+    # when
+    group.permissions.add(permission_manage_orders)
+    invalidate_user_auth()
+
+    # then
+    assert backend.authenticate(request).has_perm("order.manage_orders")
+
+
+def test_user_with_limited_permissions_checked_without_queries(
+    rf, staff_user, app, permission_manage_orders, django_assert_num_queries
+):
+    # given
+    staff_user.user_permissions.add(permission_manage_orders)
+    app.permissions.add(permission_manage_orders)
+    access_token_for_app = create_access_token_for_app(app, staff_user)
+    request = rf.request(HTTP_AUTHORIZATION=f"JWT {access_token_for_app}")
+    backend = JSONWebTokenBackend()
+    user = backend.authenticate(request)
+
+    # when
+    with django_assert_num_queries(0):
+        has_manage_orders = user.has_perm("order.manage_orders")
+        has_manage_users = user.has_perm("account.manage_users")
+
+    # then
+    assert user.is_staff
+    assert has_manage_orders
+    assert not has_manage_users
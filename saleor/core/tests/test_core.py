@@ -5,6 +5,7 @@ from urllib.parse import urljoin
 
 import pytest
 from django.core.management import CommandError, call_command
+from django.db.models import Sum
 from django.db.utils import DataError
 from django.templatetags.static import static
 from django.test import RequestFactory, override_settings
@@ -17,6 +18,7 @@ from ...giftcard.models import GiftCard
 from ...order.models import Order
 from ...product.models import ProductImage, ProductType
 from ...shipping.models import ShippingZone
+from ...warehouse.models import Stock
 from ..storages import S3MediaStorage
 from ..templatetags.placeholder import placeholder
 from ..utils import (
@@ -171,6 +173,11 @@ def test_create_fake_order(db, monkeypatch, image, media_root, warehouse):
     for _ in random_data.create_orders(how_many):
         pass
     assert Order.objects.all().count() == 2
+    stocks = Stock.objects.annotate(
+        allocations_quantity=Sum("allocations__quantity_allocated")
+    )
+    for stock in stocks:
+        assert stock.quantity_allocated == (stock.allocations_quantity or 0)
 
 
 def test_create_product_sales(db):
@@ -1,6 +1,7 @@
 from django.core.handlers.base import BaseHandler
 from freezegun import freeze_time
 
+from ...plugins.manager import invalidate_cached_plugins_managers
 from ..jwt import (
     JWT_REFRESH_TOKEN_COOKIE_NAME,
     JWT_REFRESH_TYPE,
@@ -8,6 +9,7 @@ from ..jwt import (
     jwt_encode,
     jwt_user_payload,
 )
+from ..middleware import plugins
 
 
 @freeze_time("2020-03-18 12:00:00")
@@ -46,3 +48,39 @@ def test_jwt_refresh_token_middleware_token_without_expire(rf, customer_user, se
     response = handler.get_response(request)
     cookie = response.cookies.get(JWT_REFRESH_TOKEN_COOKIE_NAME)
     assert cookie.value == refresh_token
+
+
+def _get_request_plugins_manager(rf):
+    captured = {}
+
+    def get_response(request):
+        captured["plugins"] = request.plugins.plugins
+        return None
+
+    plugins(get_response)(rf.request())
+    return captured["plugins"]
+
+
+def test_plugins_middleware_reuses_cached_manager(
+    rf, settings, db, django_assert_num_queries
+):
+    settings.CACHE_PLUGINS_MANAGER = True
+    settings.PLUGINS = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    invalidate_cached_plugins_managers()
+
+    with django_assert_num_queries(1):
+        first_plugins = _get_request_plugins_manager(rf)
+    with django_assert_num_queries(0):
+        second_plugins = _get_request_plugins_manager(rf)
+
+    assert first_plugins is second_plugins
+
+
+def test_plugins_middleware_without_cache(rf, settings, db, django_assert_num_queries):
+    settings.CACHE_PLUGINS_MANAGER = False
+    settings.PLUGINS = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+
+    with django_assert_num_queries(1):
+        _get_request_plugins_manager(rf)
+    with django_assert_num_queries(1):
+        _get_request_plugins_manager(rf)
@@ -13,7 +13,7 @@ from django.conf import settings
 from django.contrib.auth.models import Group, Permission
 from django.contrib.sites.models import Site
 from django.core.files import File
-from django.db.models import F, Q
+from django.db.models import Q
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.text import slugify
@@ -70,6 +70,7 @@ from ...product.models import (
     ProductVariantChannelListing,
     VariantImage,
 )
+from ...product.search import update_products_search_vector
 from ...product.tasks import update_products_discounted_prices_of_discount_task
 from ...product.thumbnails import (
     create_category_background_image_thumbnails,
@@ -82,7 +83,7 @@ from ...shipping.models import (
     ShippingMethodType,
     ShippingZone,
 )
-from ...warehouse.management import increase_stock
+from ...warehouse.management import deallocate_stock, increase_stock
 from ...warehouse.models import Stock, Warehouse
 
 fake = Factory.create()
@@ -439,6 +440,7 @@ def create_products_by_schema(placeholder_dir, create_images):
         variant_attributes=types["attribute.assignedvariantattribute"]
     )
     assign_attributes_to_pages(page_attributes=types["attribute.assignedpageattribute"])
+    update_products_search_vector(Product.objects.all())
     create_collections(
         data=types["product.collection"], placeholder_dir=placeholder_dir
     )
@@ -634,8 +636,7 @@ def create_fulfillments(order):
             line.quantity_fulfilled = quantity
             line.save(update_fields=["quantity_fulfilled"])
 
-            allocation.quantity_allocated = F("quantity_allocated") - quantity
-            allocation.save(update_fields=["quantity_allocated"])
+            deallocate_stock(line, quantity)
 
     update_order_status(order)
 
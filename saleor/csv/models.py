@@ -17,6 +17,23 @@ class ExportFile(Job):
         App, related_name="export_files", on_delete=models.CASCADE, null=True
     )
     content_file = models.FileField(upload_to="export_files", null=True)
+    # Progress of the export split into shards processed by separate tasks
+    total_shards = models.PositiveIntegerField(default=0)
+    processed_shards = models.PositiveIntegerField(default=0)
+
+
+class ImportFile(Job):
+    user = models.ForeignKey(
+        User, related_name="import_files", on_delete=models.CASCADE, null=True
+    )
+    app = models.ForeignKey(
+        App, related_name="import_files", on_delete=models.CASCADE, null=True
+    )
+    content_file = models.FileField(upload_to="import_files")
+    total_rows = models.PositiveIntegerField(default=0)
+    imported_rows = models.PositiveIntegerField(default=0)
+    # Row-level errors, the rows with errors are skipped during the import
+    errors = JSONField(blank=True, default=list, encoder=CustomJsonEncoder)
 
 
 class ExportEvent(models.Model):
@@ -1,11 +1,25 @@
 from typing import Dict, Union
 
+from celery import chord
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
 from ..celeryconf import app
 from ..core import JobStatus
 from . import events
 from .emails import send_export_failed_info
-from .models import ExportFile
-from .utils.export import export_products
+from .models import ExportFile, ImportFile
+from .utils.export import (
+    delete_products_shards,
+    export_products,
+    export_products_shard,
+    get_products_shards,
+    merge_products_shards,
+)
+from .utils.import_products import import_products
+
+SHARD_TASK_MAX_RETRIES = 3
 
 
 def on_task_failure(self, exc, task_id, args, kwargs, einfo):
@@ -28,6 +42,15 @@ def on_task_failure(self, exc, task_id, args, kwargs, einfo):
         send_export_failed_info(export_file, export_file.user.email, "export_failed")
 
 
+def on_shard_task_failure(self, exc, task_id, args, kwargs, einfo):
+    export_file_id = args[0]
+    export_file = ExportFile.objects.get(pk=export_file_id)
+    # Report the failure only once when many shards of the export failed
+    if export_file.status != JobStatus.FAILED:
+        on_task_failure(self, exc, task_id, args, kwargs, einfo)
+    delete_products_shards(export_file_id, export_file.total_shards)
+
+
 def on_task_success(self, retval, task_id, args, kwargs):
     export_file_id = args[0]
 
@@ -50,3 +73,90 @@ def export_products_task(
 ):
     export_file = ExportFile.objects.get(pk=export_file_id)
     export_products(export_file, scope, export_info, file_type, delimiter)
+
+
+@app.task(on_failure=on_task_failure)
+def export_products_in_shards_task(
+    export_file_id: int,
+    scope: Dict[str, Union[str, dict]],
+    export_info: Dict[str, list],
+    file_type: str,
+    delimiter: str = ";",
+):
+    """Export products in parallel shards and merge them into the export file.
+
+    Every shard is exported by a separate task, retried on its own in case of
+    an error. The export file is completed by the task merging the shards.
+    """
+    shards = get_products_shards(scope, settings.EXPORT_PRODUCTS_SHARD_SIZE)
+    ExportFile.objects.filter(pk=export_file_id).update(
+        total_shards=len(shards), processed_shards=0, updated_at=timezone.now()
+    )
+
+    merge_task = merge_products_shards_task.si(
+        export_file_id, export_info, file_type, delimiter, len(shards)
+    )
+    if not shards:
+        merge_task.delay()
+        return
+
+    shard_tasks = [
+        export_products_shard_task.si(
+            export_file_id, scope, export_info, index, first_pk, last_pk
+        )
+        for index, (first_pk, last_pk) in enumerate(shards)
+    ]
+    chord(shard_tasks)(merge_task)
+
+
+@app.task(
+    on_failure=on_shard_task_failure,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=SHARD_TASK_MAX_RETRIES,
+)
+def export_products_shard_task(
+    export_file_id: int,
+    scope: Dict[str, Union[str, dict]],
+    export_info: Dict[str, list],
+    index: int,
+    first_pk: int,
+    last_pk: int,
+):
+    export_products_shard(export_file_id, scope, export_info, index, first_pk, last_pk)
+    ExportFile.objects.filter(pk=export_file_id).update(
+        processed_shards=F("processed_shards") + 1, updated_at=timezone.now()
+    )
+
+
+@app.task(on_success=on_task_success, on_failure=on_task_failure)
+def merge_products_shards_task(
+    export_file_id: int,
+    export_info: Dict[str, list],
+    file_type: str,
+    delimiter: str,
+    shards_count: int,
+):
+    export_file = ExportFile.objects.get(pk=export_file_id)
+    merge_products_shards(export_file, export_info, file_type, delimiter, shards_count)
+
+
+def on_import_task_failure(self, exc, task_id, args, kwargs, einfo):
+    import_file_id = args[0]
+    import_file = ImportFile.objects.get(pk=import_file_id)
+    import_file.status = JobStatus.FAILED
+    import_file.message = str(exc)[:255]
+    import_file.save(update_fields=["status", "message", "updated_at"])
+
+
+def on_import_task_success(self, retval, task_id, args, kwargs):
+    import_file_id = args[0]
+    import_file = ImportFile.objects.get(pk=import_file_id)
+    import_file.status = JobStatus.SUCCESS
+    import_file.save(update_fields=["status", "updated_at"])
+
+
+@app.task(on_success=on_import_task_success, on_failure=on_import_task_failure)
+def import_products_task(import_file_id: int, delimiter: str = ";"):
+    import_file = ImportFile.objects.get(pk=import_file_id)
+    import_products(import_file, delimiter)
@@ -0,0 +1,88 @@
+from unittest.mock import patch
+
+import openpyxl
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .....graphql.csv.enums import ProductFieldEnum
+from .....product.models import Product, ProductVariant
+from .... import FileTypes
+from ....utils.export import create_file_with_headers, export_products_in_batches
+from ....utils.product_headers import get_export_fields_and_headers_info
+
+PRODUCTS_COUNT = 200
+VARIANTS_PER_PRODUCT = 3
+
+EXPORT_INFO = {
+    "fields": [
+        ProductFieldEnum.NAME.value,
+        ProductFieldEnum.PRODUCT_TYPE.value,
+        ProductFieldEnum.CATEGORY.value,
+        ProductFieldEnum.COLLECTIONS.value,
+        ProductFieldEnum.PRODUCT_IMAGES.value,
+        ProductFieldEnum.VARIANT_SKU.value,
+        ProductFieldEnum.VARIANT_IMAGES.value,
+    ],
+    "warehouses": [],
+    "attributes": [],
+    "channels": [],
+}
+
+
+@pytest.fixture
+def generated_catalog(product_type, category, collection):
+    products = Product.objects.bulk_create(
+        [
+            Product(
+                name=f"Product {i}",
+                slug=f"product-{i}",
+                product_type=product_type,
+                category=category,
+            )
+            for i in range(PRODUCTS_COUNT)
+        ]
+    )
+    collection.products.add(*products)
+    ProductVariant.objects.bulk_create(
+        [
+            ProductVariant(product=product, sku=f"{product.slug}-{i}")
+            for product in products
+            for i in range(VARIANTS_PER_PRODUCT)
+        ]
+    )
+    return products
+
+
+def export_products(queryset, file_type):
+    export_fields, file_headers, data_headers = get_export_fields_and_headers_info(
+        EXPORT_INFO
+    )
+    writer = create_file_with_headers(file_headers, ";", file_type)
+    export_products_in_batches(
+        queryset, EXPORT_INFO, set(export_fields), data_headers, writer
+    )
+    return writer.close()
+
+
+@pytest.mark.parametrize("file_type", [FileTypes.CSV, FileTypes.XLSX])
+@patch("saleor.csv.utils.export.BATCH_SIZE", PRODUCTS_COUNT)
+def test_export_products_queries_count_independent_of_products_count(
+    generated_catalog, file_type, django_assert_max_num_queries
+):
+    # given
+    single_product = Product.objects.filter(pk=generated_catalog[0].pk)
+    with CaptureQueriesContext(connection) as single_product_queries:
+        export_products(single_product, file_type).close()
+
+    # when
+    with django_assert_max_num_queries(len(single_product_queries)):
+        temp_file = export_products(Product.objects.order_by("pk"), file_type)
+
+    # then
+    if file_type == FileTypes.CSV:
+        rows_count = len(temp_file.read().decode().strip().split("\r\n"))
+    else:
+        rows_count = openpyxl.load_workbook(temp_file).active.max_row
+    temp_file.close()
+    assert rows_count == PRODUCTS_COUNT * VARIANTS_PER_PRODUCT + 1
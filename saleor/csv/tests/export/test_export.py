@@ -1,10 +1,8 @@
 import shutil
-from tempfile import NamedTemporaryFile
 from unittest.mock import ANY, MagicMock, patch
 
 import graphene
 import openpyxl
-import petl as etl
 import pytest
 from django.core.files import File
 from freezegun import freeze_time
@@ -14,6 +12,7 @@ from ....graphql.csv.enums import ProductFieldEnum
 from ....product.models import Product, ProductChannelListing
 from ... import FileTypes
 from ...utils.export import (
+    FileWriter,
     append_to_file,
     create_file_with_headers,
     export_products,
@@ -50,7 +49,9 @@ def test_export_products(
     }
 
     mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    writer_mock = MagicMock(spec=FileWriter)
+    writer_mock.close.return_value = mock_file
+    create_file_with_headers_mock.return_value = writer_mock
 
     # when
     export_products(user_export_file, {"all": ""}, export_info, file_type)
@@ -68,9 +69,7 @@ def test_export_products(
         export_info,
         {"id", "name"},
         ["id", "name"],
-        ";",
-        mock_file,
-        file_type,
+        writer_mock,
     )
     send_email_mock.assert_called_once_with(
         user_export_file, user_export_file.user.email, "export_products_success"
@@ -99,7 +98,9 @@ def test_export_products_ids(
     assert not user_export_file.content_file
 
     mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    writer_mock = MagicMock(spec=FileWriter)
+    writer_mock.close.return_value = mock_file
+    create_file_with_headers_mock.return_value = writer_mock
 
     # when
     export_products(user_export_file, {"ids": pks}, export_info, file_type)
@@ -116,9 +117,7 @@ def test_export_products_ids(
         export_info,
         {"id"},
         ["id"],
-        ";",
-        mock_file,
-        file_type,
+        writer_mock,
     )
     send_email_mock.assert_called_once_with(
         user_export_file, user_export_file.user.email, "export_products_success"
@@ -151,7 +150,9 @@ def test_export_products_filter_is_published(
     assert not user_export_file.content_file
 
     mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    writer_mock = MagicMock(spec=FileWriter)
+    writer_mock.close.return_value = mock_file
+    create_file_with_headers_mock.return_value = writer_mock
 
     # when
     export_products(
@@ -175,9 +176,7 @@ def test_export_products_filter_is_published(
         export_info,
         {"id"},
         ["id"],
-        ";",
-        mock_file,
-        file_type,
+        writer_mock,
     )
     send_email_mock.assert_called_once_with(
         user_export_file, user_export_file.user.email, "export_products_success"
@@ -209,7 +208,9 @@ def test_export_products_filter_collections(
     assert not user_export_file.content_file
 
     mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    writer_mock = MagicMock(spec=FileWriter)
+    writer_mock.close.return_value = mock_file
+    create_file_with_headers_mock.return_value = writer_mock
 
     # when
     export_products(
@@ -229,7 +230,7 @@ def test_export_products_filter_collections(
     assert export_products_in_batches_mock.call_count == 1
     batch_args, _ = export_products_in_batches_mock.call_args
     assert set(batch_args[0].values_list("pk", flat=True)) == {product_list[-1].pk}
-    assert batch_args[1:] == (export_info, {"id"}, ["id"], ";", mock_file, file_type)
+    assert batch_args[1:] == (export_info, {"id"}, ["id"], writer_mock)
     send_email_mock.assert_called_once_with(
         user_export_file, user_export_file.user.email, "export_products_success"
     )
@@ -258,7 +259,9 @@ def test_export_products_by_app(
     file_type = FileTypes.CSV
 
     mock_file = MagicMock(spec=File)
-    create_file_with_headers_mock.return_value = mock_file
+    writer_mock = MagicMock(spec=FileWriter)
+    writer_mock.close.return_value = mock_file
+    create_file_with_headers_mock.return_value = writer_mock
 
     # when
     export_products(app_export_file, {"all": ""}, export_info, file_type)
@@ -277,9 +280,7 @@ def test_export_products_by_app(
         export_info,
         {"id", "name"},
         ["id", "name"],
-        ";",
-        mock_file,
-        file_type,
+        writer_mock,
     )
 
     send_email_mock.assert_not_called()
@@ -331,9 +332,10 @@ def test_create_file_with_headers_csv(user_export_file, tmpdir, media_root):
     assert not user_export_file.content_file
 
     # when
-    csv_file = create_file_with_headers(file_headers, ";", FileTypes.CSV)
+    writer = create_file_with_headers(file_headers, ";", FileTypes.CSV)
 
     # then
+    csv_file = writer.close()
     assert csv_file
 
     file_content = csv_file.read().decode().split("\r\n")
@@ -350,9 +352,10 @@ def test_create_file_with_headers_xlsx(user_export_file, tmpdir, media_root):
     assert not user_export_file.content_file
 
     # when
-    xlsx_file = create_file_with_headers(file_headers, ";", FileTypes.XLSX)
+    writer = create_file_with_headers(file_headers, ";", FileTypes.XLSX)
 
     # then
+    xlsx_file = writer.close()
     assert xlsx_file
 
     wb_obj = openpyxl.load_workbook(xlsx_file)
@@ -390,17 +393,13 @@ def test_append_to_file_for_csv(user_export_file, tmpdir, media_root):
     headers = ["id", "name", "collections"]
     delimiter = ";"
 
-    table = etl.fromdicts([{"id": "1", "name": "A"}], header=headers, missing=" ")
-
-    temp_file = NamedTemporaryFile()
-    etl.tocsv(table, temp_file.name, delimiter=delimiter)
+    writer = create_file_with_headers(headers, delimiter, FileTypes.CSV)
 
     # when
-    append_to_file(export_data, headers, temp_file, FileTypes.CSV, delimiter)
+    append_to_file(export_data, headers, writer)
 
     # then
-    user_export_file.refresh_from_db()
-
+    temp_file = writer.close()
     file_content = temp_file.read().decode().split("\r\n")
     assert ";".join(headers) in file_content
     assert ";".join(export_data[0].values()) in file_content
@@ -419,25 +418,18 @@ def test_append_to_file_for_xlsx(user_export_file, tmpdir, media_root):
     expected_headers = ["id", "name", "collections"]
     delimiter = ";"
 
-    table = etl.fromdicts(
-        [{"id": "1", "name": "A"}], header=expected_headers, missing=" "
-    )
-
-    temp_file = NamedTemporaryFile(suffix=".xlsx")
-    etl.io.xlsx.toxlsx(table, temp_file.name)
+    writer = create_file_with_headers(expected_headers, delimiter, FileTypes.XLSX)
 
     # when
-    append_to_file(export_data, expected_headers, temp_file, FileTypes.XLSX, delimiter)
+    append_to_file(export_data, expected_headers, writer)
 
     # then
-    user_export_file.refresh_from_db()
-
+    temp_file = writer.close()
     wb_obj = openpyxl.load_workbook(temp_file)
 
     sheet_obj = wb_obj.active
     max_col = sheet_obj.max_column
     max_row = sheet_obj.max_row
-    expected_headers = expected_headers
     headers = [sheet_obj.cell(row=1, column=i).value for i in range(1, max_col + 1)]
     data = []
     for i in range(2, max_row + 1):
@@ -475,10 +467,7 @@ def test_export_products_in_batches_for_csv(
     export_fields = ["id", "name", "variants__sku"]
     expected_headers = ["id", "name", "variant sku"]
 
-    table = etl.wrap([expected_headers])
-
-    temp_file = NamedTemporaryFile()
-    etl.tocsv(table, temp_file.name, delimiter=";")
+    writer = create_file_with_headers(expected_headers, ";", FileTypes.CSV)
 
     # when
     export_products_in_batches(
@@ -486,12 +475,11 @@ def test_export_products_in_batches_for_csv(
         export_info,
         set(export_fields),
         export_fields,
-        ";",
-        temp_file,
-        FileTypes.CSV,
+        writer,
     )
 
     # then
+    temp_file = writer.close()
 
     expected_data = []
     for product in qs.order_by("pk"):
@@ -532,10 +520,7 @@ def test_export_products_in_batches_for_xlsx(
     export_fields = ["id", "name", "variants__sku"]
     expected_headers = ["id", "name", "variant sku"]
 
-    table = etl.wrap([expected_headers])
-
-    temp_file = NamedTemporaryFile(suffix=".xlsx")
-    etl.io.xlsx.toxlsx(table, temp_file.name)
+    writer = create_file_with_headers(expected_headers, ";", FileTypes.XLSX)
 
     # when
     export_products_in_batches(
@@ -543,12 +528,11 @@ def test_export_products_in_batches_for_xlsx(
         export_info,
         set(export_fields),
         export_fields,
-        ";",
-        temp_file,
-        FileTypes.XLSX,
+        writer,
     )
 
     # then
+    temp_file = writer.close()
     expected_data = []
     for product in qs.order_by("pk"):
         product_data = []
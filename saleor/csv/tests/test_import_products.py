@@ -0,0 +1,235 @@
+import json
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.core.files.base import ContentFile
+
+from ...product.models import Product, ProductVariant
+from ...product.search import search_products
+from ..error_codes import ImportErrorCode
+from ..models import ImportFile
+from ..utils.import_products import import_products
+
+
+def create_import_file(user, rows, file_name="products.csv"):
+    content = "\n".join(";".join(row) for row in rows)
+    import_file = ImportFile(user=user)
+    import_file.content_file.save(file_name, ContentFile(content.encode()))
+    return import_file
+
+
+def test_import_products_updates_existing_product(
+    staff_user, product, warehouse, channel_USD, media_root
+):
+    # given
+    variant = product.variants.get()
+    rows = [
+        [
+            "id",
+            "name",
+            "variant sku",
+            "variant weight",
+            "color (product attribute)",
+            f"{warehouse.slug} (warehouse quantity)",
+            f"{channel_USD.slug} (channel price amount)",
+            f"{channel_USD.slug} (channel published)",
+        ],
+        [
+            str(product.pk),
+            "Updated name",
+            variant.sku,
+            "150.0 g",
+            "blue",
+            "25",
+            "12.50",
+            "False",
+        ],
+    ]
+    import_file = create_import_file(staff_user, rows)
+
+    # when
+    import_products(import_file)
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.errors == []
+    assert import_file.total_rows == 1
+    assert import_file.imported_rows == 1
+    assert import_file.message.startswith("Imported 1 of 1 rows")
+
+    product.refresh_from_db()
+    assert product.name == "Updated name"
+    assert not product.channel_listings.get(channel=channel_USD).is_published
+    assert [
+        value.slug
+        for assigned_attribute in product.attributes.all()
+        for value in assigned_attribute.values.all()
+    ] == ["blue"]
+
+    variant.refresh_from_db()
+    assert variant.weight.g == 150
+    assert variant.stocks.get(warehouse=warehouse).quantity == 25
+    listing = variant.channel_listings.get(channel=channel_USD)
+    assert listing.price_amount == Decimal("12.50")
+    assert list(search_products(Product.objects.all(), "Updated")) == [product]
+
+
+def test_import_products_creates_products_with_variants(
+    staff_user, product_type, category, warehouse, channel_USD, media_root
+):
+    # given
+    rows = [
+        [
+            "name",
+            "product type",
+            "category",
+            "variant sku",
+            "size (variant attribute)",
+            f"{warehouse.slug} (warehouse quantity)",
+            f"{channel_USD.slug} (channel price amount)",
+            f"{channel_USD.slug} (channel variant currency code)",
+        ],
+        ["New product", product_type.name, category.slug, "new-1", "small", "5", "10"],
+        ["New product", product_type.name, category.slug, "new-2", "huge", "", "12"],
+    ]
+    rows[1].append("USD")
+    rows[2].append("USD")
+    import_file = create_import_file(staff_user, rows)
+
+    # when
+    import_products(import_file)
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.errors == []
+    assert import_file.imported_rows == 2
+
+    product = Product.objects.get(slug="new-product")
+    assert product.product_type == product_type
+    assert product.category == category
+    variants = list(product.variants.order_by("sort_order"))
+    assert [variant.sku for variant in variants] == ["new-1", "new-2"]
+    assert [variant.sort_order for variant in variants] == [0, 1]
+    assert product.default_variant == variants[0]
+    assert variants[0].stocks.get(warehouse=warehouse).quantity == 5
+    assert not variants[1].stocks.exists()
+    assert variants[1].channel_listings.get().price_amount == Decimal("12")
+    assert variants[1].attributes.get().values.get().slug == "huge"
+
+
+def test_import_products_does_not_match_existing_product_by_name(
+    staff_user, product, media_root
+):
+    # given
+    rows = [
+        ["name", "product type", "variant sku"],
+        ["Test product 11", product.product_type.name, "new-sku"],
+    ]
+    import_file = create_import_file(staff_user, rows)
+
+    # when
+    import_products(import_file)
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.imported_rows == 0
+    assert [
+        (error["row"], error["field"], error["code"]) for error in import_file.errors
+    ] == [(2, "name", ImportErrorCode.UNIQUE.value)]
+    assert product.variants.count() == 1
+    assert not ProductVariant.objects.filter(sku="new-sku").exists()
+
+
+@patch("saleor.csv.utils.import_products.BATCH_SIZE", 1)
+def test_import_products_adds_variants_to_product_created_in_previous_batch(
+    staff_user, product_type, category, media_root
+):
+    # given
+    rows = [
+        ["name", "product type", "category", "variant sku"],
+        ["New product", product_type.name, category.slug, "new-1"],
+        ["New product", product_type.name, category.slug, "new-2"],
+    ]
+    import_file = create_import_file(staff_user, rows)
+
+    # when
+    import_products(import_file)
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.errors == []
+    assert import_file.imported_rows == 2
+    product = Product.objects.get(slug="new-product")
+    assert set(product.variants.values_list("sku", flat=True)) == {"new-1", "new-2"}
+
+
+def test_import_products_accepts_description_in_json_only(
+    staff_user, product_type, category, media_root
+):
+    # given
+    description = {"blocks": [{"type": "paragraph", "data": {"text": "Text"}}]}
+    python_literal = str(description)
+    rows = [
+        ["name", "product type", "category", "description"],
+        ["JSON product", product_type.name, category.slug, json.dumps(description)],
+        ["Literal product", product_type.name, category.slug, python_literal],
+    ]
+    import_file = create_import_file(staff_user, rows)
+
+    # when
+    import_products(import_file)
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.errors == []
+    assert Product.objects.get(slug="json-product").description == description
+    assert Product.objects.get(slug="literal-product").description == {
+        "blocks": [{"type": "paragraph", "data": {"text": python_literal}}]
+    }
+
+
+def test_import_products_reports_row_errors(
+    staff_user, product, warehouse, channel_USD, media_root
+):
+    # given
+    rows = [
+        [
+            "id",
+            "name",
+            "product type",
+            "variant sku",
+            f"{warehouse.slug} (warehouse quantity)",
+            f"{channel_USD.slug} (channel variant cost price)",
+            "unknown (warehouse quantity)",
+        ],
+        [str(product.pk), "Valid row", "", "", "", "", ""],
+        ["", "New product", "Unknown type", "new-sku", "", "", ""],
+        [str(product.pk), "", "", product.variants.get().sku, "-1", "", ""],
+        ["", "Other product", "", "", "", "", ""],
+        ["", "Product", product.product_type.name, "new-sku", "", "1.00", ""],
+    ]
+    import_file = create_import_file(staff_user, rows)
+
+    # when
+    import_products(import_file)
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.total_rows == 5
+    assert import_file.imported_rows == 1
+    assert [
+        (error["row"], error["field"], error["code"]) for error in import_file.errors
+    ] == [
+        (None, "unknown (warehouse quantity)", ImportErrorCode.INVALID.value),
+        (3, "product type", ImportErrorCode.NOT_FOUND.value),
+        (4, f"{warehouse.slug} (warehouse quantity)", ImportErrorCode.INVALID.value),
+        (5, "product type", ImportErrorCode.REQUIRED.value),
+        (
+            6,
+            f"{channel_USD.slug} (channel price amount)",
+            ImportErrorCode.REQUIRED.value,
+        ),
+    ]
+    product.refresh_from_db()
+    assert product.name == "Valid row"
+    assert not ProductVariant.objects.filter(sku="new-sku").exists()
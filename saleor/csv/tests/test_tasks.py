@@ -1,13 +1,25 @@
 import datetime
 from unittest.mock import Mock, patch
 
+import openpyxl
 import pytz
+from django.core.files.storage import default_storage
 from freezegun import freeze_time
 
 from ...core import JobStatus
+from ...graphql.csv.enums import ProductFieldEnum
+from ...product.models import ProductChannelListing, ProductVariant
 from .. import ExportEvents, FileTypes
-from ..models import ExportEvent
-from ..tasks import export_products_task, on_task_failure, on_task_success
+from ..models import ExportEvent, ExportFile, ImportFile
+from ..tasks import (
+    export_products_in_shards_task,
+    export_products_task,
+    import_products_task,
+    on_shard_task_failure,
+    on_task_failure,
+    on_task_success,
+)
+from ..utils.export import get_products_shard_file_name
 
 
 @patch("saleor.csv.tasks.export_products")
@@ -133,3 +145,139 @@ def test_on_task_success(user_export_file):
         user=user_export_file.user,
         type=ExportEvents.EXPORT_SUCCESS,
     )
+
+
+@patch("saleor.csv.utils.export.send_email_with_link_to_download_file")
+def test_export_products_in_shards_task(
+    send_email_mock, user_export_file, product_list, media_root, settings
+):
+    # given
+    settings.EXPORT_PRODUCTS_SHARD_SIZE = 2
+    export_info = {
+        "fields": [ProductFieldEnum.NAME.value, ProductFieldEnum.VARIANT_SKU.value],
+        "warehouses": [],
+        "attributes": [],
+        "channels": [],
+    }
+
+    # when
+    export_products_in_shards_task(
+        user_export_file.id, {"all": ""}, export_info, FileTypes.CSV
+    )
+
+    # then
+    user_export_file.refresh_from_db()
+    assert user_export_file.status == JobStatus.SUCCESS
+    assert user_export_file.total_shards == 2
+    assert user_export_file.processed_shards == 2
+
+    file_content = user_export_file.content_file.read().decode().split("\r\n")
+    assert file_content[0] == "id;name;variant sku"
+    for variant in ProductVariant.objects.select_related("product"):
+        row = f"{variant.product.pk};{variant.product.name};{variant.sku}"
+        assert row in file_content
+
+    for index in range(user_export_file.total_shards):
+        file_name = get_products_shard_file_name(user_export_file.pk, index)
+        assert not default_storage.exists(file_name)
+    send_email_mock.assert_called_once_with(
+        user_export_file, user_export_file.user.email, "export_products_success"
+    )
+
+
+@patch("saleor.csv.utils.export.send_email_with_link_to_download_file")
+def test_export_products_in_shards_task_xlsx_matches_not_sharded_export(
+    send_email_mock, staff_user, product_list, channel_USD, media_root, settings
+):
+    # given
+    settings.EXPORT_PRODUCTS_SHARD_SIZE = 2
+    ProductChannelListing.objects.filter(channel=channel_USD).update(
+        publication_date=datetime.date(2021, 1, 1)
+    )
+    export_info = {
+        "fields": [ProductFieldEnum.NAME.value, ProductFieldEnum.VARIANT_SKU.value],
+        "warehouses": [],
+        "attributes": [],
+        "channels": [channel_USD.pk],
+    }
+    export_file = ExportFile.objects.create(user=staff_user)
+    sharded_export_file = ExportFile.objects.create(user=staff_user)
+
+    # when
+    export_products_task(export_file.id, {"all": ""}, export_info, FileTypes.XLSX)
+    export_products_in_shards_task(
+        sharded_export_file.id, {"all": ""}, export_info, FileTypes.XLSX
+    )
+
+    # then
+    export_file.refresh_from_db()
+    sharded_export_file.refresh_from_db()
+    assert sharded_export_file.total_shards == 2
+
+    def get_cell_values(export_file):
+        sheet = openpyxl.load_workbook(export_file.content_file).active
+        return sorted(sheet.iter_rows(min_row=2, values_only=True), key=str)
+
+    rows = get_cell_values(export_file)
+    assert rows
+    assert get_cell_values(sharded_export_file) == rows
+    values = {value for row in rows for value in row}
+    assert datetime.datetime(2021, 1, 1) in values
+    assert not any(
+        isinstance(value, str) and value.startswith("2021") for value in values
+    )
+
+
+@patch("saleor.csv.tasks.send_export_failed_info")
+def test_on_shard_task_failure_reported_once(
+    send_export_failed_info_mock, user_export_file
+):
+    # given
+    user_export_file.total_shards = 2
+    user_export_file.save(update_fields=["total_shards"])
+    args = [user_export_file.pk, {"all": ""}]
+    info = Mock(type="Test error")
+
+    # when
+    on_shard_task_failure(None, Exception("Test"), "task_1", args, {}, info)
+    on_shard_task_failure(None, Exception("Test"), "task_2", args, {}, info)
+
+    # then
+    user_export_file.refresh_from_db()
+    assert user_export_file.status == JobStatus.FAILED
+    assert (
+        ExportEvent.objects.filter(
+            export_file=user_export_file, type=ExportEvents.EXPORT_FAILED
+        ).count()
+        == 1
+    )
+    send_export_failed_info_mock.assert_called_once()
+
+
+@patch("saleor.csv.tasks.import_products")
+def test_import_products_task(import_products_mock, staff_user):
+    # given
+    import_file = ImportFile.objects.create(user=staff_user)
+
+    # when
+    import_products_task.apply(args=[import_file.pk])
+
+    # then
+    import_products_mock.assert_called_once_with(import_file, ";")
+    import_file.refresh_from_db()
+    assert import_file.status == JobStatus.SUCCESS
+
+
+@patch("saleor.csv.tasks.import_products")
+def test_import_products_task_failure(import_products_mock, staff_user):
+    # given
+    import_file = ImportFile.objects.create(user=staff_user)
+    import_products_mock.side_effect = ValueError("Invalid file.")
+
+    # when
+    import_products_task.apply(args=[import_file.pk])
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.status == JobStatus.FAILED
+    assert import_file.message == "Invalid file."
@@ -1,14 +1,34 @@
+import csv
+import io
+import json
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from decimal import Decimal
 from tempfile import NamedTemporaryFile
-from typing import IO, TYPE_CHECKING, Any, Dict, List, Set, Union
-
-import petl as etl
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+import openpyxl
+from django.core.files import File
+from django.core.files.storage import default_storage
 from django.utils import timezone
 
+from ...core.utils.json_serializer import CustomJsonEncoder
 from ...product.models import Product
 from .. import FileTypes
 from ..emails import send_email_with_link_to_download_file
 from .product_headers import get_export_fields_and_headers_info
-from .products_data import get_products_data
+from .products_data import iter_products_data
 
 if TYPE_CHECKING:
     # flake8: noqa
@@ -18,6 +38,8 @@ if TYPE_CHECKING:
 
 
 BATCH_SIZE = 10000
+PRODUCTS_SHARD_FILE_NAME = "export_files/shards/{export_file_id}/{index}.jsonl"
+SHARD_VALUE_TYPE_KEY = "_shard_type"
 
 
 def export_products(
@@ -27,25 +49,30 @@ def export_products(
     file_type: str,
     delimiter: str = ";",
 ):
-    file_name = get_filename("product", file_type)
     queryset = get_product_queryset(scope)
 
     export_fields, file_headers, data_headers = get_export_fields_and_headers_info(
         export_info
     )
 
-    temporary_file = create_file_with_headers(file_headers, delimiter, file_type)
+    writer = create_file_with_headers(file_headers, delimiter, file_type)
 
     export_products_in_batches(
         queryset,
         export_info,
         set(export_fields),
         data_headers,
-        delimiter,
-        temporary_file,
-        file_type,
+        writer,
     )
 
+    finish_products_export(export_file, writer, file_type)
+
+
+def finish_products_export(
+    export_file: "ExportFile", writer: "FileWriter", file_type: str
+):
+    file_name = get_filename("product", file_type)
+    temporary_file = writer.close()
     save_csv_file_in_export_file(export_file, temporary_file, file_name)
     temporary_file.close()
 
@@ -55,6 +82,76 @@ def export_products(
         )
 
 
+def get_products_shards(
+    scope: Dict[str, Union[str, dict]], shard_size: int
+) -> List[Tuple[int, int]]:
+    """Split the products from the scope into pk ranges of `shard_size` products.
+
+    Return the list of the first and last product pk of every shard.
+    """
+    queryset = get_product_queryset(scope)
+    return [(pks[0], pks[-1]) for pks in queryset_in_batches(queryset, shard_size)]
+
+
+def get_products_shard_file_name(export_file_id: int, index: int) -> str:
+    return PRODUCTS_SHARD_FILE_NAME.format(export_file_id=export_file_id, index=index)
+
+
+def export_products_shard(
+    export_file_id: int,
+    scope: Dict[str, Union[str, dict]],
+    export_info: Dict[str, list],
+    index: int,
+    first_pk: int,
+    last_pk: int,
+):
+    """Export the products from the pk range to the shard file in the storage."""
+    queryset = get_product_queryset(scope).filter(pk__gte=first_pk, pk__lte=last_pk)
+
+    export_fields, _, data_headers = get_export_fields_and_headers_info(export_info)
+
+    writer = ShardFileWriter()
+    export_products_in_batches(
+        queryset, export_info, set(export_fields), data_headers, writer
+    )
+
+    file_name = get_products_shard_file_name(export_file_id, index)
+    # The shard might be left by the previous attempt of the task
+    if default_storage.exists(file_name):
+        default_storage.delete(file_name)
+    temporary_file = writer.close()
+    default_storage.save(file_name, File(temporary_file))
+    temporary_file.close()
+
+
+def merge_products_shards(
+    export_file: "ExportFile",
+    export_info: Dict[str, list],
+    file_type: str,
+    delimiter: str,
+    shards_count: int,
+):
+    """Concatenate the exported shards into the export file."""
+    _, file_headers, _ = get_export_fields_and_headers_info(export_info)
+
+    writer = create_file_with_headers(file_headers, delimiter, file_type)
+    for index in range(shards_count):
+        file_name = get_products_shard_file_name(export_file.pk, index)
+        with default_storage.open(file_name, "rb") as shard_file:
+            for line in shard_file:
+                writer.write_row(json.loads(line, object_hook=decode_shard_value))
+
+    finish_products_export(export_file, writer, file_type)
+    delete_products_shards(export_file.pk, shards_count)
+
+
+def delete_products_shards(export_file_id: int, shards_count: int):
+    for index in range(shards_count):
+        file_name = get_products_shard_file_name(export_file_id, index)
+        if default_storage.exists(file_name):
+            default_storage.delete(file_name)
+
+
 def get_filename(model_name: str, file_type: str) -> str:
     return "{}_data_{}.{}".format(
         model_name, timezone.now().strftime("%d_%m_%Y"), file_type
@@ -77,15 +174,16 @@ def get_product_queryset(scope: Dict[str, Union[str, dict]]) -> "QuerySet":
     return queryset
 
 
-def queryset_in_batches(queryset):
+def queryset_in_batches(queryset, batch_size: Optional[int] = None):
     """Slice a queryset into batches.
 
     Input queryset should be sorted be pk.
     """
+    batch_size = batch_size or BATCH_SIZE
     start_pk = 0
 
     while True:
-        qs = queryset.filter(pk__gt=start_pk)[:BATCH_SIZE]
+        qs = queryset.filter(pk__gt=start_pk)[:batch_size]
         pks = list(qs.values_list("pk", flat=True))
 
         if not pks:
@@ -101,9 +199,7 @@ def export_products_in_batches(
     export_info: Dict[str, list],
     export_fields: Set[str],
     headers: List[str],
-    delimiter: str,
-    temporary_file: Any,
-    file_type: str,
+    writer: "FileWriter",
 ):
     warehouses = export_info.get("warehouses")
     attributes = export_info.get("attributes")
@@ -119,39 +215,136 @@ def export_products_in_batches(
             "category",
         )
 
-        export_data = get_products_data(
+        export_data = iter_products_data(
             product_batch, export_fields, attributes, warehouses, channels
         )
 
-        append_to_file(export_data, headers, temporary_file, file_type, delimiter)
+        append_to_file(export_data, headers, writer)
+
+
+class FileWriter(ABC):
+    """Write rows to a temporary file one by one.
+
+    Rows are not kept in memory, so the size of the exported data is limited only
+    by the disk space. Call `close` to finalize the file and get the temporary file
+    with its content.
+    """
+
+    suffix = ""
+
+    def __init__(self):
+        self.temporary_file = NamedTemporaryFile("w+b", suffix=self.suffix)
+
+    @abstractmethod
+    def write_row(self, row: List[Any]):
+        pass
+
+    def close(self) -> IO[bytes]:
+        self.temporary_file.flush()
+        self.temporary_file.seek(0)
+        return self.temporary_file
+
+
+class CSVFileWriter(FileWriter):
+    suffix = ".csv"
+
+    def __init__(self, delimiter: str):
+        super().__init__()
+        self._text_file = io.TextIOWrapper(
+            self.temporary_file.file, encoding="utf-8", newline=""
+        )
+        self._writer = csv.writer(self._text_file, delimiter=delimiter)
+
+    def write_row(self, row: List[Any]):
+        self._writer.writerow(row)
+
+    def close(self) -> IO[bytes]:
+        self._text_file.flush()
+        # Detach the text wrapper, so it does not close the temporary file
+        self._text_file.detach()
+        return super().close()
+
+
+class XLSXFileWriter(FileWriter):
+    suffix = ".xlsx"
+
+    def __init__(self):
+        super().__init__()
+        # The write-only workbook streams the rows to disk instead of building
+        # the whole sheet in memory
+        self._workbook = openpyxl.Workbook(write_only=True)
+        self._worksheet = self._workbook.create_sheet()
 
+    def write_row(self, row: List[Any]):
+        self._worksheet.append(row)
 
-def create_file_with_headers(file_headers: List[str], delimiter: str, file_type: str):
-    table = etl.wrap([file_headers])
+    def close(self) -> IO[bytes]:
+        self._workbook.save(self.temporary_file)
+        return super().close()
 
+
+class ShardJsonEncoder(CustomJsonEncoder):
+    """Tag the values JSON has no type for, so they are decoded unchanged."""
+
+    def default(self, obj):
+        if isinstance(obj, Decimal):
+            return {SHARD_VALUE_TYPE_KEY: "decimal", "value": str(obj)}
+        if isinstance(obj, datetime):
+            return {SHARD_VALUE_TYPE_KEY: "datetime", "value": obj.isoformat()}
+        if isinstance(obj, date):
+            return {SHARD_VALUE_TYPE_KEY: "date", "value": obj.isoformat()}
+        return super().default(obj)
+
+
+def decode_shard_value(obj: Dict[str, Any]) -> Any:
+    value_type = obj.get(SHARD_VALUE_TYPE_KEY)
+    if value_type == "decimal":
+        return Decimal(obj["value"])
+    if value_type == "datetime":
+        return datetime.fromisoformat(obj["value"])
+    if value_type == "date":
+        return date.fromisoformat(obj["value"])
+    return obj
+
+
+class ShardFileWriter(FileWriter):
+    """Write rows as JSON lines, the format of the intermediate shard files."""
+
+    suffix = ".jsonl"
+
+    def write_row(self, row: List[Any]):
+        self.temporary_file.write(json.dumps(row, cls=ShardJsonEncoder).encode())
+        self.temporary_file.write(b"\n")
+
+
+def create_file_with_headers(
+    file_headers: List[str], delimiter: str, file_type: str
+) -> FileWriter:
+    writer: FileWriter
     if file_type == FileTypes.CSV:
-        temp_file = NamedTemporaryFile("ab+", suffix=".csv")
-        etl.tocsv(table, temp_file.name, delimiter=delimiter)
+        writer = CSVFileWriter(delimiter)
     else:
-        temp_file = NamedTemporaryFile("ab+", suffix=".xlsx")
-        etl.io.xlsx.toxlsx(table, temp_file.name)
-
-    return temp_file
+        writer = XLSXFileWriter()
+    writer.write_row(file_headers)
+    return writer
 
 
 def append_to_file(
-    export_data: List[Dict[str, Union[str, bool]]],
+    export_data: Iterable[Dict[str, Union[str, bool]]],
     headers: List[str],
-    temporary_file: Any,
-    file_type: str,
-    delimiter: str,
+    writer: FileWriter,
 ):
-    table = etl.fromdicts(export_data, header=headers, missing=" ")
+    for data in export_data:
+        writer.write_row(
+            [prepare_cell_value(data.get(header, " ")) for header in headers]
+        )
 
-    if file_type == FileTypes.CSV:
-        etl.io.csv.appendcsv(table, temporary_file.name, delimiter=delimiter)
-    else:
-        etl.io.xlsx.appendxlsx(table, temporary_file.name)
+
+def prepare_cell_value(value: Any) -> Any:
+    # Descriptions are written as JSON, the only format accepted by the import
+    if isinstance(value, dict):
+        return json.dumps(value, cls=CustomJsonEncoder)
+    return value
 
 
 def save_csv_file_in_export_file(
@@ -0,0 +1,1000 @@
+import json
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import petl as etl
+from django.db import DatabaseError, transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.utils.text import slugify
+from measurement.measures import Weight
+
+from ...attribute import AttributeInputType
+from ...attribute.models import (
+    AssignedProductAttribute,
+    AssignedProductAttributeValue,
+    AssignedVariantAttribute,
+    AssignedVariantAttributeValue,
+    Attribute,
+    AttributeProduct,
+    AttributeValue,
+    AttributeVariant,
+)
+from ...channel.models import Channel
+from ...core.utils.editorjs import clean_editor_js
+from ...product.models import (
+    Category,
+    Collection,
+    CollectionProduct,
+    Product,
+    ProductChannelListing,
+    ProductType,
+    ProductVariant,
+    ProductVariantChannelListing,
+)
+from ...product.search import update_products_search_vector
+from ...product.utils.variant_prices import update_products_discounted_prices
+from ...warehouse.availability import invalidate_stock_availability
+from ...warehouse.models import Stock, Warehouse
+from .. import FileTypes
+from ..error_codes import ImportErrorCode
+from . import ProductExportFields
+
+if TYPE_CHECKING:
+    # flake8: noqa
+    from ..models import ImportFile
+
+
+BATCH_SIZE = 1000
+
+# The first row of the file contains the headers
+FIRST_DATA_ROW = 2
+
+ATTRIBUTE_HEADER_RE = re.compile(
+    r"^(?P<slug>.+) \((?P<owner>product|variant) attribute\)$"
+)
+WAREHOUSE_HEADER_RE = re.compile(r"^(?P<slug>.+) \(warehouse quantity\)$")
+CHANNEL_HEADER_RE = re.compile(r"^(?P<slug>.+) \(channel (?P<field>.+)\)$")
+
+PRODUCT_CHANNEL_LISTING_HEADERS = {
+    "published": "is_published",
+    "publication date": "publication_date",
+    "searchable": "visible_in_listings",
+    "available for purchase": "available_for_purchase",
+}
+VARIANT_CHANNEL_LISTING_HEADERS = {
+    "price amount": "price_amount",
+    "variant cost price": "cost_price_amount",
+}
+
+# Columns exported for information only, the currency of the listings is always
+# the currency of the channel and the images have to be uploaded separately.
+IGNORED_HEADERS = {
+    "product images",
+    "variant images",
+}
+IGNORED_CHANNEL_HEADERS = {
+    "product currency code",
+    "variant currency code",
+}
+
+SUPPORTED_ATTRIBUTE_INPUT_TYPES = [
+    AttributeInputType.DROPDOWN,
+    AttributeInputType.MULTISELECT,
+]
+
+
+class RowValidationError(Exception):
+    def __init__(self, field: Optional[str], message: str, code: ImportErrorCode):
+        super().__init__(message)
+        self.field = field
+        self.message = message
+        self.code = code
+
+
+@dataclass
+class ProductRow:
+    """Cleaned data of a single row of the imported file."""
+
+    number: int
+    product_id: Optional[int] = None
+    product_data: Dict[str, Any] = field(default_factory=dict)
+    collections: Optional[List[Collection]] = None
+    sku: Optional[str] = None
+    variant_data: Dict[str, Any] = field(default_factory=dict)
+    product_attributes: Dict[Attribute, List[str]] = field(default_factory=dict)
+    variant_attributes: Dict[Attribute, List[str]] = field(default_factory=dict)
+    stocks: Dict[Warehouse, int] = field(default_factory=dict)
+    product_listings: Dict[Channel, Dict[str, Any]] = field(default_factory=dict)
+    variant_listings: Dict[Channel, Dict[str, Any]] = field(default_factory=dict)
+    product: Optional[Product] = None
+    variant: Optional[ProductVariant] = None
+
+
+def import_products(import_file: "ImportFile", delimiter: str = ";"):
+    """Create and update products and their variants from the uploaded file.
+
+    The file has to be in the format of the products export. Rows are imported
+    in batches, every batch in its own transaction; invalid rows are skipped
+    and reported in the `errors` of the import file.
+    """
+    start = time.monotonic()
+    file_type = get_file_type(import_file.content_file.name)
+
+    with NamedTemporaryFile(suffix=f".{file_type}") as temporary_file:
+        import_file.content_file.open("rb")
+        for chunk in import_file.content_file.chunks():
+            temporary_file.write(chunk)
+        import_file.content_file.close()
+        temporary_file.flush()
+
+        table = read_table(temporary_file.name, file_type, delimiter)
+        importer = ProductsImporter(etl.header(table))
+        rows = enumerate(etl.dicts(table), start=FIRST_DATA_ROW)
+        for batch in batched(rows, BATCH_SIZE):
+            importer.import_batch(batch)
+            import_file.total_rows = importer.total_rows
+            import_file.imported_rows = importer.imported_rows
+            import_file.save(
+                update_fields=["total_rows", "imported_rows", "updated_at"]
+            )
+
+    duration = time.monotonic() - start
+    import_file.errors = importer.errors
+    import_file.message = (
+        f"Imported {importer.imported_rows} of {importer.total_rows} rows "
+        f"in {duration:.1f} s ({importer.imported_rows / max(duration, 0.001):.0f} "
+        "rows/s)."
+    )
+    import_file.save(update_fields=["errors", "message", "updated_at"])
+
+
+def get_file_type(file_name: str) -> str:
+    extension = file_name.rsplit(".", 1)[-1].lower()
+    if extension == FileTypes.XLSX:
+        return FileTypes.XLSX
+    return FileTypes.CSV
+
+
+def read_table(path: str, file_type: str, delimiter: str):
+    if file_type == FileTypes.XLSX:
+        return etl.fromxlsx(path, read_only=True)
+    return etl.fromcsv(path, delimiter=delimiter, encoding="utf-8")
+
+
+def batched(iterable: Iterable, size: int):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def is_empty(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def parse_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    value = str(value).strip().lower()
+    if value in ("true", "1", "yes"):
+        return True
+    if value in ("false", "0", "no"):
+        return False
+    raise ValueError("Enter a valid boolean value.")
+
+
+def parse_weight(value: Any) -> Weight:
+    """Parse the exported weight value, e.g. "12.0 g"."""
+    amount = str(value).strip()
+    if amount.endswith("g"):
+        amount = amount[:-1].strip()
+    try:
+        return Weight(g=float(amount))
+    except ValueError:
+        raise ValueError("Enter a valid weight in grams.")
+
+
+def parse_decimal(value: Any) -> Decimal:
+    try:
+        amount = Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError("Enter a valid number.")
+    if amount < 0:
+        raise ValueError("The value cannot be lower than 0.")
+    return amount
+
+
+def parse_quantity(value: Any) -> int:
+    try:
+        quantity = int(Decimal(str(value).strip()))
+    except InvalidOperation:
+        raise ValueError("Enter a valid quantity.")
+    if quantity < 0:
+        raise ValueError("The quantity cannot be lower than 0.")
+    return quantity
+
+
+def parse_date_value(value: Any) -> date:
+    if isinstance(value, date):
+        return value
+    parsed_date = parse_date(str(value).strip()[:10])
+    if parsed_date is None:
+        raise ValueError("Enter a valid date in the YYYY-MM-DD format.")
+    return parsed_date
+
+
+def parse_description(value: Any) -> dict:
+    """Parse the EditorJS description.
+
+    The description is accepted as JSON only, the plain text is converted into
+    a single paragraph block.
+    """
+    if isinstance(value, dict):
+        return value
+    try:
+        description = json.loads(value)
+    except ValueError:
+        description = None
+    if isinstance(description, dict):
+        return description
+    return {
+        "blocks": [{"type": "paragraph", "data": {"text": str(value)}}],
+    }
+
+
+def split_values(value: Any) -> List[str]:
+    return [item.strip() for item in str(value).split(",") if item.strip()]
+
+
+class ProductsImporter:
+    """Import rows in the products export format in batches.
+
+    Headers are resolved once, the related objects used by the rows (categories,
+    product types, collections) are fetched once per batch.
+    """
+
+    def __init__(self, headers: Iterable[str]):
+        self.total_rows = 0
+        self.imported_rows = 0
+        self.errors: List[Dict[str, Any]] = []
+        # Products created by the previous batches, the rows without the ID column
+        # are matched only with them
+        self.created_products_pks: Set[int] = set()
+
+        fields_mapping: Dict[str, str] = {}
+        for mapping in ProductExportFields.HEADERS_TO_FIELDS_MAPPING.values():
+            fields_mapping.update(mapping)  # type: ignore
+
+        self.field_headers: List[str] = []
+        self.attribute_headers: Dict[str, Tuple[Attribute, str]] = {}
+        self.warehouse_headers: Dict[str, Warehouse] = {}
+        self.channel_headers: Dict[str, Tuple[Channel, str]] = {}
+        self.unknown_headers: List[str] = []
+        self.parse_headers(headers, fields_mapping)
+
+    def parse_headers(self, headers: Iterable[str], fields_mapping: Dict[str, str]):
+        attribute_slugs: Dict[str, Tuple[str, str]] = {}
+        warehouse_slugs: Dict[str, str] = {}
+        channel_slugs: Dict[str, Tuple[str, str]] = {}
+        for header in headers:
+            if header in IGNORED_HEADERS:
+                continue
+            if header in fields_mapping:
+                self.field_headers.append(header)
+            elif ATTRIBUTE_HEADER_RE.match(header):
+                match = ATTRIBUTE_HEADER_RE.match(header)
+                attribute_slugs[header] = (match["slug"], match["owner"])
+            elif WAREHOUSE_HEADER_RE.match(header):
+                warehouse_slugs[header] = WAREHOUSE_HEADER_RE.match(header)["slug"]
+            elif CHANNEL_HEADER_RE.match(header):
+                match = CHANNEL_HEADER_RE.match(header)
+                if match["field"] not in IGNORED_CHANNEL_HEADERS:
+                    channel_slugs[header] = (match["slug"], match["field"])
+            else:
+                self.unknown_headers.append(header)
+
+        attributes = Attribute.objects.in_bulk(
+            [slug for slug, _ in attribute_slugs.values()], field_name="slug"
+        )
+        warehouses = Warehouse.objects.in_bulk(
+            warehouse_slugs.values(), field_name="slug"
+        )
+        channels = Channel.objects.in_bulk(
+            [slug for slug, _ in channel_slugs.values()], field_name="slug"
+        )
+        for header, (slug, owner) in attribute_slugs.items():
+            if slug in attributes:
+                self.attribute_headers[header] = (attributes[slug], owner)
+            else:
+                self.unknown_headers.append(header)
+        for header, slug in warehouse_slugs.items():
+            if slug in warehouses:
+                self.warehouse_headers[header] = warehouses[slug]
+            else:
+                self.unknown_headers.append(header)
+        for header, (slug, channel_field) in channel_slugs.items():
+            known_field = (
+                channel_field in PRODUCT_CHANNEL_LISTING_HEADERS
+                or channel_field in VARIANT_CHANNEL_LISTING_HEADERS
+            )
+            if slug in channels and known_field:
+                self.channel_headers[header] = (channels[slug], channel_field)
+            else:
+                self.unknown_headers.append(header)
+
+        attribute_pks = [
+            attribute.pk for attribute, _ in self.attribute_headers.values()
+        ]
+        self.product_attribute_rels = set(
+            AttributeProduct.objects.filter(attribute__in=attribute_pks).values_list(
+                "product_type_id", "attribute_id"
+            )
+        )
+        self.variant_attribute_rels = set(
+            AttributeVariant.objects.filter(attribute__in=attribute_pks).values_list(
+                "product_type_id", "attribute_id"
+            )
+        )
+
+        for header in self.unknown_headers:
+            self.add_error(
+                None, header, "Unknown column, it was skipped.", ImportErrorCode.INVALID
+            )
+
+    def add_error(
+        self,
+        row: Optional[int],
+        field: Optional[str],
+        message: str,
+        code: ImportErrorCode,
+    ):
+        self.errors.append(
+            {"row": row, "field": field, "message": message, "code": code.value}
+        )
+
+    def import_batch(self, batch: List[Tuple[int, Dict[str, Any]]]):
+        self.total_rows += len(batch)
+        rows = self.clean_rows(batch)
+        rows = self.resolve_instances(rows)
+        rows = self.validate_listings(rows)
+        if not rows:
+            return
+        new_products = [row.product for row in rows if not row.product.pk]
+        try:
+            with transaction.atomic():
+                self.save_rows(rows)
+        except DatabaseError as e:
+            for row in rows:
+                self.add_error(
+                    row.number,
+                    None,
+                    f"The row could not be saved: {e}",
+                    ImportErrorCode.INVALID,
+                )
+            return
+
+        self.imported_rows += len(rows)
+        self.created_products_pks.update(product.pk for product in new_products)
+        products = Product.objects.filter(pk__in={row.product.pk for row in rows})
+        update_products_search_vector(products)
+        update_products_discounted_prices(products)
+
+    def clean_rows(self, batch: List[Tuple[int, Dict[str, Any]]]) -> List[ProductRow]:
+        categories = self.fetch_related(batch, "category", Category, "slug")
+        product_types = self.fetch_related(batch, "product type", ProductType, "name")
+        collections = self.fetch_related(
+            batch, "collections", Collection, "slug", many=True
+        )
+
+        rows = []
+        for number, data in batch:
+            row = ProductRow(number=number)
+            try:
+                self.clean_fields(row, data, categories, product_types, collections)
+                self.clean_attributes(row, data)
+                self.clean_stocks(row, data)
+                self.clean_channel_listings(row, data)
+            except RowValidationError as e:
+                self.add_error(number, e.field, e.message, e.code)
+                continue
+            rows.append(row)
+        return rows
+
+    def fetch_related(
+        self, batch, header: str, model, field_name: str, many: bool = False
+    ) -> dict:
+        if header not in self.field_headers:
+            return {}
+        values = set()
+        for _, data in batch:
+            value = data.get(header)
+            if is_empty(value):
+                continue
+            if many:
+                values.update(split_values(value))
+            else:
+                values.add(str(value).strip())
+        # Product type names are not unique, the lookup can't use `in_bulk`
+        return {
+            getattr(instance, field_name): instance
+            for instance in model.objects.filter(**{f"{field_name}__in": values})
+        }
+
+    def clean_fields(
+        self,
+        row: ProductRow,
+        data: Dict[str, Any],
+        categories: Dict[str, Category],
+        product_types: Dict[str, ProductType],
+        collections: Dict[str, Collection],
+    ):
+        for header in self.field_headers:
+            value = data.get(header)
+            if is_empty(value):
+                continue
+            try:
+                if header == "id":
+                    row.product_id = int(value)
+                elif header == "name":
+                    row.product_data["name"] = str(value).strip()
+                elif header == "description":
+                    description = parse_description(value)
+                    row.product_data["description"] = description
+                    row.product_data["description_plaintext"] = clean_editor_js(
+                        description, to_string=True
+                    )
+                elif header == "category":
+                    row.product_data["category"] = self.get_related(
+                        categories, value, "Category"
+                    )
+                elif header == "product type":
+                    row.product_data["product_type"] = self.get_related(
+                        product_types, value, "Product type"
+                    )
+                elif header == "charge taxes":
+                    row.product_data["charge_taxes"] = parse_bool(value)
+                elif header == "product weight":
+                    row.product_data["weight"] = parse_weight(value)
+                elif header == "collections":
+                    row.collections = [
+                        self.get_related(collections, slug, "Collection")
+                        for slug in split_values(value)
+                    ]
+                elif header == "variant sku":
+                    row.sku = str(value).strip()
+                elif header == "variant weight":
+                    row.variant_data["weight"] = parse_weight(value)
+            except ValueError as e:
+                raise RowValidationError(header, str(e), ImportErrorCode.INVALID)
+            except LookupError as e:
+                raise RowValidationError(header, e.args[0], ImportErrorCode.NOT_FOUND)
+
+    @staticmethod
+    def get_related(objects: dict, value: Any, name: str):
+        value = str(value).strip()
+        if value not in objects:
+            raise LookupError(f'{name} "{value}" does not exist.')
+        return objects[value]
+
+    def clean_attributes(self, row: ProductRow, data: Dict[str, Any]):
+        for header, (attribute, owner) in self.attribute_headers.items():
+            value = data.get(header)
+            if is_empty(value):
+                continue
+            if attribute.input_type not in SUPPORTED_ATTRIBUTE_INPUT_TYPES:
+                raise RowValidationError(
+                    header,
+                    f"Importing values of the {attribute.input_type} attributes "
+                    "is not supported.",
+                    ImportErrorCode.INVALID,
+                )
+            slugs = split_values(value)
+            if attribute.input_type == AttributeInputType.DROPDOWN and len(slugs) > 1:
+                raise RowValidationError(
+                    header,
+                    "Dropdown attribute can have only one value.",
+                    ImportErrorCode.INVALID,
+                )
+            if owner == "product":
+                row.product_attributes[attribute] = slugs
+            else:
+                row.variant_attributes[attribute] = slugs
+
+    def clean_stocks(self, row: ProductRow, data: Dict[str, Any]):
+        for header, warehouse in self.warehouse_headers.items():
+            value = data.get(header)
+            if is_empty(value):
+                continue
+            try:
+                row.stocks[warehouse] = parse_quantity(value)
+            except ValueError as e:
+                raise RowValidationError(header, str(e), ImportErrorCode.INVALID)
+
+    def clean_channel_listings(self, row: ProductRow, data: Dict[str, Any]):
+        for header, (channel, channel_field) in self.channel_headers.items():
+            value = data.get(header)
+            if is_empty(value):
+                continue
+            try:
+                if channel_field in VARIANT_CHANNEL_LISTING_HEADERS:
+                    field_name = VARIANT_CHANNEL_LISTING_HEADERS[channel_field]
+                    listing = row.variant_listings.setdefault(channel, {})
+                    listing[field_name] = parse_decimal(value)
+                    continue
+                field_name = PRODUCT_CHANNEL_LISTING_HEADERS[channel_field]
+                listing = row.product_listings.setdefault(channel, {})
+                if field_name in ["is_published", "visible_in_listings"]:
+                    listing[field_name] = parse_bool(value)
+                else:
+                    listing[field_name] = parse_date_value(value)
+            except ValueError as e:
+                raise RowValidationError(header, str(e), ImportErrorCode.INVALID)
+
+    def resolve_instances(self, rows: List[ProductRow]) -> List[ProductRow]:
+        """Match the rows with the existing products and variants.
+
+        Products are matched by the ID column, rows without the ID create new
+        products or add variants to the products created by the same import,
+        matched by the slug of the name. Variants are matched by SKU. Unmatched
+        variants are initialized to be created.
+        """
+        products_by_id = Product.objects.in_bulk(
+            {row.product_id for row in rows if row.product_id}
+        )
+        slugs = {
+            slugify(row.product_data["name"], allow_unicode=True)
+            for row in rows
+            if not row.product_id and "name" in row.product_data
+        }
+        products_by_slug = Product.objects.in_bulk(slugs, field_name="slug")
+        variants_by_sku = ProductVariant.objects.in_bulk(
+            {row.sku for row in rows if row.sku}, field_name="sku"
+        )
+
+        resolved_rows = []
+        for row in rows:
+            try:
+                row.product = self.get_product(
+                    row, products_by_id, products_by_slug, self.created_products_pks
+                )
+                if row.sku:
+                    row.variant = self.get_variant(row, variants_by_sku)
+                self.validate_variant_data(row)
+                self.validate_attributes_assignment(row)
+            except RowValidationError as e:
+                self.add_error(row.number, e.field, e.message, e.code)
+                continue
+            resolved_rows.append(row)
+        return resolved_rows
+
+    @staticmethod
+    def get_product(
+        row: ProductRow,
+        products_by_id: Dict[int, Product],
+        products_by_slug: Dict[str, Product],
+        created_products_pks: Set[int],
+    ) -> Product:
+        if row.product_id:
+            product = products_by_id.get(row.product_id)
+            if not product:
+                raise RowValidationError(
+                    "id",
+                    f"Product with id {row.product_id} does not exist.",
+                    ImportErrorCode.NOT_FOUND,
+                )
+        else:
+            name = row.product_data.get("name")
+            if not name:
+                raise RowValidationError(
+                    "name",
+                    "Product name or id is required.",
+                    ImportErrorCode.REQUIRED,
+                )
+            slug = slugify(name, allow_unicode=True)
+            product = products_by_slug.get(slug)
+            if product and product.pk and product.pk not in created_products_pks:
+                raise RowValidationError(
+                    "name",
+                    f'Product with slug "{slug}" already exists, '
+                    "use the id column to update it.",
+                    ImportErrorCode.UNIQUE,
+                )
+            if not product:
+                if "product_type" not in row.product_data:
+                    raise RowValidationError(
+                        "product type",
+                        "Product type is required to create a product.",
+                        ImportErrorCode.REQUIRED,
+                    )
+                product = Product(slug=slug)
+                products_by_slug[slug] = product
+
+        product_type = row.product_data.get("product_type")
+        if product.pk and product_type and product_type.pk != product.product_type_id:
+            raise RowValidationError(
+                "product type",
+                "Product type of an existing product cannot be changed.",
+                ImportErrorCode.INVALID,
+            )
+        return product
+
+    @staticmethod
+    def get_variant(
+        row: ProductRow, variants_by_sku: Dict[str, ProductVariant]
+    ) -> ProductVariant:
+        variant = variants_by_sku.get(row.sku)  # type: ignore
+        if not variant:
+            variant = ProductVariant(sku=row.sku)
+            variants_by_sku[row.sku] = variant  # type: ignore
+        elif variant.product_id != row.product.pk:  # type: ignore
+            raise RowValidationError(
+                "variant sku",
+                f'Variant with SKU "{row.sku}" belongs to another product.',
+                ImportErrorCode.UNIQUE,
+            )
+        return variant
+
+    @staticmethod
+    def validate_variant_data(row: ProductRow):
+        has_variant_data = (
+            row.variant_data
+            or row.variant_attributes
+            or row.stocks
+            or row.variant_listings
+        )
+        if has_variant_data and not row.variant:
+            raise RowValidationError(
+                "variant sku",
+                "Variant SKU is required to import the variant data.",
+                ImportErrorCode.REQUIRED,
+            )
+
+    def validate_attributes_assignment(self, row: ProductRow):
+        product_type = row.product_data.get("product_type")
+        product_type_id = product_type.pk if product_type else None
+        product_type_id = row.product.product_type_id or product_type_id  # type: ignore
+        for attributes, attribute_rels, owner in [
+            (row.product_attributes, self.product_attribute_rels, "product"),
+            (row.variant_attributes, self.variant_attribute_rels, "variant"),
+        ]:
+            for attribute in attributes:
+                if (product_type_id, attribute.pk) not in attribute_rels:
+                    raise RowValidationError(
+                        f"{attribute.slug} ({owner} attribute)",
+                        f"Attribute is not assigned to the product type as a {owner} "
+                        "attribute.",
+                        ImportErrorCode.INVALID,
+                    )
+
+    def validate_listings(self, rows: List[ProductRow]) -> List[ProductRow]:
+        """Check that the new variant channel listings have a price."""
+        existing_listings = set(
+            ProductVariantChannelListing.objects.filter(
+                variant__in=[
+                    row.variant for row in rows if row.variant and row.variant.pk
+                ]
+            ).values_list("variant_id", "channel_id")
+        )
+        valid_rows = []
+        for row in rows:
+            errors = [
+                channel
+                for channel, listing in row.variant_listings.items()
+                if "price_amount" not in listing
+                and (row.variant.pk, channel.pk) not in existing_listings  # type: ignore
+            ]
+            if errors:
+                self.add_error(
+                    row.number,
+                    f"{errors[0].slug} (channel price amount)",
+                    "Price is required to add a variant to a channel.",
+                    ImportErrorCode.REQUIRED,
+                )
+                continue
+            valid_rows.append(row)
+        return valid_rows
+
+    def save_rows(self, rows: List[ProductRow]):
+        self.save_products(rows)
+        self.save_variants(rows)
+        self.save_collections(rows)
+        self.save_product_listings(rows)
+        self.save_variant_listings(rows)
+        self.save_stocks(rows)
+        self.save_attributes(
+            [(row.product, row.product_attributes) for row in rows],
+            AttributeProduct,
+            AssignedProductAttribute,
+            AssignedProductAttributeValue,
+            "product",
+        )
+        self.save_attributes(
+            [(row.variant, row.variant_attributes) for row in rows if row.variant],
+            AttributeVariant,
+            AssignedVariantAttribute,
+            AssignedVariantAttributeValue,
+            "variant",
+        )
+
+    def save_products(self, rows: List[ProductRow]):
+        now = timezone.now()
+        products: Dict[int, Product] = {}
+        fields = {"updated_at"}
+        for row in rows:
+            product = row.product
+            for field_name, value in row.product_data.items():
+                setattr(product, field_name, value)
+                fields.add(field_name)
+            product.updated_at = now
+            products[id(product)] = product
+
+        new_products = [product for product in products.values() if not product.pk]
+        existing_products = [product for product in products.values() if product.pk]
+        Product.objects.bulk_create(new_products)
+        fields.discard("product_type")
+        Product.objects.bulk_update(existing_products, sorted(fields))
+
+    def save_variants(self, rows: List[ProductRow]):
+        variants: Dict[int, ProductVariant] = {}
+        fields = set()
+        for row in rows:
+            variant = row.variant
+            if not variant:
+                continue
+            variant.product = row.product
+            for field_name, value in row.variant_data.items():
+                setattr(variant, field_name, value)
+                fields.add(field_name)
+            variants[id(variant)] = variant
+
+        new_variants = [variant for variant in variants.values() if not variant.pk]
+        existing_variants = [variant for variant in variants.values() if variant.pk]
+        # The sort order is set in `save` which is not called by `bulk_create`
+        sort_orders = dict(
+            ProductVariant.objects.filter(
+                product__in={variant.product_id for variant in new_variants}
+            )
+            .values("product_id")
+            .annotate(max_sort_order=Max("sort_order"))
+            .values_list("product_id", "max_sort_order")
+        )
+        for variant in new_variants:
+            sort_order = sort_orders.get(variant.product_id)
+            variant.sort_order = 0 if sort_order is None else sort_order + 1
+            sort_orders[variant.product_id] = variant.sort_order
+        ProductVariant.objects.bulk_create(new_variants)
+        if fields:
+            ProductVariant.objects.bulk_update(existing_variants, sorted(fields))
+
+        products = {}
+        for variant in new_variants:
+            product = variant.product
+            if not product.default_variant_id and product.pk not in products:
+                product.default_variant = variant
+                products[product.pk] = product
+        Product.objects.bulk_update(products.values(), ["default_variant"])
+
+    def save_collections(self, rows: List[ProductRow]):
+        collection_products = [
+            CollectionProduct(collection=collection, product=row.product)
+            for row in rows
+            for collection in row.collections or []
+        ]
+        CollectionProduct.objects.bulk_create(
+            collection_products, ignore_conflicts=True
+        )
+
+    def save_product_listings(self, rows: List[ProductRow]):
+        listings_data = {
+            (row.product.pk, channel): data
+            for row in rows
+            for channel, data in row.product_listings.items()
+        }
+        if not listings_data:
+            return
+        existing_listings = {
+            (listing.product_id, listing.channel_id): listing
+            for listing in ProductChannelListing.objects.filter(
+                product__in={product_pk for product_pk, _ in listings_data}
+            )
+        }
+        self.save_listings(
+            ProductChannelListing,
+            listings_data,
+            existing_listings,
+            lambda product_pk, channel: ProductChannelListing(
+                product_id=product_pk, channel=channel, currency=channel.currency_code
+            ),
+        )
+
+    def save_variant_listings(self, rows: List[ProductRow]):
+        listings_data = {
+            (row.variant.pk, channel): data  # type: ignore
+            for row in rows
+            for channel, data in row.variant_listings.items()
+        }
+        if not listings_data:
+            return
+        existing_listings = {
+            (listing.variant_id, listing.channel_id): listing
+            for listing in ProductVariantChannelListing.objects.filter(
+                variant__in={variant_pk for variant_pk, _ in listings_data}
+            )
+        }
+        self.save_listings(
+            ProductVariantChannelListing,
+            listings_data,
+            existing_listings,
+            lambda variant_pk, channel: ProductVariantChannelListing(
+                variant_id=variant_pk, channel=channel, currency=channel.currency_code
+            ),
+        )
+
+    @staticmethod
+    def save_listings(model, listings_data, existing_listings, create_listing):
+        new_listings = []
+        updated_listings = []
+        fields = set()
+        for (pk, channel), data in listings_data.items():
+            listing = existing_listings.get((pk, channel.pk))
+            if listing:
+                updated_listings.append(listing)
+            else:
+                listing = create_listing(pk, channel)
+                new_listings.append(listing)
+            for field_name, value in data.items():
+                setattr(listing, field_name, value)
+                fields.add(field_name)
+        model.objects.bulk_create(new_listings)
+        model.objects.bulk_update(updated_listings, sorted(fields))
+
+    def save_stocks(self, rows: List[ProductRow]):
+        quantities = {
+            (row.variant.pk, warehouse.pk): quantity  # type: ignore
+            for row in rows
+            for warehouse, quantity in row.stocks.items()
+            if row.variant
+        }
+        if not quantities:
+            return
+        existing_stocks = {
+            (stock.product_variant_id, stock.warehouse_id): stock
+            for stock in Stock.objects.filter(
+                product_variant__in={variant_pk for variant_pk, _ in quantities}
+            )
+        }
+        new_stocks = []
+        updated_stocks = []
+        for (variant_pk, warehouse_pk), quantity in quantities.items():
+            stock = existing_stocks.get((variant_pk, warehouse_pk))
+            if stock:
+                stock.quantity = quantity
+                updated_stocks.append(stock)
+            else:
+                new_stocks.append(
+                    Stock(
+                        product_variant_id=variant_pk,
+                        warehouse_id=warehouse_pk,
+                        quantity=quantity,
+                    )
+                )
+        Stock.objects.bulk_create(new_stocks)
+        Stock.objects.bulk_update(updated_stocks, ["quantity"])
+        invalidate_stock_availability({variant_pk for variant_pk, _ in quantities})
+
+    def save_attributes(
+        self,
+        instances_attributes: List[Tuple[Any, Dict[Attribute, List[str]]]],
+        attribute_rel_model,
+        assigned_attribute_model,
+        assigned_value_model,
+        instance_field: str,
+    ):
+        """Replace the values of the given attributes of products or variants.
+
+        The attribute has to be assigned to the product type, missing attribute
+        values are created.
+        """
+        instances_attributes = [
+            (instance, attributes)
+            for instance, attributes in instances_attributes
+            if attributes
+        ]
+        if not instances_attributes:
+            return
+
+        attribute_rels = {
+            (rel.product_type_id, rel.attribute_id): rel
+            for rel in attribute_rel_model.objects.filter(
+                attribute__in={
+                    attribute
+                    for _, attributes in instances_attributes
+                    for attribute in attributes
+                }
+            )
+        }
+        values = self.get_or_create_attribute_values(
+            [attributes for _, attributes in instances_attributes]
+        )
+
+        assignments: Dict[Tuple[int, int], Any] = {
+            (getattr(assignment, f"{instance_field}_id"), assignment.assignment_id): (
+                assignment
+            )
+            for assignment in assigned_attribute_model.objects.filter(
+                **{
+                    f"{instance_field}__in": [
+                        instance for instance, _ in instances_attributes
+                    ]
+                }
+            )
+        }
+        new_assignments = []
+        assigned_values: List[Tuple[Tuple[int, int], List[AttributeValue]]] = []
+        for instance, attributes in instances_attributes:
+            product = instance if instance_field == "product" else instance.product
+            for attribute, slugs in attributes.items():
+                attribute_rel = attribute_rels[(product.product_type_id, attribute.pk)]
+                key = (instance.pk, attribute_rel.pk)
+                if key not in assignments:
+                    assignments[key] = assigned_attribute_model(
+                        **{instance_field: instance, "assignment": attribute_rel}
+                    )
+                    new_assignments.append(assignments[key])
+                assigned_values.append(
+                    (key, [values[(attribute.pk, slug)] for slug in slugs])
+                )
+        assigned_attribute_model.objects.bulk_create(new_assignments)
+
+        assigned_value_model.objects.filter(
+            assignment__in=[assignments[key] for key, _ in assigned_values]
+        ).delete()
+        assigned_value_model.objects.bulk_create(
+            [
+                assigned_value_model(
+                    assignment=assignments[key], value=value, sort_order=index
+                )
+                for key, attribute_values in assigned_values
+                for index, value in enumerate(attribute_values)
+            ],
+            ignore_conflicts=True,
+        )
+
+    @staticmethod
+    def get_or_create_attribute_values(
+        attributes_list: List[Dict[Attribute, List[str]]]
+    ) -> Dict[Tuple[int, str], AttributeValue]:
+        slugs_by_attribute: Dict[Attribute, set] = defaultdict(set)
+        for attributes in attributes_list:
+            for attribute, slugs in attributes.items():
+                slugs_by_attribute[attribute].update(slugs)
+
+        values: Dict[Tuple[int, str], AttributeValue] = {}
+        for value in AttributeValue.objects.filter(
+            attribute__in=slugs_by_attribute.keys(),
+            slug__in=set.union(*slugs_by_attribute.values()),
+        ):
+            values[(value.attribute_id, value.slug)] = value
+
+        new_values = [
+            AttributeValue(attribute=attribute, name=slug, slug=slug)
+            for attribute, slugs in slugs_by_attribute.items()
+            for slug in sorted(slugs)
+            if (attribute.pk, slug) not in values
+        ]
+        AttributeValue.objects.bulk_create(new_values)
+        for value in new_values:
+            values[(value.attribute_id, value.slug)] = value
+        return values
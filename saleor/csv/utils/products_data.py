@@ -1,5 +1,5 @@
 from collections import defaultdict, namedtuple
-from typing import TYPE_CHECKING, Dict, List, Optional, Set, Union
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set, Union
 from urllib.parse import urljoin
 
 from django.conf import settings
@@ -28,9 +28,25 @@ def get_products_data(
     It return list with product and variant data which can be used as import to
     csv writer and list of attribute and warehouse headers.
     """
+    return list(
+        iter_products_data(
+            queryset, export_fields, attribute_ids, warehouse_ids, channel_ids
+        )
+    )
 
-    products_with_variants_data = []
 
+def iter_products_data(
+    queryset: "QuerySet",
+    export_fields: Set[str],
+    attribute_ids: Optional[List[int]],
+    warehouse_ids: Optional[List[int]],
+    channel_ids: Optional[List[int]],
+) -> Iterator[Dict[str, Union[str, bool]]]:
+    """Yield data of products and their variants with fields values row by row.
+
+    Only the relations data of the given queryset is kept in memory, the product
+    rows are fetched from the database with a server-side cursor.
+    """
     product_fields = set(
         ProductExportFields.HEADERS_TO_FIELDS_MAPPING["fields"].values()
     )
@@ -66,7 +82,7 @@ def get_products_data(
         queryset, export_fields, attribute_ids, warehouse_ids, channel_ids
     )
 
-    for product_data in products_data:
+    for product_data in products_data.iterator():
         pk = product_data["id"]
         variant_pk = product_data.pop("variants__id")
 
@@ -75,11 +91,7 @@ def get_products_data(
             variant_pk, {}
         )
 
-        data = {**product_data, **product_relations_data, **variant_relations_data}
-
-        products_with_variants_data.append(data)
-
-    return products_with_variants_data
+        yield {**product_data, **product_relations_data, **variant_relations_data}
 
 
 def get_products_relations_data(
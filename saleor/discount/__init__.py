@@ -1,5 +1,7 @@
+import datetime
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Dict, Iterable, List, Set, Union
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Set, Union
 
 from django.conf import settings
 
@@ -37,3 +39,57 @@ class DiscountInfo:
     product_ids: Union[List[int], Set[int]]
     category_ids: Union[List[int], Set[int]]
     collection_ids: Union[List[int], Set[int]]
+
+
+class DiscountsIndex:
+    """Discounts indexed by the products, categories and collections on sale.
+
+    Iterating over the index yields all the discounts, so it can be passed
+    wherever a list of discounts is expected.
+    """
+
+    def __init__(self, discounts: Iterable[DiscountInfo]):
+        self.discounts = list(discounts)
+        self.product_index = self._build_index("product_ids")
+        self.category_index = self._build_index("category_ids")
+        self.collection_index = self._build_index("collection_ids")
+
+    def _build_index(self, ids_field: str) -> Dict[int, List[int]]:
+        index: Dict[int, List[int]] = defaultdict(list)
+        for position, discount in enumerate(self.discounts):
+            for pk in getattr(discount, ids_field):
+                index[pk].append(position)
+        return dict(index)
+
+    def __iter__(self) -> Iterator[DiscountInfo]:
+        return iter(self.discounts)
+
+    def __len__(self) -> int:
+        return len(self.discounts)
+
+    def get_product_discounts(
+        self,
+        product_id: int,
+        category_id: Optional[int],
+        collection_ids: Iterable[int],
+    ) -> List[DiscountInfo]:
+        """Return discounts on sale for the product in the order of the index."""
+        positions = set(self.product_index.get(product_id, []))
+        positions.update(self.category_index.get(category_id, []))  # type: ignore
+        for collection_id in collection_ids:
+            positions.update(self.collection_index.get(collection_id, []))
+        return [self.discounts[position] for position in sorted(positions)]
+
+
+@dataclass
+class DiscountsSnapshot:
+    """Active discounts valid between the two closest sale start or end dates."""
+
+    discounts: DiscountsIndex
+    valid_from: datetime.datetime
+    valid_until: Optional[datetime.datetime]
+
+    def is_valid_for(self, date: datetime.datetime) -> bool:
+        if date < self.valid_from:
+            return False
+        return self.valid_until is None or date < self.valid_until
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def set_discounted_prices_updated_at(apps, schema_editor):
+    # The prices of the products on the existing sales are already up to date
+    Sale = apps.get_model("discount", "Sale")
+    Sale.objects.update(discounted_prices_updated_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("discount", "0023_voucher_channel_listing"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sale",
+            name="discounted_prices_updated_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(
+            set_discounted_prices_updated_at, migrations.RunPython.noop
+        ),
+    ]
@@ -229,6 +229,7 @@ class Sale(models.Model):
     collections = models.ManyToManyField("product.Collection", blank=True)
     start_date = models.DateTimeField(default=timezone.now)
     end_date = models.DateTimeField(null=True, blank=True)
+    discounted_prices_updated_at = models.DateTimeField(null=True, blank=True)
 
     objects = SaleQueryset.as_manager()
     translated = TranslationProxy()
@@ -0,0 +1,27 @@
+from django.db import transaction
+from django.utils import timezone
+
+from ..celeryconf import app
+from ..product.tasks import update_products_discounted_prices_of_discount_task
+from .models import Sale
+from .utils import fetch_toggled_sales
+
+
+@app.task
+def update_discounted_prices_of_toggled_sales_task():
+    """Update discounted prices of products of sales which started or ended.
+
+    Sales are marked as updated in the same transaction in which they are
+    selected, and the rows locked by a concurrent run are skipped, so every
+    start and end of a sale is handled once, even with multiple beat workers.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        sale_ids = list(
+            fetch_toggled_sales(now)
+            .select_for_update(skip_locked=True)
+            .values_list("pk", flat=True)
+        )
+        Sale.objects.filter(pk__in=sale_ids).update(discounted_prices_updated_at=now)
+    for sale_id in sale_ids:
+        update_products_discounted_prices_of_discount_task.delay(sale_id)
@@ -0,0 +1,76 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+from prices import Money
+
+from ....channel.models import Channel
+from ....product.models import Collection, Product
+from ... import DiscountInfo, DiscountsIndex, DiscountValueType
+from ...models import Sale, SaleChannelListing
+from ...utils import calculate_discounted_price, get_product_discount_on_sale
+
+SALES_COUNT = 500
+PRODUCTS_COUNT = 100
+
+
+def get_discounts(channel):
+    discounts = []
+    for index in range(SALES_COUNT):
+        sale = Sale(id=index, name=f"Sale {index}", type=DiscountValueType.PERCENTAGE)
+        channel_listing = SaleChannelListing(
+            sale=sale,
+            channel=channel,
+            discount_value=Decimal(index % 50 + 1),
+            currency=channel.currency_code,
+        )
+        discounts.append(
+            DiscountInfo(
+                sale=sale,
+                channel_listings={channel.slug: channel_listing},
+                product_ids={index * 10 + offset for offset in range(10)},
+                category_ids={index},
+                collection_ids={index},
+            )
+        )
+    return discounts
+
+
+def calculate_prices(products, discounts, channel):
+    return [
+        calculate_discounted_price(
+            product=product,
+            price=Money(100, channel.currency_code),
+            collections=collections,
+            discounts=discounts,
+            channel=channel,
+        )
+        for product, collections in products
+    ]
+
+
+def test_calculate_discounted_price_with_discounts_index():
+    # given
+    channel = Channel(id=1, slug="main", currency_code="USD")
+    discounts = get_discounts(channel)
+    products = [
+        (Product(id=index, category_id=index), [Collection(id=index * 3)])
+        for index in range(PRODUCTS_COUNT)
+    ]
+
+    # when
+    index = DiscountsIndex(discounts)
+    with patch(
+        "saleor.discount.utils.get_product_discount_on_sale",
+        wraps=get_product_discount_on_sale,
+    ) as check_discount_mock:
+        linear_prices = calculate_prices(products, discounts, channel)
+        linear_checks_count = check_discount_mock.call_count
+        check_discount_mock.reset_mock()
+        indexed_prices = calculate_prices(products, index, channel)
+        indexed_checks_count = check_discount_mock.call_count
+
+    # then
+    assert indexed_prices == linear_prices
+    assert linear_checks_count == PRODUCTS_COUNT * SALES_COUNT
+    # Every product is on sale by its ID, category and collection at most
+    assert indexed_checks_count <= PRODUCTS_COUNT * 3
@@ -1,5 +1,6 @@
 from datetime import timedelta
 from decimal import Decimal
+from unittest.mock import patch
 
 import pytest
 from django.utils import timezone
@@ -8,7 +9,7 @@ from prices import Money
 from ...checkout.utils import fetch_checkout_lines, get_voucher_discount_for_checkout
 from ...plugins.manager import get_plugins_manager
 from ...product.models import Product, ProductVariant, ProductVariantChannelListing
-from .. import DiscountInfo, DiscountValueType, VoucherType
+from .. import DiscountInfo, DiscountsIndex, DiscountValueType, VoucherType
 from ..models import (
     NotApplicable,
     Sale,
@@ -20,9 +21,12 @@ from ..models import (
 from ..templatetags.voucher import discount_as_negative
 from ..utils import (
     add_voucher_usage_by_customer,
+    calculate_discounted_price,
     decrease_voucher_usage,
+    fetch_cached_discounts,
     get_product_discount_on_sale,
     increase_voucher_usage,
+    invalidate_discounts_cache,
     remove_voucher_usage_by_customer,
     validate_voucher,
 )
@@ -537,3 +541,149 @@ def test_get_not_applicable_sale_discount(sale, channel_PLN):
 
     with pytest.raises(NotApplicable):
         sale.get_discount(None)
+
+
+def test_fetch_cached_discounts_reuses_snapshot(
+    sale, settings, django_assert_num_queries
+):
+    settings.CACHE_ACTIVE_DISCOUNTS = True
+    invalidate_discounts_cache()
+    now = timezone.now()
+
+    discounts = fetch_cached_discounts(now)
+
+    with django_assert_num_queries(0):
+        assert fetch_cached_discounts(now) is discounts
+    assert [discount.sale for discount in discounts] == [sale]
+
+
+def test_fetch_cached_discounts_after_invalidation(sale, settings):
+    settings.CACHE_ACTIVE_DISCOUNTS = True
+    invalidate_discounts_cache()
+    now = timezone.now()
+    assert len(fetch_cached_discounts(now)) == 1
+
+    sale.delete()
+    invalidate_discounts_cache()
+
+    assert list(fetch_cached_discounts(now)) == []
+
+
+def test_fetch_cached_discounts_refetched_after_sale_end(sale, settings):
+    settings.CACHE_ACTIVE_DISCOUNTS = True
+    invalidate_discounts_cache()
+    now = timezone.now()
+    sale.end_date = now + timedelta(days=1)
+    sale.save(update_fields=["end_date"])
+
+    assert len(fetch_cached_discounts(now)) == 1
+    assert list(fetch_cached_discounts(now + timedelta(days=2))) == []
+
+
+def test_fetch_cached_discounts_refetched_after_sale_start(sale, settings):
+    settings.CACHE_ACTIVE_DISCOUNTS = True
+    invalidate_discounts_cache()
+    now = timezone.now()
+    sale.start_date = now + timedelta(days=1)
+    sale.save(update_fields=["start_date"])
+
+    assert list(fetch_cached_discounts(now)) == []
+    assert len(fetch_cached_discounts(now + timedelta(days=2))) == 1
+
+
+@patch("saleor.discount.utils.transaction.on_commit")
+def test_invalidate_discounts_cache_after_commit(on_commit_mock):
+    # when
+    invalidate_discounts_cache()
+
+    # then
+    on_commit_mock.assert_called_once()
+
+
+def test_discounts_index_get_product_discounts(product, collection):
+    # given
+    product.collections.add(collection)
+    sale = Sale(name="Sale")
+    product_discount = DiscountInfo(
+        sale=sale,
+        channel_listings={},
+        product_ids={product.id},
+        category_ids=set(),
+        collection_ids=set(),
+    )
+    category_discount = DiscountInfo(
+        sale=sale,
+        channel_listings={},
+        product_ids=set(),
+        category_ids={product.category_id},
+        collection_ids=set(),
+    )
+    collection_discount = DiscountInfo(
+        sale=sale,
+        channel_listings={},
+        product_ids={product.id},
+        category_ids=set(),
+        collection_ids={collection.id},
+    )
+    other_discount = DiscountInfo(
+        sale=sale,
+        channel_listings={},
+        product_ids={product.id + 1},
+        category_ids=set(),
+        collection_ids=set(),
+    )
+    index = DiscountsIndex(
+        [other_discount, product_discount, category_discount, collection_discount]
+    )
+
+    # when
+    discounts = index.get_product_discounts(
+        product.id, product.category_id, [collection.id]
+    )
+
+    # then
+    assert discounts == [product_discount, category_discount, collection_discount]
+    assert len(index) == 4
+    assert list(index) == [
+        other_discount,
+        product_discount,
+        category_discount,
+        collection_discount,
+    ]
+
+
+def test_calculate_discounted_price_with_discounts_index(
+    product, sale, discount_info, channel_USD, channel_PLN
+):
+    # given
+    variant = product.variants.get()
+    price = variant.channel_listings.get(channel=channel_USD).price
+    index = DiscountsIndex([discount_info])
+
+    # when
+    discounted_price = calculate_discounted_price(
+        product=product,
+        price=price,
+        collections=[],
+        discounts=index,
+        channel=channel_USD,
+    )
+    # the sale is not available in the PLN channel
+    not_discounted_price = calculate_discounted_price(
+        product=product,
+        price=price,
+        collections=[],
+        discounts=index,
+        channel=channel_PLN,
+    )
+
+    # then
+    assert discounted_price == calculate_discounted_price(
+        product=product,
+        price=price,
+        collections=[],
+        discounts=[discount_info],
+        channel=channel_USD,
+    )
+    assert discounted_price < price
+    assert not_discounted_price == price
@@ -0,0 +1,58 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.utils import timezone
+
+from ..models import Sale
+from ..tasks import update_discounted_prices_of_toggled_sales_task
+from ..utils import fetch_toggled_sales
+
+
+def test_fetch_toggled_sales(channel_USD):
+    # given
+    now = timezone.now()
+    started_sale = Sale.objects.create(
+        name="Started", start_date=now - timedelta(hours=1)
+    )
+    ended_sale = Sale.objects.create(
+        name="Ended",
+        start_date=now - timedelta(days=2),
+        end_date=now - timedelta(hours=1),
+        discounted_prices_updated_at=now - timedelta(days=1),
+    )
+    Sale.objects.create(
+        name="Upcoming",
+        start_date=now + timedelta(hours=1),
+        discounted_prices_updated_at=now - timedelta(days=1),
+    )
+    Sale.objects.create(
+        name="Updated",
+        start_date=now - timedelta(days=2),
+        end_date=now + timedelta(hours=1),
+        discounted_prices_updated_at=now - timedelta(days=1),
+    )
+
+    # when
+    sales = fetch_toggled_sales(now)
+
+    # then
+    assert set(sales) == {started_sale, ended_sale}
+
+
+@patch("saleor.discount.tasks.update_products_discounted_prices_of_discount_task.delay")
+def test_update_discounted_prices_of_toggled_sales_task(
+    update_prices_task_mock, channel_USD
+):
+    # given
+    sale = Sale.objects.create(
+        name="Sale", start_date=timezone.now() - timedelta(minutes=1)
+    )
+
+    # when
+    update_discounted_prices_of_toggled_sales_task()
+    update_discounted_prices_of_toggled_sales_task()
+
+    # then
+    update_prices_task_mock.assert_called_once_with(sale.pk)
+    sale.refresh_from_db()
+    assert sale.discounted_prices_updated_at >= sale.start_date
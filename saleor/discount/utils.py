@@ -1,15 +1,19 @@
 import datetime
 from collections import defaultdict
 from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set
+from uuid import uuid4
 
-from django.db.models import F
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Min, Q, QuerySet
 from django.utils import timezone
 from prices import Money
 
 from ..channel.models import Channel
 from ..checkout import calculations
 from ..core.taxes import zero_money
-from . import DiscountInfo
+from . import DiscountInfo, DiscountsIndex, DiscountsSnapshot
 from .models import NotApplicable, Sale, SaleChannelListing, VoucherCustomer
 
 if TYPE_CHECKING:
@@ -22,6 +26,15 @@ if TYPE_CHECKING:
     from .models import Voucher
 
 
+DISCOUNTS_VERSION_CACHE_KEY = "discounts_version"
+DISCOUNTS_SNAPSHOT_CACHE_KEY = "discounts_snapshot_{version}"
+DISCOUNTS_SNAPSHOT_CACHE_TIMEOUT = 60 * 60
+
+# Snapshot of active discounts shared by all requests handled by the current
+# process, keyed by the discounts version it was fetched for.
+_discounts_snapshots: Dict[str, DiscountsSnapshot] = {}
+
+
 def increase_voucher_usage(voucher: "Voucher") -> None:
     """Increase voucher uses by 1."""
     voucher.used = F("used") + 1
@@ -78,6 +91,11 @@ def get_product_discounts(
 ) -> Money:
     """Return discount values for all discounts applicable to a product."""
     product_collections = set(pc.id for pc in collections)
+    if isinstance(discounts, DiscountsIndex):
+        # Check only the sales containing the product instead of all of them
+        discounts = discounts.get_product_discounts(
+            product.id, product.category_id, product_collections
+        )
     for discount in discounts or []:
         try:
             yield get_product_discount_on_sale(
@@ -229,6 +247,22 @@ def fetch_sale_channel_listings(
     return channel_listings_map
 
 
+def fetch_toggled_sales(date: datetime.datetime) -> QuerySet:
+    """Return sales which started or ended after their prices were last updated.
+
+    The discounted prices of products are stored, so they have to be updated
+    once a sale becomes active or expires.
+    """
+    not_updated = Q(discounted_prices_updated_at__isnull=True)
+    started = Q(start_date__lte=date) & (
+        not_updated | Q(discounted_prices_updated_at__lt=F("start_date"))
+    )
+    ended = Q(end_date__lte=date) & (
+        not_updated | Q(discounted_prices_updated_at__lt=F("end_date"))
+    )
+    return Sale.objects.filter(started | ended)
+
+
 def fetch_discounts(date: datetime.date) -> List[DiscountInfo]:
     sales = list(Sale.objects.active(date))
     pks = {s.pk for s in sales}
@@ -249,5 +283,74 @@ def fetch_discounts(date: datetime.date) -> List[DiscountInfo]:
     ]
 
 
-def fetch_active_discounts() -> List[DiscountInfo]:
-    return fetch_discounts(timezone.now())
+def fetch_active_discounts() -> DiscountsIndex:
+    return DiscountsIndex(fetch_discounts(timezone.now()))
+
+
+def fetch_discounts_snapshot(date: datetime.datetime) -> DiscountsSnapshot:
+    """Fetch discounts active on the given date and the date until they stay valid.
+
+    The snapshot is valid until the closest start date of an upcoming sale or
+    the closest end date of an active one.
+    """
+    discounts = DiscountsIndex(fetch_discounts(date))
+    boundaries = [
+        discount.sale.end_date for discount in discounts if discount.sale.end_date
+    ]
+    next_start_date = Sale.objects.filter(start_date__gt=date).aggregate(
+        Min("start_date")
+    )["start_date__min"]
+    if next_start_date:
+        boundaries.append(next_start_date)
+    return DiscountsSnapshot(
+        discounts=discounts, valid_from=date, valid_until=min(boundaries, default=None)
+    )
+
+
+def get_discounts_version() -> str:
+    return cache.get_or_set(
+        DISCOUNTS_VERSION_CACHE_KEY, lambda: uuid4().hex, timeout=None
+    )
+
+
+def invalidate_discounts_cache():
+    """Force all processes to refetch active discounts.
+
+    Must be called every time sales, their catalogues or channel listings change.
+    The version is changed again after the current transaction is committed, so
+    the discounts fetched in the meantime from the uncommitted data are not used.
+    """
+
+    def invalidate():
+        cache.set(DISCOUNTS_VERSION_CACHE_KEY, uuid4().hex, timeout=None)
+
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+def fetch_cached_discounts(date: datetime.datetime) -> DiscountsIndex:
+    """Return discounts active on the given date using a shared snapshot.
+
+    The snapshot is kept in the process memory and in the cache shared between
+    processes. It is refetched when the discounts version changes or when the
+    date passes the start or end date of any sale, so it requires a cache backend
+    shared by all processes, see `SHARED_CACHE`.
+    """
+    if not settings.CACHE_ACTIVE_DISCOUNTS:
+        return DiscountsIndex(fetch_discounts(date))
+
+    version = get_discounts_version()
+    snapshot = _discounts_snapshots.get(version)
+    if snapshot is None or not snapshot.is_valid_for(date):
+        cache_key = DISCOUNTS_SNAPSHOT_CACHE_KEY.format(version=version)
+        snapshot = cache.get(cache_key)
+        if snapshot is None or not snapshot.is_valid_for(date):
+            snapshot = fetch_discounts_snapshot(date)
+            timeout = DISCOUNTS_SNAPSHOT_CACHE_TIMEOUT
+            if snapshot.valid_until:
+                seconds_left = (snapshot.valid_until - date).total_seconds()
+                timeout = max(1, min(timeout, int(seconds_left)))
+            cache.set(cache_key, snapshot, timeout=timeout)
+        _discounts_snapshots.clear()
+        _discounts_snapshots[version] = snapshot
+    return snapshot.discounts
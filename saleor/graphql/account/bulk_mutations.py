@@ -4,6 +4,7 @@ import graphene
 from django.core.exceptions import ValidationError
 
 from ...account import models
+from ...account.auth_cache import invalidate_user_auth
 from ...account.error_codes import AccountErrorCode
 from ...core.permissions import AccountPermissions
 from ..core.mutations import BaseBulkMutation, ModelBulkDeleteMutation
@@ -21,6 +22,11 @@ class UserBulkDelete(ModelBulkDeleteMutation):
     class Meta:
         abstract = True
 
+    @classmethod
+    def bulk_action(cls, queryset):
+        super().bulk_action(queryset)
+        invalidate_user_auth()
+
 
 class CustomerBulkDelete(CustomerDeleteMixin, UserBulkDelete):
     class Meta:
@@ -110,3 +116,4 @@ class UserBulkSetActive(BaseBulkMutation):
     @classmethod
     def bulk_action(cls, queryset, is_active):
         queryset.update(is_active=is_active)
+        invalidate_user_auth()
@@ -6,6 +6,7 @@ from django.contrib.auth import models as auth_models
 from django.core.exceptions import ValidationError
 from django.db import transaction
 
+from ....account.auth_cache import invalidate_user_auth
 from ....account.error_codes import PermissionGroupErrorCode
 from ....core.permissions import AccountPermissions, get_permissions
 from ...account.utils import (
@@ -66,6 +67,10 @@ class PermissionGroupCreate(ModelMutation):
         if users:
             instance.user_set.add(*users)
 
+    @classmethod
+    def post_save_action(cls, info, instance, cleaned_input):
+        invalidate_user_auth()
+
     @classmethod
     def clean_input(
         cls,
@@ -435,6 +440,12 @@ class PermissionGroupDelete(ModelDeleteMutation):
 
         cls.check_if_group_can_be_removed(requestor, instance)
 
+    @classmethod
+    def perform_mutation(cls, _root, info, **data):
+        response = super().perform_mutation(_root, info, **data)
+        invalidate_user_auth()
+        return response
+
     @classmethod
     def check_if_group_can_be_removed(cls, requestor, group):
         cls.ensure_deleting_not_left_not_manageable_permissions(group)
@@ -7,6 +7,7 @@ from django.db import transaction
 
 from ....account import events as account_events
 from ....account import models, utils
+from ....account.auth_cache import invalidate_user_auth_for_token
 from ....account.emails import send_set_password_email_with_url
 from ....account.error_codes import AccountErrorCode
 from ....account.thumbnails import create_user_avatar_thumbnails
@@ -253,6 +254,11 @@ class StaffCreate(ModelMutation):
         if groups:
             instance.groups.add(*groups)
 
+    @classmethod
+    def post_save_action(cls, info, instance, cleaned_input):
+        # Groups of the user are changed after the user is saved
+        invalidate_user_auth_for_token(instance.email, instance.jwt_token_key)
+
 
 class StaffUpdate(StaffCreate):
     class Arguments:
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import graphene
 import pytest
 from django.contrib.auth.models import Group
@@ -533,6 +535,30 @@ def test_permission_group_update_mutation(
     assert data["permissionGroupErrors"] == []
 
 
+@patch("saleor.graphql.account.mutations.permission_group.invalidate_user_auth")
+def test_permission_group_update_mutation_invalidates_user_auth(
+    invalidate_user_auth_mock,
+    permission_group_manage_users,
+    superuser_api_client,
+):
+    # given
+    group = permission_group_manage_users
+    variables = {
+        "id": graphene.Node.to_global_id("Group", group.id),
+        "input": {"addPermissions": [OrderPermissions.MANAGE_ORDERS.name]},
+    }
+
+    # when
+    response = superuser_api_client.post_graphql(
+        PERMISSION_GROUP_UPDATE_MUTATION, variables
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["permissionGroupUpdate"]["permissionGroupErrors"] == []
+    invalidate_user_auth_mock.assert_called_once_with()
+
+
 def test_permission_group_update_mutation_removing_perm_left_not_manageable_perms(
     permission_group_manage_users,
     staff_user,
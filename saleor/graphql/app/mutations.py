@@ -14,6 +14,7 @@ from ...core.permissions import (
     get_permissions,
     get_permissions_enum_list,
 )
+from ...webhook.subscribers import invalidate_webhook_subscribers
 from ..account.utils import can_manage_app
 from ..core.enums import PermissionEnum
 from ..core.mutations import BaseMutation, ModelDeleteMutation, ModelMutation
@@ -221,6 +222,10 @@ class AppUpdate(ModelMutation):
             ensure_can_manage_permissions(requestor, permissions)
         return cleaned_input
 
+    @classmethod
+    def post_save_action(cls, info, instance, cleaned_input):
+        invalidate_webhook_subscribers()
+
 
 class AppDelete(ModelDeleteMutation):
     class Arguments:
@@ -247,6 +252,12 @@ class AppDelete(ModelDeleteMutation):
             code = AppErrorCode.OUT_OF_SCOPE_APP.value
             raise ValidationError({"id": ValidationError(msg, code=code)})
 
+    @classmethod
+    def perform_mutation(cls, _root, info, **data):
+        response = super().perform_mutation(_root, info, **data)
+        invalidate_webhook_subscribers()
+        return response
+
 
 class AppActivate(ModelMutation):
     class Arguments:
@@ -264,6 +275,7 @@ class AppActivate(ModelMutation):
         app = cls.get_instance(info, **data)
         app.is_active = True
         cls.save(info, app, cleaned_input=None)
+        invalidate_webhook_subscribers()
         return cls.success_response(app)
 
 
@@ -283,6 +295,7 @@ class AppDeactivate(ModelMutation):
         app = cls.get_instance(info, **data)
         app.is_active = False
         cls.save(info, app, cleaned_input=None)
+        invalidate_webhook_subscribers()
         return cls.success_response(app)
 
 
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import graphene
 
 from .....app.models import App
@@ -42,6 +44,25 @@ def test_deactivate_app(app, staff_api_client, permission_manage_apps):
     assert not app.is_active
 
 
+@patch("saleor.graphql.app.mutations.invalidate_webhook_subscribers")
+def test_deactivate_app_invalidates_webhook_subscribers(
+    mocked_invalidate_webhook_subscribers, app, staff_api_client, permission_manage_apps
+):
+    # given
+    variables = {"id": graphene.Node.to_global_id("App", app.id)}
+
+    # when
+    response = staff_api_client.post_graphql(
+        APP_DEACTIVATE_MUTATION,
+        variables=variables,
+        permissions=(permission_manage_apps,),
+    )
+
+    # then
+    get_graphql_content(response)
+    mocked_invalidate_webhook_subscribers.assert_called_once_with()
+
+
 def test_deactivate_app_by_app(app, app_api_client, permission_manage_apps):
     # given
     app = App.objects.create(name="Sample app objects", is_active=True)
@@ -14,6 +14,11 @@ from ...core.permissions import (
     ProductPermissions,
     ProductTypePermissions,
 )
+from ...product.models import Product
+from ...product.search import (
+    get_products_with_attribute_value,
+    update_products_search_vector,
+)
 from ..attribute.types import Attribute, AttributeValue
 from ..core.inputs import ReorderInput
 from ..core.mutations import BaseMutation, ModelDeleteMutation, ModelMutation
@@ -606,6 +611,11 @@ class AttributeValueUpdate(ModelMutation):
         validate_value_is_unique(instance.attribute, instance)
         super().clean_instance(info, instance)
 
+    @classmethod
+    def post_save_action(cls, info, instance, cleaned_input):
+        if "name" in cleaned_input:
+            update_products_search_vector(get_products_with_attribute_value(instance))
+
     @classmethod
     def success_response(cls, instance):
         response = super().success_response(instance)
@@ -626,6 +636,20 @@ class AttributeValueDelete(ModelDeleteMutation):
         error_type_class = AttributeError
         error_type_field = "attribute_errors"
 
+    @classmethod
+    def perform_mutation(cls, _root, info, **data):
+        if not cls.check_permissions(info.context):
+            raise PermissionDenied()
+        value = cls.get_node_or_error(info, data["id"], only_type=AttributeValue)
+        # Products have to be fetched before their assignments to the value are
+        # deleted
+        product_pks = list(
+            get_products_with_attribute_value(value).values_list("pk", flat=True)
+        )
+        response = super().perform_mutation(_root, info, **data)
+        update_products_search_vector(Product.objects.filter(pk__in=product_pks))
+        return response
+
     @classmethod
     def success_response(cls, instance):
         response = super().success_response(instance)
@@ -2,6 +2,8 @@ import graphene
 from django.utils.text import slugify
 
 from .....attribute.error_codes import AttributeErrorCode
+from .....product.models import Product
+from .....product.search import search_products
 from ....tests.utils import get_graphql_content
 
 UPDATE_ATTRIBUTE_VALUE_MUTATION = """
@@ -54,6 +56,28 @@ def test_update_attribute_value(
     assert name in [value["name"] for value in data["attribute"]["values"]]
 
 
+def test_update_attribute_value_updates_products_search_vector(
+    staff_api_client, product, permission_manage_product_types_and_attributes
+):
+    # given
+    value = product.attributes.first().values.first()
+    node_id = graphene.Node.to_global_id("AttributeValue", value.id)
+    name = "Crimson"
+    variables = {"name": name, "id": node_id}
+
+    # when
+    response = staff_api_client.post_graphql(
+        UPDATE_ATTRIBUTE_VALUE_MUTATION,
+        variables,
+        permissions=[permission_manage_product_types_and_attributes],
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert not content["data"]["attributeValueUpdate"]["attributeErrors"]
+    assert list(search_products(Product.objects.all(), name)) == [product]
+
+
 def test_update_attribute_value_name_not_unique(
     staff_api_client,
     pink_attribute_value,
@@ -9,6 +9,7 @@ from django.utils.text import slugify
 from ...channel import models
 from ...checkout.models import Checkout
 from ...core.permissions import ChannelPermissions
+from ...discount.utils import invalidate_discounts_cache
 from ...order.models import Order
 from ..core.mutations import BaseMutation, ModelDeleteMutation, ModelMutation
 from ..core.types.common import ChannelError, ChannelErrorCode
@@ -84,6 +85,12 @@ class ChannelUpdate(ModelMutation):
 
         return cleaned_input
 
+    @classmethod
+    def post_save_action(cls, info, instance, cleaned_input):
+        if "slug" in cleaned_input:
+            # Active discounts keep sale channel listings by channel slug
+            invalidate_discounts_cache()
+
 
 class ChannelDeleteInput(graphene.InputObjectType):
     target_channel = graphene.ID(
@@ -181,7 +188,9 @@ class ChannelDelete(ModelDeleteMutation):
         else:
             cls.perform_delete_channel_without_order(origin_channel)
 
-        return super().perform_mutation(_root, info, **data)
+        response = super().perform_mutation(_root, info, **data)
+        invalidate_discounts_cache()
+        return response
 
 
 ErrorType = DefaultDict[str, List[ValidationError]]
@@ -1,7 +1,9 @@
 import graphene
+from django.utils import timezone
 from django.utils.text import slugify
 
 from ....channel.error_codes import ChannelErrorCode
+from ....discount.utils import fetch_cached_discounts, invalidate_discounts_cache
 from ...tests.utils import assert_no_permission, get_graphql_content
 
 CHANNEL_UPDATE_MUTATION = """
@@ -77,6 +79,33 @@ def test_channel_update_mutation_as_app(
     assert channel_data["currencyCode"] == channel_USD.currency_code == "USD"
 
 
+def test_channel_update_mutation_slug_invalidates_cached_discounts(
+    permission_manage_channels, staff_api_client, channel_USD, sale, settings
+):
+    # given
+    settings.CACHE_ACTIVE_DISCOUNTS = True
+    invalidate_discounts_cache()
+    old_slug = channel_USD.slug
+    [discount] = fetch_cached_discounts(timezone.now())
+    assert list(discount.channel_listings) == [old_slug]
+    channel_id = graphene.Node.to_global_id("Channel", channel_USD.id)
+    slug = "new_slug"
+    variables = {"id": channel_id, "input": {"slug": slug}}
+
+    # when
+    response = staff_api_client.post_graphql(
+        CHANNEL_UPDATE_MUTATION,
+        variables=variables,
+        permissions=(permission_manage_channels,),
+    )
+    content = get_graphql_content(response)
+
+    # then
+    assert not content["data"]["channelUpdate"]["channelErrors"]
+    [discount] = fetch_cached_discounts(timezone.now())
+    assert list(discount.channel_listings) == [slug]
+
+
 def test_channel_update_mutation_as_customer(user_api_client, channel_USD):
     # given
     channel_id = graphene.Node.to_global_id("Channel", channel_USD.id)
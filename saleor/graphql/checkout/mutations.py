@@ -88,10 +88,24 @@ def update_checkout_shipping_method_if_invalid(
     )
 
     if not is_valid:
-        cheapest_alternative = get_valid_shipping_methods_for_checkout(
+        valid_methods = get_valid_shipping_methods_for_checkout(
             checkout, lines, discounts
-        ).first()
-        checkout.shipping_method = cheapest_alternative
+        )
+        # The methods come from the shared shipping rules, which might not include
+        # the latest changes yet, so check that the method still exists
+        existing_method_ids = set(
+            shipping_models.ShippingMethod.objects.filter(
+                pk__in=[method.pk for method in valid_methods or []]
+            ).values_list("pk", flat=True)
+        )
+        checkout.shipping_method = next(
+            (
+                method
+                for method in valid_methods or []
+                if method.pk in existing_method_ids
+            ),
+            None,
+        )
         checkout.save(update_fields=["shipping_method", "last_change"])
 
 
@@ -91,6 +91,36 @@ def test_update_checkout_shipping_method_if_invalid(
     assert checkout.shipping_method == other_shipping_method
 
 
+@patch("saleor.graphql.checkout.mutations.get_valid_shipping_methods_for_checkout")
+def test_update_checkout_shipping_method_if_invalid_skips_deleted_method(
+    mocked_get_valid_shipping_methods,
+    checkout_with_single_item,
+    address,
+    shipping_method,
+    other_shipping_method,
+):
+    # given
+    checkout = checkout_with_single_item
+    checkout.shipping_address = address
+    checkout.shipping_method = other_shipping_method
+    lines = fetch_checkout_lines(checkout)
+    deleted_method_id = shipping_method.pk
+    shipping_method.delete()
+    shipping_method.pk = deleted_method_id
+    # Shipping rules cached before the method was deleted
+    mocked_get_valid_shipping_methods.side_effect = [
+        [shipping_method],
+        [shipping_method, other_shipping_method],
+    ]
+
+    # when
+    update_checkout_shipping_method_if_invalid(checkout, lines, None)
+
+    # then
+    checkout.refresh_from_db(fields=["shipping_method"])
+    assert checkout.shipping_method == other_shipping_method
+
+
 MUTATION_CHECKOUT_CREATE = """
     mutation createCheckout($checkoutInput: CheckoutCreateInput!) {
       checkoutCreate(input: $checkoutInput) {
@@ -117,6 +147,7 @@ MUTATION_CHECKOUT_CREATE = """
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
 def test_checkout_create_triggers_webhooks(
     mocked_webhook_trigger,
+    any_event_webhook,
     user_api_client,
     stock,
     graphql_address_data,
@@ -2588,7 +2619,7 @@ def test_checkout_shipping_method_update(
         assert checkout.shipping_method is None
 
 
-@patch("saleor.shipping.models.check_shipping_method_for_zip_code")
+@patch("saleor.shipping.rules.check_shipping_method_for_zip_code")
 def test_checkout_shipping_method_update_excluded_zip_code(
     mock_check_zip_code, staff_api_client, shipping_method, checkout_with_item, address
 ):
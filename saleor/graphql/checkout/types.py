@@ -384,7 +384,7 @@ class Checkout(CountableDjangoObjectType):
             )
             if available is None:
                 return []
-            available_ids = available.values_list("id", flat=True)
+            available_ids = [shipping_method.id for shipping_method in available]
 
             def map_shipping_method_with_channel(shippings):
                 def apply_price_to_shipping_method(channel_listings):
@@ -1,9 +1,15 @@
+import hashlib
 import json
-from typing import Any, Dict, Iterable, List, Tuple, Union
+from typing import Any, Dict, Iterable, List, Tuple, Type, Union
 
 import graphene
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist
+from django.db import connections
+from django.db.models import BooleanField, F, Func
 from django.db.models import Model as DjangoModel
-from django.db.models import Q, QuerySet
+from django.db.models import Q, QuerySet, Value
 from graphene.relay.connection import Connection
 from graphene_django.types import DjangoObjectType
 from graphql.error import GraphQLError
@@ -93,6 +99,70 @@ def _prepare_filter(
     return filter_kwargs
 
 
+class RowValueComparison(Func):
+    """Compare a row of fields with a row of values, e.g. `(name, id) > (%s, %s)`.
+
+    Unlike the equivalent alternative of conditions, the row comparison lets
+    PostgreSQL use a composite index matching the ordering of the queryset.
+    """
+
+    output_field = BooleanField()
+
+    def __init__(self, fields: List[str], values: List[Any], operator: str):
+        self.operator = operator
+        super().__init__(
+            *[F(field) for field in fields], *[Value(value) for value in values]
+        )
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sql_parts = []
+        params: List[Any] = []
+        for expression in self.get_source_expressions():
+            expression_sql, expression_params = compiler.compile(expression)
+            sql_parts.append(expression_sql)
+            params.extend(expression_params)
+        size = len(sql_parts) // 2
+        lhs = ", ".join(sql_parts[:size])
+        rhs = ", ".join(sql_parts[size:])
+        return f"({lhs}) {self.operator} ({rhs})", params
+
+
+def _is_nullable_field(model: Type[DjangoModel], field_name: str) -> bool:
+    """Return True when values of the field may be null.
+
+    Annotations, relations and fields reached through nullable relations are
+    considered nullable.
+    """
+    field = None
+    for name in field_name.split("__"):
+        if model is None:
+            return True
+        try:
+            field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return True
+        if not field.concrete or field.null:
+            return True
+        model = field.related_model
+    return field is None or field.is_relation
+
+
+def _prepare_row_value_filter(
+    qs: QuerySet, cursor: List[str], sorting_fields: List[str], sorting_direction: str
+):
+    """Return the row comparison filter when it matches rows like `_prepare_filter`.
+
+    Rows can be compared only when the sorting fields and cursor values are not
+    null, because nulls are compared differently than they are sorted.
+    """
+    if any(value is None for value in cursor):
+        return None
+    if any(_is_nullable_field(qs.model, field) for field in sorting_fields):
+        return None
+    operator = ">" if sorting_direction == "gt" else "<"
+    return RowValueComparison(sorting_fields, cursor, operator)
+
+
 def _validate_connection_args(args):
     first = args.get("first")
     last = args.get("last")
@@ -212,10 +282,14 @@ def connection_from_queryset_slice(
     sorting_direction = _get_sorting_direction(sort_by, last)
     if cursor and len(cursor) != len(sorting_fields):
         raise GraphQLError("Received cursor is invalid.")
-    filter_kwargs = (
-        _prepare_filter(cursor, sorting_fields, sorting_direction) if cursor else Q()
-    )
-    qs = qs.filter(filter_kwargs)
+    if cursor:
+        row_value_filter = _prepare_row_value_filter(
+            qs, cursor, sorting_fields, sorting_direction
+        )
+        if row_value_filter is not None:
+            qs = qs.filter(row_value_filter)
+        else:
+            qs = qs.filter(_prepare_filter(cursor, sorting_fields, sorting_direction))
     qs = qs[:end_margin]
     edges, page_info = _get_edges_for_connection(edge_type, qs, args, sorting_fields)
 
@@ -267,7 +341,47 @@ class CountableConnection(NonNullConnection):
     def resolve_total_count(root, *_args, **_kwargs):
         if isinstance(root.iterable, list):
             return len(root.iterable)
-        return root.iterable.count()
+        return count_queryset(root.iterable)
+
+
+def _get_estimated_count(qs: QuerySet) -> int:
+    """Return the number of rows estimated by the PostgreSQL query planner."""
+    sql, params = qs.order_by().query.sql_with_params()
+    with connections[qs.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_queryset(qs: QuerySet) -> int:
+    """Return the number of rows of the queryset for the `totalCount` field.
+
+    When the planner estimates more rows than
+    `GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD`, the estimate is returned instead of
+    counting the rows. Exact counts are cached for
+    `GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT` seconds, keyed by the query of the queryset.
+    """
+    estimate_threshold = settings.GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD
+    cache_timeout = settings.GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT
+    if not estimate_threshold and not cache_timeout:
+        return qs.count()
+    try:
+        sql, params = qs.query.sql_with_params()
+    except EmptyResultSet:
+        # The queryset can't match any rows, e.g. it's filtered by an empty list
+        return 0
+
+    if estimate_threshold:
+        estimated_count = _get_estimated_count(qs)
+        if estimated_count > estimate_threshold:
+            return estimated_count
+
+    if not cache_timeout:
+        return qs.count()
+    query_hash = hashlib.md5(f"{sql}{params}".encode()).hexdigest()
+    return cache.get_or_set(f"total_count_{query_hash}", qs.count, cache_timeout)
 
 
 class CountableDjangoObjectType(DjangoObjectType):
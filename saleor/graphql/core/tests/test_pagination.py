@@ -1,10 +1,19 @@
 import math
+from unittest.mock import patch
 
 import graphene
 import pytest
+from django.core.cache import cache
 
+from ....product.models import Product
 from ....tests.models import Book
-from ..connection import CountableDjangoObjectType
+from ..connection import (
+    CountableDjangoObjectType,
+    RowValueComparison,
+    _get_estimated_count,
+    _prepare_row_value_filter,
+    count_queryset,
+)
 from ..fields import FilterInputConnectionField
 
 
@@ -218,3 +227,99 @@ def test_pagination_backward_last_page_info(books):
     page_info = content["books"]["pageInfo"]
     assert page_info["hasNextPage"]
     assert page_info["hasPreviousPage"] is False
+
+
+def test_prepare_row_value_filter_for_not_nullable_fields():
+    # when
+    row_value_filter = _prepare_row_value_filter(
+        Product.objects.all(), ["Name", "slug", "5"], ["name", "slug", "pk"], "gt"
+    )
+
+    # then
+    assert isinstance(row_value_filter, RowValueComparison)
+    assert row_value_filter.operator == ">"
+
+
+@pytest.mark.parametrize(
+    "cursor, sorting_fields",
+    [
+        (["Category", "5"], ["category__name", "pk"]),
+        (["1", "5"], ["product_type", "pk"]),
+        (["10", "5"], ["min_price_amount", "pk"]),
+        ([None, "5"], ["name", "pk"]),
+    ],
+)
+def test_prepare_row_value_filter_for_nullable_fields(cursor, sorting_fields):
+    # when
+    row_value_filter = _prepare_row_value_filter(
+        Product.objects.all(), cursor, sorting_fields, "lt"
+    )
+
+    # then
+    assert row_value_filter is None
+
+
+QUERY_TOTAL_COUNT_TEST = """
+    query BooksTotalCountTest{
+        books(first: 1) {
+            totalCount
+        }
+    }
+"""
+
+
+def test_total_count_cached(books, settings):
+    # given
+    settings.GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT = 60
+    cache.clear()
+    result = schema.execute(QUERY_TOTAL_COUNT_TEST)
+    Book.objects.create(name="New book")
+
+    # when
+    cached_result = schema.execute(QUERY_TOTAL_COUNT_TEST)
+    cache.clear()
+    result_after_timeout = schema.execute(QUERY_TOTAL_COUNT_TEST)
+
+    # then
+    assert result.data["books"]["totalCount"] == len(books)
+    assert cached_result.data["books"]["totalCount"] == len(books)
+    assert result_after_timeout.data["books"]["totalCount"] == len(books) + 1
+
+
+def test_get_estimated_count(books):
+    # when
+    estimated_count = _get_estimated_count(Book.objects.filter(name__isnull=False))
+
+    # then
+    assert isinstance(estimated_count, int)
+
+
+@pytest.mark.parametrize("estimated_count, total_count", [(1000, 1000), (10, 24)])
+@patch("saleor.graphql.core.connection._get_estimated_count")
+def test_total_count_estimated(
+    mocked_get_estimated_count, estimated_count, total_count, books, settings
+):
+    # given
+    settings.GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD = 100
+    mocked_get_estimated_count.return_value = estimated_count
+
+    # when
+    result = schema.execute(QUERY_TOTAL_COUNT_TEST)
+
+    # then
+    assert result.data["books"]["totalCount"] == total_count
+
+
+@pytest.mark.parametrize(
+    "queryset", [Book.objects.none(), Book.objects.filter(pk__in=[])]
+)
+def test_count_queryset_without_results(queryset, books, settings):
+    # given
+    settings.GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD = 100
+    settings.GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT = 60
+
+    # when
+    total_count = count_queryset(queryset)
+
+    # then
+    assert total_count == 0
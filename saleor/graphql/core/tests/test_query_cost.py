@@ -0,0 +1,125 @@
+from unittest import mock
+
+import pytest
+from graphql import parse
+
+from ...api import schema
+from ...query_cost import QueryCostCalculator, calculate_query_cost
+from ...tests.utils import get_graphql_content, get_graphql_content_from_response
+
+PRODUCTS_QUERY = """
+    query Products($first: Int) {
+        products(first: $first) {
+            edges {
+                node {
+                    name
+                    category {
+                        name
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.parametrize("first, cost", [(10, 31), (5, 16), (None, 301)])
+def test_query_cost_multiplied_by_requested_items(first, cost):
+    document_ast = parse(PRODUCTS_QUERY)
+
+    assert calculate_query_cost(schema, document_ast, None, {"first": first}) == cost
+
+
+def test_query_cost_with_fragments():
+    query = """
+        query {
+            products(first: 10) {
+                edges {
+                    node {
+                        ...ProductFragment
+                        ... on Product {
+                            name
+                        }
+                    }
+                }
+            }
+        }
+        fragment ProductFragment on Product {
+            category {
+                name
+            }
+        }
+    """
+
+    assert calculate_query_cost(schema, parse(query)) == 31
+
+
+def test_query_cost_with_nested_repeated_fragments():
+    # given
+    depth = 50
+    fragments = [
+        "fragment Fragment0 on Category { parent { name } }",
+        *(
+            f"fragment Fragment{i} on Category {{ "
+            f"...Fragment{i - 1} ...Fragment{i - 1} ...Fragment{i - 1} }}"
+            for i in range(1, depth + 1)
+        ),
+    ]
+    query = f'query {{ category(id: "1") {{ ...Fragment{depth} }} }}'
+    calculator = QueryCostCalculator(schema, parse("\n".join([query, *fragments])))
+
+    # when
+    with mock.patch.object(
+        calculator, "get_field_cost", wraps=calculator.get_field_cost
+    ) as get_field_cost_mock:
+        cost = calculator.calculate()
+
+    # then
+    assert cost == 1 + 3 ** depth
+    # The `category`, `parent` and `name` fields are calculated once
+    assert get_field_cost_mock.call_count == 3
+
+
+def test_query_cost_with_field_cost_override():
+    calculator = QueryCostCalculator(
+        schema,
+        parse(PRODUCTS_QUERY),
+        variables={"first": 10},
+        field_costs={"Product.category": 10},
+    )
+
+    assert calculator.calculate() == 121
+
+
+def test_query_cost_ignores_introspection_fields():
+    query = "{ __schema { queryType { name } } }"
+
+    assert calculate_query_cost(schema, parse(query)) == 0
+
+
+def test_query_cost_reported_in_extensions(api_client, settings):
+    settings.GRAPHQL_QUERY_MAX_COST = 100
+    query = "{ shop { name } }"
+
+    response = api_client.post_graphql(query)
+
+    content = get_graphql_content(response)
+    assert content["extensions"]["cost"] == {
+        "requestedQueryCost": 1,
+        "maximumAvailable": 100,
+    }
+
+
+def test_query_exceeding_max_cost_rejected(api_client, settings, channel_USD):
+    settings.GRAPHQL_QUERY_MAX_COST = 20
+    variables = {"first": 10}
+
+    response = api_client.post_graphql(PRODUCTS_QUERY, variables)
+
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == (
+        "The query exceeds the maximum cost of 20. Requested query cost is 31."
+    )
+    assert "data" not in content
+    assert content["extensions"]["cost"]["requestedQueryCost"] == 31
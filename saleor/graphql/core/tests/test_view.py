@@ -1,10 +1,13 @@
+import json
 from unittest import mock
 
 import graphene
 import pytest
+from django.core.cache import cache
 from django.test import override_settings
 
 from ....demo.views import EXAMPLE_QUERY
+from ...document_cache import DocumentCache, document_cache, get_query_hash
 from ...tests.fixtures import (
     ACCESS_CONTROL_ALLOW_CREDENTIALS,
     ACCESS_CONTROL_ALLOW_HEADERS,
@@ -86,7 +89,7 @@ def test_graphql_view_access_control_header(client, settings):
     response = client.options(API_PATH, HTTP_ORIGIN=origin)
     assert response[ACCESS_CONTROL_ALLOW_ORIGIN] == origin
     assert response[ACCESS_CONTROL_ALLOW_CREDENTIALS] == "true"
-    assert response[ACCESS_CONTROL_ALLOW_METHODS] == "POST, OPTIONS"
+    assert response[ACCESS_CONTROL_ALLOW_METHODS] == "GET, POST, OPTIONS"
     assert (
         response[ACCESS_CONTROL_ALLOW_HEADERS]
         == "Origin, Content-Type, Accept, Authorization"
@@ -333,3 +336,199 @@ def test_query_contains_not_only_schema_raise_error(
     assert graphql_log_handler.messages == [
         "saleor.graphql.errors.handled[INFO].GraphQLError"
     ]
+
+
+def test_document_cache_reuses_validated_document(api_client, settings):
+    settings.GRAPHQL_DOCUMENT_CACHE_SIZE = 10
+    document_cache.clear()
+    query = "{ shop { name } }"
+
+    for _ in range(2):
+        response = api_client.post_graphql(query)
+        content = get_graphql_content(response)
+        assert content["data"]["shop"]["name"]
+
+    assert document_cache.info() == {"hits": 1, "misses": 1, "size": 1, "max_size": 10}
+
+
+def test_document_cache_skips_invalid_documents(api_client, settings):
+    settings.GRAPHQL_DOCUMENT_CACHE_SIZE = 10
+    document_cache.clear()
+
+    for _ in range(2):
+        response = api_client.post_graphql("{ shop }")
+        assert response.status_code == 400
+
+    assert document_cache.info()["size"] == 0
+
+
+def test_document_cache_disabled(api_client, settings):
+    settings.GRAPHQL_DOCUMENT_CACHE_SIZE = 0
+    document_cache.clear()
+
+    for _ in range(2):
+        response = api_client.post_graphql("{ shop { name } }")
+        get_graphql_content(response)
+
+    assert document_cache.info() == {"hits": 0, "misses": 0, "size": 0, "max_size": 0}
+
+
+def test_document_cache_evicts_least_recently_used(settings):
+    settings.GRAPHQL_DOCUMENT_CACHE_SIZE = 2
+    cache = DocumentCache()
+    schema = mock.sentinel.schema
+    first, second, third = (get_query_hash(query) for query in ["a", "b", "c"])
+    cache.set(schema, first, mock.sentinel.first)
+    cache.set(schema, second, mock.sentinel.second)
+
+    assert cache.get(schema, first) is mock.sentinel.first
+    cache.set(schema, third, mock.sentinel.third)
+
+    assert cache.get(schema, second) is None
+    assert cache.get(schema, first) is mock.sentinel.first
+    assert cache.get(schema, third) is mock.sentinel.third
+
+
+def _persisted_query_extensions(query_hash):
+    return {"persistedQuery": {"version": 1, "sha256Hash": query_hash}}
+
+
+def test_persisted_query_not_found(api_client):
+    cache.clear()
+    query_hash = get_query_hash("{ shop { name } }")
+
+    response = api_client.post({"extensions": _persisted_query_extensions(query_hash)})
+
+    assert response.status_code == 200
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotFound"
+
+
+def test_persisted_query_registered_and_reused(api_client):
+    cache.clear()
+    query = "{ shop { name } }"
+    extensions = _persisted_query_extensions(get_query_hash(query))
+
+    response = api_client.post({"query": query, "extensions": extensions})
+    assert get_graphql_content(response)["data"]["shop"]["name"]
+
+    response = api_client.post({"extensions": extensions})
+    assert get_graphql_content(response)["data"]["shop"]["name"]
+
+
+def test_persisted_query_hash_mismatch(api_client):
+    cache.clear()
+    extensions = _persisted_query_extensions(get_query_hash("{ shop { domain } }"))
+
+    response = api_client.post({"query": "{ shop { name } }", "extensions": extensions})
+
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "Provided hash does not match the query."
+
+
+def test_persisted_query_unsupported_version(api_client):
+    query = "{ shop { name } }"
+    extensions = {"persistedQuery": {"version": 2, "sha256Hash": get_query_hash(query)}}
+
+    response = api_client.post({"query": query, "extensions": extensions})
+
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "Unsupported persisted query version."
+
+
+def test_persisted_query_sent_as_get_request(api_client):
+    cache.clear()
+    query = "query GetShop { shop { name } }"
+    extensions = _persisted_query_extensions(get_query_hash(query))
+    api_client.post({"query": query, "extensions": extensions})
+
+    response = api_client.get(
+        API_PATH,
+        {"operationName": "GetShop", "extensions": json.dumps(extensions)},
+    )
+
+    assert get_graphql_content(response)["data"]["shop"]["name"]
+
+
+def test_persisted_mutation_sent_as_get_request(api_client):
+    cache.clear()
+    query = 'mutation { tokenVerify(token: "abc") { isValid } }'
+    extensions = _persisted_query_extensions(get_query_hash(query))
+    api_client.post({"query": query, "extensions": extensions})
+
+    response = api_client.get(API_PATH, {"extensions": json.dumps(extensions)})
+
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == (
+        "Only queries can be sent as GET requests."
+    )
+
+
+def test_batch_queries_executed_concurrently(
+    category, product, api_client, channel_USD, settings
+):
+    settings.GRAPHQL_CONCURRENT_BATCH_QUERIES = True
+    query_product = """
+        query GetProduct($id: ID!, $channel: String) {
+            product(id: $id, channel: $channel) {
+                name
+            }
+        }
+    """
+    query_category = """
+        query GetCategory($id: ID!) {
+            category(id: $id) {
+                name
+            }
+        }
+    """
+    data = [
+        {
+            "query": query_category,
+            "variables": {"id": graphene.Node.to_global_id("Category", category.pk)},
+        },
+        {
+            "query": query_product,
+            "variables": {
+                "id": graphene.Node.to_global_id("Product", product.pk),
+                "channel": channel_USD.slug,
+            },
+        },
+        {"query": "{ invalid }"},
+    ]
+
+    response = api_client.post(data)
+
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content[0]["data"]["category"]["name"] == category.name
+    assert content[1]["data"]["product"]["name"] == product.name
+    assert "errors" in content[2]
+
+
+def test_batch_concurrent_queries_keep_mutation_order(
+    staff_api_client, site_settings, permission_manage_settings, settings
+):
+    settings.GRAPHQL_CONCURRENT_BATCH_QUERIES = True
+    staff_api_client.user.user_permissions.add(permission_manage_settings)
+    old_header_text = site_settings.header_text
+    query = "{ shop { headerText } }"
+    mutation = """
+        mutation {
+            shopSettingsUpdate(input: {headerText: "New header"}) {
+                shop {
+                    headerText
+                }
+            }
+        }
+    """
+    data = [{"query": query}, {"query": mutation}, {"query": query}]
+
+    response = staff_api_client.post(data)
+
+    content = get_graphql_content(response)
+    assert content[0]["data"]["shop"]["headerText"] == old_header_text
+    assert content[2]["data"]["shop"]["headerText"] == "New header"
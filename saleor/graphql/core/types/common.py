@@ -15,6 +15,7 @@ from ..enums import (
     DiscountErrorCode,
     ExportErrorCode,
     GiftCardErrorCode,
+    ImportErrorCode,
     InvoiceErrorCode,
     JobStatusEnum,
     MenuErrorCode,
@@ -145,6 +146,10 @@ class ExportError(Error):
     code = ExportErrorCode(description="The error code.", required=True)
 
 
+class ImportFileError(Error):
+    code = ImportErrorCode(description="The error code.", required=True)
+
+
 class MenuError(Error):
     code = MenuErrorCode(description="The error code.", required=True)
 
@@ -1,23 +1,30 @@
 from typing import Dict, List, Mapping, Union
 
 import graphene
+from django.conf import settings
 from django.core.exceptions import ValidationError
 
 from ...core.permissions import ProductPermissions
+from ...csv import FileTypes
 from ...csv import models as csv_models
 from ...csv.events import export_started_event
-from ...csv.tasks import export_products_task
+from ...csv.tasks import (
+    export_products_in_shards_task,
+    export_products_task,
+    import_products_task,
+)
 from ..attribute.types import Attribute
 from ..channel.types import Channel
-from ..core.enums import ExportErrorCode
+from ..core.enums import ExportErrorCode, ImportErrorCode
 from ..core.mutations import BaseMutation
-from ..core.types.common import ExportError
+from ..core.types import Upload
+from ..core.types.common import ExportError, ImportFileError
 from ..product.filters import ProductFilterInput
 from ..product.types import Product
 from ..utils import resolve_global_ids_to_primary_keys
 from ..warehouse.types import Warehouse
 from .enums import ExportScope, FileTypeEnum, ProductFieldEnum
-from .types import ExportFile
+from .types import ExportFile, ImportFile
 
 
 class ExportInfoInput(graphene.InputObjectType):
@@ -89,7 +96,12 @@ class ExportProducts(BaseMutation):
 
         export_file = csv_models.ExportFile.objects.create(**kwargs)
         export_started_event(export_file=export_file, **kwargs)
-        export_products_task.delay(export_file.pk, scope, export_info, file_type)
+        if settings.EXPORT_PRODUCTS_SHARD_SIZE:
+            export_products_in_shards_task.delay(
+                export_file.pk, scope, export_info, file_type
+            )
+        else:
+            export_products_task.delay(export_file.pk, scope, export_info, file_type)
 
         export_file.refresh_from_db()
         return cls(export_file=export_file)
@@ -157,3 +169,72 @@ class ExportProducts(BaseMutation):
             return
         _, pks = resolve_global_ids_to_primary_keys(ids, graphene_type=graphene_type)
         return pks
+
+
+class ImportProductsInput(graphene.InputObjectType):
+    file = Upload(
+        required=True,
+        description=(
+            "CSV or XLSX file in the format of the products export. Products are "
+            "matched by ID, rows without ID create new products. Variants are "
+            "matched by SKU."
+        ),
+    )
+
+
+class ImportProducts(BaseMutation):
+    import_file = graphene.Field(
+        ImportFile,
+        description=(
+            "The newly created import file job which is responsible for import data."
+        ),
+    )
+
+    class Arguments:
+        input = ImportProductsInput(
+            required=True, description="Fields required to import product data."
+        )
+
+    class Meta:
+        description = "Create and update products and variants from csv file."
+        permissions = (ProductPermissions.MANAGE_PRODUCTS,)
+        error_type_class = ImportFileError
+        error_type_field = "import_errors"
+
+    @classmethod
+    def perform_mutation(cls, root, info, **data):
+        content_file = cls.clean_file(info, data["input"]["file"])
+
+        app = info.context.app
+        kwargs = {"app": app} if app else {"user": info.context.user}
+
+        import_file = csv_models.ImportFile.objects.create(
+            content_file=content_file, **kwargs
+        )
+        import_products_task.delay(import_file.pk)
+
+        import_file.refresh_from_db()
+        return cls(import_file=import_file)
+
+    @staticmethod
+    def clean_file(info, file_name):
+        content_file = info.context.FILES.get(file_name)
+        if not content_file:
+            raise ValidationError(
+                {
+                    "file": ValidationError(
+                        "File is required.", code=ImportErrorCode.REQUIRED.value
+                    )
+                }
+            )
+        extension = content_file.name.rsplit(".", 1)[-1].lower()
+        if extension not in [FileTypes.CSV, FileTypes.XLSX]:
+            raise ValidationError(
+                {
+                    "file": ValidationError(
+                        "Only csv and xlsx files can be imported.",
+                        code=ImportErrorCode.INVALID.value,
+                    )
+                }
+            )
+        return content_file
@@ -0,0 +1,90 @@
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from .....csv.error_codes import ImportErrorCode
+from .....csv.models import ImportFile
+from ....tests.utils import get_graphql_content, get_multipart_request_body
+
+IMPORT_PRODUCTS_MUTATION = """
+    mutation ImportProducts($file: Upload!){
+        importProducts(input: {file: $file}){
+            importFile {
+                id
+                status
+                totalRows
+                importedRows
+                user {
+                    email
+                }
+            }
+            importErrors {
+                field
+                code
+                message
+            }
+        }
+    }
+"""
+
+
+@patch("saleor.graphql.csv.mutations.import_products_task.delay")
+def test_import_products_mutation(
+    import_products_task_mock,
+    staff_api_client,
+    permission_manage_products,
+    media_root,
+):
+    # given
+    file_name = "products.csv"
+    upload = SimpleUploadedFile(file_name, b"id;name\n", content_type="text/csv")
+    variables = {"file": file_name}
+    body = get_multipart_request_body(
+        IMPORT_PRODUCTS_MUTATION, variables, upload, file_name
+    )
+
+    # when
+    response = staff_api_client.post_multipart(
+        body, permissions=[permission_manage_products]
+    )
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["importProducts"]
+    assert not data["importErrors"]
+    assert data["importFile"]["status"] == "PENDING"
+    assert data["importFile"]["user"]["email"] == staff_api_client.user.email
+
+    import_file = ImportFile.objects.get()
+    assert import_file.content_file.read() == b"id;name\n"
+    import_products_task_mock.assert_called_once_with(import_file.pk)
+
+
+@patch("saleor.graphql.csv.mutations.import_products_task.delay")
+def test_import_products_mutation_invalid_file_type(
+    import_products_task_mock,
+    staff_api_client,
+    permission_manage_products,
+    media_root,
+):
+    # given
+    file_name = "products.json"
+    upload = SimpleUploadedFile(file_name, b"{}", content_type="application/json")
+    variables = {"file": file_name}
+    body = get_multipart_request_body(
+        IMPORT_PRODUCTS_MUTATION, variables, upload, file_name
+    )
+
+    # when
+    response = staff_api_client.post_multipart(
+        body, permissions=[permission_manage_products]
+    )
+
+    # then
+    content = get_graphql_content(response)
+    errors = content["data"]["importProducts"]["importErrors"]
+    assert len(errors) == 1
+    assert errors[0]["field"] == "file"
+    assert errors[0]["code"] == ImportErrorCode.INVALID.name
+    assert not ImportFile.objects.exists()
+    import_products_task_mock.assert_not_called()
@@ -7,6 +7,7 @@ from ..account.types import User
 from ..account.utils import requestor_has_access
 from ..app.types import App
 from ..core.connection import CountableDjangoObjectType
+from ..core.enums import ImportErrorCode
 from ..core.types.common import Job
 from ..utils import get_user_or_app_from_context
 from .enums import ExportEventEnum
@@ -56,6 +57,12 @@ class ExportEvent(CountableDjangoObjectType):
 
 class ExportFile(CountableDjangoObjectType):
     url = graphene.String(description="The URL of field to download.")
+    progress = graphene.Float(
+        description=(
+            "Fraction of the exported data processed so far, from 0 to 1. Available "
+            "only for the exports split into shards."
+        )
+    )
     events = graphene.List(
         graphene.NonNull(ExportEvent),
         description="List of events associated with the export.",
@@ -74,6 +81,12 @@ class ExportFile(CountableDjangoObjectType):
             return None
         return info.context.build_absolute_uri(content_file.url)
 
+    @staticmethod
+    def resolve_progress(root: models.ExportFile, _info):
+        if not root.total_shards:
+            return None
+        return root.processed_shards / root.total_shards
+
     @staticmethod
     def resolve_user(root: models.ExportFile, info):
         requestor = get_user_or_app_from_context(info.context)
@@ -91,3 +104,61 @@ class ExportFile(CountableDjangoObjectType):
     @staticmethod
     def resolve_events(root: models.ExportFile, _info):
         return root.events.all().order_by("pk")
+
+
+class ImportRowError(graphene.ObjectType):
+    row = graphene.Int(
+        description=(
+            "Number of the row in the imported file, the headers are in the first "
+            "row. Empty for the errors of the whole file."
+        )
+    )
+    field = graphene.String(description="Column of the row which caused the error.")
+    message = graphene.String(description="The error message.", required=True)
+    code = ImportErrorCode(description="The error code.", required=True)
+
+    class Meta:
+        description = "Represents an error in a row of the imported file."
+
+
+class ImportFile(CountableDjangoObjectType):
+    url = graphene.String(description="The URL of the imported file.")
+    total_rows = graphene.Int(
+        description="Number of the rows processed so far.", required=True
+    )
+    imported_rows = graphene.Int(
+        description="Number of the rows imported without errors.", required=True
+    )
+    errors = graphene.List(
+        graphene.NonNull(ImportRowError),
+        description="List of errors of the skipped rows.",
+        required=True,
+    )
+
+    class Meta:
+        description = "Represents a job data of imported file."
+        interfaces = [graphene.relay.Node, Job]
+        model = models.ImportFile
+        only_fields = ["id", "user", "app", "url", "total_rows", "imported_rows"]
+
+    @staticmethod
+    def resolve_url(root: models.ImportFile, info):
+        return info.context.build_absolute_uri(root.content_file.url)
+
+    @staticmethod
+    def resolve_errors(root: models.ImportFile, _info):
+        return [ImportRowError(**error) for error in root.errors]
+
+    @staticmethod
+    def resolve_user(root: models.ImportFile, info):
+        requestor = get_user_or_app_from_context(info.context)
+        if requestor_has_access(requestor, root.user, AccountPermissions.MANAGE_STAFF):
+            return root.user
+        raise PermissionDenied()
+
+    @staticmethod
+    def resolve_app(root: models.ImportFile, info):
+        requestor = get_user_or_app_from_context(info.context)
+        if requestor_has_access(requestor, root.user, AccountPermissions.MANAGE_STAFF):
+            return root.app
+        raise PermissionDenied()
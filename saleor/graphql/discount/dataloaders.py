@@ -2,7 +2,7 @@ from collections import defaultdict
 
 from django.db.models import F
 
-from ...discount import DiscountInfo
+from ...discount import DiscountInfo, DiscountsIndex
 from ...discount.models import Sale, SaleChannelListing, Voucher, VoucherChannelListing
 from ...discount.utils import (
     fetch_categories,
@@ -28,7 +28,7 @@ class DiscountsByDateTimeLoader(DataLoader):
         categories = fetch_categories(pks)
 
         return [
-            [
+            DiscountsIndex(
                 DiscountInfo(
                     sale=sale,
                     channel_listings=channel_listings[sale.pk],
@@ -37,7 +37,7 @@ class DiscountsByDateTimeLoader(DataLoader):
                     product_ids=products[sale.pk],
                 )
                 for sale in sales_map[datetime]
-            ]
+            )
             for datetime in keys
         ]
 
@@ -10,6 +10,7 @@ from ...core.utils.promo_code import generate_promo_code, is_available_promo_cod
 from ...discount import DiscountValueType, models
 from ...discount.error_codes import DiscountErrorCode
 from ...discount.models import SaleChannelListing
+from ...discount.utils import invalidate_discounts_cache
 from ...product.tasks import (
     update_products_discounted_prices_of_catalogues_task,
     update_products_discounted_prices_of_discount_task,
@@ -53,6 +54,7 @@ class BaseDiscountCatalogueMutation(BaseMutation):
 
     @classmethod
     def recalculate_discounted_prices(cls, products, categories, collections):
+        invalidate_discounts_cache()
         update_products_discounted_prices_of_catalogues_task.delay(
             product_ids=[p.pk for p in products],
             category_ids=[c.pk for c in categories],
@@ -460,6 +462,7 @@ class SaleUpdateDiscountedPriceMixin:
     def success_response(cls, instance):
         # Update the "discounted_prices" of the associated, discounted
         # products (including collections and categories).
+        invalidate_discounts_cache()
         update_products_discounted_prices_of_discount_task.delay(instance.pk)
         return super().success_response(
             ChannelContext(node=instance, channel_slug=None)
@@ -658,6 +661,7 @@ class SaleChannelListingUpdate(BaseChannelListingMutation):
             raise ValidationError(errors)
 
         cls.save(info, sale, cleaned_input)
+        invalidate_discounts_cache()
         return SaleChannelListingUpdate(
             sale=ChannelContext(node=sale, channel_slug=None)
         )
@@ -0,0 +1,70 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from graphql import GraphQLDocument
+
+
+def get_query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+class DocumentCache:
+    """Thread-safe LRU cache of parsed and validated GraphQL documents.
+
+    Documents are kept per schema and query hash, so only queries that passed
+    validation against the given schema should be stored. The size of the cache
+    is read from the `GRAPHQL_DOCUMENT_CACHE_SIZE` setting; `0` disables it.
+    """
+
+    def __init__(self):
+        self._documents: "OrderedDict[Tuple[Any, str], GraphQLDocument]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_size(self) -> int:
+        return settings.GRAPHQL_DOCUMENT_CACHE_SIZE
+
+    def get(self, schema, query_hash: str) -> Optional[GraphQLDocument]:
+        if not self.max_size:
+            return None
+        key = (schema, query_hash)
+        with self._lock:
+            document = self._documents.get(key)
+            if document is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._documents.move_to_end(key)
+        return document
+
+    def set(self, schema, query_hash: str, document: GraphQLDocument):
+        max_size = self.max_size
+        if not max_size:
+            return
+        with self._lock:
+            self._documents[(schema, query_hash)] = document
+            self._documents.move_to_end((schema, query_hash))
+            while len(self._documents) > max_size:
+                self._documents.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._documents),
+            "max_size": self.max_size,
+        }
+
+
+document_cache = DocumentCache()
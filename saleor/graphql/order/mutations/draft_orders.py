@@ -19,7 +19,7 @@ from ....order.utils import (
     recalculate_order,
     update_order_prices,
 )
-from ....warehouse.management import allocate_stock
+from ....warehouse.management import allocate_stocks
 from ...account.i18n import I18nMixin
 from ...account.types import AddressInput
 from ...channel.types import Channel
@@ -361,19 +361,22 @@ class DraftOrderComplete(BaseMutation):
 
         order.save()
 
-        for line in order:
-            if line.variant.track_inventory:
-                try:
-                    allocate_stock(line, country, line.quantity)
-                except InsufficientStock as exc:
-                    raise ValidationError(
-                        {
-                            "lines": ValidationError(
-                                f"Insufficient product stock: {exc.item}",
-                                code=OrderErrorCode.INSUFFICIENT_STOCK,
-                            )
-                        }
+        lines_to_allocate = [line for line in order if line.variant.track_inventory]
+        try:
+            allocate_stocks(
+                lines_to_allocate,
+                country,
+                [line.quantity for line in lines_to_allocate],
+            )
+        except InsufficientStock as exc:
+            raise ValidationError(
+                {
+                    "lines": ValidationError(
+                        f"Insufficient product stock: {exc.item}",
+                        code=OrderErrorCode.INSUFFICIENT_STOCK,
                     )
+                }
+            )
         order_created(order, user=info.context.user, from_draft=True)
 
         return DraftOrderComplete(order=order)
@@ -279,6 +279,7 @@ def test_page_create_mutation(staff_api_client, permission_manage_pages, page_ty
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
 def test_page_create_trigger_page_webhook(
     mocked_webhook_trigger,
+    any_event_webhook,
     staff_api_client,
     permission_manage_pages,
     page_type,
@@ -1042,7 +1043,12 @@ def test_page_delete_mutation(staff_api_client, page, permission_manage_pages):
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
 def test_page_delete_trigger_webhook(
-    mocked_webhook_trigger, staff_api_client, page, permission_manage_pages, settings
+    mocked_webhook_trigger,
+    any_event_webhook,
+    staff_api_client,
+    page,
+    permission_manage_pages,
+    settings,
 ):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     variables = {"id": graphene.Node.to_global_id("Page", page.id)}
@@ -1171,7 +1177,12 @@ def test_update_page(staff_api_client, permission_manage_pages, page):
 @freeze_time("2020-03-18 12:00:00")
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
 def test_update_page_trigger_webhook(
-    mocked_webhook_trigger, staff_api_client, permission_manage_pages, page, settings
+    mocked_webhook_trigger,
+    any_event_webhook,
+    staff_api_client,
+    permission_manage_pages,
+    page,
+    settings,
 ):
     query = UPDATE_PAGE_MUTATION
 
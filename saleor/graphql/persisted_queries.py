@@ -0,0 +1,47 @@
+from typing import Optional
+
+from django.core.cache import cache
+from graphql.error import GraphQLError
+
+PERSISTED_QUERY_CACHE_KEY = "persisted_query_{query_hash}"
+PERSISTED_QUERY_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+PERSISTED_QUERY_VERSION = 1
+
+
+class PersistedQueryNotFound(GraphQLError):
+    def __init__(self):
+        # Clients recognize the error by the message and retry with the full query
+        super().__init__("PersistedQueryNotFound")
+
+
+def get_persisted_query_hash(data: dict) -> Optional[str]:
+    """Return the query hash sent by the client using automatic persisted queries.
+
+    See https://github.com/apollographql/apollo-link-persisted-queries#protocol
+    """
+    extensions = data.get("extensions") or {}
+    if not isinstance(extensions, dict):
+        raise GraphQLError("Extensions must be an object.")
+    persisted_query = extensions.get("persistedQuery")
+    if not persisted_query:
+        return None
+    if not isinstance(persisted_query, dict):
+        raise GraphQLError("Persisted query must be an object.")
+    if persisted_query.get("version") != PERSISTED_QUERY_VERSION:
+        raise GraphQLError("Unsupported persisted query version.")
+    query_hash = persisted_query.get("sha256Hash")
+    if not query_hash or not isinstance(query_hash, str):
+        raise GraphQLError("Must provide a persisted query hash.")
+    return query_hash
+
+
+def get_persisted_query(query_hash: str) -> Optional[str]:
+    return cache.get(PERSISTED_QUERY_CACHE_KEY.format(query_hash=query_hash))
+
+
+def store_persisted_query(query_hash: str, query: str):
+    cache.set(
+        PERSISTED_QUERY_CACHE_KEY.format(query_hash=query_hash),
+        query,
+        timeout=PERSISTED_QUERY_CACHE_TIMEOUT,
+    )
@@ -10,10 +10,15 @@ from ....order import OrderStatus
 from ....order import models as order_models
 from ....product import models
 from ....product.error_codes import ProductErrorCode
+from ....product.search import (
+    update_product_search_vector,
+    update_products_search_vector,
+)
 from ....product.tasks import update_product_discounted_price_task
 from ....product.utils import delete_categories
 from ....product.utils.variants import generate_and_set_variant_name
 from ....warehouse import models as warehouse_models
+from ....warehouse.availability import invalidate_stock_availability
 from ....warehouse.error_codes import StockErrorCode
 from ...channel import ChannelContext
 from ...channel.types import Channel
@@ -434,6 +439,7 @@ class ProductVariantBulkCreate(BaseMutation):
         if not product.default_variant:
             product.default_variant = instances[0]
             product.save(update_fields=["default_variant", "updated_at"])
+        update_product_search_vector(product)
 
     @classmethod
     def create_variant_stocks(cls, variant, cleaned_input):
@@ -513,6 +519,8 @@ class ProductVariantBulkDelete(ModelBulkDeleteMutation):
             product.default_variant = product.variants.first()
             product.save(update_fields=["default_variant"])
 
+        update_products_search_vector(models.Product.objects.filter(pk__in=product_pks))
+
         return response
 
 
@@ -635,6 +643,7 @@ class ProductVariantStocksUpdate(ProductVariantStocksCreate):
             stock.quantity = stock_data["quantity"]
             stocks.append(stock)
         warehouse_models.Stock.objects.bulk_update(stocks, ["quantity"])
+        invalidate_stock_availability([variant.pk])
 
 
 class ProductVariantStocksDelete(BaseMutation):
@@ -668,6 +677,7 @@ class ProductVariantStocksDelete(BaseMutation):
         warehouse_models.Stock.objects.filter(
             product_variant=variant, warehouse__pk__in=warehouses_pks
         ).delete()
+        invalidate_stock_availability([variant.pk])
 
         variant = ChannelContext(node=variant, channel_slug=None)
         return cls(product_variant=variant)
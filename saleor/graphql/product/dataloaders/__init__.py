@@ -4,6 +4,10 @@ from .attributes import (
     SelectedAttributesByProductVariantIdLoader,
     VariantAttributesByProductTypeIdLoader,
 )
+from .pricing import (
+    PricingByProductIdAndChannelSlugLoader,
+    VariantPricingByVariantIdAndChannelSlugLoader,
+)
 from .products import (
     CategoryByIdLoader,
     CollectionByIdLoader,
@@ -40,6 +44,7 @@ __all__ = [
     "CollectionsByProductIdLoader",
     "CollectionsByVariantIdLoader",
     "ImagesByProductIdLoader",
+    "PricingByProductIdAndChannelSlugLoader",
     "ProductAttributesByProductTypeIdLoader",
     "ProductByIdLoader",
     "ProductByVariantIdLoader",
@@ -59,5 +64,6 @@ __all__ = [
     "VariantAttributesByProductTypeIdLoader",
     "VariantChannelListingByVariantIdAndChannelSlugLoader",
     "VariantChannelListingByVariantIdLoader",
+    "VariantPricingByVariantIdAndChannelSlugLoader",
     "VariantsChannelListingByProductIdAndChanneSlugLoader",
 ]
@@ -0,0 +1,170 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from promise import Promise
+
+from ....product.utils.availability import (
+    ProductAvailability,
+    ProductTaxes,
+    VariantAvailability,
+    get_product_availability_from_prices,
+    get_variant_availability_from_prices,
+    get_variants_prices,
+)
+from ...channel.dataloaders import ChannelBySlugLoader
+from ...core.dataloaders import DataLoader
+from ...discount.dataloaders import DiscountsByDateTimeLoader
+from .products import (
+    CollectionsByProductIdLoader,
+    ProductByIdLoader,
+    ProductByVariantIdLoader,
+    ProductChannelListingByProductIdAndChannelSlugLoader,
+    ProductIdAndChannelSlug,
+    ProductVariantsByProductIdLoader,
+    VariantIdAndChannelSlug,
+    VariantsChannelListingByProductIdAndChanneSlugLoader,
+)
+
+
+@dataclass
+class ProductPricing:
+    """Availability of a product and its variants in a channel."""
+
+    product: Optional[ProductAvailability] = None
+    variants: Dict[int, VariantAvailability] = field(default_factory=dict)
+
+
+class PricingByProductIdAndChannelSlugLoader(
+    DataLoader[ProductIdAndChannelSlug, ProductPricing]
+):
+    """Calculate prices of products and their variants for the whole batch at once.
+
+    The data is fetched with the same loaders as the other product fields, the
+    discounted price of every variant is calculated once and the taxes are
+    applied once for each distinct price of the product.
+    """
+
+    context_key = "pricing_by_product_and_channel"
+
+    def batch_load(self, keys):
+        context = self.context
+        product_ids = [product_id for product_id, _ in keys]
+        channel_slugs = [channel_slug for _, channel_slug in keys]
+        return Promise.all(
+            [
+                ProductByIdLoader(context).load_many(product_ids),
+                ProductChannelListingByProductIdAndChannelSlugLoader(context).load_many(
+                    keys
+                ),
+                ProductVariantsByProductIdLoader(context).load_many(product_ids),
+                VariantsChannelListingByProductIdAndChanneSlugLoader(context).load_many(
+                    keys
+                ),
+                CollectionsByProductIdLoader(context).load_many(product_ids),
+                ChannelBySlugLoader(context).load_many(channel_slugs),
+                DiscountsByDateTimeLoader(context).load(context.request_time),
+            ]
+        ).then(self.calculate_pricing)
+
+    def calculate_pricing(self, results):
+        (
+            products,
+            product_channel_listings,
+            variants,
+            variants_channel_listings,
+            collections,
+            channels,
+            discounts,
+        ) = results
+        context = self.context
+        taxes = ProductTaxes(context.plugins, context.country)
+        pricing = []
+        for data in zip(
+            products,
+            product_channel_listings,
+            variants,
+            variants_channel_listings,
+            collections,
+            channels,
+        ):
+            (
+                product,
+                product_channel_listing,
+                product_variants,
+                variants_channel_listing,
+                product_collections,
+                channel,
+            ) = data
+            if not product or not channel or not variants_channel_listing:
+                pricing.append(ProductPricing())
+                continue
+            prices = get_variants_prices(
+                product=product,
+                variants=product_variants,
+                variants_channel_listing=variants_channel_listing,
+                collections=product_collections,
+                discounts=discounts,
+                channel=channel,
+            )
+            product_availability = get_product_availability_from_prices(
+                product=product,
+                product_channel_listing=product_channel_listing,
+                prices=prices.values(),
+                taxes=taxes,
+                local_currency=context.currency,
+            )
+            variants_availability = {}
+            if product_channel_listing:
+                variants_availability = {
+                    variant_id: get_variant_availability_from_prices(
+                        product=product,
+                        product_channel_listing=product_channel_listing,
+                        undiscounted_price=undiscounted_price,
+                        discounted_price=discounted_price,
+                        taxes=taxes,
+                        local_currency=context.currency,
+                    )
+                    for variant_id, (undiscounted_price, discounted_price) in (
+                        prices.items()
+                    )
+                }
+            pricing.append(
+                ProductPricing(
+                    product=product_availability, variants=variants_availability
+                )
+            )
+        return pricing
+
+
+class VariantPricingByVariantIdAndChannelSlugLoader(
+    DataLoader[VariantIdAndChannelSlug, Optional[VariantAvailability]]
+):
+    """Return the variant prices calculated along with the prices of its product."""
+
+    context_key = "variant_pricing_by_variant_and_channel"
+
+    def batch_load(self, keys):
+        def with_products(products):
+            product_keys = [
+                (product.id if product else None, channel_slug)
+                for product, (_, channel_slug) in zip(products, keys)
+            ]
+
+            def with_pricing(products_pricing):
+                return [
+                    pricing.variants.get(variant_id)
+                    for pricing, (variant_id, _) in zip(products_pricing, keys)
+                ]
+
+            return (
+                PricingByProductIdAndChannelSlugLoader(self.context)
+                .load_many(product_keys)
+                .then(with_pricing)
+            )
+
+        variant_ids = [variant_id for variant_id, _ in keys]
+        return (
+            ProductByVariantIdLoader(self.context)
+            .load_many(variant_ids)
+            .then(with_products)
+        )
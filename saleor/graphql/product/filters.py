@@ -13,6 +13,7 @@ from ...attribute.models import (
     Attribute,
 )
 from ...product.models import Category, Collection, Product, ProductType, ProductVariant
+from ...product.search import search_products
 from ...warehouse.models import Stock
 from ..channel.filters import get_channel_slug_from_filter_data
 from ..core.filters import EnumFilter, ListObjectTypeFilter, ObjectTypeFilter
@@ -211,20 +212,19 @@ def filter_stock_availability(qs, _, value):
 def product_search(phrase):
     """Return matching products for storefront views.
 
-        Name and description is matched using search vector.
+        Name, description, SKUs, attribute values and translations are matched
+        using the search vector.
 
     Args:
         phrase (str): searched phrase
 
     """
-    ft_in_description_or_name = Q(search_vector=phrase)
-    ft_by_sku = Q(variants__sku__search=phrase)
-    return Product.objects.filter((ft_in_description_or_name | ft_by_sku))
+    return search_products(Product.objects.all(), phrase)
 
 
 def filter_search(qs, _, value):
     if value:
-        qs = qs.distinct() & product_search(value).distinct()
+        qs = search_products(qs, value)
     return qs
 
 
@@ -13,10 +13,12 @@ from ....attribute import models as attribute_models
 from ....core.exceptions import PermissionDenied
 from ....core.permissions import ProductPermissions, ProductTypePermissions
 from ....core.utils.editorjs import clean_editor_js
+from ....discount.utils import invalidate_discounts_cache
 from ....order import OrderStatus
 from ....order import models as order_models
 from ....product import models
 from ....product.error_codes import CollectionErrorCode, ProductErrorCode
+from ....product.search import update_product_search_vector
 from ....product.tasks import (
     update_product_discounted_price_task,
     update_products_discounted_prices_of_catalogues_task,
@@ -120,6 +122,9 @@ class CategoryCreate(ModelMutation):
     @classmethod
     def save(cls, info, instance, cleaned_input):
         instance.save()
+        if instance.parent_id:
+            # Sales applied to the parent category cover its new subcategory
+            invalidate_discounts_cache()
         if cleaned_input.get("background_image"):
             create_category_background_image_thumbnails.delay(instance.pk)
 
@@ -610,6 +615,7 @@ class ProductCreate(ModelMutation):
         attributes = cleaned_input.get("attributes")
         if attributes:
             AttributeAssignmentMixin.save(instance, attributes)
+        update_product_search_vector(instance)
 
     @classmethod
     def _save_m2m(cls, info, instance, cleaned_data):
@@ -656,6 +662,7 @@ class ProductUpdate(ProductCreate):
         attributes = cleaned_input.get("attributes")
         if attributes:
             AttributeAssignmentMixin.save(instance, attributes)
+        update_product_search_vector(instance)
 
     @classmethod
     def post_save_action(cls, info, instance, cleaned_input):
@@ -891,6 +898,7 @@ class ProductVariantCreate(ModelMutation):
         if attributes:
             AttributeAssignmentMixin.save(instance, attributes)
             generate_and_set_variant_name(instance, cleaned_input.get("sku"))
+        update_product_search_vector(instance.product)
         info.context.plugins.product_updated(instance.product)
 
     @classmethod
@@ -973,6 +981,7 @@ class ProductVariantDelete(ModelDeleteMutation):
         if not product.default_variant:
             product.default_variant = product.variants.first()
             product.save(update_fields=["default_variant"])
+        update_product_search_vector(product)
         instance = ChannelContext(node=instance, channel_slug=None)
         return super().success_response(instance)
 
@@ -14,6 +14,7 @@ from django.db.models import (
 )
 from django.db.models.expressions import Window
 from django.db.models.functions import Coalesce, DenseRank
+from graphql.error import GraphQLError
 
 from ...product.models import (
     Category,
@@ -133,6 +134,7 @@ class ProductOrderField(graphene.Enum):
     PUBLICATION_DATE = ["publication_date", "name", "slug"]
     COLLECTION = ["sort_order"]
     RATING = ["rating", "name", "slug"]
+    RANK = ["search_rank", "name", "slug"]
 
     @property
     def description(self):
@@ -152,6 +154,10 @@ class ProductOrderField(graphene.Enum):
             ProductOrderField.PUBLISHED.name: "publication status.",
             ProductOrderField.PUBLICATION_DATE.name: "publication date.",
             ProductOrderField.RATING.name: "rating.",
+            ProductOrderField.RANK.name: (
+                "rank of the search results. Note: "
+                "This option is available only with the `search` filter."
+            ),
         }
         if self.name in descriptions:
             return f"Sort products by {descriptions[self.name]}"
@@ -201,6 +207,14 @@ class ProductOrderField(graphene.Enum):
             publication_date=ExpressionWrapper(subquery, output_field=DateField())
         )
 
+    @staticmethod
+    def qs_with_rank(queryset: QuerySet, **_kwargs) -> QuerySet:
+        if "search_rank" not in queryset.query.annotations:
+            raise GraphQLError(
+                "Sorting by RANK is available only when using a search filter."
+            )
+        return queryset
+
     @staticmethod
     def qs_with_collection(queryset: QuerySet, **_kwargs) -> QuerySet:
         return queryset.annotate(
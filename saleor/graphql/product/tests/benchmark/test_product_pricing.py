@@ -0,0 +1,68 @@
+import pytest
+
+from ....tests.utils import get_graphql_content
+
+PRODUCTS_PRICING_QUERY = """
+    fragment Price on TaxedMoney {
+      gross {
+        amount
+        currency
+      }
+      net {
+        amount
+      }
+    }
+
+    query ProductsPricing($channel: String) {
+      products(first: 10, channel: $channel) {
+        edges {
+          node {
+            id
+            pricing {
+              onSale
+              discount {
+                ...Price
+              }
+              priceRange {
+                start {
+                  ...Price
+                }
+                stop {
+                  ...Price
+                }
+              }
+              priceRangeUndiscounted {
+                start {
+                  ...Price
+                }
+              }
+            }
+            variants {
+              id
+              pricing {
+                onSale
+                price {
+                  ...Price
+                }
+                priceUndiscounted {
+                  ...Price
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+"""
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_retrieve_products_pricing(
+    product_list, sale, api_client, count_queries, channel_USD
+):
+    variables = {"channel": channel_USD.slug}
+    content = get_graphql_content(
+        api_client.post_graphql(PRODUCTS_PRICING_QUERY, variables)
+    )
+    assert len(content["data"]["products"]["edges"]) == len(product_list)
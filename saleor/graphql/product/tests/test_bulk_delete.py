@@ -252,6 +252,7 @@ def test_delete_products(
 @patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
 def test_delete_products_trigger_webhook(
     mocked_webhook_trigger,
+    any_event_webhook,
     staff_api_client,
     product_list,
     permission_manage_products,
@@ -33,6 +33,7 @@ from ....product.models import (
     ProductVariant,
     ProductVariantChannelListing,
 )
+from ....product.search import update_products_search_vector
 from ....product.tasks import update_variants_names
 from ....product.tests.utils import create_image, create_pdf_file_with_image_ext
 from ....product.utils.costs import get_product_costs_data
@@ -42,6 +43,7 @@ from ....webhook.event_types import WebhookEventType
 from ....webhook.payloads import generate_product_deleted_payload
 from ...core.enums import AttributeErrorCode, ReportingPeriod
 from ...tests.utils import (
+    assert_graphql_error_with_message,
     assert_no_permission,
     get_graphql_content,
     get_graphql_content_from_response,
@@ -49,6 +51,7 @@ from ...tests.utils import (
 )
 from ..bulk_mutations.products import ProductVariantStocksUpdate
 from ..enums import VariantAttributeScope
+from ..filters import product_search
 from ..utils import create_stocks
 
 
@@ -1630,6 +1633,7 @@ def test_products_query_with_filter_category_and_search(
     product.category = category
     second_product.save()
     product.save()
+    update_products_search_vector(Product.objects.all())
 
     category_id = graphene.Node.to_global_id("Category", category.id)
     variables = {"filter": {"categories": [category_id], "search": product.name}}
@@ -1712,6 +1716,7 @@ def test_products_query_with_filter(
         channel=channel_USD,
         is_published=True,
     )
+    update_products_search_vector(Product.objects.all())
     variables = {"filter": {"search": "Juice1"}, "channel": channel_USD.slug}
     staff_api_client.user.user_permissions.add(permission_manage_products)
     response = staff_api_client.post_graphql(query_products_with_filter, variables)
@@ -1737,6 +1742,7 @@ def test_products_query_with_filter_search_by_sku(
     ProductChannelListing.objects.filter(
         product=product_with_default_variant, channel=channel_USD
     ).update(is_published=is_published)
+    update_products_search_vector(Product.objects.all())
     variables = {"filter": {"search": "1234"}}
     staff_api_client.user.user_permissions.add(permission_manage_products)
     response = staff_api_client.post_graphql(query_products_with_filter, variables)
@@ -2181,6 +2187,48 @@ def test_sort_products_product_type_name(
     assert product_type_name_0 < product_type_name_1
 
 
+SEARCH_AND_SORT_PRODUCTS_QUERY = """
+    query ($filter: ProductFilterInput, $sortBy: ProductOrder) {
+        products(first: 10, filter: $filter, sortBy: $sortBy) {
+            edges {
+                node {
+                    name
+                }
+            }
+        }
+    }
+"""
+
+
+def test_sort_products_by_rank(staff_api_client, product_list):
+    product_by_name, product_by_description, _ = product_list
+    product_by_name.name = "Coffee mug"
+    product_by_name.save(update_fields=["name"])
+    product_by_description.description_plaintext = "Perfect for coffee"
+    product_by_description.save(update_fields=["description_plaintext"])
+    update_products_search_vector(Product.objects.all())
+
+    variables = {
+        "filter": {"search": "coffee"},
+        "sortBy": {"field": "RANK", "direction": "DESC"},
+    }
+    response = staff_api_client.post_graphql(SEARCH_AND_SORT_PRODUCTS_QUERY, variables)
+    content = get_graphql_content(response)
+    edges = content["data"]["products"]["edges"]
+    assert [edge["node"]["name"] for edge in edges] == [
+        product_by_name.name,
+        product_by_description.name,
+    ]
+
+
+def test_sort_products_by_rank_without_search(staff_api_client, product_list):
+    variables = {"sortBy": {"field": "RANK", "direction": "DESC"}}
+    response = staff_api_client.post_graphql(SEARCH_AND_SORT_PRODUCTS_QUERY, variables)
+    assert_graphql_error_with_message(
+        response, "Sorting by RANK is available only when using a search filter."
+    )
+
+
 QUERY_PRODUCT_TYPE = """
     query ($id: ID!){
         productType(
@@ -2404,6 +2452,7 @@ def test_create_product_description_plaintext(
 
 
 def test_search_product_by_description(user_api_client, product_list, channel_USD):
+    update_products_search_vector(Product.objects.all())
     search_query = """
     query Products($filters: ProductFilterInput, $channel: String) {
       products(first: 5, filter: $filters, channel: $channel) {
@@ -3796,6 +3845,8 @@ def test_update_and_search_product_by_description(
     assert data["product"]["slug"] == product_slug
     assert data["product"]["description"] == other_description_json
 
+    assert list(product_search(product_name)) == [product]
+
 
 def test_update_product_without_description_clear_description_plaintext(
     staff_api_client,
@@ -4911,6 +4962,7 @@ def test_delete_product(staff_api_client, product, permission_manage_products):
 @patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
 def test_delete_product_trigger_webhook(
     mocked_webhook_trigger,
+    any_event_webhook,
     staff_api_client,
     product,
     permission_manage_products,
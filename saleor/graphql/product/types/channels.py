@@ -2,12 +2,9 @@ from dataclasses import asdict
 
 import graphene
 
-from saleor.graphql.product.dataloaders.products import ProductByIdLoader
-
 from ....core.permissions import ProductPermissions
 from ....graphql.core.types import Money, MoneyRange
 from ....product import models
-from ....product.utils.availability import get_product_availability
 from ....product.utils.costs import (
     get_margin_for_variant_channel_listing,
     get_product_costs_data,
@@ -15,12 +12,10 @@ from ....product.utils.costs import (
 from ...channel.dataloaders import ChannelByIdLoader
 from ...core.connection import CountableDjangoObjectType
 from ...decorators import permission_required
-from ...discount.dataloaders import DiscountsByDateTimeLoader
 from ..dataloaders import (
-    CollectionsByProductIdLoader,
+    PricingByProductIdAndChannelSlugLoader,
     ProductVariantsByProductIdLoader,
     VariantChannelListingByVariantIdAndChannelSlugLoader,
-    VariantsChannelListingByProductIdAndChanneSlugLoader,
 )
 
 
@@ -143,71 +138,21 @@ class ProductChannelListing(CountableDjangoObjectType):
 
     @staticmethod
     def resolve_pricing(root: models.ProductChannelListing, info):
-        context = info.context
-
-        def calculate_pricing_info(discounts):
-            def calculate_pricing_with_channel(channel):
-                def calculate_pricing_with_product(product):
-                    def calculate_pricing_with_variants(variants):
-                        def calculate_pricing_with_variants_channel_listings(
-                            variants_channel_listing,
-                        ):
-                            def calculate_pricing_with_collections(collections):
-                                if not variants_channel_listing:
-                                    return None
-                                availability = get_product_availability(
-                                    product=product,
-                                    product_channel_listing=root,
-                                    variants=variants,
-                                    variants_channel_listing=variants_channel_listing,
-                                    collections=collections,
-                                    discounts=discounts,
-                                    channel=channel,
-                                    country=context.country,
-                                    local_currency=context.currency,
-                                    plugins=context.plugins,
-                                )
-                                from .products import ProductPricingInfo
-
-                                return ProductPricingInfo(**asdict(availability))
-
-                            return (
-                                CollectionsByProductIdLoader(context)
-                                .load(root.product_id)
-                                .then(calculate_pricing_with_collections)
-                            )
-
-                        return (
-                            VariantsChannelListingByProductIdAndChanneSlugLoader(
-                                context
-                            )
-                            .load((root.product_id, channel.slug))
-                            .then(calculate_pricing_with_variants_channel_listings)
-                        )
-
-                    return (
-                        ProductVariantsByProductIdLoader(context)
-                        .load(root.product_id)
-                        .then(calculate_pricing_with_variants)
-                    )
+        def calculate_pricing_info(pricing):
+            if pricing.product is None:
+                return None
+            from .products import ProductPricingInfo
 
-                return (
-                    ProductByIdLoader(context)
-                    .load(root.product_id)
-                    .then(calculate_pricing_with_product)
-                )
+            return ProductPricingInfo(**asdict(pricing.product))
 
+        def load_pricing(channel):
             return (
-                ChannelByIdLoader(context)
-                .load(root.channel_id)
-                .then(calculate_pricing_with_channel)
+                PricingByProductIdAndChannelSlugLoader(info.context)
+                .load((root.product_id, channel.slug))
+                .then(calculate_pricing_info)
             )
 
-        return (
-            DiscountsByDateTimeLoader(context)
-            .load(info.context.request_time)
-            .then(calculate_pricing_info)
-        )
+        return ChannelByIdLoader(info.context).load(root.channel_id).then(load_pricing)
 
 
 class ProductVariantChannelListing(CountableDjangoObjectType):
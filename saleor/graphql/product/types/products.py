@@ -6,6 +6,7 @@ from django.conf import settings
 from graphene import relay
 from graphene_federation import key
 from graphql.error import GraphQLError
+from promise import Promise
 
 from ....account.utils import requestor_is_staff_member_or_app
 from ....attribute import models as attribute_models
@@ -17,12 +18,7 @@ from ....product.templatetags.product_images import (
     get_thumbnail,
 )
 from ....product.utils import calculate_revenue_for_variant
-from ....product.utils.availability import (
-    get_product_availability,
-    get_variant_availability,
-)
 from ....product.utils.variants import get_variant_selection_attributes
-from ....warehouse.availability import is_product_in_stock
 from ...account.enums import CountryCodeEnum
 from ...attribute.filters import AttributeFilterInput
 from ...attribute.resolvers import resolve_attributes
@@ -44,7 +40,6 @@ from ...decorators import (
     permission_required,
     staff_member_or_app_required,
 )
-from ...discount.dataloaders import DiscountsByDateTimeLoader
 from ...meta.types import ObjectWithMetadata
 from ...order.dataloaders import (
     OrderByIdLoader,
@@ -70,6 +65,7 @@ from ..dataloaders import (
     CollectionsByProductIdLoader,
     ImagesByProductIdLoader,
     ImagesByProductVariantIdLoader,
+    PricingByProductIdAndChannelSlugLoader,
     ProductAttributesByProductTypeIdLoader,
     ProductByIdLoader,
     ProductChannelListingByProductIdAndChannelSlugLoader,
@@ -80,9 +76,8 @@ from ..dataloaders import (
     SelectedAttributesByProductIdLoader,
     SelectedAttributesByProductVariantIdLoader,
     VariantAttributesByProductTypeIdLoader,
-    VariantChannelListingByVariantIdAndChannelSlugLoader,
     VariantChannelListingByVariantIdLoader,
-    VariantsChannelListingByProductIdAndChanneSlugLoader,
+    VariantPricingByVariantIdAndChannelSlugLoader,
 )
 from ..enums import VariantAttributeScope
 from ..filters import ProductFilterInput
@@ -297,64 +292,14 @@ class ProductVariant(ChannelContextTypeWithMetadata, CountableDjangoObjectType):
         if not root.channel_slug:
             return None
 
-        channel_slug = str(root.channel_slug)
-        context = info.context
-        product = ProductByIdLoader(context).load(root.node.product_id)
-        product_channel_listing = ProductChannelListingByProductIdAndChannelSlugLoader(
-            context
-        ).load((root.node.product_id, channel_slug))
-        variant_channel_listing = VariantChannelListingByVariantIdAndChannelSlugLoader(
-            context
-        ).load((root.node.id, channel_slug))
-        collections = CollectionsByProductIdLoader(context).load(root.node.product_id)
-        channel = ChannelBySlugLoader(context).load(channel_slug)
-
-        def calculate_pricing_info(discounts):
-            def calculate_pricing_with_channel(channel):
-                def calculate_pricing_with_product_variant_channel_listings(
-                    variant_channel_listing,
-                ):
-                    def calculate_pricing_with_product(product):
-                        def calculate_pricing_with_product_channel_listings(
-                            product_channel_listing,
-                        ):
-                            def calculate_pricing_with_collections(collections):
-                                if (
-                                    not variant_channel_listing
-                                    or not product_channel_listing
-                                ):
-                                    return None
-                                availability = get_variant_availability(
-                                    variant=root.node,
-                                    variant_channel_listing=variant_channel_listing,
-                                    product=product,
-                                    product_channel_listing=product_channel_listing,
-                                    collections=collections,
-                                    discounts=discounts,
-                                    channel=channel,
-                                    country=context.country,
-                                    local_currency=context.currency,
-                                    plugins=context.plugins,
-                                )
-                                return VariantPricingInfo(**asdict(availability))
-
-                            return collections.then(calculate_pricing_with_collections)
-
-                        return product_channel_listing.then(
-                            calculate_pricing_with_product_channel_listings
-                        )
-
-                    return product.then(calculate_pricing_with_product)
-
-                return variant_channel_listing.then(
-                    calculate_pricing_with_product_variant_channel_listings
-                )
-
-            return channel.then(calculate_pricing_with_channel)
+        def calculate_pricing_info(availability):
+            if availability is None:
+                return None
+            return VariantPricingInfo(**asdict(availability))
 
         return (
-            DiscountsByDateTimeLoader(context)
-            .load(info.context.request_time)
+            VariantPricingByVariantIdAndChannelSlugLoader(info.context)
+            .load((root.node.id, str(root.channel_slug)))
             .then(calculate_pricing_info)
         )
 
@@ -571,61 +516,14 @@ class Product(ChannelContextTypeWithMetadata, CountableDjangoObjectType):
         if not root.channel_slug:
             return None
 
-        context = info.context
-        channel_slug = str(root.channel_slug)
-        product_channel_listing = ProductChannelListingByProductIdAndChannelSlugLoader(
-            context
-        ).load((root.node.id, channel_slug))
-        variants = ProductVariantsByProductIdLoader(context).load(root.node.id)
-        variants_channel_listing = VariantsChannelListingByProductIdAndChanneSlugLoader(
-            context
-        ).load((root.node.id, channel_slug))
-        collections = CollectionsByProductIdLoader(context).load(root.node.id)
-        channel = ChannelBySlugLoader(context).load(channel_slug)
-
-        def calculate_pricing_info(discounts):
-            def calculate_pricing_with_channel(channel):
-                def calculate_pricing_with_product_channel_listings(
-                    product_channel_listing,
-                ):
-                    def calculate_pricing_with_variants(variants):
-                        def calculate_pricing_with_variants_channel_listings(
-                            variants_channel_listing,
-                        ):
-                            def calculate_pricing_with_collections(collections):
-                                if not variants_channel_listing:
-                                    return None
-                                availability = get_product_availability(
-                                    product=root.node,
-                                    product_channel_listing=product_channel_listing,
-                                    variants=variants,
-                                    variants_channel_listing=variants_channel_listing,
-                                    collections=collections,
-                                    discounts=discounts,
-                                    channel=channel,
-                                    country=context.country,
-                                    local_currency=context.currency,
-                                    plugins=context.plugins,
-                                )
-                                return ProductPricingInfo(**asdict(availability))
-
-                            return collections.then(calculate_pricing_with_collections)
-
-                        return variants_channel_listing.then(
-                            calculate_pricing_with_variants_channel_listings
-                        )
-
-                    return variants.then(calculate_pricing_with_variants)
-
-                return product_channel_listing.then(
-                    calculate_pricing_with_product_channel_listings
-                )
-
-            return channel.then(calculate_pricing_with_channel)
+        def calculate_pricing_info(pricing):
+            if pricing.product is None:
+                return None
+            return ProductPricingInfo(**asdict(pricing.product))
 
         return (
-            DiscountsByDateTimeLoader(context)
-            .load(info.context.request_time)
+            PricingByProductIdAndChannelSlugLoader(info.context)
+            .load((root.node.id, str(root.channel_slug)))
             .then(calculate_pricing_info)
         )
 
@@ -634,19 +532,31 @@ class Product(ChannelContextTypeWithMetadata, CountableDjangoObjectType):
         if not root.channel_slug:
             return None
         channel_slug = str(root.channel_slug)
+        country = info.context.country
 
-        def calculate_is_available(product_channel_listing):
-            country = info.context.country
-            in_stock = is_product_in_stock(root.node, country)
+        def calculate_is_available(results):
+            product_channel_listing, quantities = results
+            in_stock = any(quantities)
             is_visible = False
             if product_channel_listing:
                 is_visible = product_channel_listing.is_available_for_purchase()
             return is_visible and in_stock
 
-        return (
-            ProductChannelListingByProductIdAndChannelSlugLoader(info.context)
-            .load((root.node.id, channel_slug))
-            .then(calculate_is_available)
+        def load_available_quantities(variants):
+            return AvailableQuantityByProductVariantIdAndCountryCodeLoader(
+                info.context
+            ).load_many([(variant.id, country) for variant in variants])
+
+        product_channel_listing = ProductChannelListingByProductIdAndChannelSlugLoader(
+            info.context
+        ).load((root.node.id, channel_slug))
+        quantities = (
+            ProductVariantsByProductIdLoader(info.context)
+            .load(root.node.id)
+            .then(load_available_quantities)
+        )
+        return Promise.all([product_channel_listing, quantities]).then(
+            calculate_is_available
         )
 
     @staticmethod
@@ -6,6 +6,7 @@ from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.db.utils import IntegrityError
 
+from ...warehouse.availability import invalidate_stock_availability
 from ...warehouse.models import Stock
 
 if TYPE_CHECKING:
@@ -78,3 +79,4 @@ def create_stocks(
     except IntegrityError:
         msg = "Stock for one of warehouses already exists for this product variant."
         raise ValidationError(msg)
+    invalidate_stock_availability([variant.pk])
@@ -0,0 +1,147 @@
+from typing import Any, Dict, Optional
+
+from graphene_django.settings import graphene_settings
+from graphql import GraphQLSchema
+from graphql.error import GraphQLError
+from graphql.language import ast
+from graphql.type.definition import get_named_type
+from graphql.utils.get_operation_ast import get_operation_ast
+
+# Costs of fields that are more expensive to resolve than a regular object field,
+# in the "TypeName.fieldName" format. Fields returning objects cost 1 by default
+# and scalar fields are free. The cost of fields selected on a connection is
+# multiplied by the requested number of items (`first` or `last`).
+FIELD_COSTS: Dict[str, int] = {
+    "Product.pricing": 5,
+    "Product.isAvailable": 2,
+    "ProductVariant.pricing": 5,
+    "ProductVariant.quantityAvailable": 2,
+    "ProductVariant.revenue": 10,
+    "ProductVariant.stocks": 2,
+}
+
+
+class QueryCostError(GraphQLError):
+    pass
+
+
+class QueryCostCalculator:
+    """Calculate the cost of a GraphQL operation based on its AST.
+
+    The cost is an upper bound of the work needed to resolve the operation:
+    every field with a selection set costs 1 (or its `FIELD_COSTS` value)
+    and the cost of the fields nested in a connection is multiplied by
+    the number of requested items.
+    """
+
+    def __init__(
+        self,
+        schema: GraphQLSchema,
+        document_ast: ast.Document,
+        variables: Optional[Dict[str, Any]] = None,
+        field_costs: Optional[Dict[str, int]] = None,
+    ):
+        self.schema = schema
+        self.document_ast = document_ast
+        self.variables = variables if isinstance(variables, dict) else {}
+        self.field_costs = FIELD_COSTS if field_costs is None else field_costs
+        self.fragments = {
+            definition.name.value: definition
+            for definition in document_ast.definitions
+            if isinstance(definition, ast.FragmentDefinition)
+        }
+        # Fragments can be spread many times, also in other fragments, so their
+        # costs are calculated once to keep the calculation linear
+        self.fragment_costs: Dict[str, int] = {}
+
+    def calculate(self, operation_name: Optional[str] = None) -> int:
+        operation = get_operation_ast(self.document_ast, operation_name)
+        if operation is None:
+            return 0
+        if operation.operation == "mutation":
+            root_type = self.schema.get_mutation_type()
+        elif operation.operation == "subscription":
+            root_type = self.schema.get_subscription_type()
+        else:
+            root_type = self.schema.get_query_type()
+        return self.get_selection_set_cost(root_type, operation.selection_set)
+
+    def get_selection_set_cost(self, parent_type, selection_set) -> int:
+        cost = 0
+        for selection in selection_set.selections:
+            if isinstance(selection, ast.Field):
+                cost += self.get_field_cost(parent_type, selection)
+            elif isinstance(selection, ast.InlineFragment):
+                fragment_type = parent_type
+                if selection.type_condition:
+                    type_name = selection.type_condition.name.value
+                    fragment_type = self.schema.get_type(type_name)
+                cost += self.get_selection_set_cost(
+                    fragment_type, selection.selection_set
+                )
+            elif isinstance(selection, ast.FragmentSpread):
+                cost += self.get_fragment_cost(selection.name.value)
+        return cost
+
+    def get_fragment_cost(self, fragment_name: str) -> int:
+        if fragment_name not in self.fragment_costs:
+            fragment = self.fragments[fragment_name]
+            fragment_type = self.schema.get_type(fragment.type_condition.name.value)
+            self.fragment_costs[fragment_name] = self.get_selection_set_cost(
+                fragment_type, fragment.selection_set
+            )
+        return self.fragment_costs[fragment_name]
+
+    def get_field_cost(self, parent_type, field: ast.Field) -> int:
+        field_name = field.name.value
+        field_def = getattr(parent_type, "fields", {}).get(field_name)
+        if field_def is None:
+            # Introspection fields are not a part of the type definition
+            return 0
+
+        default_cost = 1 if field.selection_set else 0
+        cost = self.field_costs.get(f"{parent_type.name}.{field_name}", default_cost)
+        if field.selection_set:
+            children_cost = self.get_selection_set_cost(
+                get_named_type(field_def.type), field.selection_set
+            )
+            cost += self.get_items_count(field, field_def) * children_cost
+        return cost
+
+    def get_items_count(self, field: ast.Field, field_def) -> int:
+        if "first" not in field_def.args and "last" not in field_def.args:
+            return 1
+        arguments = {
+            argument.name.value: argument.value for argument in field.arguments
+        }
+        counts = [
+            self.get_argument_value(arguments[name])
+            for name in ("first", "last")
+            if name in arguments
+        ]
+        counts = [count for count in counts if count is not None]
+        if not counts:
+            return graphene_settings.RELAY_CONNECTION_MAX_LIMIT
+        return max(counts)
+
+    def get_argument_value(self, value) -> Optional[int]:
+        if isinstance(value, ast.Variable):
+            value = self.variables.get(value.name.value)
+        elif isinstance(value, ast.IntValue):
+            value = value.value
+        else:
+            return None
+        try:
+            return max(int(value), 0)
+        except (TypeError, ValueError):
+            return None
+
+
+def calculate_query_cost(
+    schema: GraphQLSchema,
+    document_ast: ast.Document,
+    operation_name: Optional[str] = None,
+    variables: Optional[Dict[str, Any]] = None,
+) -> int:
+    calculator = QueryCostCalculator(schema, document_ast, variables)
+    return calculator.calculate(operation_name)
@@ -2,6 +2,8 @@ import graphene
 
 from ...core.permissions import ShippingPermissions
 from ...shipping import models
+from ...shipping.rules import invalidate_shipping_rules
+from ...warehouse.availability import invalidate_stock_availability
 from ..core.mutations import ModelBulkDeleteMutation
 from ..core.types.common import ShippingError
 
@@ -21,6 +23,12 @@ class ShippingZoneBulkDelete(ModelBulkDeleteMutation):
         error_type_class = ShippingError
         error_type_field = "shipping_errors"
 
+    @classmethod
+    def bulk_action(cls, queryset):
+        super().bulk_action(queryset)
+        invalidate_stock_availability()
+        invalidate_shipping_rules()
+
 
 class ShippingPriceBulkDelete(ModelBulkDeleteMutation):
     class Arguments:
@@ -36,3 +44,8 @@ class ShippingPriceBulkDelete(ModelBulkDeleteMutation):
         permissions = (ShippingPermissions.MANAGE_SHIPPING,)
         error_type_class = ShippingError
         error_type_field = "shipping_errors"
+
+    @classmethod
+    def bulk_action(cls, queryset):
+        super().bulk_action(queryset)
+        invalidate_shipping_rules()
@@ -8,6 +8,7 @@ from django.db import transaction
 from ....core.permissions import ShippingPermissions
 from ....shipping.error_codes import ShippingErrorCode
 from ....shipping.models import ShippingMethodChannelListing
+from ....shipping.rules import invalidate_shipping_rules
 from ...channel import ChannelContext
 from ...channel.mutations import BaseChannelListingMutation
 from ...core.scalars import PositiveDecimal
@@ -105,6 +106,7 @@ class ShippingMethodChannelListingUpdate(BaseChannelListingMutation):
     def save(cls, info, shipping_method: "ShippingMethodModel", cleaned_input: Dict):
         cls.add_channels(shipping_method, cleaned_input.get("add_channels", []))
         cls.remove_channels(shipping_method, cleaned_input.get("remove_channels", []))
+        invalidate_shipping_rules()
 
     @classmethod
     def get_shipping_method_channel_listing_to_create(
@@ -7,10 +7,12 @@ from ....core.permissions import ShippingPermissions
 from ....product import models as product_models
 from ....shipping import models
 from ....shipping.error_codes import ShippingErrorCode
+from ....shipping.rules import invalidate_shipping_rules
 from ....shipping.utils import (
     default_shipping_zone_exists,
     get_countries_without_shipping_zone,
 )
+from ....warehouse.availability import invalidate_stock_availability
 from ...channel.types import ChannelContext
 from ...core.mutations import BaseMutation, ModelDeleteMutation, ModelMutation
 from ...core.scalars import WeightScalar
@@ -127,6 +129,12 @@ class ShippingZoneMixin:
         if remove_warehouses:
             instance.warehouses.remove(*remove_warehouses)
 
+    @classmethod
+    def post_save_action(cls, info, instance, cleaned_input):
+        # Countries and warehouses of the zone decide where the stocks are available
+        invalidate_stock_availability()
+        invalidate_shipping_rules()
+
 
 class ShippingZoneCreate(ShippingZoneMixin, ModelMutation):
     class Arguments:
@@ -233,6 +241,7 @@ class ShippingZipCodeRulesCreate(BaseMutation):
                         }
                     )
                 instances.append(instance)
+        invalidate_shipping_rules()
         return ShippingZipCodeRulesCreate(
             zip_code_rules=instances,
             shipping_method=ChannelContext(node=shipping_method, channel_slug=None),
@@ -261,6 +270,7 @@ class ShippingZipCodeRulesDelete(ModelDeleteMutation):
         instance = cls.get_instance(info, **data)
         shipping_method = instance.shipping_method
         super().perform_mutation(_root, info, **data)
+        invalidate_shipping_rules()
         return ShippingZipCodeRulesDelete(
             shipping_method=ChannelContext(node=shipping_method, channel_slug=None)
         )
@@ -277,6 +287,13 @@ class ShippingZoneDelete(ModelDeleteMutation):
         error_type_class = ShippingError
         error_type_field = "shipping_errors"
 
+    @classmethod
+    def perform_mutation(cls, _root, info, **data):
+        response = super().perform_mutation(_root, info, **data)
+        invalidate_stock_availability()
+        invalidate_shipping_rules()
+        return response
+
     @classmethod
     def success_response(cls, instance):
         instance = ChannelContext(node=instance, channel_slug=None)
@@ -391,6 +408,10 @@ class ShippingPriceMixin:
                 error_msg, code=ShippingErrorCode.INVALID.value
             )
 
+    @classmethod
+    def post_save_action(cls, info, instance, cleaned_input):
+        invalidate_shipping_rules()
+
 
 class ShippingPriceCreate(ShippingPriceMixin, ModelMutation):
     shipping_zone = graphene.Field(
@@ -482,6 +503,7 @@ class ShippingPriceDelete(BaseMutation):
         shipping_method_id = shipping_method.id
         shipping_zone = shipping_method.shipping_zone
         shipping_method.delete()
+        invalidate_shipping_rules()
         shipping_method.id = shipping_method_id
         return ShippingPriceDelete(
             shipping_method=ChannelContext(node=shipping_method, channel_slug=None),
@@ -536,6 +558,7 @@ class ShippingPriceExcludeProducts(BaseMutation):
         shipping_method.excluded_products.set(
             (current_excluded_products | product_to_exclude).distinct()
         )
+        invalidate_shipping_rules()
         return ShippingPriceExcludeProducts(
             shipping_method=ChannelContext(node=shipping_method, channel_slug=None)
         )
@@ -574,6 +597,7 @@ class ShippingPriceRemoveProductFromExclude(BaseMutation):
             shipping_method.excluded_products.set(
                 shipping_method.excluded_products.exclude(id__in=product_db_ids)
             )
+            invalidate_shipping_rules()
         return ShippingPriceExcludeProducts(
             shipping_method=ChannelContext(node=shipping_method, channel_slug=None)
         )
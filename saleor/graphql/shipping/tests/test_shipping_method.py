@@ -4,6 +4,7 @@ from measurement.measures import Weight
 
 from ....core.weight import WeightUnits
 from ....shipping.error_codes import ShippingErrorCode
+from ....shipping.rules import get_shipping_rules_table
 from ....shipping.utils import get_countries_without_shipping_zone
 from ...core.enums import WeightUnitsEnum
 from ...shipping.resolvers import resolve_price_range
@@ -1470,6 +1471,36 @@ def test_exclude_products_for_shipping_method_only_products(
     assert excluded_product_ids == set(product_ids)
 
 
+def test_exclude_products_for_shipping_method_invalidates_shipping_rules(
+    shipping_method, product, staff_api_client, permission_manage_shipping, settings
+):
+    # given
+    settings.CACHE_SHIPPING_RULES = True
+    channel_id = shipping_method.channel_listings.get().channel_id
+
+    def get_excluded_product_ids():
+        rules = get_shipping_rules_table(channel_id).rules
+        for rule in rules:
+            if rule.shipping_method.pk == shipping_method.pk:
+                return rule.excluded_product_ids
+
+    assert not get_excluded_product_ids()
+    shipping_method_id = graphene.Node.to_global_id(
+        "ShippingMethod", shipping_method.pk
+    )
+    product_id = graphene.Node.to_global_id("Product", product.pk)
+    variables = {"id": shipping_method_id, "input": {"products": [product_id]}}
+
+    # when
+    response = staff_api_client.post_graphql(
+        EXCLUDE_PRODUCTS_MUTATION, variables, permissions=[permission_manage_shipping]
+    )
+
+    # then
+    get_graphql_content(response)
+    assert get_excluded_product_ids() == {product.pk}
+
+
 @pytest.mark.parametrize("requestor", ["staff", "app"])
 def test_exclude_products_for_shipping_method_already_has_excluded_products(
     requestor,
@@ -7,6 +7,7 @@ from ...discount import models as discount_models
 from ...menu import models as menu_models
 from ...page import models as page_models
 from ...product import models as product_models
+from ...product.search import update_product_search_vector
 from ...shipping import models as shipping_models
 from ..channel import ChannelContext
 from ..core.mutations import BaseMutation, ModelMutation, registry
@@ -95,6 +96,7 @@ class ProductTranslate(BaseTranslateMutation):
         product.translations.update_or_create(
             language_code=data["language_code"], defaults=data["input"]
         )
+        update_product_search_vector(product)
         product = ChannelContext(node=product, channel_slug=None)
         return cls(**{cls._meta.return_field_name: product})
 
@@ -148,6 +150,7 @@ class ProductVariantTranslate(BaseTranslateMutation):
         variant.translations.update_or_create(
             language_code=data["language_code"], defaults=data["input"]
         )
+        update_product_search_vector(variant.product)
         variant = ChannelContext(node=variant, channel_slug=None)
         return cls(**{cls._meta.return_field_name: variant})
 
@@ -20,10 +20,20 @@ from graphql import GraphQLDocument, get_default_backend
 from graphql.error import GraphQLError, GraphQLSyntaxError
 from graphql.error import format_error as format_graphql_error
 from graphql.execution import ExecutionResult
+from graphql.validation import validate
 from jwt.exceptions import PyJWTError
+from promise import Promise
 
 from ..core.exceptions import PermissionDenied, ReadOnlyException
 from ..core.utils import is_valid_ipv4, is_valid_ipv6
+from .document_cache import document_cache, get_query_hash
+from .persisted_queries import (
+    PersistedQueryNotFound,
+    get_persisted_query,
+    get_persisted_query_hash,
+    store_persisted_query,
+)
+from .query_cost import QueryCostError, calculate_query_cost
 
 API_PATH = SimpleLazyObject(lambda: reverse("api"))
 
@@ -82,13 +92,15 @@ class GraphQLView(View):
 
     def dispatch(self, request, *args, **kwargs):
         # Handle options method the GraphQlView restricts it.
-        if request.method == "GET":
+        if request.method == "GET" and "extensions" not in request.GET:
             if settings.PLAYGROUND_ENABLED:
                 return self.render_playground(request)
-            return HttpResponseNotAllowed(["OPTIONS", "POST"])
+            return HttpResponseNotAllowed(["GET", "OPTIONS", "POST"])
         if request.method == "OPTIONS":
             response = self.options(request, *args, **kwargs)
-        elif request.method == "POST":
+        elif request.method in ("GET", "POST"):
+            # GET requests are allowed only for persisted queries, which lets
+            # HTTP caches store responses of anonymous queries
             response = self.handle_query(request)
         else:
             return HttpResponseNotAllowed(["GET", "OPTIONS", "POST"])
@@ -99,7 +111,7 @@ class GraphQLView(View):
                     response["Access-Control-Allow-Origin"] = request.META[
                         "HTTP_ORIGIN"
                     ]
-                    response["Access-Control-Allow-Methods"] = "POST, OPTIONS"
+                    response["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
                     response[
                         "Access-Control-Allow-Headers"
                     ] = "Origin, Content-Type, Accept, Authorization"
@@ -120,7 +132,7 @@ class GraphQLView(View):
             )
 
         if isinstance(data, list):
-            responses = [self.get_response(request, entry) for entry in data]
+            responses = self.get_batch_responses(request, data)
             result: Union[list, Optional[dict]] = [
                 response for response, code in responses
             ]
@@ -162,10 +174,71 @@ class GraphQLView(View):
 
             return response
 
+    def get_batch_responses(
+        self, request: HttpRequest, data: list
+    ) -> List[Tuple[Optional[Dict[str, List[Any]]], int]]:
+        """Execute all operations of a batched request.
+
+        By default operations are executed one after another. When
+        `GRAPHQL_CONCURRENT_BATCH_QUERIES` is enabled, consecutive queries are
+        started together and resolved at once, so data loaders shared through
+        the request batch loads of all of them. Mutations are still executed in
+        order, after all preceding queries are resolved.
+        """
+        if not settings.GRAPHQL_CONCURRENT_BATCH_QUERIES:
+            return [self.get_response(request, entry) for entry in data]
+
+        responses: List[Tuple[Optional[Dict[str, List[Any]]], int]] = []
+        pending_queries: List[Union[Promise, ExecutionResult, None]] = []
+        for entry in data:
+            if self.get_operation_type(request, entry) == "query":
+                pending_queries.append(
+                    self.execute_graphql_request(request, entry, return_promise=True)
+                )
+                continue
+            responses.extend(self.resolve_pending_queries(pending_queries))
+            pending_queries = []
+            responses.append(self.get_response(request, entry))
+        responses.extend(self.resolve_pending_queries(pending_queries))
+        return responses
+
+    def resolve_pending_queries(
+        self, pending_queries: List[Union[Promise, ExecutionResult, None]]
+    ) -> List[Tuple[Optional[Dict[str, List[Any]]], int]]:
+        responses = []
+        with connection.execute_wrapper(tracing_wrapper):
+            for execution_result in pending_queries:
+                if isinstance(execution_result, Promise):
+                    try:
+                        execution_result = execution_result.get()
+                    except Exception as e:
+                        execution_result = ExecutionResult(errors=[e], invalid=True)
+                responses.append(self.format_execution_result(execution_result))
+        return responses
+
+    def get_operation_type(self, request: HttpRequest, data: dict) -> Optional[str]:
+        query, _variables, operation_name = self.get_graphql_params(request, data)
+        try:
+            persisted_query_hash = get_persisted_query_hash(data)
+        except GraphQLError:
+            return None
+        if persisted_query_hash:
+            document, _error = self.parse_persisted_query(query, persisted_query_hash)
+        else:
+            document, _error = self.parse_query(query)
+        if document is None:
+            return None
+        return document.get_operation_type(operation_name)
+
     def get_response(
         self, request: HttpRequest, data: dict
     ) -> Tuple[Optional[Dict[str, List[Any]]], int]:
         execution_result = self.execute_graphql_request(request, data)
+        return self.format_execution_result(execution_result)
+
+    def format_execution_result(
+        self, execution_result: Optional[ExecutionResult]
+    ) -> Tuple[Optional[Dict[str, List[Any]]], int]:
         status_code = 200
         if execution_result:
             response = {}
@@ -177,6 +250,8 @@ class GraphQLView(View):
                 status_code = 400
             else:
                 response["data"] = execution_result.data
+            if execution_result.extensions:
+                response["extensions"] = execution_result.extensions
             result: Optional[Dict[str, List[Any]]] = response
         else:
             result = None
@@ -189,11 +264,12 @@ class GraphQLView(View):
     def parse_query(
         self, query: str
     ) -> Tuple[Optional[GraphQLDocument], Optional[ExecutionResult]]:
-        """Attempt to parse a query (mandatory) to a gql document object.
+        """Attempt to parse a query (mandatory) to a validated gql document object.
 
         If no query was given or query is not a string, it returns an error.
         If the query is invalid, it returns an error as well.
-        Otherwise, it returns the parsed gql document.
+        Otherwise, it returns the parsed gql document. Validated documents are kept
+        in the document cache, so the same query is parsed and validated once.
         """
         if not query or not isinstance(query, str):
             return (
@@ -203,15 +279,58 @@ class GraphQLView(View):
                 ),
             )
 
+        query_hash = get_query_hash(query)
+        document = document_cache.get(self.schema, query_hash)
+        if document is not None:
+            return document, None
+        return self.parse_and_validate_query(query, query_hash)
+
+    def parse_persisted_query(
+        self, query: Optional[str], query_hash: str
+    ) -> Tuple[Optional[GraphQLDocument], Optional[ExecutionResult]]:
+        """Attempt to get a gql document object of a persisted query.
+
+        If the client sent the query together with its hash, the query is stored
+        for the subsequent requests. Otherwise, the document is taken from
+        the document cache or parsed from the stored query. If the query is not
+        known, the `PersistedQueryNotFound` error is returned, so the client can
+        retry with the full query.
+        """
+        if query is not None:
+            if not isinstance(query, str) or get_query_hash(query) != query_hash:
+                error = GraphQLError("Provided hash does not match the query.")
+                return None, ExecutionResult(errors=[error], invalid=True)
+            document, error = self.parse_query(query)
+            if document is not None:
+                store_persisted_query(query_hash, query)
+            return document, error
+
+        document = document_cache.get(self.schema, query_hash)
+        if document is not None:
+            return document, None
+        query = get_persisted_query(query_hash)
+        if query is None:
+            return None, ExecutionResult(errors=[PersistedQueryNotFound()])
+        return self.parse_and_validate_query(query, query_hash)
+
+    def parse_and_validate_query(
+        self, query: str, query_hash: str
+    ) -> Tuple[Optional[GraphQLDocument], Optional[ExecutionResult]]:
         # Attempt to parse the query, if it fails, return the error
         try:
-            return (
-                self.backend.document_from_string(self.schema, query),  # type: ignore
-                None,
+            document = self.backend.document_from_string(  # type: ignore
+                self.schema, query
             )
         except (ValueError, GraphQLSyntaxError) as e:
             return None, ExecutionResult(errors=[e], invalid=True)
 
+        validation_errors = validate(self.schema, document.document_ast)
+        if validation_errors:
+            return None, ExecutionResult(errors=validation_errors, invalid=True)
+
+        document_cache.set(self.schema, query_hash, document)
+        return document, None
+
     def check_if_query_contains_only_schema(self, document: GraphQLDocument):
         for definition in document.document_ast.definitions:
             selections = definition.selection_set.selections
@@ -222,17 +341,39 @@ class GraphQLView(View):
                         msg = "`__schema` must be fetched in separete query"
                         raise GraphQLError(msg)
 
-    def execute_graphql_request(self, request: HttpRequest, data: dict):
+    def execute_graphql_request(
+        self, request: HttpRequest, data: dict, return_promise: bool = False
+    ):
         with opentracing.global_tracer().start_active_span("graphql_query") as scope:
             span = scope.span
             span.set_tag(opentracing.tags.COMPONENT, "GraphQL")
 
             query, variables, operation_name = self.get_graphql_params(request, data)
 
-            document, error = self.parse_query(query)
+            try:
+                persisted_query_hash = get_persisted_query_hash(data)
+            except GraphQLError as e:
+                return ExecutionResult(errors=[e], invalid=True)
+            if persisted_query_hash:
+                document, error = self.parse_persisted_query(
+                    query, persisted_query_hash
+                )
+            elif request.method == "GET":
+                msg = "Only persisted queries can be sent as GET requests."
+                return ExecutionResult(errors=[GraphQLError(msg)], invalid=True)
+            else:
+                document, error = self.parse_query(query)
             if error:
                 return error
 
+            if request.method == "GET":
+                operation_type = document.get_operation_type(  # type: ignore
+                    operation_name
+                )
+                if operation_type != "query":
+                    msg = "Only queries can be sent as GET requests."
+                    return ExecutionResult(errors=[GraphQLError(msg)], invalid=True)
+
             if document is not None:
                 raw_query_string = document.document_string
                 span.set_tag("graphql.query", raw_query_string)
@@ -241,6 +382,33 @@ class GraphQLView(View):
                 except GraphQLError as e:
                     return ExecutionResult(errors=[e], invalid=True)
 
+            query_cost = calculate_query_cost(
+                self.schema,  # type: ignore
+                document.document_ast,  # type: ignore
+                operation_name,
+                variables,
+            )
+            span.set_tag("graphql.query_cost", query_cost)
+            max_query_cost = settings.GRAPHQL_QUERY_MAX_COST
+            extensions = {
+                "cost": {
+                    "requestedQueryCost": query_cost,
+                    "maximumAvailable": max_query_cost or None,
+                }
+            }
+            if max_query_cost and query_cost > max_query_cost:
+                error = QueryCostError(
+                    f"The query exceeds the maximum cost of {max_query_cost}. "
+                    f"Requested query cost is {query_cost}."
+                )
+                return ExecutionResult(
+                    errors=[error], invalid=True, extensions=extensions
+                )
+
+            def set_extensions(execution_result: ExecutionResult) -> ExecutionResult:
+                execution_result.extensions.update(extensions)
+                return execution_result
+
             extra_options: Dict[str, Optional[Any]] = {}
 
             if self.executor:
@@ -249,20 +417,32 @@ class GraphQLView(View):
                 extra_options["executor"] = self.executor
             try:
                 with connection.execute_wrapper(tracing_wrapper):
-                    return document.execute(  # type: ignore
+                    execution_result = document.execute(  # type: ignore
                         root=self.get_root_value(),
                         variables=variables,
                         operation_name=operation_name,
                         context=request,
                         middleware=self.middleware,
+                        # The document was already validated in `parse_query`
+                        validate=False,
+                        return_promise=return_promise,
                         **extra_options,
                     )
             except Exception as e:
                 span.set_tag(opentracing.tags.ERROR, True)
                 return ExecutionResult(errors=[e], invalid=True)
+            if isinstance(execution_result, Promise):
+                return execution_result.then(set_extensions)
+            return set_extensions(execution_result)
 
     @staticmethod
     def parse_body(request: HttpRequest):
+        if request.method == "GET":
+            data = request.GET.dict()
+            for param in ("variables", "extensions"):
+                if data.get(param):
+                    data[param] = json.loads(data[param])
+            return data
         content_type = request.content_type
         if content_type == "application/graphql":
             return {"query": request.body.decode("utf-8")}
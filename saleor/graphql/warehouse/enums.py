@@ -0,0 +1,4 @@
+from ...graphql.core.enums import to_enum
+from ...warehouse import AllocationStrategy
+
+AllocationStrategyEnum = to_enum(AllocationStrategy, type_name="AllocationStrategyEnum")
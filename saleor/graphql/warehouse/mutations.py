@@ -3,6 +3,7 @@ from django.core.exceptions import ValidationError
 
 from ...core.permissions import ProductPermissions
 from ...warehouse import models
+from ...warehouse.availability import invalidate_stock_availability
 from ...warehouse.error_codes import WarehouseErrorCode
 from ...warehouse.validation import validate_warehouse_count  # type: ignore
 from ..account.i18n import I18nMixin
@@ -59,6 +60,11 @@ class WarehouseMixin:
         cleaned_data["address"] = cls.prepare_address(cleaned_data, instance)
         return super().construct_instance(instance, cleaned_data)
 
+    @classmethod
+    def post_save_action(cls, info, instance, cleaned_input):
+        # Shipping zones of the warehouse decide where its stocks are available
+        invalidate_stock_availability()
+
 
 class WarehouseCreate(WarehouseMixin, ModelMutation, I18nMixin):
     class Arguments:
@@ -102,6 +108,7 @@ class WarehouseShippingZoneAssign(WarehouseMixin, ModelMutation, I18nMixin):
             data.get("shipping_zone_ids"), "shipping_zone_id", only_type=ShippingZone
         )
         warehouse.shipping_zones.add(*shipping_zones)
+        invalidate_stock_availability()
         return WarehouseShippingZoneAssign(warehouse=warehouse)
 
 
@@ -128,6 +135,7 @@ class WarehouseShippingZoneUnassign(WarehouseMixin, ModelMutation, I18nMixin):
             data.get("shipping_zone_ids"), "shipping_zone_id", only_type=ShippingZone
         )
         warehouse.shipping_zones.remove(*shipping_zones)
+        invalidate_stock_availability()
         return WarehouseShippingZoneAssign(warehouse=warehouse)
 
 
@@ -165,3 +173,9 @@ class WarehouseDelete(ModelDeleteMutation):
 
     class Arguments:
         id = graphene.ID(description="ID of a warehouse to delete.", required=True)
+
+    @classmethod
+    def perform_mutation(cls, _root, info, **data):
+        response = super().perform_mutation(_root, info, **data)
+        invalidate_stock_availability()
+        return response
@@ -2,6 +2,7 @@ import graphene
 import pytest
 
 from ....account.models import Address
+from ....warehouse import AllocationStrategy
 from ....warehouse.error_codes import WarehouseErrorCode
 from ....warehouse.models import Warehouse
 from ...tests.utils import assert_no_permission, get_graphql_content
@@ -593,6 +594,30 @@ def test_mutation_update_warehouse(
     assert warehouse.company_name == "New name for company"
 
 
+def test_mutation_update_warehouse_allocation_strategy(
+    staff_api_client, warehouse, permission_manage_products
+):
+    # given
+    warehouse_id = graphene.Node.to_global_id("Warehouse", warehouse.id)
+    variables = {
+        "id": warehouse_id,
+        "input": {"allocationStrategy": "CONDITIONAL_UPDATE"},
+    }
+
+    # when
+    response = staff_api_client.post_graphql(
+        MUTATION_UPDATE_WAREHOUSE,
+        variables=variables,
+        permissions=[permission_manage_products],
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert not content["data"]["updateWarehouse"]["warehouseErrors"]
+    warehouse.refresh_from_db()
+    assert warehouse.allocation_strategy == AllocationStrategy.CONDITIONAL_UPDATE
+
+
 def test_mutation_update_warehouse_can_update_address(
     staff_api_client, warehouse, permission_manage_products
 ):
@@ -9,6 +9,7 @@ from ..channel import ChannelContext
 from ..core.connection import CountableDjangoObjectType
 from ..decorators import one_of_permissions_required
 from ..meta.types import ObjectWithMetadata
+from .enums import AllocationStrategyEnum
 
 
 class WarehouseAddressInput(graphene.InputObjectType):
@@ -26,6 +27,9 @@ class WarehouseInput(graphene.InputObjectType):
     slug = graphene.String(description="Warehouse slug.")
     company_name = graphene.String(description="Company name.")
     email = graphene.String(description="The email address of the warehouse.")
+    allocation_strategy = AllocationStrategyEnum(
+        description="Strategy of allocating stocks of the warehouse for orders."
+    )
 
 
 class WarehouseCreateInput(WarehouseInput):
@@ -46,6 +50,11 @@ class WarehouseUpdateInput(WarehouseInput):
 
 
 class Warehouse(CountableDjangoObjectType):
+    allocation_strategy = AllocationStrategyEnum(
+        required=True,
+        description="Strategy of allocating stocks of the warehouse for orders.",
+    )
+
     class Meta:
         description = "Represents warehouse."
         model = models.Warehouse
@@ -58,6 +67,7 @@ class Warehouse(CountableDjangoObjectType):
             "shipping_zones",
             "address",
             "email",
+            "allocation_strategy",
         ]
 
     @staticmethod
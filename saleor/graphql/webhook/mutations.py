@@ -4,6 +4,7 @@ from django.core.exceptions import ValidationError
 from ...core.permissions import AppPermission
 from ...webhook import models
 from ...webhook.error_codes import WebhookErrorCode
+from ...webhook.subscribers import invalidate_webhook_subscribers
 from ..core.mutations import ModelDeleteMutation, ModelMutation
 from ..core.types.common import WebhookError
 from .enums import WebhookEventTypeEnum
@@ -89,6 +90,7 @@ class WebhookCreate(ModelMutation):
                 for event in events
             ]
         )
+        invalidate_webhook_subscribers()
 
 
 class WebhookUpdateInput(graphene.InputObjectType):
@@ -160,6 +162,7 @@ class WebhookUpdate(ModelMutation):
                     for event in events
                 ]
             )
+        invalidate_webhook_subscribers()
 
 
 class WebhookDelete(ModelDeleteMutation):
@@ -199,4 +202,6 @@ class WebhookDelete(ModelDeleteMutation):
                     code=WebhookErrorCode.GRAPHQL_ERROR,
                 )
 
-        return super().perform_mutation(_root, info, **data)
+        response = super().perform_mutation(_root, info, **data)
+        invalidate_webhook_subscribers()
+        return response
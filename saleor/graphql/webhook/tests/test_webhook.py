@@ -50,6 +50,29 @@ def test_webhook_create_by_app(app_api_client, permission_manage_orders):
     assert events[0].event_type == WebhookEventTypeEnum.ORDER_CREATED.value
 
 
+@patch("saleor.graphql.webhook.mutations.invalidate_webhook_subscribers")
+def test_webhook_create_invalidates_webhook_subscribers(
+    mocked_invalidate_webhook_subscribers, app_api_client, permission_manage_orders
+):
+    # given
+    variables = {
+        "target_url": "https://www.example.com",
+        "events": [WebhookEventTypeEnum.ORDER_CREATED.name],
+    }
+
+    # when
+    response = app_api_client.post_graphql(
+        WEBHOOK_CREATE_BY_APP,
+        variables=variables,
+        permissions=[permission_manage_orders],
+        check_no_permissions=False,
+    )
+
+    # then
+    get_graphql_content(response)
+    mocked_invalidate_webhook_subscribers.assert_called_once_with()
+
+
 def test_webhook_create_inactive_app(app_api_client, app, permission_manage_orders):
     app.is_active = False
     app.save()
@@ -23,8 +23,9 @@ from ..plugins.manager import PluginsManager, get_plugins_manager
 from ..warehouse.management import (
     deallocate_stock,
     deallocate_stock_for_order,
-    decrease_stock,
+    decrease_stocks,
 )
+from ..warehouse.models import Stock
 from . import (
     FulfillmentLineData,
     FulfillmentStatus,
@@ -310,10 +311,22 @@ def clean_mark_order_as_paid(order: "Order"):
 
 def fulfill_order_line(order_line, quantity, warehouse_pk):
     """Fulfill order line with given quantity."""
-    if order_line.variant and order_line.variant.track_inventory:
-        decrease_stock(order_line, quantity, warehouse_pk)
-    order_line.quantity_fulfilled += quantity
-    order_line.save(update_fields=["quantity_fulfilled"])
+    fulfill_order_lines([order_line], [quantity], warehouse_pk)
+
+
+def fulfill_order_lines(order_lines, quantities, warehouse_pk):
+    """Fulfill order lines with given quantities from the same warehouse."""
+    lines_to_decrease = [
+        (order_line, quantity)
+        for order_line, quantity in zip(order_lines, quantities)
+        if order_line.variant and order_line.variant.track_inventory
+    ]
+    if lines_to_decrease:
+        lines, lines_quantities = zip(*lines_to_decrease)
+        decrease_stocks(list(lines), list(lines_quantities), warehouse_pk)
+    for order_line, quantity in zip(order_lines, quantities):
+        order_line.quantity_fulfilled += quantity
+    OrderLine.objects.bulk_update(order_lines, ["quantity_fulfilled"])
 
 
 def automatically_fulfill_digital_lines(order: "Order"):
@@ -375,26 +388,37 @@ def _create_fulfillment_lines(
         InsufficientStock: If system hasn't containt enough item in stock for any line.
 
     """
+    lines = [line for line in lines if line["quantity"] > 0]
+    order_lines = [line["order_line"] for line in lines]
+    quantities = [line["quantity"] for line in lines]
+    stocks = {
+        stock.product_variant_id: stock
+        for stock in Stock.objects.filter(
+            warehouse=warehouse_pk,
+            product_variant_id__in=[
+                order_line.variant_id for order_line in order_lines
+            ],
+        )
+    }
+    for order_line in order_lines:
+        if order_line.variant_id not in stocks:
+            error_context = {"order_line": order_line, "warehouse_pk": warehouse_pk}
+            raise InsufficientStock(order_line.variant, error_context)
+
+    fulfill_order_lines(order_lines, quantities, warehouse_pk)
+
     fulfillment_lines = []
-    for line in lines:
-        quantity = line["quantity"]
-        order_line = line["order_line"]
-        if quantity > 0:
-            stock = order_line.variant.stocks.filter(warehouse=warehouse_pk).first()
-            if stock is None:
-                error_context = {"order_line": order_line, "warehouse_pk": warehouse_pk}
-                raise InsufficientStock(order_line.variant, error_context)
-            fulfill_order_line(order_line, quantity, warehouse_pk)
-            if order_line.is_digital:
-                order_line.variant.digital_content.urls.create(line=order_line)
-            fulfillment_lines.append(
-                FulfillmentLine(
-                    order_line=order_line,
-                    fulfillment=fulfillment,
-                    quantity=quantity,
-                    stock=stock,
-                )
+    for order_line, quantity in zip(order_lines, quantities):
+        if order_line.is_digital:
+            order_line.variant.digital_content.urls.create(line=order_line)
+        fulfillment_lines.append(
+            FulfillmentLine(
+                order_line=order_line,
+                fulfillment=fulfillment,
+                quantity=quantity,
+                stock=stocks[order_line.variant_id],
             )
+        )
     return fulfillment_lines
 
 
@@ -17,7 +17,7 @@ from ..order.models import Order, OrderLine
 from ..plugins.manager import get_plugins_manager
 from ..product.utils.digital_products import get_default_digital_content_settings
 from ..shipping.models import ShippingMethod
-from ..warehouse.management import deallocate_stock, increase_stock
+from ..warehouse.management import deallocate_stocks, increase_stock
 from ..warehouse.models import Warehouse
 from . import events
 
@@ -335,10 +335,21 @@ def restock_order_lines(order):
         shipping_zones__countries__contains=country
     ).first()
 
-    for line in order:
+    lines = list(order)
+    lines_to_deallocate = [
+        line
+        for line in lines
+        if line.variant
+        and line.variant.track_inventory
+        and line.quantity_unfulfilled > 0
+    ]
+    deallocate_stocks(
+        lines_to_deallocate,
+        [line.quantity_unfulfilled for line in lines_to_deallocate],
+    )
+
+    for line in lines:
         if line.variant and line.variant.track_inventory:
-            if line.quantity_unfulfilled > 0:
-                deallocate_stock(line, line.quantity_unfulfilled)
             if line.quantity_fulfilled > 0:
                 allocation = line.allocations.first()
                 warehouse = (
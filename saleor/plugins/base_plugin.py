@@ -85,6 +85,13 @@ class BasePlugin:
     def __str__(self):
         return self.PLUGIN_NAME
 
+    def clear_request_cache(self):
+        """Drop data cached on the plugin instance while handling a request.
+
+        Overwrite this method if the plugin caches data on the instance level. It is
+        called every time a plugins manager reused between requests is handed out.
+        """
+
     def external_authentication_url(
         self, data: dict, request: WSGIRequest, previous_value
     ) -> dict:
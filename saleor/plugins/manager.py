@@ -1,9 +1,13 @@
+import threading
 from decimal import Decimal
 from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Union
+from uuid import uuid4
 
 import opentracing
 from django.conf import settings
+from django.core.cache import cache
 from django.core.handlers.wsgi import WSGIRequest
+from django.db import transaction
 from django.http import HttpResponse, HttpResponseNotFound
 from django.utils.module_loading import import_string
 from django_countries.fields import Country
@@ -44,6 +48,9 @@ if TYPE_CHECKING:
     from .base_plugin import BasePlugin
 
 
+PLUGINS_CONFIGURATION_VERSION_CACHE_KEY = "plugins_configuration_version"
+
+
 class PluginsManager(PaymentInterface):
     """Base manager for handling plugins logic."""
 
@@ -668,8 +675,13 @@ class PluginsManager(PaymentInterface):
                 )
                 configuration.name = plugin.PLUGIN_NAME
                 configuration.description = plugin.PLUGIN_DESCRIPTION
+                invalidate_cached_plugins_managers()
                 return configuration
 
+    def clear_request_cache(self):
+        for plugin in self.plugins:
+            plugin.clear_request_cache()
+
     def get_plugin(self, plugin_id: str) -> Optional["BasePlugin"]:
         for plugin in self.plugins:
             if plugin.PLUGIN_ID == plugin_id:
@@ -678,7 +690,11 @@ class PluginsManager(PaymentInterface):
 
     def fetch_taxes_data(self) -> bool:
         default_value = False
-        return self.__run_method_on_plugins("fetch_taxes_data", default_value)
+        fetched = self.__run_method_on_plugins("fetch_taxes_data", default_value)
+        if fetched:
+            # Plugins can keep fetched tax rates on the instance level
+            invalidate_cached_plugins_managers()
+        return fetched
 
     def webhook(self, request: WSGIRequest, plugin_id: str) -> HttpResponse:
         split_path = request.path.split(plugin_id, maxsplit=1)
@@ -759,3 +775,73 @@ def get_plugins_manager(
         plugins = settings.PLUGINS
     manager = import_string(manager_path)
     return manager(plugins)
+
+
+class _CachedPluginsManagers(threading.local):
+    """Plugins managers reused by the requests handled by the current thread.
+
+    Stored as (configuration version, manager) pairs keyed by the manager path and
+    plugin paths. A manager is never shared between threads, as the plugins keep
+    data of the request being handled.
+    """
+
+    def __init__(self):
+        self.managers: Dict[
+            Tuple[str, Tuple[str, ...]], Tuple[str, PluginsManager]
+        ] = {}
+
+
+_cached_plugins_managers = _CachedPluginsManagers()
+
+
+def get_plugins_configuration_version() -> str:
+    return cache.get_or_set(
+        PLUGINS_CONFIGURATION_VERSION_CACHE_KEY, lambda: uuid4().hex, timeout=None
+    )
+
+
+def invalidate_cached_plugins_managers():
+    """Force all processes to rebuild their cached plugins managers.
+
+    The version is changed again after the current transaction is committed, so
+    the managers built in the meantime from the uncommitted configuration are not
+    used.
+    """
+
+    def invalidate():
+        cache.set(PLUGINS_CONFIGURATION_VERSION_CACHE_KEY, uuid4().hex, timeout=None)
+
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+def get_cached_plugins_manager(
+    manager_path: str = None, plugins: List[str] = None
+) -> PluginsManager:
+    """Return a plugins manager reused across requests handled by this thread.
+
+    Creating a manager imports all plugins and fetches their configurations from
+    the database. The cached instance is rebuilt only when the plugins
+    configuration version changes, which happens every time a plugin configuration
+    is saved. Data cached by the plugins while handling the previous request is
+    dropped, so e.g. updated tax rates are used. The version is read from the
+    cache, so it requires a cache backend shared by all processes, see
+    `SHARED_CACHE`.
+    """
+    if not settings.CACHE_PLUGINS_MANAGER:
+        return get_plugins_manager(manager_path=manager_path, plugins=plugins)
+    if not manager_path:
+        manager_path = settings.PLUGINS_MANAGER
+    if plugins is None:
+        plugins = settings.PLUGINS
+
+    key = (manager_path, tuple(plugins))
+    version = get_plugins_configuration_version()
+    managers = _cached_plugins_managers.managers
+    cached_version, manager = managers.get(key, (None, None))
+    if manager is None or cached_version != version:
+        manager = get_plugins_manager(manager_path=manager_path, plugins=plugins)
+        managers[key] = (version, manager)
+    else:
+        manager.clear_request_cache()
+    return manager
@@ -1,5 +1,7 @@
 import json
+import threading
 from decimal import Decimal
+from unittest.mock import Mock, patch
 
 import pytest
 from django.http import HttpResponseNotFound, JsonResponse
@@ -12,7 +14,12 @@ from ...core.taxes import TaxType
 from ...payment.interface import PaymentGateway
 from ...product.models import Product
 from ..base_plugin import ExternalAccessTokens
-from ..manager import PluginsManager, get_plugins_manager
+from ..manager import (
+    PluginsManager,
+    get_cached_plugins_manager,
+    get_plugins_manager,
+    invalidate_cached_plugins_managers,
+)
 from ..models import PluginConfiguration
 from ..tests.sample_plugins import (
     ActiveDummyPaymentGateway,
@@ -479,6 +486,76 @@ def test_manager_save_plugin_configuration(plugin_configuration):
     assert not plugin_configuration.active
 
 
+def test_get_cached_plugins_manager_reuses_manager(settings, db):
+    settings.CACHE_PLUGINS_MANAGER = True
+    plugins = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    invalidate_cached_plugins_managers()
+
+    manager = get_cached_plugins_manager(plugins=plugins)
+
+    assert get_cached_plugins_manager(plugins=plugins) is manager
+    assert get_cached_plugins_manager(plugins=[]) is not manager
+
+
+@patch("saleor.plugins.manager.get_plugins_manager")
+def test_get_cached_plugins_manager_not_shared_between_threads(
+    get_plugins_manager_mock, settings
+):
+    # given
+    settings.CACHE_PLUGINS_MANAGER = True
+    get_plugins_manager_mock.side_effect = lambda **kwargs: Mock()
+    plugins = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    manager = get_cached_plugins_manager(plugins=plugins)
+    thread_managers = []
+
+    # when
+    thread = threading.Thread(
+        target=lambda: thread_managers.append(
+            get_cached_plugins_manager(plugins=plugins)
+        )
+    )
+    thread.start()
+    thread.join()
+
+    # then
+    assert thread_managers[0] is not manager
+    assert get_cached_plugins_manager(plugins=plugins) is manager
+
+
+def test_get_cached_plugins_manager_disabled(settings, db):
+    settings.CACHE_PLUGINS_MANAGER = False
+    plugins = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+
+    manager = get_cached_plugins_manager(plugins=plugins)
+
+    assert get_cached_plugins_manager(plugins=plugins) is not manager
+
+
+def test_save_plugin_configuration_invalidates_cached_managers(
+    settings, plugin_configuration
+):
+    settings.CACHE_PLUGINS_MANAGER = True
+    plugins = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    invalidate_cached_plugins_managers()
+    manager = get_cached_plugins_manager(plugins=plugins)
+    assert manager.get_plugin(PluginSample.PLUGIN_ID).active
+
+    manager.save_plugin_configuration(PluginSample.PLUGIN_ID, {"active": False})
+
+    new_manager = get_cached_plugins_manager(plugins=plugins)
+    assert new_manager is not manager
+    assert not new_manager.get_plugin(PluginSample.PLUGIN_ID).active
+
+
+@patch("saleor.plugins.manager.transaction.on_commit")
+def test_invalidate_cached_plugins_managers_after_commit(on_commit_mock):
+    # when
+    invalidate_cached_plugins_managers()
+
+    # then
+    on_commit_mock.assert_called_once()
+
+
 def test_plugin_updates_configuration_shape(
     new_config,
     new_config_structure,
@@ -64,6 +64,9 @@ class VatlayerPlugin(BasePlugin):
         self.config = VatlayerConfiguration(access_key=configuration["Access key"])
         self._cached_taxes = {}
 
+    def clear_request_cache(self):
+        self._cached_taxes = {}
+
     def _skip_plugin(
         self, previous_value: Union[TaxedMoney, TaxedMoneyRange, Decimal]
     ) -> bool:
@@ -12,7 +12,11 @@ from ....checkout.utils import add_variant_to_checkout, fetch_checkout_lines
 from ....core.prices import quantize_price
 from ....core.taxes import zero_taxed_money
 from ....product.models import Product
-from ...manager import get_plugins_manager
+from ...manager import (
+    get_cached_plugins_manager,
+    get_plugins_manager,
+    invalidate_cached_plugins_managers,
+)
 from ...models import PluginConfiguration
 from ...vatlayer import (
     DEFAULT_TAX_RATE_NAME,
@@ -964,3 +968,20 @@ def test_get_order_shipping_tax_rate_skip_plugin(
 
     tax_rate = manager.get_order_shipping_tax_rate(order, shipping_price)
     assert tax_rate == Decimal("0.25")
+
+
+def test_cached_plugins_manager_drops_cached_taxes(settings, vatlayer):
+    # given
+    settings.CACHE_PLUGINS_MANAGER = True
+    plugins = ["saleor.plugins.vatlayer.plugin.VatlayerPlugin"]
+    invalidate_cached_plugins_managers()
+    manager = get_cached_plugins_manager(plugins=plugins)
+    plugin = manager.get_plugin(VatlayerPlugin.PLUGIN_ID)
+    plugin._cached_taxes["PL"] = {"standard": {"value": 1, "tax": None}}
+
+    # when
+    cached_manager = get_cached_plugins_manager(plugins=plugins)
+
+    # then
+    assert cached_manager is manager
+    assert plugin._cached_taxes == {}
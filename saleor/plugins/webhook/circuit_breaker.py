@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from ...webhook.models import WebhookTargetCircuit
+
+# Number of consecutive failed deliveries after which a target isn't called
+CIRCUIT_FAILURES_THRESHOLD = 5
+
+# Number of seconds for which a failing target isn't called
+CIRCUIT_OPEN_TIMEOUT = 5 * 60
+
+# Number of seconds after which the failures of a target are forgotten
+CIRCUIT_FAILURES_TIMEOUT = 60 * 60
+
+
+def get_circuits_open_until(target_urls: Iterable[str]) -> Dict[str, datetime]:
+    """Return the time until which deliveries to the failing targets are held."""
+    return dict(
+        WebhookTargetCircuit.objects.filter(
+            target_url__in=target_urls, open_until__gt=timezone.now()
+        ).values_list("target_url", "open_until")
+    )
+
+
+def record_delivery_success(target_url: str):
+    WebhookTargetCircuit.objects.filter(target_url=target_url).delete()
+
+
+def _get_circuit_for_update(target_url: str) -> WebhookTargetCircuit:
+    circuit = (
+        WebhookTargetCircuit.objects.select_for_update()
+        .filter(target_url=target_url)
+        .first()
+    )
+    if circuit:
+        return circuit
+    try:
+        with transaction.atomic():
+            return WebhookTargetCircuit.objects.create(target_url=target_url)
+    except IntegrityError:
+        # The circuit was created by another worker in the meantime
+        return WebhookTargetCircuit.objects.select_for_update().get(
+            target_url=target_url
+        )
+
+
+def record_delivery_failure(target_url: str):
+    """Count the failed delivery and open the circuit of a failing target.
+
+    The circuits are stored in the database, so they are shared by the workers
+    sending and dispatching the deliveries. Once open, the circuit is closed after
+    `CIRCUIT_OPEN_TIMEOUT`, but a single failed delivery opens it again until
+    a delivery to the target succeeds.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        circuit = _get_circuit_for_update(target_url)
+        if circuit.last_failure < now - timedelta(seconds=CIRCUIT_FAILURES_TIMEOUT):
+            circuit.failures_count = 0
+        circuit.failures_count += 1
+        circuit.last_failure = now
+        if circuit.failures_count >= CIRCUIT_FAILURES_THRESHOLD:
+            circuit.open_until = now + timedelta(seconds=CIRCUIT_OPEN_TIMEOUT)
+        circuit.save(update_fields=["failures_count", "last_failure", "open_until"])
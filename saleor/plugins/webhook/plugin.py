@@ -1,18 +1,22 @@
-from typing import TYPE_CHECKING, Any, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Model
 
 from ...webhook.event_types import WebhookEventType
 from ...webhook.payloads import (
-    generate_checkout_payload,
-    generate_customer_payload,
-    generate_fulfillment_payload,
     generate_invoice_payload,
-    generate_order_payload,
     generate_page_payload,
     generate_product_deleted_payload,
-    generate_product_payload,
 )
+from ...webhook.subscribers import is_event_subscribed
 from ..base_plugin import BasePlugin
-from .tasks import trigger_webhooks_for_event
+from .tasks import (
+    PAYLOAD_GENERATORS,
+    generate_payload_and_trigger_webhooks_for_event,
+    trigger_webhooks_for_event,
+)
 
 if TYPE_CHECKING:
     from ...account.models import User
@@ -23,6 +27,35 @@ if TYPE_CHECKING:
     from ...product.models import Product
 
 
+def trigger_webhooks(
+    event_type: str,
+    instance: Model,
+    generate_payload: Optional[Callable[[Any], str]] = None,
+):
+    """Send the payload of the instance to webhooks subscribed to the event.
+
+    The payload is not generated at all when no webhook subscribes to the event.
+    Unless a payload generator is given, e.g. for deleted instances, the payload
+    generation can be deferred to the worker with `WEBHOOK_DEFER_PAYLOADS`; the
+    instance is then fetched by the worker after the current transaction is
+    committed.
+    """
+    if not is_event_subscribed(event_type):
+        return
+    if generate_payload is None:
+        model_label = instance._meta.label
+        if settings.WEBHOOK_DEFER_PAYLOADS:
+            pk = str(instance.pk)
+            transaction.on_commit(
+                lambda: generate_payload_and_trigger_webhooks_for_event.delay(
+                    event_type, model_label, pk
+                )
+            )
+            return
+        generate_payload = PAYLOAD_GENERATORS[model_label]
+    trigger_webhooks_for_event.delay(event_type, generate_payload(instance))
+
+
 class WebhookPlugin(BasePlugin):
     PLUGIN_ID = "mirumee.webhooks"
     PLUGIN_NAME = "Webhooks"
@@ -35,26 +68,22 @@ class WebhookPlugin(BasePlugin):
     def order_created(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_CREATED, order_data)
+        trigger_webhooks(WebhookEventType.ORDER_CREATED, order)
 
     def order_confirmed(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_CONFIRMED, order_data)
+        trigger_webhooks(WebhookEventType.ORDER_CONFIRMED, order)
 
     def order_fully_paid(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_FULLY_PAID, order_data)
+        trigger_webhooks(WebhookEventType.ORDER_FULLY_PAID, order)
 
     def order_updated(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_UPDATED, order_data)
+        trigger_webhooks(WebhookEventType.ORDER_UPDATED, order)
 
     def invoice_request(
         self,
@@ -65,101 +94,82 @@ class WebhookPlugin(BasePlugin):
     ) -> Any:
         if not self.active:
             return previous_value
-        invoice_data = generate_invoice_payload(invoice)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.INVOICE_REQUESTED, invoice_data
-        )
+        trigger_webhooks(WebhookEventType.INVOICE_REQUESTED, invoice)
 
     def invoice_delete(self, invoice: "Invoice", previous_value: Any):
         if not self.active:
             return previous_value
-        invoice_data = generate_invoice_payload(invoice)
-        trigger_webhooks_for_event.delay(WebhookEventType.INVOICE_DELETED, invoice_data)
+        trigger_webhooks(
+            WebhookEventType.INVOICE_DELETED, invoice, generate_invoice_payload
+        )
 
     def invoice_sent(self, invoice: "Invoice", email: str, previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        invoice_data = generate_invoice_payload(invoice)
-        trigger_webhooks_for_event.delay(WebhookEventType.INVOICE_SENT, invoice_data)
+        trigger_webhooks(WebhookEventType.INVOICE_SENT, invoice)
 
     def order_cancelled(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_CANCELLED, order_data)
+        trigger_webhooks(WebhookEventType.ORDER_CANCELLED, order)
 
     def order_fulfilled(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        order_data = generate_order_payload(order)
-        trigger_webhooks_for_event.delay(WebhookEventType.ORDER_FULFILLED, order_data)
+        trigger_webhooks(WebhookEventType.ORDER_FULFILLED, order)
 
     def fulfillment_created(self, fulfillment: "Fulfillment", previous_value):
         if not self.active:
             return previous_value
-        fulfillment_data = generate_fulfillment_payload(fulfillment)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.FULFILLMENT_CREATED, fulfillment_data
-        )
+        trigger_webhooks(WebhookEventType.FULFILLMENT_CREATED, fulfillment)
 
     def customer_created(self, customer: "User", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        customer_data = generate_customer_payload(customer)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.CUSTOMER_CREATED, customer_data
-        )
+        trigger_webhooks(WebhookEventType.CUSTOMER_CREATED, customer)
 
     def product_created(self, product: "Product", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        product_data = generate_product_payload(product)
-        trigger_webhooks_for_event.delay(WebhookEventType.PRODUCT_CREATED, product_data)
+        trigger_webhooks(WebhookEventType.PRODUCT_CREATED, product)
 
     def product_updated(self, product: "Product", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        product_data = generate_product_payload(product)
-        trigger_webhooks_for_event.delay(WebhookEventType.PRODUCT_UPDATED, product_data)
+        trigger_webhooks(WebhookEventType.PRODUCT_UPDATED, product)
 
     def product_deleted(
         self, product: "Product", variants: List[int], previous_value: Any
     ) -> Any:
         if not self.active:
             return previous_value
-        product_data = generate_product_deleted_payload(product, variants)
-        trigger_webhooks_for_event.delay(WebhookEventType.PRODUCT_DELETED, product_data)
+        trigger_webhooks(
+            WebhookEventType.PRODUCT_DELETED,
+            product,
+            lambda product: generate_product_deleted_payload(product, variants),
+        )
 
     def checkout_created(self, checkout: "Checkout", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        checkout_data = generate_checkout_payload(checkout)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.CHECKOUT_CREATED, checkout_data
-        )
+        trigger_webhooks(WebhookEventType.CHECKOUT_CREATED, checkout)
 
     def checkout_updated(self, checkout: "Checkout", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        checkout_data = generate_checkout_payload(checkout)
-        trigger_webhooks_for_event.delay(
-            WebhookEventType.CHECKOUT_UPADTED, checkout_data
-        )
+        trigger_webhooks(WebhookEventType.CHECKOUT_UPADTED, checkout)
 
     def page_created(self, page: "Page", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        page_data = generate_page_payload(page)
-        trigger_webhooks_for_event.delay(WebhookEventType.PAGE_CREATED, page_data)
+        trigger_webhooks(WebhookEventType.PAGE_CREATED, page)
 
     def page_updated(self, page: "Page", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        page_data = generate_page_payload(page)
-        trigger_webhooks_for_event.delay(WebhookEventType.PAGE_UPDATED, page_data)
+        trigger_webhooks(WebhookEventType.PAGE_UPDATED, page)
 
     def page_deleted(self, page: "Page", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        page_data = generate_page_payload(page)
-        trigger_webhooks_for_event.delay(WebhookEventType.PAGE_DELETED, page_data)
+        trigger_webhooks(WebhookEventType.PAGE_DELETED, page, generate_page_payload)
@@ -1,22 +1,91 @@
 import logging
+import time
+from collections import Counter
+from datetime import timedelta
 from enum import Enum
+from functools import lru_cache
+from http.cookiejar import DefaultCookiePolicy
+from typing import Optional
 from urllib.parse import urlparse, urlunparse
 
 import boto3
+import opentracing
+import opentracing.tags
 import requests
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
 from google.cloud import pubsub_v1
+from requests.adapters import HTTPAdapter
+from requests.cookies import RequestsCookieJar
 from requests.exceptions import RequestException
 
 from ...celeryconf import app
 from ...site.models import Site
+from ...webhook import WebhookDeliveryStatus
 from ...webhook.event_types import WebhookEventType
-from ...webhook.models import Webhook
+from ...webhook.models import Webhook, WebhookDelivery, WebhookDeliveryAttempt
+from ...webhook.payloads import (
+    generate_checkout_payload,
+    generate_customer_payload,
+    generate_fulfillment_payload,
+    generate_invoice_payload,
+    generate_order_payload,
+    generate_page_payload,
+    generate_product_payload,
+)
 from . import signature_for_payload
+from .circuit_breaker import (
+    get_circuits_open_until,
+    record_delivery_failure,
+    record_delivery_success,
+)
 
 logger = logging.getLogger(__name__)
 
 WEBHOOK_TIMEOUT = 10
 
+# Number of connections kept open by a worker process to a single webhook host
+WEBHOOK_HTTP_POOL_SIZE = 10
+
+# Number of webhook hosts and message queues which clients are kept by a worker
+# process
+WEBHOOK_CLIENTS_CACHE_SIZE = 256
+
+# Number of due deliveries taken by a single run of the dispatcher
+WEBHOOK_DELIVERY_BATCH_SIZE = 100
+
+# Maximal number of deliveries sent to a single target url at the same time
+WEBHOOK_TARGET_CONCURRENCY_LIMIT = 5
+
+# Number of seconds by which deliveries over the concurrency limit are postponed
+WEBHOOK_DELIVERY_POSTPONE_DELAY = 5
+
+# Number of seconds after which a delivery not finished by a worker is sent again
+WEBHOOK_DELIVERY_LEASE_TIMEOUT = 5 * 60
+
+# Number of finished deliveries deleted at once by the cleanup task
+WEBHOOK_DELIVERY_DELETE_BATCH_SIZE = 1000
+
+# Failed deliveries are retried with exponential backoff, like Celery tasks with
+# `retry_backoff` set
+WEBHOOK_DELIVERY_MAX_RETRIES = 15
+WEBHOOK_DELIVERY_RETRY_BACKOFF = 60
+WEBHOOK_DELIVERY_RETRY_BACKOFF_MAX = 600
+
+# Payload generators of the models which payloads can be generated by the worker
+PAYLOAD_GENERATORS = {
+    "account.User": generate_customer_payload,
+    "checkout.Checkout": generate_checkout_payload,
+    "invoice.Invoice": generate_invoice_payload,
+    "order.Fulfillment": generate_fulfillment_payload,
+    "order.Order": generate_order_payload,
+    "page.Page": generate_page_payload,
+    "product.Product": generate_product_payload,
+}
+
 
 class WebhookSchemes(str, Enum):
     HTTP = "http"
@@ -40,14 +109,225 @@ def trigger_webhooks_for_event(event_type, data):
         events__event_type__in=[event_type, WebhookEventType.ANY],
         **permissions,
     )
-    webhooks = webhooks.select_related("app").prefetch_related(
-        "app__permissions__content_type"
+    deliveries = WebhookDelivery.objects.bulk_create(
+        [
+            WebhookDelivery(webhook=webhook, event_type=event_type, payload=data)
+            for webhook in webhooks
+        ]
     )
+    if deliveries:
+        dispatch_webhook_deliveries.delay()
+
+
+def get_delivery_retry_delay(attempts_count: int) -> timedelta:
+    seconds = WEBHOOK_DELIVERY_RETRY_BACKOFF * 2 ** (attempts_count - 1)
+    return timedelta(seconds=min(seconds, WEBHOOK_DELIVERY_RETRY_BACKOFF_MAX))
 
-    for webhook in webhooks:
-        send_webhook_request.delay(
-            webhook.pk, webhook.target_url, webhook.secret_key, event_type, data
+
+@app.task
+def dispatch_webhook_deliveries():
+    """Send a batch of due webhook deliveries.
+
+    Deliveries to targets with an open circuit are held until the circuit is
+    closed and the deliveries over the concurrency limit of their target are
+    postponed, so failing or slow targets don't hold the deliveries to others.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        deliveries = list(
+            WebhookDelivery.objects.select_for_update(skip_locked=True, of=("self",))
+            .filter(
+                status__in=[
+                    WebhookDeliveryStatus.PENDING,
+                    WebhookDeliveryStatus.IN_PROGRESS,
+                ],
+                next_retry__lte=now,
+            )
+            .select_related("webhook")
+            .order_by("next_retry", "pk")[:WEBHOOK_DELIVERY_BATCH_SIZE]
+        )
+        target_urls = {delivery.webhook.target_url for delivery in deliveries}
+        deliveries_in_progress = Counter(
+            dict(
+                WebhookDelivery.objects.filter(
+                    status=WebhookDeliveryStatus.IN_PROGRESS,
+                    next_retry__gt=now,
+                    webhook__target_url__in=target_urls,
+                )
+                .order_by()
+                .values_list("webhook__target_url")
+                .annotate(count=Count("pk"))
+            )
         )
+        circuits_open_until = get_circuits_open_until(target_urls)
+
+        deliveries_to_send = []
+        for delivery in deliveries:
+            target_url = delivery.webhook.target_url
+            if target_url in circuits_open_until:
+                delivery.status = WebhookDeliveryStatus.PENDING
+                delivery.next_retry = circuits_open_until[target_url]
+            elif deliveries_in_progress[target_url] >= WEBHOOK_TARGET_CONCURRENCY_LIMIT:
+                delivery.status = WebhookDeliveryStatus.PENDING
+                delivery.next_retry = now + timedelta(
+                    seconds=WEBHOOK_DELIVERY_POSTPONE_DELAY
+                )
+            else:
+                deliveries_in_progress[target_url] += 1
+                delivery.status = WebhookDeliveryStatus.IN_PROGRESS
+                delivery.next_retry = now + timedelta(
+                    seconds=WEBHOOK_DELIVERY_LEASE_TIMEOUT
+                )
+                deliveries_to_send.append(delivery)
+        WebhookDelivery.objects.bulk_update(deliveries, ["status", "next_retry"])
+
+    for delivery in deliveries_to_send:
+        send_webhook_delivery.delay(delivery.pk)
+    if len(deliveries) == WEBHOOK_DELIVERY_BATCH_SIZE:
+        dispatch_webhook_deliveries.delay()
+
+
+@app.task
+def send_webhook_delivery(delivery_id):
+    delivery = (
+        WebhookDelivery.objects.filter(
+            pk=delivery_id, status=WebhookDeliveryStatus.IN_PROGRESS
+        )
+        .select_related("webhook")
+        .first()
+    )
+    if delivery is None:
+        return
+    webhook = delivery.webhook
+    attempt = WebhookDeliveryAttempt(delivery=delivery)
+    start = time.monotonic()
+    try:
+        response = send_webhook(
+            webhook.target_url,
+            webhook.secret_key,
+            delivery.event_type,
+            delivery.payload,
+        )
+    except Exception as e:
+        logger.warning(
+            "[Webhook ID:%r] Failed request to %r for event %r.",
+            webhook.pk,
+            webhook.target_url,
+            delivery.event_type,
+            exc_info=True,
+        )
+        attempt.status = WebhookDeliveryStatus.FAILED
+        attempt.error = str(e)
+        response = e.response if isinstance(e, RequestException) else None
+    else:
+        attempt.status = WebhookDeliveryStatus.SUCCESS
+    attempt.response_time = time.monotonic() - start
+    if response is not None:
+        attempt.response_status_code = response.status_code
+
+    delivery.attempts_count += 1
+    if attempt.status == WebhookDeliveryStatus.SUCCESS:
+        logger.debug(
+            "[Webhook ID:%r] Payload sent to %r for event %r in %.3fs",
+            webhook.pk,
+            webhook.target_url,
+            delivery.event_type,
+            attempt.response_time,
+        )
+        record_delivery_success(webhook.target_url)
+        delivery.status = WebhookDeliveryStatus.SUCCESS
+    else:
+        record_delivery_failure(webhook.target_url)
+        if delivery.attempts_count > WEBHOOK_DELIVERY_MAX_RETRIES:
+            delivery.status = WebhookDeliveryStatus.FAILED
+        else:
+            delivery.status = WebhookDeliveryStatus.PENDING
+            delivery.next_retry = timezone.now() + get_delivery_retry_delay(
+                delivery.attempts_count
+            )
+    with transaction.atomic():
+        attempt.save()
+        delivery.save(update_fields=["status", "attempts_count", "next_retry"])
+
+
+@app.task
+def delete_old_webhook_deliveries():
+    """Delete finished deliveries older than the retention period in batches.
+
+    The attempts of the deliveries are deleted with them.
+    """
+    created_before = timezone.now() - settings.WEBHOOK_DELIVERIES_RETENTION
+    deliveries = WebhookDelivery.objects.filter(
+        status__in=[WebhookDeliveryStatus.SUCCESS, WebhookDeliveryStatus.FAILED],
+        created__lt=created_before,
+    )
+    while True:
+        pks = list(
+            deliveries.values_list("pk", flat=True)[:WEBHOOK_DELIVERY_DELETE_BATCH_SIZE]
+        )
+        if not pks:
+            break
+        WebhookDelivery.objects.filter(pk__in=pks).delete()
+
+
+@app.task
+def generate_payload_and_trigger_webhooks_for_event(event_type, model_label, pk):
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        logger.warning(
+            "Skipping %s webhooks, %s with pk %s doesn't exist.",
+            event_type,
+            model_label,
+            pk,
+        )
+        return
+    data = PAYLOAD_GENERATORS[model_label](instance)
+    trigger_webhooks_for_event(event_type, data)
+
+
+class RejectCookiesPolicy(DefaultCookiePolicy):
+    """Refuse cookies, the sessions are shared between webhooks of all apps."""
+
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
+
+@lru_cache(maxsize=WEBHOOK_CLIENTS_CACHE_SIZE)
+def get_http_session(scheme: str, netloc: str) -> requests.Session:
+    """Return the session keeping connections to the host open between webhooks."""
+    session = requests.Session()
+    session.cookies = RequestsCookieJar(policy=RejectCookiesPolicy())
+    session.mount(
+        f"{scheme}://",
+        HTTPAdapter(pool_connections=1, pool_maxsize=WEBHOOK_HTTP_POOL_SIZE),
+    )
+    return session
+
+
+@lru_cache(maxsize=WEBHOOK_CLIENTS_CACHE_SIZE)
+def get_sqs_client(region: str, access_key_id: str, secret_access_key: str):
+    return boto3.client(
+        "sqs",
+        region_name=region,
+        aws_access_key_id=access_key_id,
+        aws_secret_access_key=secret_access_key,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_pubsub_client() -> pubsub_v1.PublisherClient:
+    return pubsub_v1.PublisherClient()
+
+
+def clear_webhook_clients():
+    """Drop the sessions and clients kept by the current process."""
+    get_http_session.cache_clear()
+    get_sqs_client.cache_clear()
+    get_pubsub_client.cache_clear()
 
 
 def send_webhook_using_http(target_url, message, domain, signature, event_type):
@@ -57,11 +337,13 @@ def send_webhook_using_http(target_url, message, domain, signature, event_type):
         "X-Saleor-Domain": domain,
         "X-Saleor-Signature": signature,
     }
-
-    response = requests.post(
+    parts = urlparse(target_url)
+    session = get_http_session(parts.scheme.lower(), parts.netloc.lower())
+    response = session.post(
         target_url, data=message, headers=headers, timeout=WEBHOOK_TIMEOUT
     )
     response.raise_for_status()
+    return response
 
 
 def send_webhook_using_aws_sqs(target_url, message, domain, signature, event_type):
@@ -70,12 +352,7 @@ def send_webhook_using_aws_sqs(target_url, message, domain, signature, event_typ
     hostname_parts = parts.hostname.split(".")
     if len(hostname_parts) == 4 and hostname_parts[0] == "sqs":
         region = hostname_parts[1]
-    client = boto3.client(
-        "sqs",
-        region_name=region,
-        aws_access_key_id=parts.username,
-        aws_secret_access_key=parts.password,
-    )
+    client = get_sqs_client(region, parts.username, parts.password)
     queue_url = urlunparse(
         ("https", parts.hostname, parts.path, parts.params, parts.query, parts.fragment)
     )
@@ -97,7 +374,7 @@ def send_webhook_using_google_cloud_pubsub(
     target_url, message, domain, signature, event_type
 ):
     parts = urlparse(target_url)
-    client = pubsub_v1.PublisherClient()
+    client = get_pubsub_client()
     topic_name = parts.path[1:]  # drop the leading slash
     client.publish(
         topic_name,
@@ -108,29 +385,51 @@ def send_webhook_using_google_cloud_pubsub(
     )
 
 
+def send_webhook(target_url, secret, event_type, data) -> Optional[requests.Response]:
+    """Send the payload to the target and return the response of HTTP targets."""
+    parts = urlparse(target_url)
+    scheme = parts.scheme.lower()
+    domain = Site.objects.get_current().domain
+    message = data.encode("utf-8")
+    signature = signature_for_payload(message, secret)
+    with opentracing.global_tracer().start_active_span("webhooks.send") as scope:
+        span = scope.span
+        span.set_tag(opentracing.tags.COMPONENT, "webhooks")
+        span.set_tag("webhooks.event_type", event_type)
+        span.set_tag("webhooks.scheme", scheme)
+        span.set_tag(opentracing.tags.PEER_HOSTNAME, parts.hostname)
+        span.set_tag("webhooks.payload_size", len(message))
+        if scheme in [WebhookSchemes.HTTP, WebhookSchemes.HTTPS]:
+            return send_webhook_using_http(
+                target_url, message, domain, signature, event_type
+            )
+        elif scheme == WebhookSchemes.AWS_SQS:
+            send_webhook_using_aws_sqs(
+                target_url, message, domain, signature, event_type
+            )
+        elif scheme == WebhookSchemes.GOOGLE_CLOUD_PUBSUB:
+            send_webhook_using_google_cloud_pubsub(
+                target_url, message, domain, signature, event_type
+            )
+        else:
+            raise ValueError("Unknown webhook scheme: %r" % (parts.scheme,))
+    return None
+
+
 @app.task(
     autoretry_for=(RequestException,),
     retry_backoff=60,
     retry_kwargs={"max_retries": 15},
 )
 def send_webhook_request(webhook_id, target_url, secret, event_type, data):
-    parts = urlparse(target_url)
-    domain = Site.objects.get_current().domain
-    message = data.encode("utf-8")
-    signature = signature_for_payload(message, secret)
-    if parts.scheme.lower() in [WebhookSchemes.HTTP, WebhookSchemes.HTTPS]:
-        send_webhook_using_http(target_url, message, domain, signature, event_type)
-    elif parts.scheme.lower() == WebhookSchemes.AWS_SQS:
-        send_webhook_using_aws_sqs(target_url, message, domain, signature, event_type)
-    elif parts.scheme.lower() == WebhookSchemes.GOOGLE_CLOUD_PUBSUB:
-        send_webhook_using_google_cloud_pubsub(
-            target_url, message, domain, signature, event_type
-        )
-    else:
-        raise ValueError("Unknown webhook scheme: %r" % (parts.scheme,))
+    # Deliveries are sent with `send_webhook_delivery`, the task is kept to send
+    # the requests queued before the deliveries were introduced.
+    start = time.monotonic()
+    send_webhook(target_url, secret, event_type, data)
     logger.debug(
-        "[Webhook ID:%r] Payload sent to %r for event %r",
+        "[Webhook ID:%r] Payload sent to %r for event %r in %.3fs",
         webhook_id,
         target_url,
         event_type,
+        time.monotonic() - start,
     )
@@ -0,0 +1,81 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from .....webhook.event_types import WebhookEventType
+from ...tasks import WEBHOOK_TIMEOUT, clear_webhook_clients, send_webhook_using_http
+
+WEBHOOKS_COUNT = 50
+
+
+class StubWebhookHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubWebhookServer(ThreadingHTTPServer):
+    daemon_threads = True
+    connections_count = 0
+
+    def process_request(self, request, client_address):
+        self.connections_count += 1
+        super().process_request(request, client_address)
+
+
+@pytest.fixture
+def stub_webhook_server():
+    server = StubWebhookServer(("127.0.0.1", 0), StubWebhookHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    clear_webhook_clients()
+    yield server
+    clear_webhook_clients()
+    server.shutdown()
+    server.server_close()
+
+
+def send_webhook_without_session(target_url, message, domain, signature, event_type):
+    headers = {
+        "Content-Type": "application/json",
+        "X-Saleor-Event": event_type,
+        "X-Saleor-Domain": domain,
+        "X-Saleor-Signature": signature,
+    }
+    response = requests.post(
+        target_url, data=message, headers=headers, timeout=WEBHOOK_TIMEOUT
+    )
+    response.raise_for_status()
+
+
+def send_webhooks(send_webhook, target_url):
+    for _ in range(WEBHOOKS_COUNT):
+        send_webhook(
+            target_url, b"{}", "mirumee.com", "", WebhookEventType.ORDER_CREATED
+        )
+
+
+def test_send_webhook_using_http_reuses_connections(stub_webhook_server):
+    # given
+    host, port = stub_webhook_server.server_address
+    target_url = f"http://{host}:{port}/webhooks/"
+
+    # when
+    send_webhooks(send_webhook_using_http, target_url)
+    pooled_connections_count = stub_webhook_server.connections_count
+    stub_webhook_server.connections_count = 0
+    send_webhooks(send_webhook_without_session, target_url)
+    unpooled_connections_count = stub_webhook_server.connections_count
+
+    # then
+    assert pooled_connections_count == 1
+    assert unpooled_connections_count == WEBHOOKS_COUNT
@@ -6,6 +6,7 @@ import pytest
 
 from ....app.models import App
 from ....webhook.event_types import WebhookEventType
+from ....webhook.models import WebhookDelivery
 from ....webhook.payloads import (
     generate_checkout_payload,
     generate_customer_payload,
@@ -16,7 +17,11 @@ from ....webhook.payloads import (
     generate_product_payload,
 )
 from ...manager import get_plugins_manager
-from ...webhook.tasks import trigger_webhooks_for_event
+from ...webhook.tasks import (
+    PAYLOAD_GENERATORS,
+    generate_payload_and_trigger_webhooks_for_event,
+    trigger_webhooks_for_event,
+)
 
 first_url = "http://www.example.com/first/"
 third_url = "http://www.example.com/third/"
@@ -35,9 +40,9 @@ third_url = "http://www.example.com/third/"
         (WebhookEventType.CUSTOMER_CREATED, 0, set()),
     ],
 )
-@mock.patch("saleor.plugins.webhook.tasks.send_webhook_request.delay")
+@mock.patch("saleor.plugins.webhook.tasks.dispatch_webhook_deliveries.delay")
 def test_trigger_webhooks_for_event_calls_expected_events(
-    mock_request,
+    mock_dispatch,
     event_name,
     total_webhook_calls,
     expected_target_urls,
@@ -73,14 +78,18 @@ def test_trigger_webhooks_for_event_calls_expected_events(
     third_webhook.events.create(event_type=WebhookEventType.ANY)
 
     trigger_webhooks_for_event(event_name, data="")
-    assert mock_request.call_count == total_webhook_calls
+    deliveries = WebhookDelivery.objects.select_related("webhook")
+    assert len(deliveries) == total_webhook_calls
+    assert mock_dispatch.called == bool(total_webhook_calls)
 
-    target_url_calls = {call[0][1] for call in mock_request.call_args_list}
+    target_url_calls = {delivery.webhook.target_url for delivery in deliveries}
     assert target_url_calls == expected_target_urls
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_created(mocked_webhook_trigger, settings, order_with_lines):
+def test_order_created(
+    mocked_webhook_trigger, any_event_webhook, settings, order_with_lines
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_created(order_with_lines)
@@ -92,7 +101,9 @@ def test_order_created(mocked_webhook_trigger, settings, order_with_lines):
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_confirmed(mocked_webhook_trigger, settings, order_with_lines):
+def test_order_confirmed(
+    mocked_webhook_trigger, any_event_webhook, settings, order_with_lines
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_confirmed(order_with_lines)
@@ -104,7 +115,9 @@ def test_order_confirmed(mocked_webhook_trigger, settings, order_with_lines):
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_customer_created(mocked_webhook_trigger, settings, customer_user):
+def test_customer_created(
+    mocked_webhook_trigger, any_event_webhook, settings, customer_user
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.customer_created(customer_user)
@@ -116,7 +129,9 @@ def test_customer_created(mocked_webhook_trigger, settings, customer_user):
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_fully_paid(mocked_webhook_trigger, settings, order_with_lines):
+def test_order_fully_paid(
+    mocked_webhook_trigger, any_event_webhook, settings, order_with_lines
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_fully_paid(order_with_lines)
@@ -128,7 +143,7 @@ def test_order_fully_paid(mocked_webhook_trigger, settings, order_with_lines):
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_product_created(mocked_webhook_trigger, settings, product):
+def test_product_created(mocked_webhook_trigger, any_event_webhook, settings, product):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.product_created(product)
@@ -140,7 +155,7 @@ def test_product_created(mocked_webhook_trigger, settings, product):
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_product_updated(mocked_webhook_trigger, settings, product):
+def test_product_updated(mocked_webhook_trigger, any_event_webhook, settings, product):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.product_updated(product)
@@ -152,7 +167,7 @@ def test_product_updated(mocked_webhook_trigger, settings, product):
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_product_deleted(mocked_webhook_trigger, settings, product):
+def test_product_deleted(mocked_webhook_trigger, any_event_webhook, settings, product):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
 
@@ -179,7 +194,9 @@ def test_product_deleted(mocked_webhook_trigger, settings, product):
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_updated(mocked_webhook_trigger, settings, order_with_lines):
+def test_order_updated(
+    mocked_webhook_trigger, any_event_webhook, settings, order_with_lines
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_updated(order_with_lines)
@@ -191,7 +208,9 @@ def test_order_updated(mocked_webhook_trigger, settings, order_with_lines):
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_order_cancelled(mocked_webhook_trigger, settings, order_with_lines):
+def test_order_cancelled(
+    mocked_webhook_trigger, any_event_webhook, settings, order_with_lines
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.order_cancelled(order_with_lines)
@@ -203,7 +222,9 @@ def test_order_cancelled(mocked_webhook_trigger, settings, order_with_lines):
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_checkout_created(mocked_webhook_trigger, settings, checkout_with_items):
+def test_checkout_created(
+    mocked_webhook_trigger, any_event_webhook, settings, checkout_with_items
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.checkout_created(checkout_with_items)
@@ -215,7 +236,9 @@ def test_checkout_created(mocked_webhook_trigger, settings, checkout_with_items)
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_checkout_updated(mocked_webhook_trigger, settings, checkout_with_items):
+def test_checkout_updated(
+    mocked_webhook_trigger, any_event_webhook, settings, checkout_with_items
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.checkout_updated(checkout_with_items)
@@ -227,7 +250,7 @@ def test_checkout_updated(mocked_webhook_trigger, settings, checkout_with_items)
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_page_created(mocked_webhook_trigger, settings, page):
+def test_page_created(mocked_webhook_trigger, any_event_webhook, settings, page):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.page_created(page)
@@ -239,7 +262,7 @@ def test_page_created(mocked_webhook_trigger, settings, page):
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_page_updated(mocked_webhook_trigger, settings, page):
+def test_page_updated(mocked_webhook_trigger, any_event_webhook, settings, page):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     manager.page_updated(page)
@@ -251,7 +274,7 @@ def test_page_updated(mocked_webhook_trigger, settings, page):
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_page_deleted(mocked_webhook_trigger, settings, page):
+def test_page_deleted(mocked_webhook_trigger, any_event_webhook, settings, page):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     page_id = page.id
@@ -267,7 +290,9 @@ def test_page_deleted(mocked_webhook_trigger, settings, page):
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_invoice_request(mocked_webhook_trigger, settings, fulfilled_order):
+def test_invoice_request(
+    mocked_webhook_trigger, any_event_webhook, settings, fulfilled_order
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     invoice = fulfilled_order.invoices.first()
@@ -279,7 +304,9 @@ def test_invoice_request(mocked_webhook_trigger, settings, fulfilled_order):
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_invoice_delete(mocked_webhook_trigger, settings, fulfilled_order):
+def test_invoice_delete(
+    mocked_webhook_trigger, any_event_webhook, settings, fulfilled_order
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     invoice = fulfilled_order.invoices.first()
@@ -291,7 +318,9 @@ def test_invoice_delete(mocked_webhook_trigger, settings, fulfilled_order):
 
 
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
-def test_invoice_sent(mocked_webhook_trigger, settings, fulfilled_order):
+def test_invoice_sent(
+    mocked_webhook_trigger, any_event_webhook, settings, fulfilled_order
+):
     settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
     manager = get_plugins_manager()
     invoice = fulfilled_order.invoices.first()
@@ -300,3 +329,88 @@ def test_invoice_sent(mocked_webhook_trigger, settings, fulfilled_order):
     mocked_webhook_trigger.assert_called_once_with(
         WebhookEventType.INVOICE_SENT, expected_data
     )
+
+
+@mock.patch(
+    "saleor.plugins.webhook.plugin.generate_payload_and_trigger_webhooks_for_event"
+)
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
+def test_order_created_without_subscribers_skips_payload(
+    mocked_webhook_trigger,
+    mocked_deferred_webhook_trigger,
+    webhook,
+    settings,
+    order_with_lines,
+):
+    # given
+    settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
+    manager = get_plugins_manager()
+    mocked_generate_payload = mock.Mock()
+
+    # when
+    with mock.patch.dict(PAYLOAD_GENERATORS, {"order.Order": mocked_generate_payload}):
+        manager.order_created(order_with_lines)
+
+    # then
+    mocked_generate_payload.assert_not_called()
+    mocked_webhook_trigger.assert_not_called()
+    mocked_deferred_webhook_trigger.delay.assert_not_called()
+
+
+@pytest.mark.django_db(transaction=True)
+@mock.patch(
+    "saleor.plugins.webhook.plugin.generate_payload_and_trigger_webhooks_for_event"
+)
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
+def test_order_created_with_deferred_payload(
+    mocked_webhook_trigger,
+    mocked_deferred_webhook_trigger,
+    any_event_webhook,
+    settings,
+    order_with_lines,
+):
+    # given
+    settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
+    settings.WEBHOOK_DEFER_PAYLOADS = True
+    manager = get_plugins_manager()
+
+    # when
+    manager.order_created(order_with_lines)
+
+    # then
+    mocked_webhook_trigger.assert_not_called()
+    mocked_deferred_webhook_trigger.delay.assert_called_once_with(
+        WebhookEventType.ORDER_CREATED, "order.Order", str(order_with_lines.pk)
+    )
+
+
+@mock.patch("saleor.plugins.webhook.tasks.trigger_webhooks_for_event")
+def test_generate_payload_and_trigger_webhooks_for_event(
+    mocked_webhook_trigger, order_with_lines
+):
+    # when
+    generate_payload_and_trigger_webhooks_for_event(
+        WebhookEventType.ORDER_CREATED, "order.Order", str(order_with_lines.pk)
+    )
+
+    # then
+    mocked_webhook_trigger.assert_called_once_with(
+        WebhookEventType.ORDER_CREATED, generate_order_payload(order_with_lines)
+    )
+
+
+@mock.patch("saleor.plugins.webhook.tasks.trigger_webhooks_for_event")
+def test_generate_payload_and_trigger_webhooks_for_deleted_instance(
+    mocked_webhook_trigger, order_with_lines
+):
+    # given
+    order_pk = str(order_with_lines.pk)
+    order_with_lines.delete()
+
+    # when
+    generate_payload_and_trigger_webhooks_for_event(
+        WebhookEventType.ORDER_CREATED, "order.Order", order_pk
+    )
+
+    # then
+    mocked_webhook_trigger.assert_not_called()
@@ -0,0 +1,276 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+from requests.exceptions import ConnectionError
+
+from ....webhook import WebhookDeliveryStatus
+from ....webhook.event_types import WebhookEventType
+from ....webhook.models import (
+    WebhookDelivery,
+    WebhookDeliveryAttempt,
+    WebhookTargetCircuit,
+)
+from ..circuit_breaker import (
+    CIRCUIT_FAILURES_THRESHOLD,
+    CIRCUIT_FAILURES_TIMEOUT,
+    get_circuits_open_until,
+    record_delivery_failure,
+    record_delivery_success,
+)
+from ..tasks import (
+    WEBHOOK_DELIVERY_MAX_RETRIES,
+    delete_old_webhook_deliveries,
+    dispatch_webhook_deliveries,
+    send_webhook_delivery,
+)
+
+
+@pytest.fixture(autouse=True)
+def closed_circuits(webhook):
+    record_delivery_success(webhook.target_url)
+
+
+def create_deliveries(webhook, count, **kwargs):
+    return WebhookDelivery.objects.bulk_create(
+        [
+            WebhookDelivery(
+                webhook=webhook,
+                event_type=WebhookEventType.ORDER_CREATED,
+                payload="{}",
+                **kwargs,
+            )
+            for _ in range(count)
+        ]
+    )
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_delivery.delay")
+def test_dispatch_webhook_deliveries(mocked_send_delivery, webhook):
+    # given
+    due_deliveries = create_deliveries(webhook, 2)
+    create_deliveries(webhook, 1, next_retry=timezone.now() + timedelta(minutes=1))
+
+    # when
+    dispatch_webhook_deliveries()
+
+    # then
+    sent_ids = {call[0][0] for call in mocked_send_delivery.call_args_list}
+    assert sent_ids == {delivery.pk for delivery in due_deliveries}
+    assert (
+        set(
+            WebhookDelivery.objects.filter(
+                status=WebhookDeliveryStatus.IN_PROGRESS
+            ).values_list("pk", flat=True)
+        )
+        == sent_ids
+    )
+
+
+@mock.patch("saleor.plugins.webhook.tasks.WEBHOOK_TARGET_CONCURRENCY_LIMIT", 2)
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_delivery.delay")
+def test_dispatch_webhook_deliveries_concurrency_limit(mocked_send_delivery, webhook):
+    # given
+    other_webhook = webhook.app.webhooks.create(
+        target_url="http://www.example.com/other"
+    )
+    record_delivery_success(other_webhook.target_url)
+    create_deliveries(webhook, 3)
+    other_delivery = create_deliveries(other_webhook, 1)[0]
+
+    # when
+    dispatch_webhook_deliveries()
+
+    # then
+    assert mocked_send_delivery.call_count == 3
+    mocked_send_delivery.assert_any_call(other_delivery.pk)
+    postponed_delivery = WebhookDelivery.objects.get(
+        status=WebhookDeliveryStatus.PENDING
+    )
+    assert postponed_delivery.webhook == webhook
+    assert postponed_delivery.next_retry > timezone.now()
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_delivery.delay")
+def test_dispatch_webhook_deliveries_holds_deliveries_to_open_circuit(
+    mocked_send_delivery, webhook
+):
+    # given
+    delivery = create_deliveries(webhook, 1)[0]
+    for _ in range(CIRCUIT_FAILURES_THRESHOLD):
+        record_delivery_failure(webhook.target_url)
+
+    # when
+    dispatch_webhook_deliveries()
+
+    # then
+    mocked_send_delivery.assert_not_called()
+    delivery.refresh_from_db()
+    assert delivery.status == WebhookDeliveryStatus.PENDING
+    assert (
+        delivery.next_retry
+        == get_circuits_open_until([webhook.target_url])[webhook.target_url]
+    )
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook")
+def test_send_webhook_delivery(mocked_send_webhook, webhook):
+    # given
+    mocked_send_webhook.return_value = mock.Mock(status_code=200)
+    delivery = create_deliveries(webhook, 1, status=WebhookDeliveryStatus.IN_PROGRESS)[
+        0
+    ]
+
+    # when
+    send_webhook_delivery(delivery.pk)
+
+    # then
+    mocked_send_webhook.assert_called_once_with(
+        webhook.target_url,
+        webhook.secret_key,
+        WebhookEventType.ORDER_CREATED,
+        "{}",
+    )
+    delivery.refresh_from_db()
+    assert delivery.status == WebhookDeliveryStatus.SUCCESS
+    assert delivery.attempts_count == 1
+    attempt = delivery.attempts.get()
+    assert attempt.status == WebhookDeliveryStatus.SUCCESS
+    assert attempt.response_status_code == 200
+    assert attempt.response_time is not None
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook")
+def test_send_webhook_delivery_failed(mocked_send_webhook, webhook):
+    # given
+    mocked_send_webhook.side_effect = ConnectionError("Connection refused")
+    delivery = create_deliveries(webhook, 1, status=WebhookDeliveryStatus.IN_PROGRESS)[
+        0
+    ]
+
+    # when
+    send_webhook_delivery(delivery.pk)
+
+    # then
+    delivery.refresh_from_db()
+    assert delivery.status == WebhookDeliveryStatus.PENDING
+    assert delivery.attempts_count == 1
+    assert delivery.next_retry > timezone.now() + timedelta(seconds=50)
+    attempt = delivery.attempts.get()
+    assert attempt.status == WebhookDeliveryStatus.FAILED
+    assert attempt.error == "Connection refused"
+    assert attempt.response_status_code is None
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook")
+def test_send_webhook_delivery_failed_after_max_retries(mocked_send_webhook, webhook):
+    # given
+    mocked_send_webhook.side_effect = ConnectionError("Connection refused")
+    delivery = create_deliveries(
+        webhook,
+        1,
+        status=WebhookDeliveryStatus.IN_PROGRESS,
+        attempts_count=WEBHOOK_DELIVERY_MAX_RETRIES,
+    )[0]
+
+    # when
+    send_webhook_delivery(delivery.pk)
+
+    # then
+    delivery.refresh_from_db()
+    assert delivery.status == WebhookDeliveryStatus.FAILED
+    assert delivery.attempts_count == WEBHOOK_DELIVERY_MAX_RETRIES + 1
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook")
+def test_send_webhook_delivery_not_in_progress(mocked_send_webhook, webhook):
+    # given
+    delivery = create_deliveries(webhook, 1, status=WebhookDeliveryStatus.SUCCESS)[0]
+
+    # when
+    send_webhook_delivery(delivery.pk)
+
+    # then
+    mocked_send_webhook.assert_not_called()
+
+
+@mock.patch("saleor.plugins.webhook.tasks.WEBHOOK_DELIVERY_DELETE_BATCH_SIZE", 2)
+def test_delete_old_webhook_deliveries(webhook, settings):
+    # given
+    settings.WEBHOOK_DELIVERIES_RETENTION = timedelta(days=7)
+    old_finished = [
+        *create_deliveries(webhook, 2, status=WebhookDeliveryStatus.SUCCESS),
+        *create_deliveries(webhook, 1, status=WebhookDeliveryStatus.FAILED),
+    ]
+    old_pending = create_deliveries(webhook, 1, status=WebhookDeliveryStatus.PENDING)
+    recent = create_deliveries(webhook, 1, status=WebhookDeliveryStatus.SUCCESS)
+    WebhookDeliveryAttempt.objects.bulk_create(
+        [
+            WebhookDeliveryAttempt(delivery=delivery, status=delivery.status)
+            for delivery in old_finished + recent
+        ]
+    )
+    WebhookDelivery.objects.filter(
+        pk__in=[delivery.pk for delivery in old_finished + old_pending]
+    ).update(created=timezone.now() - timedelta(days=8))
+
+    # when
+    delete_old_webhook_deliveries()
+
+    # then
+    assert set(WebhookDelivery.objects.values_list("pk", flat=True)) == {
+        old_pending[0].pk,
+        recent[0].pk,
+    }
+    assert WebhookDeliveryAttempt.objects.get().delivery_id == recent[0].pk
+
+
+def test_circuit_breaker(webhook):
+    # given
+    target_url = webhook.target_url
+
+    # when
+    for _ in range(CIRCUIT_FAILURES_THRESHOLD - 1):
+        record_delivery_failure(target_url)
+    open_before_threshold = get_circuits_open_until([target_url])
+    record_delivery_failure(target_url)
+    open_after_threshold = get_circuits_open_until([target_url])
+    record_delivery_success(target_url)
+
+    # then
+    assert open_before_threshold == {}
+    assert open_after_threshold[target_url] > timezone.now()
+    assert get_circuits_open_until([target_url]) == {}
+
+
+def test_circuit_breaker_shared_without_cache(webhook):
+    # given
+    target_url = webhook.target_url
+    for _ in range(CIRCUIT_FAILURES_THRESHOLD):
+        record_delivery_failure(target_url)
+
+    # when
+    cache.clear()
+
+    # then
+    assert target_url in get_circuits_open_until([target_url])
+
+
+def test_circuit_breaker_forgets_old_failures(webhook):
+    # given
+    target_url = webhook.target_url
+    for _ in range(CIRCUIT_FAILURES_THRESHOLD - 1):
+        record_delivery_failure(target_url)
+    WebhookTargetCircuit.objects.filter(target_url=target_url).update(
+        last_failure=timezone.now() - timedelta(seconds=CIRCUIT_FAILURES_TIMEOUT + 1)
+    )
+
+    # when
+    record_delivery_failure(target_url)
+
+    # then
+    assert get_circuits_open_until([target_url]) == {}
+    circuit = WebhookTargetCircuit.objects.get(target_url=target_url)
+    assert circuit.failures_count == 1
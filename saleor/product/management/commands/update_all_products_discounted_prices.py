@@ -5,7 +5,10 @@ from tqdm import tqdm
 
 from ....discount.utils import fetch_active_discounts
 from ...models import Product
-from ...utils.variant_prices import update_product_discounted_price
+from ...utils.variant_prices import (
+    DISCOUNTED_PRICES_BATCH_SIZE,
+    update_products_discounted_prices,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +20,13 @@ class Command(BaseCommand):
         self.stdout.write('Updating "discounted_price" field of all the products.')
         # Fetching the discounts just once and reusing them
         discounts = fetch_active_discounts()
-        # Run the update on all the products with "progress bar" (tqdm)
-        qs = Product.objects.all()
-        for product in tqdm(qs.iterator(), total=qs.count()):
-            update_product_discounted_price(product, discounts=discounts)
+        # Run the update on batches of products with "progress bar" (tqdm)
+        product_ids = list(Product.objects.order_by("pk").values_list("pk", flat=True))
+        with tqdm(total=len(product_ids)) as progress_bar:
+            for start in range(0, len(product_ids), DISCOUNTED_PRICES_BATCH_SIZE):
+                end = start + DISCOUNTED_PRICES_BATCH_SIZE
+                batch_ids = product_ids[start:end]
+                update_products_discounted_prices(
+                    Product.objects.filter(pk__in=batch_ids), discounts=discounts
+                )
+                progress_bar.update(len(batch_ids))
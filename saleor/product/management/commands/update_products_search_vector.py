@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from ...models import Product
+from ...search import update_products_search_vector
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the search vector of all the products."
+
+    def handle(self, *args, **options):
+        self.stdout.write('Updating "search_vector" field of all the products.')
+        update_products_search_vector(Product.objects.all())
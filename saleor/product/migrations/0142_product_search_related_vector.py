@@ -0,0 +1,144 @@
+from collections import defaultdict
+
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import TextField, Value
+
+from saleor.core.utils.editorjs import clean_editor_js
+
+BATCH_SIZE = 300
+
+
+def prepare_search_vector(texts, weight):
+    text = " ".join(text for text in texts if text)
+    return SearchVector(
+        Value(text, output_field=TextField()), config="english", weight=weight
+    )
+
+
+def update_products_search_related_vector(apps, schema_editor):
+    """Index SKUs, variant names, attribute values and translations of products.
+
+    Saving the vector fires the trigger, which adds it to the search vector.
+    """
+    Product = apps.get_model("product", "Product")
+    ProductVariant = apps.get_model("product", "ProductVariant")
+    ProductTranslation = apps.get_model("product", "ProductTranslation")
+    ProductVariantTranslation = apps.get_model("product", "ProductVariantTranslation")
+    AssignedProductAttributeValue = apps.get_model(
+        "attribute", "AssignedProductAttributeValue"
+    )
+    AssignedVariantAttributeValue = apps.get_model(
+        "attribute", "AssignedVariantAttributeValue"
+    )
+
+    last_pk = 0
+    while True:
+        pks = list(
+            Product.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:BATCH_SIZE]
+        )
+        if not pks:
+            break
+
+        main = defaultdict(list)
+        secondary = defaultdict(list)
+        translated_descriptions = defaultdict(list)
+        variants = ProductVariant.objects.filter(product_id__in=pks)
+        for product_id, sku, name in variants.values_list("product_id", "sku", "name"):
+            main[product_id].append(sku)
+            secondary[product_id].append(name)
+        translations = ProductTranslation.objects.filter(product_id__in=pks)
+        for product_id, name, description in translations.values_list(
+            "product_id", "name", "description"
+        ):
+            secondary[product_id].append(name)
+            translated_descriptions[product_id].append(
+                clean_editor_js(description, to_string=True)
+            )
+        related_names = [
+            ProductVariantTranslation.objects.filter(
+                product_variant__product_id__in=pks
+            ).values_list("product_variant__product_id", "name"),
+            AssignedProductAttributeValue.objects.filter(
+                assignment__product_id__in=pks
+            ).values_list("assignment__product_id", "value__name"),
+            AssignedVariantAttributeValue.objects.filter(
+                assignment__variant__product_id__in=pks
+            ).values_list("assignment__variant__product_id", "value__name"),
+        ]
+        for names in related_names:
+            for product_id, name in names:
+                secondary[product_id].append(name)
+
+        products = [
+            Product(
+                pk=pk,
+                search_related_vector=(
+                    prepare_search_vector(main[pk], "A")
+                    + prepare_search_vector(secondary[pk], "B")
+                    + prepare_search_vector(translated_descriptions[pk], "D")
+                ),
+            )
+            for pk in pks
+        ]
+        Product.objects.bulk_update(products, ["search_related_vector"])
+        last_pk = pks[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("attribute", "0006_auto_20210105_1031"),
+        ("product", "0141_update_product_ts_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="search_related_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                blank=True, null=True
+            ),
+        ),
+        migrations.RunSQL(
+            """
+            CREATE OR REPLACE FUNCTION product_trigger() RETURNS trigger AS $$
+            begin
+              new.search_vector :=
+                 setweight(
+                 to_tsvector('pg_catalog.english', coalesce(new.name,'')), 'A'
+                 ) ||
+                 setweight(
+                 to_tsvector(
+                 'pg_catalog.english', coalesce(new.description_plaintext,'')),
+                 'B'
+                 ) ||
+                 coalesce(new.search_related_vector, ''::tsvector);
+              return new;
+            end
+            $$ LANGUAGE plpgsql;
+            """,
+            reverse_sql="""
+            CREATE OR REPLACE FUNCTION product_trigger() RETURNS trigger AS $$
+            begin
+              new.search_vector :=
+                 setweight(
+                 to_tsvector('pg_catalog.english', coalesce(new.name,'')), 'A'
+                 ) ||
+                 setweight(
+                 to_tsvector(
+                 'pg_catalog.english', coalesce(new.description_plaintext,'')),
+                 'B'
+                 );
+              return new;
+            end
+            $$ LANGUAGE plpgsql;
+            """,
+        ),
+        migrations.RunPython(
+            update_products_search_related_vector, migrations.RunPython.noop
+        ),
+    ]
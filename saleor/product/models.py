@@ -313,6 +313,9 @@ class Product(SeoModel, ModelWithMetadata):
     )
     description_plaintext = TextField(blank=True, default="")
     search_vector = SearchVectorField(null=True, blank=True)
+    # Search document of the related objects, like variants, attribute values and
+    # translations, added to the search vector by the database trigger
+    search_related_vector = SearchVectorField(null=True, blank=True)
 
     category = models.ForeignKey(
         Category,
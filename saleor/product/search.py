@@ -0,0 +1,102 @@
+from typing import TYPE_CHECKING, Iterable, List
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, Q, QuerySet, TextField, Value
+
+from ..core.utils.editorjs import clean_editor_js
+from .models import Product
+
+if TYPE_CHECKING:
+    from ..attribute.models import AttributeValue
+
+SEARCH_CONFIG = "english"
+
+# Relations used to build the search document, prefetch them when updating
+# the search vector of many products at once.
+PRODUCT_SEARCH_FIELDS_PREFETCH = [
+    "translations",
+    "attributes__values",
+    "variants__attributes__values",
+    "variants__translations",
+]
+
+PRODUCTS_BATCH_SIZE = 300
+
+
+def _prepare_search_vector(texts: Iterable[str], weight: str) -> SearchVector:
+    text = " ".join(text for text in texts if text)
+    return SearchVector(
+        Value(text, output_field=TextField()), config=SEARCH_CONFIG, weight=weight
+    )
+
+
+def prepare_product_search_related_vector_value(product: Product) -> SearchVector:
+    """Return the search vector expression with the product's related objects.
+
+    The document is built from the variant SKUs (weight A), variant names,
+    attribute values and translated names (weight B) and translated descriptions
+    (weight D). The database trigger adds the product name (weight A) and
+    description (weight B) to it whenever the product is saved.
+    """
+    main: List[str] = []
+    secondary: List[str] = []
+    translated_descriptions: List[str] = []
+
+    for assigned_attribute in product.attributes.all():
+        secondary.extend(value.name for value in assigned_attribute.values.all())
+    for translation in product.translations.all():
+        secondary.append(translation.name)
+        translated_descriptions.append(
+            clean_editor_js(translation.description, to_string=True)
+        )
+    for variant in product.variants.all():
+        main.append(variant.sku)
+        secondary.append(variant.name)
+        for assigned_attribute in variant.attributes.all():
+            secondary.extend(value.name for value in assigned_attribute.values.all())
+        secondary.extend(translation.name for translation in variant.translations.all())
+
+    return (
+        _prepare_search_vector(main, "A")
+        + _prepare_search_vector(secondary, "B")
+        + _prepare_search_vector(translated_descriptions, "D")
+    )
+
+
+def update_products_search_vector(products: QuerySet):
+    """Rebuild the search vector of the given products in batches.
+
+    Only the related objects' part is set here, saving it fires the trigger
+    which builds the whole search vector.
+    """
+    products = products.order_by("pk").prefetch_related(*PRODUCT_SEARCH_FIELDS_PREFETCH)
+    last_pk = 0
+    while True:
+        batch = list(products.filter(pk__gt=last_pk)[:PRODUCTS_BATCH_SIZE])
+        if not batch:
+            break
+        for product in batch:
+            product.search_related_vector = prepare_product_search_related_vector_value(
+                product
+            )
+        Product.objects.bulk_update(batch, ["search_related_vector"])
+        last_pk = batch[-1].pk
+
+
+def update_product_search_vector(product: Product):
+    update_products_search_vector(Product.objects.filter(pk=product.pk))
+
+
+def get_products_with_attribute_value(value: "AttributeValue") -> QuerySet:
+    return Product.objects.filter(
+        Q(pk__in=value.productassignments.values("product_id"))
+        | Q(pk__in=value.variantassignments.values("variant__product_id"))
+    )
+
+
+def search_products(products: QuerySet, phrase: str) -> QuerySet:
+    """Filter products matching the phrase and annotate them with `search_rank`."""
+    query = SearchQuery(phrase, config=SEARCH_CONFIG)
+    return products.filter(search_vector=query).annotate(
+        search_rank=SearchRank(F("search_vector"), query)
+    )
@@ -1,17 +1,23 @@
 from typing import Iterable, List, Optional
 
+from django.db.models import QuerySet
+from django.utils import timezone
+
 from ..attribute.models import Attribute
 from ..celeryconf import app
 from ..discount.models import Sale
 from .models import Product, ProductType, ProductVariant
 from .utils.variant_prices import (
+    get_products_of_catalogues,
+    get_products_of_discount,
     update_product_discounted_price,
     update_products_discounted_prices,
-    update_products_discounted_prices_of_catalogues,
-    update_products_discounted_prices_of_discount,
 )
 from .utils.variants import generate_and_set_variant_name
 
+# Maximal number of products which discounted prices are updated in one task
+DISCOUNTED_PRICES_TASK_SIZE = 10000
+
 
 def _update_variants_names(instance: ProductType, saved_attributes: Iterable):
     """Product variant names are created from names of assigned attributes.
@@ -41,6 +47,21 @@ def update_variants_names(product_type_pk: int, saved_attributes_ids: List[int])
     _update_variants_names(instance, saved_attributes)
 
 
+def _update_products_discounted_prices_in_tasks(products: QuerySet):
+    """Update discounted prices of the products, split into tasks if there are many.
+
+    Small sets of products are updated in the current task; large catalogues are
+    divided into chunks processed by separate tasks, so they can run in parallel.
+    """
+    product_ids = list(products.order_by("pk").values_list("pk", flat=True))
+    if len(product_ids) <= DISCOUNTED_PRICES_TASK_SIZE:
+        update_products_discounted_prices(Product.objects.filter(pk__in=product_ids))
+        return
+    for start in range(0, len(product_ids), DISCOUNTED_PRICES_TASK_SIZE):
+        end = start + DISCOUNTED_PRICES_TASK_SIZE
+        update_products_discounted_prices_task.delay(product_ids=product_ids[start:end])
+
+
 @app.task
 def update_product_discounted_price_task(product_pk: int):
     product = Product.objects.get(pk=product_pk)
@@ -53,15 +74,18 @@ def update_products_discounted_prices_of_catalogues_task(
     category_ids: Optional[List[int]] = None,
     collection_ids: Optional[List[int]] = None,
 ):
-    update_products_discounted_prices_of_catalogues(
-        product_ids, category_ids, collection_ids
-    )
+    products = get_products_of_catalogues(product_ids, category_ids, collection_ids)
+    _update_products_discounted_prices_in_tasks(products)
 
 
 @app.task
 def update_products_discounted_prices_of_discount_task(discount_pk: int):
     discount = Sale.objects.get(pk=discount_pk)
-    update_products_discounted_prices_of_discount(discount)
+    # Boundaries of the sale which passed before now are already reflected
+    Sale.objects.filter(pk=discount_pk).update(
+        discounted_prices_updated_at=timezone.now()
+    )
+    _update_products_discounted_prices_in_tasks(get_products_of_discount(discount))
 
 
 @app.task
@@ -7,7 +7,7 @@ from prices import Money, TaxedMoney, TaxedMoneyRange
 
 from ...plugins.manager import PluginsManager
 from .. import models
-from ..utils.availability import get_product_availability
+from ..utils.availability import ProductTaxes, get_product_availability
 
 
 def test_availability(stock, monkeypatch, settings, channel_USD):
@@ -338,3 +338,22 @@ def test_filter_not_published_product_without_assigned_channel(
 
     not_available_products_pln = models.Product.objects.not_published(channel_PLN.slug)
     assert not_available_products_pln.count() == 1
+
+
+def test_product_taxes_applied_once_per_price(product, monkeypatch):
+    # given
+    taxed_price = TaxedMoney(Money("10.0", "USD"), Money("12.30", "USD"))
+    apply_taxes_mock = Mock(return_value=taxed_price)
+    monkeypatch.setattr(PluginsManager, "apply_taxes_to_product", apply_taxes_mock)
+    taxes = ProductTaxes(PluginsManager(plugins=[]), country="PL")
+
+    # when
+    prices = [
+        taxes.apply(product, Money("10.0", "USD")),
+        taxes.apply(product, Money("10.0", "USD")),
+        taxes.apply(product, Money("15.0", "USD")),
+    ]
+
+    # then
+    assert prices == [taxed_price] * 3
+    assert apply_taxes_mock.call_count == 2
@@ -1,13 +1,19 @@
-from unittest.mock import patch
+from unittest.mock import call, patch
 
 from django.core.management import call_command
 from prices import Money
 
+from ...discount.utils import fetch_active_discounts
+from ..models import Product, ProductChannelListing
 from ..tasks import (
-    update_products_discounted_prices_of_catalogues,
+    update_products_discounted_prices_of_catalogues_task,
     update_products_discounted_prices_task,
 )
-from ..utils.variant_prices import update_product_discounted_price
+from ..utils.variant_prices import (
+    update_product_discounted_price,
+    update_products_discounted_prices,
+    update_products_discounted_prices_of_catalogues,
+)
 
 
 def test_update_product_discounted_price(product, channel_USD):
@@ -109,12 +115,72 @@ def test_update_products_discounted_prices_task(product_list):
 @patch(
     "saleor.product.management.commands"
     ".update_all_products_discounted_prices"
-    ".update_product_discounted_price"
+    ".update_products_discounted_prices"
 )
 def test_management_commmand_update_all_products_discounted_price(
-    mock_update_product_discounted_price, product_list
+    mock_update_products_discounted_prices, product_list
 ):
     call_command("update_all_products_discounted_prices")
-    call_args_list = mock_update_product_discounted_price.call_args_list
-    for (args, kwargs), product in zip(call_args_list, product_list):
-        assert args[0] == product
+    mock_update_products_discounted_prices.assert_called_once()
+    args, kwargs = mock_update_products_discounted_prices.call_args
+    assert list(args[0]) == product_list
+
+
+def test_update_products_discounted_prices_with_sale(
+    product_list, sale, channel_USD, django_assert_num_queries
+):
+    # given
+    sale.products.add(*product_list)
+    discounts = fetch_active_discounts()
+    products = Product.objects.filter(pk__in=[product.pk for product in product_list])
+
+    # when
+    with django_assert_num_queries(7):
+        update_products_discounted_prices(products, discounts)
+
+    # then
+    discounted_prices = [
+        product.channel_listings.get(channel=channel_USD).discounted_price
+        for product in product_list
+    ]
+    assert discounted_prices == [
+        Money("5", "USD"),
+        Money("15", "USD"),
+        Money("25", "USD"),
+    ]
+
+
+def test_update_products_discounted_prices_saves_only_changed_listings(
+    product_list, channel_USD
+):
+    # given
+    update_products_discounted_prices(Product.objects.all())
+    product = product_list[0]
+    variant_channel_listing = product.variants.first().channel_listings.get()
+    variant_channel_listing.price = Money("0.01", "USD")
+    variant_channel_listing.save()
+
+    # when
+    with patch.object(ProductChannelListing.objects, "bulk_update") as bulk_update_mock:
+        update_products_discounted_prices(Product.objects.all())
+
+    # then
+    (changed_listings, fields), _ = bulk_update_mock.call_args
+    assert changed_listings == [product.channel_listings.get()]
+    assert changed_listings[0].discounted_price == variant_channel_listing.price
+
+
+@patch("saleor.product.tasks.DISCOUNTED_PRICES_TASK_SIZE", 2)
+@patch("saleor.product.tasks.update_products_discounted_prices_task.delay")
+def test_update_products_discounted_prices_of_catalogues_task_splits_products(
+    update_products_discounted_prices_task_mock, product_list, category
+):
+    # when
+    update_products_discounted_prices_of_catalogues_task(category_ids=[category.pk])
+
+    # then
+    product_ids = sorted(product.pk for product in product_list)
+    assert update_products_discounted_prices_task_mock.call_args_list == [
+        call(product_ids=product_ids[:2]),
+        call(product_ids=product_ids[2:]),
+    ]
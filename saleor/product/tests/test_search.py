@@ -0,0 +1,72 @@
+from ..models import Product, ProductTranslation
+from ..search import (
+    search_products,
+    update_product_search_vector,
+    update_products_search_vector,
+)
+
+
+def test_update_product_search_vector(product):
+    # given
+    variant = product.variants.get()
+    product_attribute_value = product.attributes.first().values.first()
+    variant_attribute_value = variant.attributes.first().values.first()
+    ProductTranslation.objects.create(
+        product=product, language_code="pl", name="Produkt testowy"
+    )
+
+    # when
+    update_product_search_vector(product)
+
+    # then
+    for phrase in [
+        product.name,
+        variant.sku,
+        product_attribute_value.name,
+        variant_attribute_value.name,
+        "testowy",
+    ]:
+        assert list(search_products(Product.objects.all(), phrase)) == [product]
+
+
+def test_update_products_search_vector_description(product_list):
+    # given
+    product = product_list[0]
+    product.description_plaintext = "Handmade ceramics"
+    product.save(update_fields=["description_plaintext"])
+
+    # when
+    update_products_search_vector(Product.objects.all())
+
+    # then
+    assert list(search_products(Product.objects.all(), "ceramics")) == [product]
+
+
+def test_search_products_rank(product_list):
+    # given
+    product_by_name, product_by_description, _ = product_list
+    product_by_name.name = "Coffee mug"
+    product_by_name.save(update_fields=["name"])
+    product_by_description.description_plaintext = "Perfect for coffee"
+    product_by_description.save(update_fields=["description_plaintext"])
+    update_products_search_vector(Product.objects.all())
+
+    # when
+    results = search_products(Product.objects.all(), "coffee").order_by("-search_rank")
+
+    # then
+    assert list(results) == [product_by_name, product_by_description]
+
+
+def test_product_save_keeps_related_search_vector(product):
+    # given
+    variant = product.variants.get()
+    update_product_search_vector(product)
+
+    # when
+    product.name = "Ceramic mug"
+    product.save(update_fields=["name"])
+
+    # then
+    for phrase in ["mug", variant.sku]:
+        assert list(search_products(Product.objects.all(), phrase)) == [product]
@@ -1,9 +1,9 @@
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple, Union
+from decimal import Decimal
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, Union
 
 import opentracing
-from django.conf import settings
-from prices import MoneyRange, TaxedMoney, TaxedMoneyRange
+from prices import Money, MoneyRange, TaxedMoney, TaxedMoneyRange
 
 from ...channel.models import Channel
 from ...core.utils import to_local_currency
@@ -137,6 +137,145 @@ def get_product_price_range(
         return None
 
 
+class ProductTaxes:
+    """Apply taxes to product prices, once for every product and net price.
+
+    Products usually have many variants with the same price, so the taxes of the
+    product price range and of its variants are calculated once.
+    """
+
+    def __init__(self, plugins: "PluginsManager", country: Optional[str] = None):
+        self.plugins = plugins
+        self.country = country
+        self._taxed_prices: Dict[Tuple[int, Decimal, str], TaxedMoney] = {}
+
+    def apply(self, product: Product, price: Money) -> TaxedMoney:
+        key = (product.id, price.amount, price.currency)
+        if key not in self._taxed_prices:
+            self._taxed_prices[key] = self.plugins.apply_taxes_to_product(
+                product, price, self.country
+            )
+        return self._taxed_prices[key]
+
+
+def get_variants_prices(
+    *,
+    product: Product,
+    variants: Iterable[ProductVariant],
+    variants_channel_listing: Iterable[Optional[ProductVariantChannelListing]],
+    collections: Iterable[Collection],
+    discounts: Iterable[DiscountInfo],
+    channel: Channel,
+) -> Dict[int, Tuple[Money, Money]]:
+    """Return the undiscounted and discounted net price of the product variants.
+
+    Variants not available in the channel are skipped.
+    """
+    variants_channel_listing_dict = {
+        channel_listing.variant_id: channel_listing
+        for channel_listing in variants_channel_listing
+        if channel_listing
+    }
+    prices = {}
+    for variant in variants:
+        variant_channel_listing = variants_channel_listing_dict.get(variant.id)
+        if variant_channel_listing:
+            prices[variant.id] = (
+                variant_channel_listing.price,
+                get_variant_price(
+                    variant=variant,
+                    variant_channel_listing=variant_channel_listing,
+                    product=product,
+                    collections=collections,
+                    discounts=discounts,
+                    channel=channel,
+                ),
+            )
+    return prices
+
+
+def get_product_availability_from_prices(
+    *,
+    product: Product,
+    product_channel_listing: Optional[ProductChannelListing],
+    prices: Iterable[Tuple[Money, Money]],
+    taxes: ProductTaxes,
+    local_currency: Optional[str] = None,
+) -> ProductAvailability:
+    """Return the product availability from the net prices of its variants."""
+    prices = list(prices)
+    discounted = None
+    undiscounted = None
+    discount = None
+    price_range_local = None
+    discount_local_currency = None
+    if prices:
+        undiscounted_prices = [undiscounted for undiscounted, _ in prices]
+        discounted_prices = [discounted for _, discounted in prices]
+        discounted = TaxedMoneyRange(
+            start=taxes.apply(product, min(discounted_prices)),
+            stop=taxes.apply(product, max(discounted_prices)),
+        )
+        undiscounted = TaxedMoneyRange(
+            start=taxes.apply(product, min(undiscounted_prices)),
+            stop=taxes.apply(product, max(undiscounted_prices)),
+        )
+        discount = _get_total_discount_from_range(undiscounted, discounted)
+        price_range_local, discount_local_currency = _get_product_price_range(
+            discounted, undiscounted, local_currency
+        )
+
+    is_visible = (
+        product_channel_listing is not None and product_channel_listing.is_visible
+    )
+    is_on_sale = is_visible and discount is not None
+
+    return ProductAvailability(
+        on_sale=is_on_sale,
+        price_range=discounted,
+        price_range_undiscounted=undiscounted,
+        discount=discount,
+        price_range_local_currency=price_range_local,
+        discount_local_currency=discount_local_currency,
+    )
+
+
+def get_variant_availability_from_prices(
+    *,
+    product: Product,
+    product_channel_listing: Optional[ProductChannelListing],
+    undiscounted_price: Money,
+    discounted_price: Money,
+    taxes: ProductTaxes,
+    local_currency: Optional[str] = None,
+) -> VariantAvailability:
+    """Return the variant availability from its net prices."""
+    discounted = taxes.apply(product, discounted_price)
+    undiscounted = taxes.apply(product, undiscounted_price)
+    discount = _get_total_discount(undiscounted, discounted)
+
+    if local_currency:
+        price_local_currency = to_local_currency(discounted, local_currency)
+        discount_local_currency = to_local_currency(discount, local_currency)
+    else:
+        price_local_currency = None
+        discount_local_currency = None
+
+    is_visible = (
+        product_channel_listing is not None and product_channel_listing.is_visible
+    )
+    is_on_sale = is_visible and discount is not None
+
+    return VariantAvailability(
+        on_sale=is_on_sale,
+        price=discounted,
+        price_undiscounted=undiscounted,
+        discount=discount,
+        price_local_currency=price_local_currency,
+        discount_local_currency=discount_local_currency,
+    )
+
+
 def get_product_availability(
     *,
     product: Product,
@@ -153,8 +292,7 @@ def get_product_availability(
     with opentracing.global_tracer().start_active_span("get_product_availability"):
         if not plugins:
             plugins = get_plugins_manager()
-        discounted = None
-        discounted_net_range = get_product_price_range(
+        prices = get_variants_prices(
             product=product,
             variants=variants,
             variants_channel_listing=variants_channel_listing,
@@ -162,56 +300,12 @@ def get_product_availability(
             discounts=discounts,
             channel=channel,
         )
-        if discounted_net_range is not None:
-            discounted = TaxedMoneyRange(
-                start=plugins.apply_taxes_to_product(
-                    product, discounted_net_range.start, country
-                ),
-                stop=plugins.apply_taxes_to_product(
-                    product, discounted_net_range.stop, country
-                ),
-            )
-
-        undiscounted = None
-        undiscounted_net_range = get_product_price_range(
+        return get_product_availability_from_prices(
             product=product,
-            variants=variants,
-            variants_channel_listing=variants_channel_listing,
-            collections=collections,
-            discounts=[],
-            channel=channel,
-        )
-        if undiscounted_net_range is not None:
-            undiscounted = TaxedMoneyRange(
-                start=plugins.apply_taxes_to_product(
-                    product, undiscounted_net_range.start, country
-                ),
-                stop=plugins.apply_taxes_to_product(
-                    product, undiscounted_net_range.stop, country
-                ),
-            )
-
-        discount = None
-        price_range_local = None
-        discount_local_currency = None
-        if undiscounted_net_range is not None and discounted_net_range is not None:
-            discount = _get_total_discount_from_range(undiscounted, discounted)
-            price_range_local, discount_local_currency = _get_product_price_range(
-                discounted, undiscounted, local_currency
-            )
-
-        is_visible = (
-            product_channel_listing is not None and product_channel_listing.is_visible
-        )
-        is_on_sale = is_visible and discount is not None
-
-        return ProductAvailability(
-            on_sale=is_on_sale,
-            price_range=discounted,
-            price_range_undiscounted=undiscounted,
-            discount=discount,
-            price_range_local_currency=price_range_local,
-            discount_local_currency=discount_local_currency,
+            product_channel_listing=product_channel_listing,
+            prices=prices.values(),
+            taxes=ProductTaxes(plugins, country),
+            local_currency=local_currency,
         )
 
 
@@ -230,53 +324,19 @@ def get_variant_availability(
     with opentracing.global_tracer().start_active_span("get_variant_availability"):
         if not plugins:
             plugins = get_plugins_manager()
-        discounted = plugins.apply_taxes_to_product(
-            product,
-            get_variant_price(
-                variant=variant,
-                variant_channel_listing=variant_channel_listing,
-                product=product,
-                collections=collections,
-                discounts=discounts,
-                channel=channel,
-            ),
-            country,
-        )
-        undiscounted = plugins.apply_taxes_to_product(
-            product,
-            get_variant_price(
-                variant=variant,
-                variant_channel_listing=variant_channel_listing,
-                product=product,
-                collections=collections,
-                discounts=[],
-                channel=channel,
-            ),
-            country,
-        )
-
-        discount = _get_total_discount(undiscounted, discounted)
-
-        if country is None:
-            country = settings.DEFAULT_COUNTRY
-
-        if local_currency:
-            price_local_currency = to_local_currency(discounted, local_currency)
-            discount_local_currency = to_local_currency(discount, local_currency)
-        else:
-            price_local_currency = None
-            discount_local_currency = None
-
-        is_visible = (
-            product_channel_listing is not None and product_channel_listing.is_visible
+        discounted_price = get_variant_price(
+            variant=variant,
+            variant_channel_listing=variant_channel_listing,
+            product=product,
+            collections=collections,
+            discounts=discounts,
+            channel=channel,
         )
-        is_on_sale = is_visible and discount is not None
-
-        return VariantAvailability(
-            on_sale=is_on_sale,
-            price=discounted,
-            price_undiscounted=undiscounted,
-            discount=discount,
-            price_local_currency=price_local_currency,
-            discount_local_currency=discount_local_currency,
+        return get_variant_availability_from_prices(
+            product=product,
+            product_channel_listing=product_channel_listing,
+            undiscounted_price=variant_channel_listing.price,
+            discounted_price=discounted_price,
+            taxes=ProductTaxes(plugins, country),
+            local_currency=local_currency,
         )
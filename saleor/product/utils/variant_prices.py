@@ -1,25 +1,49 @@
 import operator
 from collections import defaultdict
 from functools import reduce
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from django.db.models.query_utils import Q
 from prices import Money
 
+from ...channel.models import Channel
+from ...discount import DiscountInfo, DiscountsIndex
 from ...discount.utils import calculate_discounted_price, fetch_active_discounts
-from ..models import Product, ProductChannelListing, ProductVariantChannelListing
+from ..models import (
+    Collection,
+    CollectionProduct,
+    Product,
+    ProductChannelListing,
+    ProductVariantChannelListing,
+)
 
+# Number of products which discounted prices are calculated together
+DISCOUNTED_PRICES_BATCH_SIZE = 1000
 
-def _get_variant_prices_in_channels_dict(product):
+
+def _get_variant_prices_in_channels_dict(
+    product_ids: Iterable[int],
+) -> Dict[Tuple[int, int], List[Money]]:
     prices_dict = defaultdict(list)
-    for variant_channel_listing in ProductVariantChannelListing.objects.filter(
-        variant__product_id=product
-    ):
-        channel_id = variant_channel_listing.channel_id
-        prices_dict[channel_id].append(variant_channel_listing.price)
+    variant_channel_listings = ProductVariantChannelListing.objects.filter(
+        variant__product_id__in=product_ids
+    ).values_list("variant__product_id", "channel_id", "price_amount", "currency")
+    for product_id, channel_id, price_amount, currency in variant_channel_listings:
+        prices_dict[(product_id, channel_id)].append(Money(price_amount, currency))
     return prices_dict
 
 
+def _get_collections_dict(product_ids: Iterable[int]) -> Dict[int, List[Collection]]:
+    collections_dict = defaultdict(list)
+    collection_products = CollectionProduct.objects.filter(
+        product_id__in=product_ids
+    ).values_list("product_id", "collection_id")
+    for product_id, collection_id in collection_products:
+        # Only the collection ids are needed to match the discounts
+        collections_dict[product_id].append(Collection(id=collection_id))
+    return collections_dict
+
+
 def _get_product_discounted_price(
     variant_prices, product, collections, discounts, channel
 ) -> Optional[Money]:
@@ -33,44 +57,73 @@ def _get_product_discounted_price(
             channel=channel,
         )
         discounted_variants_price.append(discounted_variant_price)
-    return min(discounted_variants_price)
+    return min(discounted_variants_price, default=None)
 
 
-def update_product_discounted_price(product, discounts=None):
-    if discounts is None:
-        discounts = fetch_active_discounts()
-    collections = list(product.collections.all())
-    variant_prices_in_channels_dict = _get_variant_prices_in_channels_dict(product)
+def _update_products_discounted_prices_batch(
+    product_ids: List[int], discounts: DiscountsIndex, channels: Dict[int, Channel]
+):
+    """Recalculate discounted prices of the products with a few queries.
+
+    Only the channel listings which discounted price has changed are saved.
+    """
+    products = Product.objects.only("id", "category_id").in_bulk(product_ids)
+    variant_prices_in_channels_dict = _get_variant_prices_in_channels_dict(product_ids)
+    collections_dict = _get_collections_dict(product_ids)
     changed_products_channels_to_update = []
-    for product_channel_listing in product.channel_listings.all():
+    for product_channel_listing in ProductChannelListing.objects.filter(
+        product_id__in=product_ids
+    ):
+        product_id = product_channel_listing.product_id
         channel_id = product_channel_listing.channel_id
-        variant_prices_dict = variant_prices_in_channels_dict[channel_id]
         product_discounted_price = _get_product_discounted_price(
-            variant_prices_dict,
-            product,
-            collections,
+            variant_prices_in_channels_dict[(product_id, channel_id)],
+            products[product_id],
+            collections_dict[product_id],
             discounts,
-            product_channel_listing.channel,
+            channels[channel_id],
         )
-        if product_channel_listing.discounted_price != product_discounted_price:
-            product_channel_listing.discounted_price_amount = (
-                product_discounted_price.amount
-            )
+        discounted_price_amount = (
+            product_discounted_price.amount
+            if product_discounted_price is not None
+            else None
+        )
+        if product_channel_listing.discounted_price_amount != discounted_price_amount:
+            product_channel_listing.discounted_price_amount = discounted_price_amount
             changed_products_channels_to_update.append(product_channel_listing)
     ProductChannelListing.objects.bulk_update(
-        changed_products_channels_to_update, ["discounted_price_amount"]
+        changed_products_channels_to_update,
+        ["discounted_price_amount"],
+        batch_size=DISCOUNTED_PRICES_BATCH_SIZE,
+    )
+
+
+def update_product_discounted_price(product, discounts=None):
+    update_products_discounted_prices(
+        Product.objects.filter(pk=product.pk), discounts=discounts
     )
 
 
-def update_products_discounted_prices(products, discounts=None):
+def update_products_discounted_prices(
+    products, discounts: Optional[Iterable[DiscountInfo]] = None
+):
+    product_ids = list(products.order_by("pk").values_list("pk", flat=True))
+    if not product_ids:
+        return
     if discounts is None:
         discounts = fetch_active_discounts()
-
-    for product in products.prefetch_related("channel_listings"):
-        update_product_discounted_price(product, discounts)
+    if not isinstance(discounts, DiscountsIndex):
+        discounts = DiscountsIndex(discounts)
+    channels = Channel.objects.in_bulk()
+
+    for start in range(0, len(product_ids), DISCOUNTED_PRICES_BATCH_SIZE):
+        end = start + DISCOUNTED_PRICES_BATCH_SIZE
+        _update_products_discounted_prices_batch(
+            product_ids[start:end], discounts, channels
+        )
 
 
-def update_products_discounted_prices_of_catalogues(
+def get_products_of_catalogues(
     product_ids=None, category_ids=None, collection_ids=None
 ):
     # Building the matching products query
@@ -82,17 +135,27 @@ def update_products_discounted_prices_of_catalogues(
     if collection_ids:
         q_list.append(Q(collectionproduct__collection_id__in=collection_ids))
     # Asserting that the function was called with some ids
-    if q_list:
-        # Querying the products
-        q_or = reduce(operator.or_, q_list)
-        products = Product.objects.filter(q_or).distinct()
+    if not q_list:
+        return Product.objects.none()
+    # Querying the products
+    q_or = reduce(operator.or_, q_list)
+    return Product.objects.filter(q_or).distinct()
 
-        update_products_discounted_prices(products)
 
-
-def update_products_discounted_prices_of_discount(discount):
-    update_products_discounted_prices_of_catalogues(
+def get_products_of_discount(discount):
+    return get_products_of_catalogues(
         product_ids=discount.products.all().values_list("id", flat=True),
         category_ids=discount.categories.all().values_list("id", flat=True),
         collection_ids=discount.collections.all().values_list("id", flat=True),
     )
+
+
+def update_products_discounted_prices_of_catalogues(
+    product_ids=None, category_ids=None, collection_ids=None
+):
+    products = get_products_of_catalogues(product_ids, category_ids, collection_ids)
+    update_products_discounted_prices(products)
+
+
+def update_products_discounted_prices_of_discount(discount):
+    update_products_discounted_prices(get_products_of_discount(discount))
@@ -392,6 +392,28 @@ PLAYGROUND_ENABLED = get_bool_from_env("PLAYGROUND_ENABLED", True)
 ALLOWED_HOSTS = get_list(os.environ.get("ALLOWED_HOSTS", "localhost,127.0.0.1"))
 ALLOWED_GRAPHQL_ORIGINS = get_list(os.environ.get("ALLOWED_GRAPHQL_ORIGINS", "*"))
 
+# Number of parsed and validated GraphQL queries kept in memory, 0 disables the cache
+GRAPHQL_DOCUMENT_CACHE_SIZE = int(os.environ.get("GRAPHQL_DOCUMENT_CACHE_SIZE", 1000))
+
+# Maximum cost of a GraphQL query calculated before its execution, 0 disables the limit
+GRAPHQL_QUERY_MAX_COST = int(os.environ.get("GRAPHQL_QUERY_MAX_COST", 0))
+
+# Number of seconds the counts of connection items are cached, 0 disables the cache
+GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT = int(
+    os.environ.get("GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT", 0)
+)
+
+# Return the planner estimate as the count of connection items above this number of
+# items, 0 always counts the items exactly
+GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD = int(
+    os.environ.get("GRAPHQL_TOTAL_COUNT_ESTIMATE_THRESHOLD", 0)
+)
+
+# Resolve consecutive queries of a batched request together to share data loaders
+GRAPHQL_CONCURRENT_BATCH_QUERIES = get_bool_from_env(
+    "GRAPHQL_CONCURRENT_BATCH_QUERIES", False
+)
+
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
 
 # Amazon S3 configuration
@@ -480,6 +502,35 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_RESULT_BACKEND = os.environ.get("CELERY_RESULT_BACKEND", None)
+CELERY_BEAT_SCHEDULE = {
+    "update-discounted-prices-of-toggled-sales": {
+        "task": "saleor.discount.tasks.update_discounted_prices_of_toggled_sales_task",
+        "schedule": timedelta(
+            seconds=parse(os.environ.get("SALES_TOGGLE_CHECK_INTERVAL", "1 minute"))
+        ),
+    },
+    "dispatch-webhook-deliveries": {
+        "task": "saleor.plugins.webhook.tasks.dispatch_webhook_deliveries",
+        "schedule": timedelta(
+            seconds=parse(
+                os.environ.get("WEBHOOK_DELIVERIES_DISPATCH_INTERVAL", "10 seconds")
+            )
+        ),
+    },
+    "delete-old-webhook-deliveries": {
+        "task": "saleor.plugins.webhook.tasks.delete_old_webhook_deliveries",
+        "schedule": timedelta(
+            seconds=parse(
+                os.environ.get("WEBHOOK_DELIVERIES_CLEANUP_INTERVAL", "1 hour")
+            )
+        ),
+    },
+}
+
+# Number of products exported by a single task. When set, product exports are
+# split into shards processed in parallel, which requires the Celery result backend.
+# 0 exports all the products in a single task.
+EXPORT_PRODUCTS_SHARD_SIZE = int(os.environ.get("EXPORT_PRODUCTS_SHARD_SIZE", 0))
 
 # Change this value if your application is running behind a proxy,
 # e.g. HTTP_CF_Connecting_IP for Cloudflare or X_FORWARDED_FOR
@@ -575,6 +626,44 @@ if REDIS_URL:
     CACHE_URL = os.environ.setdefault("CACHE_URL", REDIS_URL)
 CACHES = {"default": django_cache_url.config()}
 
+# Whether the default cache is shared between processes. The caches of data which
+# is changed by one process and read by the others are enabled by default only
+# with a shared cache, otherwise the other processes would never see the changes.
+SHARED_CACHE = CACHES["default"]["BACKEND"] not in [
+    "django.core.cache.backends.dummy.DummyCache",
+    "django.core.cache.backends.locmem.LocMemCache",
+]
+
+# Reuse the plugins manager between requests until any plugin configuration changes
+CACHE_PLUGINS_MANAGER = get_bool_from_env("CACHE_PLUGINS_MANAGER", SHARED_CACHE)
+
+# Share the snapshot of active discounts between requests until any sale changes
+CACHE_ACTIVE_DISCOUNTS = get_bool_from_env("CACHE_ACTIVE_DISCOUNTS", SHARED_CACHE)
+
+# Cache quantities of variants available in countries until their stocks change
+CACHE_STOCK_AVAILABILITY = get_bool_from_env("CACHE_STOCK_AVAILABILITY", SHARED_CACHE)
+
+# Share the shipping rules of channels between requests until shipping changes
+CACHE_SHIPPING_RULES = get_bool_from_env("CACHE_SHIPPING_RULES", SHARED_CACHE)
+
+# Share the event types with webhook subscribers between requests until
+# webhooks or apps change
+CACHE_WEBHOOK_SUBSCRIBERS = get_bool_from_env("CACHE_WEBHOOK_SUBSCRIBERS", SHARED_CACHE)
+
+# Share users authenticated with tokens and their permissions between requests
+# for a short time or until the users, their groups or permissions change.
+# Requires a cache shared between processes, otherwise deactivated users and
+# revoked tokens are accepted by the other processes until the entries expire.
+CACHE_USER_AUTH = get_bool_from_env("CACHE_USER_AUTH", False)
+
+# Generate webhook payloads in the worker instead of the request when possible
+WEBHOOK_DEFER_PAYLOADS = get_bool_from_env("WEBHOOK_DEFER_PAYLOADS", False)
+
+# Time for which the finished webhook deliveries and their attempts are kept
+WEBHOOK_DELIVERIES_RETENTION = timedelta(
+    seconds=parse(os.environ.get("WEBHOOK_DELIVERIES_RETENTION", "7 days"))
+)
+
 # Default False because storefront and dashboard don't support expiration of token
 JWT_EXPIRE = get_bool_from_env("JWT_EXPIRE", False)
 JWT_TTL_ACCESS = timedelta(seconds=parse(os.environ.get("JWT_TTL_ACCESS", "5 minutes")))
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+from saleor.shipping.zip_codes import get_zip_code_sort_keys
+
+
+def set_zip_code_rules_sort_keys(apps, schema_editor):
+    ShippingMethodZipCodeRule = apps.get_model("shipping", "ShippingMethodZipCodeRule")
+    rules = list(ShippingMethodZipCodeRule.objects.all())
+    for rule in rules:
+        rule.sort_keys = get_zip_code_sort_keys(rule.start, rule.end)
+    ShippingMethodZipCodeRule.objects.bulk_update(rules, ["sort_keys"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("shipping", "0026_shippingzone_description"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="shippingmethodzipcoderule",
+            name="sort_keys",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.RunPython(set_zip_code_rules_sort_keys, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,7 @@ from typing import TYPE_CHECKING, List, Union
 
 from django.conf import settings
 from django.db import models
+from django.db.models import JSONField  # type: ignore
 from django.db.models import OuterRef, Q, Subquery
 from django_countries.fields import CountryField
 from django_measurement.models import MeasurementField
@@ -20,7 +21,7 @@ from ..core.weight import (
     zero_weight,
 )
 from . import ShippingMethodType
-from .zip_codes import check_shipping_method_for_zip_code
+from .zip_codes import check_shipping_method_for_zip_code, get_zip_code_sort_keys
 
 if TYPE_CHECKING:
     # flake8: noqa
@@ -221,10 +222,16 @@ class ShippingMethodZipCodeRule(models.Model):
     )
     start = models.CharField(max_length=32)
     end = models.CharField(max_length=32, blank=True, null=True)
+    # Start and end of the range converted to comparable keys of zip code formats
+    sort_keys = JSONField(blank=True, default=dict)
 
     class Meta:
         unique_together = ("shipping_method", "start", "end")
 
+    def save(self, *args, **kwargs):
+        self.sort_keys = get_zip_code_sort_keys(self.start, self.end)
+        super().save(*args, **kwargs)
+
 
 class ShippingMethodChannelListing(models.Model):
     shipping_method = models.ForeignKey(
@@ -0,0 +1,186 @@
+import copy
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, List, Optional
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from measurement.measures import Weight
+from prices import Money
+
+from . import ShippingMethodType
+from .models import ShippingMethod, ShippingMethodChannelListing
+from .zip_codes import check_shipping_method_for_zip_code
+
+if TYPE_CHECKING:
+    from ..account.models import Address
+
+
+SHIPPING_RULES_VERSION_CACHE_KEY = "shipping_rules_version"
+SHIPPING_RULES_CACHE_KEY = "shipping_rules_{version}_{channel_id}"
+SHIPPING_RULES_CACHE_TIMEOUT = 60 * 60
+
+# Shipping rules of channels shared by all requests handled by the current
+# process, keyed by the shipping rules version they were fetched for.
+_shipping_rules_tables: Dict[str, Dict[int, "ShippingRulesTable"]] = {}
+
+
+def _is_in_range(value, minimum, maximum) -> bool:
+    if minimum is None:
+        return False
+    return minimum <= value and (maximum is None or value <= maximum)
+
+
+@dataclass
+class ShippingMethodRule:
+    """Conditions under which a shipping method can be used in a channel."""
+
+    shipping_method: ShippingMethod
+    countries: FrozenSet[str]
+    currency: str
+    minimum_order_price_amount: Optional[Decimal]
+    maximum_order_price_amount: Optional[Decimal]
+    excluded_product_ids: FrozenSet[int] = field(default_factory=frozenset)
+
+    def is_applicable(
+        self,
+        price: Money,
+        weight: Weight,
+        country_code: str,
+        product_ids: Iterable[int],
+    ) -> bool:
+        if country_code not in self.countries or price.currency != self.currency:
+            return False
+        if not self.excluded_product_ids.isdisjoint(product_ids):
+            return False
+        method = self.shipping_method
+        if method.type == ShippingMethodType.PRICE_BASED:
+            return _is_in_range(
+                price.amount,
+                self.minimum_order_price_amount,
+                self.maximum_order_price_amount,
+            )
+        if method.type == ShippingMethodType.WEIGHT_BASED:
+            return _is_in_range(
+                weight, method.minimum_order_weight, method.maximum_order_weight
+            )
+        return False
+
+
+@dataclass
+class ShippingRulesTable:
+    """Rules of all shipping methods of a channel ordered by their price."""
+
+    rules: List[ShippingMethodRule]
+
+    def applicable_shipping_methods(
+        self,
+        price: Money,
+        weight: Weight,
+        country_code: str,
+        product_ids: Iterable[int],
+        shipping_address: "Address",
+    ) -> List[ShippingMethod]:
+        """Return the shipping methods that can be used for the given shipment.
+
+        Works like `ShippingMethodQueryset.applicable_shipping_methods_for_instance`
+        without querying the database.
+        """
+        product_ids = set(product_ids)
+        return [
+            copy.copy(rule.shipping_method)
+            for rule in self.rules
+            if rule.is_applicable(price, weight, country_code, product_ids)
+            and not check_shipping_method_for_zip_code(
+                shipping_address, rule.shipping_method
+            )
+        ]
+
+
+def fetch_shipping_rules_table(channel_id: int) -> ShippingRulesTable:
+    channel_listings = (
+        ShippingMethodChannelListing.objects.filter(channel_id=channel_id)
+        .select_related("shipping_method__shipping_zone")
+        .prefetch_related("shipping_method__zip_code_rules")
+        .order_by("price_amount", "shipping_method_id")
+    )
+    method_ids = [listing.shipping_method_id for listing in channel_listings]
+    excluded_products = ShippingMethod.excluded_products.through.objects.filter(
+        shippingmethod_id__in=method_ids
+    ).values_list("shippingmethod_id", "product_id")
+    excluded_product_ids: Dict[int, set] = {
+        method_id: set() for method_id in method_ids
+    }
+    for method_id, product_id in excluded_products:
+        excluded_product_ids[method_id].add(product_id)
+
+    rules = []
+    for listing in channel_listings:
+        shipping_method = listing.shipping_method
+        rules.append(
+            ShippingMethodRule(
+                shipping_method=shipping_method,
+                countries=frozenset(
+                    country.code for country in shipping_method.shipping_zone.countries
+                ),
+                currency=listing.currency,
+                minimum_order_price_amount=listing.minimum_order_price_amount,
+                maximum_order_price_amount=listing.maximum_order_price_amount,
+                excluded_product_ids=frozenset(
+                    excluded_product_ids[shipping_method.pk]
+                ),
+            )
+        )
+    return ShippingRulesTable(rules=rules)
+
+
+def get_shipping_rules_version() -> str:
+    return cache.get_or_set(
+        SHIPPING_RULES_VERSION_CACHE_KEY, lambda: uuid4().hex, timeout=None
+    )
+
+
+def get_shipping_rules_table(channel_id: int) -> ShippingRulesTable:
+    """Return shipping rules of the channel using a shared table.
+
+    The table is kept in the process memory and in the cache shared between
+    processes. It is refetched when the shipping rules version changes, so it
+    requires a cache backend shared by all processes, see `SHARED_CACHE`.
+    """
+    if not settings.CACHE_SHIPPING_RULES:
+        return fetch_shipping_rules_table(channel_id)
+
+    version = get_shipping_rules_version()
+    tables = _shipping_rules_tables.get(version)
+    if tables is None:
+        _shipping_rules_tables.clear()
+        tables = _shipping_rules_tables.setdefault(version, {})
+    table = tables.get(channel_id)
+    if table is None:
+        cache_key = SHIPPING_RULES_CACHE_KEY.format(
+            version=version, channel_id=channel_id
+        )
+        table = cache.get(cache_key)
+        if table is None:
+            table = fetch_shipping_rules_table(channel_id)
+            cache.set(cache_key, table, timeout=SHIPPING_RULES_CACHE_TIMEOUT)
+        tables[channel_id] = table
+    return table
+
+
+def invalidate_shipping_rules():
+    """Force all processes to refetch shipping rules.
+
+    Must be called every time shipping zones, shipping methods, their channel
+    listings, excluded products or zip code rules change. The version is changed
+    again after the current transaction is committed, so the tables fetched in
+    the meantime from the uncommitted data are not used.
+    """
+
+    def invalidate():
+        cache.set(SHIPPING_RULES_VERSION_CACHE_KEY, uuid4().hex, timeout=None)
+
+    invalidate()
+    transaction.on_commit(invalidate)
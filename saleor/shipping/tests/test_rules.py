@@ -0,0 +1,89 @@
+from measurement.measures import Weight
+from prices import Money
+
+from ...checkout.utils import fetch_checkout_lines
+from .. import ShippingMethodType
+from ..models import ShippingMethod, ShippingMethodChannelListing
+from ..rules import get_shipping_rules_table, invalidate_shipping_rules
+
+
+def test_shipping_rules_table_matches_applicable_shipping_methods(
+    checkout_with_item, address, shipping_zone, channel_USD
+):
+    # given
+    checkout = checkout_with_item
+    checkout.shipping_address = address
+    checkout.save(update_fields=["shipping_address"])
+    lines = fetch_checkout_lines(checkout)
+    weight_based = shipping_zone.shipping_methods.create(
+        name="Heavy",
+        type=ShippingMethodType.WEIGHT_BASED,
+        minimum_order_weight=Weight(kg=0),
+    )
+    ShippingMethodChannelListing.objects.create(
+        channel=channel_USD,
+        currency=channel_USD.currency_code,
+        shipping_method=weight_based,
+        price=Money(5, channel_USD.currency_code),
+    )
+    excluded = shipping_zone.shipping_methods.create(
+        name="Excluded", type=ShippingMethodType.PRICE_BASED
+    )
+    ShippingMethodChannelListing.objects.create(
+        channel=channel_USD,
+        currency=channel_USD.currency_code,
+        shipping_method=excluded,
+        minimum_order_price=Money(0, channel_USD.currency_code),
+        price=Money(1, channel_USD.currency_code),
+    )
+    excluded.excluded_products.add(lines[0].product)
+    zip_code_excluded = shipping_zone.shipping_methods.create(
+        name="Zip code excluded", type=ShippingMethodType.PRICE_BASED
+    )
+    ShippingMethodChannelListing.objects.create(
+        channel=channel_USD,
+        currency=channel_USD.currency_code,
+        shipping_method=zip_code_excluded,
+        minimum_order_price=Money(0, channel_USD.currency_code),
+        price=Money(1, channel_USD.currency_code),
+    )
+    zip_code_excluded.zip_code_rules.create(start=address.postal_code)
+    price = Money(100, channel_USD.currency_code)
+
+    # when
+    methods = get_shipping_rules_table(channel_USD.id).applicable_shipping_methods(
+        price=price,
+        weight=checkout.get_total_weight(lines),
+        country_code=address.country.code,
+        product_ids={line.product.id for line in lines},
+        shipping_address=address,
+    )
+
+    # then
+    expected_methods = ShippingMethod.objects.applicable_shipping_methods_for_instance(
+        checkout, channel_id=channel_USD.id, price=price, lines=lines
+    )
+    assert methods == list(expected_methods)
+    assert [method.name for method in methods] == ["Heavy", "DHL"]
+
+
+def test_get_shipping_rules_table_cached(
+    shipping_zone, channel_USD, settings, django_assert_num_queries
+):
+    # given
+    settings.CACHE_SHIPPING_RULES = True
+    invalidate_shipping_rules()
+    table = get_shipping_rules_table(channel_USD.id)
+    method = shipping_zone.shipping_methods.get()
+    method.channel_listings.update(maximum_order_price_amount=1)
+
+    # when
+    with django_assert_num_queries(0):
+        cached_table = get_shipping_rules_table(channel_USD.id)
+    invalidate_shipping_rules()
+    refreshed_table = get_shipping_rules_table(channel_USD.id)
+
+    # then
+    assert cached_table is table
+    assert table.rules[0].maximum_order_price_amount is None
+    assert refreshed_table.rules[0].maximum_order_price_amount == 1
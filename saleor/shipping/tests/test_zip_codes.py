@@ -1,8 +1,14 @@
+from random import Random
 from unittest.mock import patch
 
 import pytest
 
-from ..zip_codes import check_zip_code_in_excluded_range
+from ..models import ShippingMethodZipCodeRule
+from ..zip_codes import (
+    ZipCodeRulesMatcher,
+    check_zip_code_in_excluded_range,
+    get_zip_code_sort_keys,
+)
 
 
 @pytest.mark.parametrize(
@@ -77,3 +83,47 @@ def test_check_uk_islands_follow_uk_check(check_uk_mock, country, code, start, e
     """Check if Isle of Man, Guernsey and Jersey triggers check_uk_zip_code method."""
     assert check_zip_code_in_excluded_range(country, code, start, end)
     check_uk_mock.assert_called_once_with(code, start, end)
+
+
+def generate_zip_code(random, country):
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    if country == "GB":
+        outward = "".join(random.choices(letters, k=random.randint(1, 2)))
+        outward += str(random.randint(0, 30))
+        outward += random.choice(["", random.choice(letters)])
+        inward = str(random.randint(0, 9)) + "".join(random.choices(letters, k=2))
+        return random.choice([f"{outward} {inward}", f"{outward}{inward}"])
+    if country == "IR":
+        characters = letters + "0123456789"
+        return (
+            "".join(random.choices(characters, k=3))
+            + random.choice(["", " "])
+            + "".join(random.choices(characters, k=4))
+        )
+    return f"{random.randint(0, 99):02d}-{random.randint(0, 999):03d}"
+
+
+@pytest.mark.parametrize("country", ["GB", "IR", "PL"])
+def test_zip_code_rules_matcher_matches_excluded_ranges(country):
+    # given
+    random = Random(country)
+    rules = []
+    for _ in range(30):
+        start = generate_zip_code(random, country)
+        end = random.choice([None, "", "invalid", generate_zip_code(random, country)])
+        rules.append(ShippingMethodZipCodeRule(start=start, end=end))
+    for rule in rules[::2]:
+        rule.sort_keys = get_zip_code_sort_keys(rule.start, rule.end)
+    codes = [generate_zip_code(random, country) for _ in range(500)]
+    codes += ["", None, "invalid"] + [rule.start for rule in rules]
+
+    # when
+    matcher = ZipCodeRulesMatcher(rules)
+
+    # then
+    for code in codes:
+        expected = any(
+            check_zip_code_in_excluded_range(country, code, rule.start, rule.end)
+            for rule in rules
+        )
+        assert matcher.is_excluded(country, code) is expected, code
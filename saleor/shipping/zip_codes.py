@@ -1,4 +1,12 @@
 import re
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .models import ShippingMethodZipCodeRule
+
+UK_ZIP_CODE_PATTERN = r"^([A-Z]{1,2})([0-9]+)([A-Z]?) ?([0-9][A-Z]{2})$"
+IRISH_ZIP_CODE_PATTERN = r"([\dA-Z]{3}) ?([\dA-Z]{4})"
 
 
 def group_values(pattern, *values):
@@ -44,8 +52,7 @@ def check_uk_zip_code(code, start, end):
 
     Example zip codes: BH20 2BC  (UK), IM16 7HF  (Isle of Man).
     """
-    pattern = r"^([A-Z]{1,2})([0-9]+)([A-Z]?) ?([0-9][A-Z]{2})$"
-    code, start, end = group_values(pattern, code, start, end)
+    code, start, end = group_values(UK_ZIP_CODE_PATTERN, code, start, end)
     # replace second item of each tuple with it's value casted to int
     code, start, end = cast_tuple_index_to_type(1, int, code, start, end)
     return compare_values(code, start, end)
@@ -56,8 +63,7 @@ def check_irish_zip_code(code, start, end):
 
     Example zip codes: A65 2F0A, A61 2F0G.
     """
-    pattern = r"([\dA-Z]{3}) ?([\dA-Z]{4})"
-    code, start, end = group_values(pattern, code, start, end)
+    code, start, end = group_values(IRISH_ZIP_CODE_PATTERN, code, start, end)
     return compare_values(code, start, end)
 
 
@@ -80,12 +86,121 @@ def check_zip_code_in_excluded_range(country, code, start, end):
     return country_func_map.get(country, check_any_zip_code)(code, start, end)
 
 
+def get_uk_sort_key(code: Optional[str]) -> Optional[str]:
+    """Return a key which orders UK zip codes like `check_uk_zip_code`.
+
+    The district number is prefixed with its length, so it is compared as number.
+    """
+    match = re.match(UK_ZIP_CODE_PATTERN, code or "")
+    if not match:
+        return None
+    area, district, sub_district, inward = match.groups()
+    district = str(int(district))
+    return f"{area:<2}{len(district):02d}{district}{sub_district:<1}{inward}"
+
+
+def get_irish_sort_key(code: Optional[str]) -> Optional[str]:
+    """Return a key which orders Irish zip codes like `check_irish_zip_code`."""
+    match = re.match(IRISH_ZIP_CODE_PATTERN, code or "")
+    if not match:
+        return None
+    return "".join(match.groups())
+
+
+def get_any_sort_key(code: Optional[str]) -> Optional[str]:
+    return code or None
+
+
+# Sort key functions of zip code formats, stored in `ShippingMethodZipCodeRule`
+ZIP_CODE_SORT_KEYS = {
+    "uk": get_uk_sort_key,
+    "irish": get_irish_sort_key,
+}
+
+COUNTRY_ZIP_CODE_FORMATS = {
+    "GB": "uk",  # United Kingdom
+    "IM": "uk",  # Isle of Man
+    "GG": "uk",  # Guernsey
+    "JE": "uk",  # Jersey
+    "IR": "irish",  # Ireland
+}
+
+
+def get_zip_code_sort_keys(start: str, end: Optional[str]) -> Dict[str, List]:
+    """Return sort keys of the zip code range for every zip code format."""
+    return {
+        zip_code_format: [get_sort_key(start), get_sort_key(end)]
+        for zip_code_format, get_sort_key in ZIP_CODE_SORT_KEYS.items()
+    }
+
+
+class ZipCodeRulesMatcher:
+    """Check zip codes against many excluded ranges with a binary search.
+
+    The ranges are converted to the sort keys of a zip code format, merged into
+    disjoint intervals and sorted once per format. Matches the same codes as
+    `check_zip_code_in_excluded_range` called for every range.
+    """
+
+    def __init__(self, zip_code_rules: Iterable["ShippingMethodZipCodeRule"]):
+        self.zip_code_rules = list(zip_code_rules)
+        self._intervals: Dict[str, Tuple[List[str], List[Optional[str]]]] = {}
+
+    def _get_rule_sort_keys(self, rule, zip_code_format: str):
+        if zip_code_format in (rule.sort_keys or {}):
+            return rule.sort_keys[zip_code_format]
+        get_sort_key = ZIP_CODE_SORT_KEYS.get(zip_code_format, get_any_sort_key)
+        return get_sort_key(rule.start), get_sort_key(rule.end)
+
+    def _get_intervals(self, zip_code_format: str):
+        if zip_code_format in self._intervals:
+            return self._intervals[zip_code_format]
+        ranges = []
+        for rule in self.zip_code_rules:
+            start, end = self._get_rule_sort_keys(rule, zip_code_format)
+            # Ranges without a valid start or with the end before the start
+            # never match
+            if start is not None and (end is None or start <= end):
+                ranges.append((start, end))
+        ranges.sort(key=lambda zip_code_range: zip_code_range[0])
+
+        starts: List[str] = []
+        ends: List[Optional[str]] = []
+        for start, end in ranges:
+            if starts and (ends[-1] is None or start <= ends[-1]):
+                if ends[-1] is not None:
+                    ends[-1] = None if end is None else max(ends[-1], end)
+                continue
+            starts.append(start)
+            ends.append(end)
+        self._intervals[zip_code_format] = starts, ends
+        return starts, ends
+
+    def is_excluded(self, country: str, code: Optional[str]) -> bool:
+        zip_code_format = COUNTRY_ZIP_CODE_FORMATS.get(country, "")
+        get_sort_key = ZIP_CODE_SORT_KEYS.get(zip_code_format, get_any_sort_key)
+        key = get_sort_key(code)
+        if key is None:
+            return False
+        starts, ends = self._get_intervals(zip_code_format)
+        index = bisect_right(starts, key) - 1
+        return index >= 0 and (ends[index] is None or key <= ends[index])
+
+
+def get_zip_code_rules_matcher(method) -> ZipCodeRulesMatcher:
+    """Return the matcher of the shipping method zip code rules.
+
+    The matcher is kept on the shipping method instance, so methods shared between
+    requests compile their rules only once.
+    """
+    matcher = getattr(method, "_zip_code_rules_matcher", None)
+    if matcher is None:
+        matcher = ZipCodeRulesMatcher(method.zip_code_rules.all())
+        method._zip_code_rules_matcher = matcher
+    return matcher
+
+
 def check_shipping_method_for_zip_code(customer_shipping_address, method):
     country = customer_shipping_address.country.code
     postal_code = customer_shipping_address.postal_code
-    for zip_code in method.zip_code_rules.all():
-        if check_zip_code_in_excluded_range(
-            country, postal_code, zip_code.start, zip_code.end
-        ):
-            return True
-    return False
+    return get_zip_code_rules_matcher(method).is_excluded(country, postal_code)
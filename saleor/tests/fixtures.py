@@ -3375,6 +3375,23 @@ def webhook(app):
     return webhook
 
 
+@pytest.fixture
+def any_event_webhook(app):
+    app.permissions.set(
+        Permission.objects.filter(
+            codename__in=[
+                permission.codename
+                for permission in WebhookEventType.PERMISSIONS.values()
+            ]
+        )
+    )
+    webhook = Webhook.objects.create(
+        name="Any event webhook", app=app, target_url="http://www.example.com/any"
+    )
+    webhook.events.create(event_type=WebhookEventType.ANY)
+    return webhook
+
+
 @pytest.fixture
 def fake_payment_interface(mocker):
     return mocker.Mock(spec=PaymentInterface)
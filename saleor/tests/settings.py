@@ -47,6 +47,16 @@ PLUGINS_MANAGER = "saleor.plugins.manager.PluginsManager"
 
 PLUGINS = []
 
+# Cache invalidation relies on mutations and is bypassed by fixtures and test
+# transaction rollbacks
+CACHE_PLUGINS_MANAGER = False
+CACHE_ACTIVE_DISCOUNTS = False
+CACHE_STOCK_AVAILABILITY = False
+CACHE_SHIPPING_RULES = False
+CACHE_WEBHOOK_SUBSCRIBERS = False
+CACHE_USER_AUTH = False
+GRAPHQL_DOCUMENT_CACHE_SIZE = 0
+
 PATTERNS_IGNORED_IN_QUERY_CAPTURES: List[Union[Pattern, SimpleLazyObject]] = [
     lazy_re_compile(r"^SET\s+")
 ]
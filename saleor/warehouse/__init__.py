@@ -0,0 +1,17 @@
+class AllocationStrategy:
+    """Determine how stocks of a warehouse are allocated for order lines.
+
+    Stocks of warehouses with the locking strategy are locked for the whole
+    allocation, which is safe but serializes checkouts buying the same variants.
+    The conditional update strategy claims the quantity with a single UPDATE
+    of the stock allocated counter which succeeds only when enough is available,
+    so concurrent checkouts do not wait for each other to compute allocations.
+    """
+
+    LOCK_STOCKS = "lock_stocks"
+    CONDITIONAL_UPDATE = "conditional_update"
+
+    CHOICES = [
+        (LOCK_STOCKS, "Lock stocks while allocating"),
+        (CONDITIONAL_UPDATE, "Allocate with conditional update of stocks"),
+    ]
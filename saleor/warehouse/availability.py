@@ -1,6 +1,10 @@
 from collections import defaultdict
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, DefaultDict, Dict, Iterable, Optional
+from uuid import uuid4
 
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models import Sum
 from django.db.models.functions import Coalesce
 
@@ -11,6 +15,11 @@ if TYPE_CHECKING:
     from ..product.models import Product, ProductVariant
 
 
+STOCK_AVAILABILITY_VERSION_CACHE_KEY = "stock_availability_version"
+STOCK_AVAILABILITY_CACHE_KEY = "stock_availability_{version}_{variant_id}"
+STOCK_AVAILABILITY_CACHE_TIMEOUT = 60 * 10
+
+
 def _get_available_quantity(stocks: StockQuerySet) -> int:
     results = stocks.aggregate(
         total_quantity=Coalesce(Sum("quantity", distinct=True), 0),
@@ -82,3 +91,118 @@ def is_product_in_stock(product: "Product", country_code: str) -> bool:
         country_code, product
     ).annotate_available_quantity()
     return any(stocks.values_list("available_quantity", flat=True))
+
+
+def _fetch_available_quantities(
+    variant_ids: Iterable[int], country_code: Optional[str]
+) -> Dict[int, int]:
+    """Return the highest quantity available in a single shipping zone.
+
+    Only the shipping zones supporting the given country are taken into account,
+    or all of them when the country is unknown.
+    """
+    stocks = Stock.objects.filter(product_variant_id__in=variant_ids)
+    if country_code:
+        stocks = stocks.filter(
+            warehouse__shipping_zones__countries__contains=country_code
+        )
+    stocks = stocks.annotate_available_quantity().values_list(
+        "product_variant_id", "warehouse__shipping_zones", "available_quantity"
+    )
+
+    # A single country code (or a missing country code) can return results from
+    # multiple shipping zones. We want to combine all quantities within a single
+    # zone and then find out which zone contains the highest total.
+    quantity_by_shipping_zone_by_product_variant: DefaultDict[
+        int, DefaultDict[int, int]
+    ] = defaultdict(lambda: defaultdict(int))
+    for variant_id, shipping_zone_id, quantity in stocks:
+        quantity_by_shipping_zone_by_product_variant[variant_id][
+            shipping_zone_id
+        ] += quantity
+    quantities = {variant_id: 0 for variant_id in variant_ids}
+    for (
+        variant_id,
+        quantity_by_shipping_zone,
+    ) in quantity_by_shipping_zone_by_product_variant.items():
+        quantities[variant_id] = max(max(quantity_by_shipping_zone.values()), 0)
+    return quantities
+
+
+def get_stock_availability_version() -> str:
+    return cache.get_or_set(
+        STOCK_AVAILABILITY_VERSION_CACHE_KEY, lambda: uuid4().hex, timeout=None
+    )
+
+
+def get_available_quantities(
+    variant_ids: Iterable[int], country_code: Optional[str]
+) -> Dict[int, int]:
+    """Return quantities of the variants available in the given country.
+
+    The quantities are cached per variant and country, so listing pages asking
+    for the availability of many products read them with a single cache lookup.
+    The cache is invalidated whenever stocks or allocations of a variant change
+    and whenever warehouses are moved between shipping zones, so it has to be
+    shared by all processes, see `SHARED_CACHE`.
+    """
+    variant_ids = list(variant_ids)
+    if not settings.CACHE_STOCK_AVAILABILITY:
+        return _fetch_available_quantities(variant_ids, country_code)
+
+    version = get_stock_availability_version()
+    keys = {
+        variant_id: STOCK_AVAILABILITY_CACHE_KEY.format(
+            version=version, variant_id=variant_id
+        )
+        for variant_id in variant_ids
+    }
+    cached = cache.get_many(keys.values())
+    country_key = country_code or ""
+    quantities = {}
+    for variant_id, key in keys.items():
+        quantities_in_countries = cached.get(key, {})
+        if country_key in quantities_in_countries:
+            quantities[variant_id] = quantities_in_countries[country_key]
+
+    missing_variant_ids = [
+        variant_id for variant_id in variant_ids if variant_id not in quantities
+    ]
+    if missing_variant_ids:
+        fetched = _fetch_available_quantities(missing_variant_ids, country_code)
+        to_cache = {}
+        for variant_id, quantity in fetched.items():
+            key = keys[variant_id]
+            to_cache[key] = {**cached.get(key, {}), country_key: quantity}
+        cache.set_many(to_cache, timeout=STOCK_AVAILABILITY_CACHE_TIMEOUT)
+        quantities.update(fetched)
+    return quantities
+
+
+def invalidate_stock_availability(variant_ids: Optional[Iterable[int]] = None):
+    """Drop the cached availability of the given variants or of all variants.
+
+    Must be called every time stocks or allocations change; without variants
+    when the shipping zones of warehouses or their countries change. The cache
+    is cleared again after the current transaction is committed, so the values
+    calculated in the meantime from the uncommitted data are not kept.
+    """
+
+    def invalidate():
+        if variant_ids is None:
+            cache.set(STOCK_AVAILABILITY_VERSION_CACHE_KEY, uuid4().hex, timeout=None)
+            return
+        version = get_stock_availability_version()
+        cache.delete_many(
+            [
+                STOCK_AVAILABILITY_CACHE_KEY.format(
+                    version=version, variant_id=variant_id
+                )
+                for variant_id in variant_ids
+            ]
+        )
+
+    if variant_ids is not None:
+        variant_ids = list(variant_ids)
+    invalidate()
+    transaction.on_commit(invalidate)
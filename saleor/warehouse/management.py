@@ -1,11 +1,12 @@
 from collections import defaultdict
-from typing import TYPE_CHECKING, Dict
+from typing import TYPE_CHECKING, Dict, Iterable, List
 
 from django.db import transaction
 from django.db.models import F, Sum
-from django.db.models.functions import Coalesce
 
 from ..core.exceptions import AllocationError, InsufficientStock
+from . import AllocationStrategy
+from .availability import invalidate_stock_availability
 from .models import Allocation, Stock, Warehouse
 
 if TYPE_CHECKING:
@@ -20,96 +21,196 @@ def allocate_stock(
 ):
     """Allocate stocks for given `order_line` in given country.
 
-    Function lock for update all stocks and allocations for variant in
-    given country and order by pk. Next, generate the dictionary
-    ({"stock_pk": "quantity_allocated"}) with actual allocated quantity for stocks.
-    Iterate by stocks and allocate as many items as needed or available in stock
-    for order line, until allocated all required quantity for the order line.
-    If there is less quantity in stocks then rise InsufficientStock exception.
+    See `allocate_stocks` for details.
     """
-    stocks = (
-        Stock.objects.select_for_update(of=("self",))
-        .get_variant_stocks_for_country(country_code, order_line.variant)
+    allocate_stocks([order_line], country_code, [quantity])
+
+
+@transaction.atomic
+def allocate_stocks(
+    order_lines: List["OrderLine"], country_code: str, quantities: List[int]
+):
+    """Allocate stocks for given `order_lines` in given country.
+
+    Function lock for update all stocks of the lines variants in warehouses
+    with the `LOCK_STOCKS` allocation strategy in given country in a single query
+    ordered by pk and fetch actual allocated quantity for these stocks with one
+    more query. Stocks of warehouses with the `CONDITIONAL_UPDATE` strategy are
+    fetched without a lock and claimed with a conditional update of their
+    `quantity_allocated` counter, see `_allocate_stock_conditionally`. Next, for
+    every order line iterate by its stocks and allocate as many items as needed
+    or available in stock, until allocated all required quantity for the order
+    line. The lines are processed in order of their variants, so concurrent
+    allocations claim the stocks in the same order. All allocations are created
+    at once. If there is less quantity in stocks then required for any line
+    rise InsufficientStock exception.
+    """
+    variant_ids = {order_line.variant_id for order_line in order_lines}
+    country_stocks = Stock.objects.for_country(country_code).filter(
+        product_variant_id__in=variant_ids
+    )
+    locked_stocks = list(
+        country_stocks.select_for_update(of=("self",))
+        .filter(warehouse__allocation_strategy=AllocationStrategy.LOCK_STOCKS)
         .order_by("pk")
     )
-
-    quantity_allocation_list = list(
-        Allocation.objects.filter(
-            stock__in=stocks,
-            quantity_allocated__gt=0,
-        )
-        .values("stock")
-        .annotate(Sum("quantity_allocated"))
+    unlocked_stocks = list(
+        country_stocks.filter(
+            warehouse__allocation_strategy=AllocationStrategy.CONDITIONAL_UPDATE
+        ).order_by("pk")
     )
-    quantity_allocation_for_stocks: Dict = defaultdict(int)
-    for allocation in quantity_allocation_list:
-        quantity_allocation_for_stocks[allocation["stock"]] += allocation[
-            "quantity_allocated__sum"
-        ]
+    quantity_allocation_for_stocks = _get_quantity_allocated_for_stocks(locked_stocks)
+
+    quantity_available_in_stocks = {
+        stock.pk: stock.quantity - quantity_allocation_for_stocks.get(stock.pk, 0)
+        for stock in locked_stocks
+    }
+    variants_stocks: Dict = defaultdict(list)
+    for stock in sorted(locked_stocks + unlocked_stocks, key=lambda s: s.pk):
+        variants_stocks[stock.product_variant_id].append(stock)
 
-    quantity_allocated = 0
     allocations = []
+    locked_stocks_to_update = {}
+    lines_with_quantities = sorted(
+        zip(order_lines, quantities), key=lambda line: line[0].variant_id
+    )
+    for order_line, quantity in lines_with_quantities:
+        quantity_allocated = 0
+        for stock in variants_stocks[order_line.variant_id]:
+            quantity_to_allocate = quantity - quantity_allocated
+            if stock.pk in quantity_available_in_stocks:
+                quantity_to_allocate = min(
+                    quantity_to_allocate, quantity_available_in_stocks[stock.pk]
+                )
+                if quantity_to_allocate > 0:
+                    quantity_available_in_stocks[stock.pk] -= quantity_to_allocate
+                    stock.quantity_allocated += quantity_to_allocate
+                    locked_stocks_to_update[stock.pk] = stock
+            else:
+                quantity_to_allocate = _allocate_stock_conditionally(
+                    stock, quantity_to_allocate
+                )
+            if quantity_to_allocate > 0:
+                allocations.append(
+                    Allocation(
+                        order_line=order_line,
+                        stock=stock,
+                        quantity_allocated=quantity_to_allocate,
+                    )
+                )
+                quantity_allocated += quantity_to_allocate
+                if quantity_allocated == quantity:
+                    break
+        if not quantity_allocated == quantity:
+            raise InsufficientStock(order_line.variant)
 
-    for stock in stocks:
-        quantity_allocated_in_stock = quantity_allocation_for_stocks.get(stock.pk, 0)
+    Stock.objects.bulk_update(locked_stocks_to_update.values(), ["quantity_allocated"])
+    Allocation.objects.bulk_create(allocations)
+    invalidate_stock_availability(variant_ids)
 
-        quantity_available_in_stock = stock.quantity - quantity_allocated_in_stock
 
-        quantity_to_allocate = min(
-            (quantity - quantity_allocated), quantity_available_in_stock
-        )
-        if quantity_to_allocate > 0:
-            allocations.append(
-                Allocation(
-                    order_line=order_line,
-                    stock=stock,
-                    quantity_allocated=quantity_to_allocate,
-                )
-            )
+def _allocate_stock_conditionally(stock: Stock, quantity: int) -> int:
+    """Claim up to `quantity` items of the stock without locking it beforehand.
+
+    The `quantity_allocated` counter of the stock is increased only when the stock
+    still has enough quantity available, which the database checks atomically
+    while updating the row. When the update does not succeed, the stock is
+    fetched again and the allocation is retried with the quantity that is left.
+    Return the allocated quantity.
+    """
+    quantity_available = stock.quantity - stock.quantity_allocated
+    while quantity_available > 0:
+        quantity_to_allocate = min(quantity, quantity_available)
+        updated = Stock.objects.filter(
+            pk=stock.pk,
+            quantity__gte=F("quantity_allocated") + quantity_to_allocate,
+        ).update(quantity_allocated=F("quantity_allocated") + quantity_to_allocate)
+        if updated:
+            stock.quantity_allocated += quantity_to_allocate
+            return quantity_to_allocate
+        stock.refresh_from_db(fields=["quantity", "quantity_allocated"])
+        quantity_available = stock.quantity - stock.quantity_allocated
+    return 0
+
 
-            quantity_allocated += quantity_to_allocate
-            if quantity_allocated == quantity:
-                Allocation.objects.bulk_create(allocations)
-                break
-    if not quantity_allocated == quantity:
-        raise InsufficientStock(order_line.variant)
+def _get_quantity_allocated_for_stocks(stocks: Iterable[Stock]) -> Dict[int, int]:
+    return dict(
+        Allocation.objects.filter(stock__in=stocks, quantity_allocated__gt=0)
+        .values("stock")
+        .annotate(quantity_allocated_sum=Sum("quantity_allocated"))
+        .values_list("stock", "quantity_allocated_sum")
+    )
 
 
 @transaction.atomic
 def deallocate_stock(order_line: "OrderLine", quantity: int):
     """Deallocate stocks for given `order_line`.
 
-    Function lock for update stocks and allocations related to given `order_line`.
-    Iterate over allocations sorted by `stock.pk` and deallocate as many items
-    as needed of available in stock for order line, until deallocated all required
-    quantity for the order line. If there is less quantity in stocks then
-    raise an exception.
+    See `deallocate_stocks` for details.
+    """
+    deallocate_stocks([order_line], [quantity])
+
+
+@transaction.atomic
+def deallocate_stocks(order_lines: List["OrderLine"], quantities: List[int]):
+    """Deallocate stocks for given `order_lines`.
+
+    Function lock for update stocks and allocations related to given `order_lines`
+    in a single query. For every line iterate over its allocations sorted by
+    `stock.pk` and deallocate as many items as needed of available in stock for
+    order line, until deallocated all required quantity for the order line.
+    All allocations are updated at once. If there is less quantity allocated
+    for any line then raise an exception.
     """
+    _deallocate_stocks(order_lines, quantities, allow_partial=False)
+
+
+def _deallocate_stocks(
+    order_lines: List["OrderLine"], quantities: List[int], allow_partial: bool
+):
     allocations = (
-        order_line.allocations.select_related("stock")
+        Allocation.objects.filter(order_line__in=order_lines)
+        .select_related("stock")
         .select_for_update(
             of=(
                 "self",
                 "stock",
             )
         )
-        .order_by("stock__pk")
+        .order_by("stock__pk", "pk")
     )
-    quantity_dealocated = 0
+    lines_allocations: Dict = defaultdict(list)
     for allocation in allocations:
-        quantity_to_deallocate = min(
-            (quantity - quantity_dealocated), allocation.quantity_allocated
-        )
-        if quantity_to_deallocate > 0:
-            allocation.quantity_allocated = (
-                F("quantity_allocated") - quantity_to_deallocate
+        lines_allocations[allocation.order_line_id].append(allocation)
+
+    allocations_to_update = {}
+    stocks_to_update = {}
+    for order_line, quantity in zip(order_lines, quantities):
+        quantity_dealocated = 0
+        for allocation in lines_allocations[order_line.pk]:
+            quantity_to_deallocate = min(
+                (quantity - quantity_dealocated), allocation.quantity_allocated
             )
-            quantity_dealocated += quantity_to_deallocate
-            if quantity_dealocated == quantity:
-                Allocation.objects.bulk_update(allocations, ["quantity_allocated"])
-                break
-    if not quantity_dealocated == quantity:
-        raise AllocationError(order_line, quantity)
+            if quantity_to_deallocate > 0:
+                allocation.quantity_allocated -= quantity_to_deallocate
+                allocations_to_update[allocation.pk] = allocation
+                stock = stocks_to_update.setdefault(
+                    allocation.stock.pk, allocation.stock
+                )
+                stock.quantity_allocated = max(
+                    stock.quantity_allocated - quantity_to_deallocate, 0
+                )
+                quantity_dealocated += quantity_to_deallocate
+                if quantity_dealocated == quantity:
+                    break
+        if not quantity_dealocated == quantity and not allow_partial:
+            raise AllocationError(order_line, quantity)
+
+    Allocation.objects.bulk_update(
+        allocations_to_update.values(), ["quantity_allocated"]
+    )
+    Stock.objects.bulk_update(stocks_to_update.values(), ["quantity_allocated"])
+    invalidate_stock_availability({order_line.variant_id for order_line in order_lines})
 
 
 @transaction.atomic
@@ -141,6 +242,9 @@ def increase_stock(
             warehouse=warehouse, product_variant=order_line.variant, quantity=quantity
         )
     if allocate:
+        Stock.objects.filter(pk=stock.pk).update(
+            quantity_allocated=F("quantity_allocated") + quantity
+        )
         allocation = order_line.allocations.filter(stock=stock).first()
         if allocation:
             allocation.quantity_allocated = F("quantity_allocated") + quantity
@@ -149,43 +253,53 @@ def increase_stock(
             Allocation.objects.create(
                 order_line=order_line, stock=stock, quantity_allocated=quantity
             )
+    invalidate_stock_availability([order_line.variant_id])
 
 
 @transaction.atomic
 def decrease_stock(order_line: "OrderLine", quantity: int, warehouse_pk: str):
     """Decrease stock quantity for given `order_line` in given warehouse.
 
-    Function deallocate as many quantities as requested if order_line has less quantity
-    from requested function deallocate whole quantity. Next function try to find the
-    stock in a given warehouse, if stock not exists or have not enough stock,
-    the function raise InsufficientStock exception. When the stock has enough quantity
-    function decrease it by given value.
+    See `decrease_stocks` for details.
     """
-    try:
-        deallocate_stock(order_line, quantity)
-    except AllocationError:
-        order_line.allocations.update(quantity_allocated=0)
-
-    try:
-        stock = (
-            order_line.variant.stocks.select_for_update()  # type: ignore
-            .prefetch_related("allocations")
-            .get(warehouse__pk=warehouse_pk)
-        )
-    except Stock.DoesNotExist:
-        error_context = {"order_line": order_line, "warehouse_pk": warehouse_pk}
-        raise InsufficientStock(order_line.variant, error_context)
+    decrease_stocks([order_line], [quantity], warehouse_pk)
+
 
-    quantity_allocated = stock.allocations.aggregate(
-        quantity_allocated=Coalesce(Sum("quantity_allocated"), 0)
-    )["quantity_allocated"]
+@transaction.atomic
+def decrease_stocks(
+    order_lines: List["OrderLine"], quantities: List[int], warehouse_pk: str
+):
+    """Decrease stocks quantities for given `order_lines` in given warehouse.
 
-    if stock.quantity - quantity_allocated < quantity:
-        error_context = {"order_line": order_line, "warehouse_pk": warehouse_pk}
-        raise InsufficientStock(order_line.variant, error_context)
+    Function deallocate as many quantities as requested; if an order line has
+    less quantity allocated, function deallocate its whole quantity. Next
+    function lock the stocks of all lines in a given warehouse in one query.
+    If stock not exists or have not enough stock for any line, the function
+    raise InsufficientStock exception. When the stocks have enough quantity
+    function decrease them by given values at once.
+    """
+    _deallocate_stocks(order_lines, quantities, allow_partial=True)
 
-    stock.quantity = F("quantity") - quantity
-    stock.save(update_fields=["quantity"])
+    variant_ids = {order_line.variant_id for order_line in order_lines}
+    stocks = {
+        stock.product_variant_id: stock
+        for stock in Stock.objects.select_for_update(of=("self",))
+        .filter(warehouse__pk=warehouse_pk, product_variant_id__in=variant_ids)
+        .order_by("pk")
+    }
+    quantity_allocation_for_stocks = _get_quantity_allocated_for_stocks(stocks.values())
+
+    for order_line, quantity in zip(order_lines, quantities):
+        stock = stocks.get(order_line.variant_id)
+        if stock is None or (
+            stock.quantity - quantity_allocation_for_stocks.get(stock.pk, 0) < quantity
+        ):
+            error_context = {"order_line": order_line, "warehouse_pk": warehouse_pk}
+            raise InsufficientStock(order_line.variant, error_context)
+        stock.quantity -= quantity
+
+    Stock.objects.bulk_update(stocks.values(), ["quantity"])
+    invalidate_stock_availability(variant_ids)
 
 
 @transaction.atomic
@@ -194,4 +308,23 @@ def deallocate_stock_for_order(order: "Order"):
     allocations = Allocation.objects.filter(
         order_line__order=order, quantity_allocated__gt=0
     ).select_for_update(of=("self",))
+    quantity_allocated_in_stocks = dict(
+        Allocation.objects.filter(order_line__order=order, quantity_allocated__gt=0)
+        .values("stock")
+        .annotate(quantity_allocated_sum=Sum("quantity_allocated"))
+        .values_list("stock", "quantity_allocated_sum")
+    )
+    stocks = list(
+        Stock.objects.select_for_update(of=("self",))
+        .filter(pk__in=quantity_allocated_in_stocks.keys())
+        .order_by("pk")
+    )
+    for stock in stocks:
+        stock.quantity_allocated = max(
+            stock.quantity_allocated - quantity_allocated_in_stocks[stock.pk], 0
+        )
     allocations.update(quantity_allocated=0)
+    Stock.objects.bulk_update(stocks, ["quantity_allocated"])
+    invalidate_stock_availability(
+        order.lines.exclude(variant=None).values_list("variant_id", flat=True)
+    )
@@ -0,0 +1,46 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def set_stocks_quantity_allocated(apps, schema_editor):
+    Stock = apps.get_model("warehouse", "Stock")
+    Allocation = apps.get_model("warehouse", "Allocation")
+    quantity_allocated = (
+        Allocation.objects.filter(stock=OuterRef("pk"))
+        .values("stock")
+        .annotate(quantity_allocated_sum=Sum("quantity_allocated"))
+        .values("quantity_allocated_sum")
+    )
+    Stock.objects.update(quantity_allocated=Coalesce(Subquery(quantity_allocated), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("warehouse", "0012_auto_20210115_1307"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="warehouse",
+            name="allocation_strategy",
+            field=models.CharField(
+                choices=[
+                    ("lock_stocks", "Lock stocks while allocating"),
+                    (
+                        "conditional_update",
+                        "Allocate with conditional update of stocks",
+                    ),
+                ],
+                default="lock_stocks",
+                max_length=32,
+            ),
+        ),
+        migrations.AddField(
+            model_name="stock",
+            name="quantity_allocated",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(set_stocks_quantity_allocated, migrations.RunPython.noop),
+    ]
@@ -11,6 +11,7 @@ from ..core.models import ModelWithMetadata
 from ..order.models import OrderLine
 from ..product.models import Product, ProductVariant
 from ..shipping.models import ShippingZone
+from . import AllocationStrategy
 
 
 class WarehouseQueryset(models.QuerySet):
@@ -35,6 +36,11 @@ class Warehouse(ModelWithMetadata):
     )
     address = models.ForeignKey(Address, on_delete=models.PROTECT)
     email = models.EmailField(blank=True, default="")
+    allocation_strategy = models.CharField(
+        max_length=32,
+        choices=AllocationStrategy.CHOICES,
+        default=AllocationStrategy.LOCK_STOCKS,
+    )
 
     objects = WarehouseQueryset.as_manager()
 
@@ -93,6 +99,8 @@ class Stock(models.Model):
         ProductVariant, null=False, on_delete=models.CASCADE, related_name="stocks"
     )
     quantity = models.PositiveIntegerField(default=0)
+    # Sum of the allocated quantities, used for allocating without locks
+    quantity_allocated = models.PositiveIntegerField(default=0)
 
     objects = StockQuerySet.as_manager()
 
@@ -0,0 +1,62 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import connection
+from django.db.models import Sum
+
+from ...core.exceptions import InsufficientStock
+from .. import AllocationStrategy
+from ..management import allocate_stocks
+from ..models import Allocation, Stock
+
+COUNTRY_CODE = "US"
+CONCURRENT_CHECKOUTS = 20
+STOCK_QUANTITY = 15
+
+
+@pytest.mark.integration
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="Requires row locks of PostgreSQL."
+)
+@pytest.mark.parametrize(
+    "allocation_strategy",
+    [AllocationStrategy.LOCK_STOCKS, AllocationStrategy.CONDITIONAL_UPDATE],
+)
+def test_allocate_stocks_concurrently(allocation_strategy, order_line, stock):
+    # given
+    warehouse = stock.warehouse
+    warehouse.allocation_strategy = allocation_strategy
+    warehouse.save(update_fields=["allocation_strategy"])
+    lines = [order_line]
+    for _ in range(CONCURRENT_CHECKOUTS - 1):
+        line = order_line.order.lines.get(pk=order_line.pk)
+        line.pk = None
+        line.save()
+        lines.append(line)
+    barrier = threading.Barrier(CONCURRENT_CHECKOUTS)
+
+    def allocate(line):
+        # Every thread uses its own database connection
+        try:
+            barrier.wait()
+            allocate_stocks([line], COUNTRY_CODE, [1])
+            return True
+        except InsufficientStock:
+            return False
+        finally:
+            connection.close()
+
+    # when
+    with ThreadPoolExecutor(max_workers=CONCURRENT_CHECKOUTS) as executor:
+        results = list(executor.map(allocate, lines))
+
+    # then
+    assert results.count(True) == STOCK_QUANTITY
+    stock = Stock.objects.get(pk=stock.pk)
+    allocated = Allocation.objects.filter(stock=stock).aggregate(
+        total=Sum("quantity_allocated")
+    )["total"]
+    assert allocated == STOCK_QUANTITY
+    assert stock.quantity_allocated == STOCK_QUANTITY
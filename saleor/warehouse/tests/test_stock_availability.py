@@ -1,7 +1,13 @@
 import pytest
 
 from ...core.exceptions import InsufficientStock
-from ..availability import check_stock_quantity, get_available_quantity
+from ..availability import (
+    check_stock_quantity,
+    get_available_quantities,
+    get_available_quantity,
+    invalidate_stock_availability,
+)
+from ..management import allocate_stock
 from ..models import Allocation
 
 COUNTRY_CODE = "US"
@@ -66,3 +72,53 @@ def test_get_available_quantity_without_stocks(variant_with_many_stocks):
     variant_with_many_stocks.stocks.all().delete()
     available_quantity = get_available_quantity(variant_with_many_stocks, COUNTRY_CODE)
     assert available_quantity == 0
+
+
+def test_get_available_quantities(variant_with_many_stocks):
+    variant_id = variant_with_many_stocks.pk
+    quantities = get_available_quantities([variant_id], COUNTRY_CODE)
+    assert quantities == {variant_id: 7}
+
+
+def test_get_available_quantities_without_stocks(variant_with_many_stocks):
+    variant_with_many_stocks.stocks.all().delete()
+    variant_id = variant_with_many_stocks.pk
+    quantities = get_available_quantities([variant_id], COUNTRY_CODE)
+    assert quantities == {variant_id: 0}
+
+
+def test_get_available_quantities_cached(
+    variant_with_many_stocks, settings, django_assert_num_queries
+):
+    # given
+    settings.CACHE_STOCK_AVAILABILITY = True
+    variant_id = variant_with_many_stocks.pk
+    assert get_available_quantities([variant_id], COUNTRY_CODE) == {variant_id: 7}
+    variant_with_many_stocks.stocks.update(quantity=1)
+
+    # when
+    with django_assert_num_queries(0):
+        cached_quantities = get_available_quantities([variant_id], COUNTRY_CODE)
+    invalidate_stock_availability([variant_id])
+    quantities = get_available_quantities([variant_id], COUNTRY_CODE)
+
+    # then
+    assert cached_quantities == {variant_id: 7}
+    assert quantities == {variant_id: 2}
+
+
+def test_allocate_stock_invalidates_available_quantities(order_line, stock, settings):
+    # given
+    settings.CACHE_STOCK_AVAILABILITY = True
+    variant_id = order_line.variant_id
+    assert get_available_quantities([variant_id], COUNTRY_CODE) == {
+        variant_id: stock.quantity
+    }
+
+    # when
+    allocate_stock(order_line, COUNTRY_CODE, 3)
+
+    # then
+    assert get_available_quantities([variant_id], COUNTRY_CODE) == {
+        variant_id: stock.quantity - 3
+    }
@@ -3,14 +3,19 @@ from django.db.models import Sum
 from django.db.models.functions import Coalesce
 
 from ...core.exceptions import InsufficientStock
+from .. import AllocationStrategy
 from ..management import (
+    _allocate_stock_conditionally,
     allocate_stock,
+    allocate_stocks,
     deallocate_stock,
     deallocate_stock_for_order,
+    deallocate_stocks,
     decrease_stock,
+    decrease_stocks,
     increase_stock,
 )
-from ..models import Allocation
+from ..models import Allocation, Stock
 
 COUNTRY_CODE = "US"
 
@@ -270,3 +275,126 @@ def test_deallocate_stock_for_order(
     allocations = order_line.allocations.all()
     assert allocations[0].quantity_allocated == 0
     assert allocations[1].quantity_allocated == 0
+
+
+def test_allocate_stocks(order_with_lines):
+    # given
+    lines = list(order_with_lines.lines.all())
+    Allocation.objects.filter(order_line__in=lines).delete()
+
+    # when
+    allocate_stocks(lines, COUNTRY_CODE, [line.quantity for line in lines])
+
+    # then
+    for line in lines:
+        allocation = line.allocations.get()
+        assert allocation.quantity_allocated == line.quantity
+
+
+def test_allocate_stocks_insufficient_stocks(order_with_lines):
+    # given
+    lines = list(order_with_lines.lines.all())
+    Allocation.objects.filter(order_line__in=lines).delete()
+
+    # when
+    with pytest.raises(InsufficientStock) as exc:
+        allocate_stocks(lines, COUNTRY_CODE, [1, 100])
+
+    # then
+    assert exc.value.item == lines[1].variant
+    assert not Allocation.objects.filter(order_line__in=lines).exists()
+
+
+def test_deallocate_stocks(order_with_lines):
+    # given
+    lines = list(order_with_lines.lines.all())
+
+    # when
+    deallocate_stocks(lines, [1, 1])
+
+    # then
+    for line in lines:
+        assert line.allocations.get().quantity_allocated == line.quantity - 1
+
+
+def test_decrease_stocks(order_with_lines):
+    # given
+    lines = list(order_with_lines.lines.all())
+    stocks = [line.allocations.get().stock for line in lines]
+    warehouse_pk = stocks[0].warehouse_id
+
+    # when
+    decrease_stocks(lines, [line.quantity for line in lines], warehouse_pk)
+
+    # then
+    for line, stock in zip(lines, stocks):
+        assert line.allocations.get().quantity_allocated == 0
+        quantity = stock.quantity
+        stock.refresh_from_db()
+        assert stock.quantity == quantity - line.quantity
+
+
+def test_allocate_stocks_conditional_update(order_line, stock):
+    # given
+    warehouse = stock.warehouse
+    warehouse.allocation_strategy = AllocationStrategy.CONDITIONAL_UPDATE
+    warehouse.save(update_fields=["allocation_strategy"])
+
+    # when
+    allocate_stocks([order_line], COUNTRY_CODE, [10])
+
+    # then
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == 10
+    allocation = Allocation.objects.get(order_line=order_line, stock=stock)
+    assert allocation.quantity_allocated == 10
+
+
+def test_allocate_stocks_conditional_update_insufficient_stock(order_line, stock):
+    # given
+    warehouse = stock.warehouse
+    warehouse.allocation_strategy = AllocationStrategy.CONDITIONAL_UPDATE
+    warehouse.save(update_fields=["allocation_strategy"])
+    stock.quantity_allocated = 10
+    stock.save(update_fields=["quantity_allocated"])
+
+    # when
+    with pytest.raises(InsufficientStock):
+        allocate_stocks([order_line], COUNTRY_CODE, [6])
+
+    # then
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == 10
+    assert not Allocation.objects.filter(order_line=order_line).exists()
+
+
+def test_allocate_stocks_conditional_update_stale_stock(order_line, stock):
+    # given
+    warehouse = stock.warehouse
+    warehouse.allocation_strategy = AllocationStrategy.CONDITIONAL_UPDATE
+    warehouse.save(update_fields=["allocation_strategy"])
+    stale_stock = Stock.objects.get(pk=stock.pk)
+    Stock.objects.filter(pk=stock.pk).update(quantity_allocated=12)
+
+    # when
+    allocated = _allocate_stock_conditionally(stale_stock, 5)
+
+    # then
+    assert allocated == 3
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == 15
+
+
+def test_allocate_and_deallocate_stocks_updates_quantity_allocated(order_with_lines):
+    # given
+    lines = list(order_with_lines.lines.all())
+    Allocation.objects.filter(order_line__in=lines).delete()
+
+    # when
+    allocate_stocks(lines, COUNTRY_CODE, [line.quantity for line in lines])
+    deallocate_stocks(lines, [1, 1])
+
+    # then
+    for line in lines:
+        stock = line.allocations.get().stock
+        assert stock.quantity_allocated == line.quantity - 1
@@ -0,0 +1,12 @@
+class WebhookDeliveryStatus:
+    PENDING = "pending"
+    IN_PROGRESS = "in_progress"
+    SUCCESS = "success"
+    FAILED = "failed"
+
+    CHOICES = [
+        (PENDING, "Pending"),
+        (IN_PROGRESS, "In progress"),
+        (SUCCESS, "Success"),
+        (FAILED, "Failed"),
+    ]
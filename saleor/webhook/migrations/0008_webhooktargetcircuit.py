@@ -0,0 +1,38 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+import saleor.webhook.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("webhook", "0007_webhook_deliveries"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WebhookTargetCircuit",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "target_url",
+                    saleor.webhook.models.WebhookURLField(max_length=255, unique=True),
+                ),
+                ("failures_count", models.PositiveIntegerField(default=0)),
+                (
+                    "last_failure",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("open_until", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -1,7 +1,9 @@
 from django.core import validators
 from django.db import models
+from django.utils import timezone
 
 from ..app.models import App
+from . import WebhookDeliveryStatus
 
 
 class WebhookURLField(models.URLField):
@@ -26,3 +28,50 @@ class WebhookEvent(models.Model):
 
     def __repr__(self):
         return self.event_type
+
+
+class WebhookDelivery(models.Model):
+    webhook = models.ForeignKey(
+        Webhook, related_name="deliveries", on_delete=models.CASCADE
+    )
+    event_type = models.CharField("Event type", max_length=128)
+    payload = models.TextField()
+    status = models.CharField(
+        max_length=32,
+        choices=WebhookDeliveryStatus.CHOICES,
+        default=WebhookDeliveryStatus.PENDING,
+    )
+    attempts_count = models.PositiveIntegerField(default=0)
+    # Time after which the delivery is sent again; for deliveries in progress it
+    # is the time after which a delivery lost by a worker is sent again.
+    next_retry = models.DateTimeField(default=timezone.now)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("pk",)
+        indexes = [models.Index(fields=["status", "next_retry"])]
+
+
+class WebhookDeliveryAttempt(models.Model):
+    delivery = models.ForeignKey(
+        WebhookDelivery, related_name="attempts", on_delete=models.CASCADE
+    )
+    created = models.DateTimeField(auto_now_add=True)
+    status = models.CharField(max_length=32, choices=WebhookDeliveryStatus.CHOICES)
+    response_status_code = models.PositiveIntegerField(null=True, blank=True)
+    # Duration of the request in seconds
+    response_time = models.FloatField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+
+    class Meta:
+        ordering = ("pk",)
+
+
+class WebhookTargetCircuit(models.Model):
+    """Failed deliveries to a webhook target, shared by all worker processes."""
+
+    target_url = WebhookURLField(max_length=255, unique=True)
+    failures_count = models.PositiveIntegerField(default=0)
+    last_failure = models.DateTimeField(default=timezone.now)
+    # Time until which deliveries to the target are held
+    open_until = models.DateTimeField(null=True, blank=True)
@@ -1,72 +1,117 @@
-from collections import OrderedDict
+import json
 from collections.abc import Iterable
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
 
 import graphene
-from django.core.serializers.json import Serializer as JSONSerializer
-from django.core.serializers.python import Serializer as PythonBaseSerializer
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Field, Model
+from django.utils.encoding import is_protected_type
 from django.utils.functional import SimpleLazyObject
 
+# Serialized name, model field and whether it is a many-to-many field
+FieldAccessor = Tuple[str, Field, bool]
 
-class PythonSerializer(PythonBaseSerializer):
+
+@lru_cache(maxsize=None)
+def get_field_accessors(
+    model: Type[Model], fields: Optional[Tuple[str, ...]]
+) -> Tuple[FieldAccessor, ...]:
+    """Return the accessors of the model fields included in payloads.
+
+    The fields are selected and ordered the same way as by Django serializers.
+    """
+    meta = model._meta.concrete_model._meta
+    selected_fields = set(fields) if fields is not None else None
+    accessors = []
+    for field in meta.local_fields:
+        if not field.serialize:
+            continue
+        name = field.attname if field.remote_field is None else field.attname[:-3]
+        if selected_fields is None or name in selected_fields:
+            accessors.append((field.name, field, False))
+    for field in meta.local_many_to_many:
+        if not field.serialize or not field.remote_field.through._meta.auto_created:
+            continue
+        if selected_fields is None or field.attname in selected_fields:
+            accessors.append((field.name, field, True))
+    return tuple(accessors)
+
+
+def get_field_value(obj: Model, field: Field) -> Any:
+    value = field.value_from_object(obj)
+    # Same as in Django serializers, values of other than primitive types are
+    # converted to strings
+    return value if is_protected_type(value) else field.value_to_string(obj)
+
+
+def get_m2m_field_value(obj: Model, field: Field) -> List[Any]:
+    prefetched_objects = getattr(obj, "_prefetched_objects_cache", {})
+    if field.name in prefetched_objects:
+        related_objects = prefetched_objects[field.name]
+    else:
+        related_objects = getattr(obj, field.name).iterator()
+    return [get_field_value(related, related._meta.pk) for related in related_objects]
+
+
+def get_fields_data(obj: Model, fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+    accessors = get_field_accessors(
+        type(obj), tuple(fields) if fields is not None else None
+    )
+    return {
+        name: get_m2m_field_value(obj, field) if is_m2m else get_field_value(obj, field)
+        for name, field, is_m2m in accessors
+    }
+
+
+def dump_payload(data: Any) -> str:
+    return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+class PayloadSerializer:
     def __init__(self, extra_model_fields=None):
-        """Serialize a QuerySet to basic Python objects.
+        """Serialize model instances to webhook payloads.
+
+        The payloads have the format of the Django JSON serializer, extended with
+        the global IDs of objects and their related objects. The fields of every
+        model are resolved once and the data is encoded to JSON with a single call.
 
         Param extra_model_fields can be provided to add fields to serialization process
         which are normally ignored (fields that doesn't exist on model).
         extra_model_fields parameter example:
         {"ModelName": ["annotated_prop_1", "custom_property"]}
         """
-        super().__init__()
-        self.extra_model_fields = extra_model_fields
-
-    def get_dump_object(self, obj):
-        obj_id = graphene.Node.to_global_id(obj._meta.object_name, obj.id)
-        data = OrderedDict([("type", str(obj._meta.object_name)), ("id", obj_id)])
-        data.update(self._current)
-
-        if obj._meta.object_name in self.extra_model_fields:
-            fields_to_add = self.extra_model_fields[obj._meta.object_name]
-            for field in fields_to_add:
-                value = getattr(obj, field, None)
-                if value is not None:
-                    data.update({field: str(value)})
+        self.extra_model_fields = extra_model_fields or {}
 
-        return data
+    def serialize(self, objects: Iterable, **options) -> str:
+        return dump_payload(self.to_python(objects, **options))
 
+    def to_python(
+        self,
+        objects: Iterable,
+        fields: Optional[Sequence[str]] = None,
+        additional_fields: Optional[Dict[str, Tuple[Callable, Sequence[str]]]] = None,
+        extra_dict_data: Optional[Dict[str, Any]] = None,
+        obj_id_name: str = "id",
+    ) -> List[Dict[str, Any]]:
+        """Return the payload data of objects before encoding it to JSON."""
+        additional_fields = additional_fields or {}
+        extra_dict_data = extra_dict_data or {}
+        return [
+            self.get_dump_object(
+                obj, fields, additional_fields, extra_dict_data, obj_id_name
+            )
+            for obj in objects
+        ]
 
-class PayloadSerializer(JSONSerializer):
-    def __init__(self, extra_model_fields=None):
-        super().__init__()
-        self.extra_model_fields = extra_model_fields or {}
-        self.additional_fields = {}
-        self.extra_dict_data = {}
-        self.obj_id_name = "id"
-
-    def serialize(self, queryset, **options):
-        self.additional_fields = options.pop("additional_fields", {})
-        self.extra_dict_data = options.pop("extra_dict_data", {})
-        self.obj_id_name = options.pop("obj_id_name", "id")
-        return super().serialize(
-            queryset,
-            stream=options.pop("stream", None),
-            fields=options.pop("fields", None),
-            use_natural_foreign_keys=options.pop("use_natural_foreign_keys", False),
-            use_natural_primary_keys=options.pop("use_natural_primary_keys", False),
-            progress_output=options.pop("progress_output", None),
-            object_count=options.pop("object_count", 0),
-            **options,
-        )
-
-    def get_dump_object(self, obj):
-        obj_id = graphene.Node.to_global_id(
-            obj._meta.object_name, getattr(obj, self.obj_id_name)
-        )
-        data = OrderedDict(
-            [("type", str(obj._meta.object_name)), (self.obj_id_name, obj_id)]
-        )
+    def get_dump_object(
+        self, obj, fields, additional_fields, extra_dict_data, obj_id_name
+    ) -> Dict[str, Any]:
+        object_name = obj._meta.object_name
+        obj_id = graphene.Node.to_global_id(object_name, getattr(obj, obj_id_name))
+        data = {"type": str(object_name), obj_id_name: obj_id}
         # Evaluate and add the "additional fields"
-        python_serializer = PythonSerializer(extra_model_fields=self.extra_model_fields)
-        for field_name, (qs, fields) in self.additional_fields.items():
+        for field_name, (qs, related_fields) in additional_fields.items():
             data_to_serialize = qs(obj)
             if not data_to_serialize:
                 data[field_name] = None
@@ -77,20 +122,34 @@ class PayloadSerializer(JSONSerializer):
                 data_to_serialize = data_to_serialize._wrapped
 
             if isinstance(data_to_serialize, Iterable):
-                data[field_name] = python_serializer.serialize(
-                    data_to_serialize, fields=fields
-                )
+                data[field_name] = [
+                    self.get_related_dump_object(related, related_fields)
+                    for related in data_to_serialize
+                ]
             else:
-                data[field_name] = python_serializer.serialize(
-                    [data_to_serialize], fields=fields
-                )[0]
-        # Update the data with the  "extra dict data"
+                data[field_name] = self.get_related_dump_object(
+                    data_to_serialize, related_fields
+                )
+        # Update the data with the "extra dict data"
         called_data = {}
-        for key, value in self.extra_dict_data.items():
+        for key, value in extra_dict_data.items():
             if callable(value):
                 called_data[key] = value(obj)
-        data.update(self.extra_dict_data)
+        data.update(extra_dict_data)
         data.update(called_data)
-        # Finally update the data with the super class' "self._current" content
-        data.update(self._current)
+        # Finally update the data with the model fields
+        data.update(get_fields_data(obj, fields))
+        return data
+
+    def get_related_dump_object(self, obj, fields) -> Dict[str, Any]:
+        object_name = obj._meta.object_name
+        data = {
+            "type": str(object_name),
+            "id": graphene.Node.to_global_id(object_name, obj.id),
+        }
+        data.update(get_fields_data(obj, fields))
+        for field in self.extra_model_fields.get(object_name, ()):
+            value = getattr(obj, field, None)
+            if value is not None:
+                data[field] = str(value)
         return data
@@ -1,5 +1,5 @@
 import json
-from typing import Iterable, Optional
+from typing import Iterable, List, Optional
 
 import graphene
 from django.db.models import QuerySet
@@ -20,7 +20,7 @@ from ..payment import ChargeStatus
 from ..product.models import Product
 from ..warehouse.models import Warehouse
 from .event_types import WebhookEventType
-from .payload_serializers import PayloadSerializer
+from .payload_serializers import PayloadSerializer, dump_payload
 from .serializers import serialize_checkout_lines
 
 ADDRESS_FIELDS = (
@@ -58,25 +58,27 @@ ORDER_FIELDS = (
 )
 
 
-def generate_order_lines_payload(lines: Iterable[OrderLine]):
-    line_fields = (
-        "product_name",
-        "variant_name",
-        "translated_product_name",
-        "translated_variant_name",
-        "product_sku",
-        "quantity",
-        "currency",
-        "unit_price_net_amount",
-        "unit_price_gross_amount",
-        "total_price_net_amount",
-        "total_price_gross_amount",
-        "tax_rate",
-    )
+ORDER_LINE_FIELDS = (
+    "product_name",
+    "variant_name",
+    "translated_product_name",
+    "translated_variant_name",
+    "product_sku",
+    "quantity",
+    "currency",
+    "unit_price_net_amount",
+    "unit_price_gross_amount",
+    "total_price_net_amount",
+    "total_price_gross_amount",
+    "tax_rate",
+)
+
+
+def serialize_order_lines(lines: Iterable[OrderLine]) -> List[dict]:
     serializer = PayloadSerializer()
-    return serializer.serialize(
+    return serializer.to_python(
         lines,
-        fields=line_fields,
+        fields=ORDER_LINE_FIELDS,
         extra_dict_data={
             "total_price_net_amount": (lambda l: l.total_price.net.amount),
             "total_price_gross_amount": (lambda l: l.total_price.gross.amount),
@@ -84,7 +86,11 @@ def generate_order_lines_payload(lines: Iterable[OrderLine]):
     )
 
 
-def generate_order_payload(order: "Order"):
+def generate_order_lines_payload(lines: Iterable[OrderLine]):
+    return dump_payload(serialize_order_lines(lines))
+
+
+def serialize_order(order: "Order") -> dict:
     serializer = PayloadSerializer()
     fulfillment_fields = ("status", "tracking_number", "created")
     payment_fields = (
@@ -113,7 +119,7 @@ def generate_order_payload(order: "Order"):
 
     shipping_method_fields = ("name", "type", "currency", "price_amount")
     lines = order.lines.all()
-    order_data = serializer.serialize(
+    return serializer.to_python(
         [order],
         fields=ORDER_FIELDS,
         additional_fields={
@@ -123,9 +129,12 @@ def generate_order_payload(order: "Order"):
             "billing_address": (lambda o: o.billing_address, ADDRESS_FIELDS),
             "fulfillments": (lambda o: o.fulfillments.all(), fulfillment_fields),
         },
-        extra_dict_data={"lines": json.loads(generate_order_lines_payload(lines))},
-    )
-    return order_data
+        extra_dict_data={"lines": serialize_order_lines(lines)},
+    )[0]
+
+
+def generate_order_payload(order: "Order"):
+    return dump_payload([serialize_order(order)])
 
 
 def generate_invoice_payload(invoice: "Invoice"):
@@ -259,13 +268,13 @@ def generate_product_deleted_payload(product: "Product", variants_id):
     return product_payload
 
 
-def generate_fulfillment_lines_payload(fulfillment: Fulfillment):
+def serialize_fulfillment_lines(fulfillment: Fulfillment) -> List[dict]:
     serializer = PayloadSerializer()
     lines = FulfillmentLine.objects.prefetch_related(
         "order_line__variant__product__product_type"
     ).filter(fulfillment=fulfillment)
     line_fields = ("quantity",)
-    return serializer.serialize(
+    return serializer.to_python(
         lines,
         fields=line_fields,
         extra_dict_data={
@@ -280,6 +289,10 @@ def generate_fulfillment_lines_payload(fulfillment: Fulfillment):
     )
 
 
+def generate_fulfillment_lines_payload(fulfillment: Fulfillment):
+    return dump_payload(serialize_fulfillment_lines(fulfillment))
+
+
 def generate_fulfillment_payload(fulfillment: Fulfillment):
     serializer = PayloadSerializer()
 
@@ -298,8 +311,8 @@ def generate_fulfillment_payload(fulfillment: Fulfillment):
             "warehouse_address": (lambda f: warehouse.address, ADDRESS_FIELDS),
         },
         extra_dict_data={
-            "order": json.loads(generate_order_payload(fulfillment.order))[0],
-            "lines": json.loads(generate_fulfillment_lines_payload(fulfillment)),
+            "order": serialize_order(fulfillment.order),
+            "lines": serialize_fulfillment_lines(fulfillment),
         },
     )
     return fulfillment_data
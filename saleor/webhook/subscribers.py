@@ -0,0 +1,109 @@
+from collections import defaultdict
+from typing import Dict, FrozenSet, Set, Tuple
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from ..app.models import App
+from .event_types import WebhookEventType
+from .models import WebhookEvent
+
+WEBHOOK_SUBSCRIBERS_VERSION_CACHE_KEY = "webhook_subscribers_version"
+WEBHOOK_SUBSCRIBED_EVENT_TYPES_CACHE_KEY = "webhook_subscribed_event_types_{version}"
+WEBHOOK_SUBSCRIBED_EVENT_TYPES_CACHE_TIMEOUT = 60 * 60
+
+# Event types with subscribers shared by all requests handled by the current
+# process, keyed by the webhook subscribers version they were fetched for.
+_subscribed_event_types: Dict[str, FrozenSet[str]] = {}
+
+
+def fetch_subscribed_event_types() -> FrozenSet[str]:
+    """Return event types which would be sent to at least one webhook.
+
+    Uses the same conditions as `trigger_webhooks_for_event`: the webhook and its
+    app must be active and the app needs the permission required by the event.
+    """
+    webhook_events = WebhookEvent.objects.filter(
+        webhook__is_active=True, webhook__app__is_active=True
+    ).values_list("webhook__app_id", "event_type")
+    app_event_types: Dict[int, Set[str]] = defaultdict(set)
+    for app_id, event_type in webhook_events:
+        if event_type == WebhookEventType.ANY:
+            app_event_types[app_id].update(WebhookEventType.PERMISSIONS)
+        else:
+            app_event_types[app_id].add(event_type)
+
+    permissions = App.permissions.through.objects.filter(
+        app_id__in=app_event_types
+    ).values_list(
+        "app_id", "permission__content_type__app_label", "permission__codename"
+    )
+    app_permissions: Set[Tuple[int, str]] = {
+        (app_id, f"{app_label}.{codename}")
+        for app_id, app_label, codename in permissions
+    }
+
+    subscribed_event_types = set()
+    for app_id, event_types in app_event_types.items():
+        for event_type in event_types:
+            required_permission = WebhookEventType.PERMISSIONS.get(event_type)
+            if required_permission is None:
+                continue
+            if (app_id, required_permission.value) in app_permissions:
+                subscribed_event_types.add(event_type)
+    return frozenset(subscribed_event_types)
+
+
+def get_webhook_subscribers_version() -> str:
+    return cache.get_or_set(
+        WEBHOOK_SUBSCRIBERS_VERSION_CACHE_KEY, lambda: uuid4().hex, timeout=None
+    )
+
+
+def get_subscribed_event_types() -> FrozenSet[str]:
+    """Return event types with subscribers using a shared registry.
+
+    The registry is kept in the process memory and in the cache shared between
+    processes. It is refetched when the webhook subscribers version changes, so
+    it requires a cache backend shared by all processes, see `SHARED_CACHE`.
+    """
+    if not settings.CACHE_WEBHOOK_SUBSCRIBERS:
+        return fetch_subscribed_event_types()
+
+    version = get_webhook_subscribers_version()
+    event_types = _subscribed_event_types.get(version)
+    if event_types is None:
+        cache_key = WEBHOOK_SUBSCRIBED_EVENT_TYPES_CACHE_KEY.format(version=version)
+        event_types = cache.get(cache_key)
+        if event_types is None:
+            event_types = fetch_subscribed_event_types()
+            cache.set(
+                cache_key,
+                event_types,
+                timeout=WEBHOOK_SUBSCRIBED_EVENT_TYPES_CACHE_TIMEOUT,
+            )
+        _subscribed_event_types.clear()
+        _subscribed_event_types[version] = event_types
+    return event_types
+
+
+def is_event_subscribed(event_type: str) -> bool:
+    return event_type in get_subscribed_event_types()
+
+
+def invalidate_webhook_subscribers():
+    """Force all processes to refetch event types with subscribers.
+
+    Must be called every time webhooks, their events or the apps they belong to
+    change. The version is changed again after the current transaction is
+    committed, so the event types fetched in the meantime from the uncommitted
+    data are not used.
+    """
+
+    def invalidate():
+        cache.set(WEBHOOK_SUBSCRIBERS_VERSION_CACHE_KEY, uuid4().hex, timeout=None)
+
+    invalidate()
+    transaction.on_commit(invalidate)
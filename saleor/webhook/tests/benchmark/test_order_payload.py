@@ -0,0 +1,53 @@
+import timeit
+from decimal import Decimal
+from unittest import mock
+
+from ....order.models import OrderLine
+from ... import payloads
+from ..legacy_payload_serializers import LegacyPayloadSerializer
+
+LINES_COUNT = 200
+
+
+def get_order_lines():
+    return [
+        OrderLine(
+            id=index,
+            product_name=f"Product {index}",
+            variant_name="XL",
+            product_sku=f"SKU-{index}",
+            is_shipping_required=True,
+            quantity=index % 5 + 1,
+            currency="USD",
+            unit_price_net_amount=Decimal("10.00"),
+            unit_price_gross_amount=Decimal("12.30"),
+            total_price_net_amount=Decimal("10.00") * (index % 5 + 1),
+            total_price_gross_amount=Decimal("12.30") * (index % 5 + 1),
+            tax_rate=Decimal("0.23"),
+        )
+        for index in range(LINES_COUNT)
+    ]
+
+
+def generate_legacy_order_lines_payload(lines):
+    with mock.patch.object(payloads, "PayloadSerializer", LegacyPayloadSerializer):
+        return payloads.generate_order_lines_payload(lines)
+
+
+def test_generate_order_lines_payload():
+    # given
+    lines = get_order_lines()
+
+    # when
+    legacy_time = timeit.timeit(
+        lambda: generate_legacy_order_lines_payload(lines), number=5
+    )
+    payload_time = timeit.timeit(
+        lambda: payloads.generate_order_lines_payload(lines), number=5
+    )
+
+    # then
+    assert payloads.generate_order_lines_payload(
+        lines
+    ) == generate_legacy_order_lines_payload(lines)
+    assert payload_time < legacy_time
@@ -1,25 +1,26 @@
-from saleor.webhook.payload_serializers import PythonSerializer
+from saleor.webhook.payload_serializers import PayloadSerializer, get_field_accessors
 
+from ...product.models import ProductVariant
 
-def test_python_serializer_extra_model_fields(product_with_single_variant):
-    serializer = PythonSerializer(
+
+def test_payload_serializer_extra_model_fields(product_with_single_variant):
+    serializer = PayloadSerializer(
         extra_model_fields={"ProductVariant": ("quantity", "quantity_allocated")}
     )
     annotated_variant = (
         product_with_single_variant.variants.annotate_quantities().first()
     )
-    serializer._current = {"test_item": "test_value"}
-    result = serializer.get_dump_object(annotated_variant)
+    result = serializer.get_related_dump_object(annotated_variant, ("sku",))
     assert result["type"] == "ProductVariant"
-    assert result["test_item"] == "test_value"
+    assert result["sku"] == annotated_variant.sku
     assert result["quantity"] == str(annotated_variant.quantity)
     assert result["quantity_allocated"] == str(annotated_variant.quantity_allocated)
 
 
-def test_python_serializer_extra_model_fields_incorrect_fields(
+def test_payload_serializer_extra_model_fields_incorrect_fields(
     product_with_single_variant,
 ):
-    serializer = PythonSerializer(
+    serializer = PayloadSerializer(
         extra_model_fields={
             "NonExistingModel": ("__dummy",),
             "ProductVariant": ("__not_on_model",),
@@ -28,7 +29,12 @@ def test_python_serializer_extra_model_fields_incorrect_fields(
     annotated_variant = (
         product_with_single_variant.variants.annotate_quantities().first()
     )
-    serializer._current = {"test_item": "test_value"}
-    result = serializer.get_dump_object(annotated_variant)
+    result = serializer.get_related_dump_object(annotated_variant, ("sku",))
     assert result["type"] == "ProductVariant"
-    assert result["test_item"] == "test_value"
+    assert result["sku"] == annotated_variant.sku
+    assert "__not_on_model" not in result
+
+
+def test_get_field_accessors_uses_model_fields_order():
+    accessors = get_field_accessors(ProductVariant, ("product", "name", "sku", "id"))
+    assert [name for name, _, _ in accessors] == ["sku", "name", "product"]
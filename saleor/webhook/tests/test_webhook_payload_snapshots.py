@@ -0,0 +1,65 @@
+from unittest import mock
+
+import pytest
+
+from .. import payloads
+from .legacy_payload_serializers import LegacyPayloadSerializer
+
+
+def generate_legacy_payload(generate_payload, *args):
+    with mock.patch.object(payloads, "PayloadSerializer", LegacyPayloadSerializer):
+        return generate_payload(*args)
+
+
+def assert_payload_not_changed(generate_payload, *args):
+    payload = generate_payload(*args)
+    assert payload == generate_legacy_payload(generate_payload, *args)
+
+
+def test_order_payload_not_changed(
+    order_with_lines, fulfilled_order, payment_txn_captured
+):
+    assert_payload_not_changed(payloads.generate_order_payload, order_with_lines)
+    assert_payload_not_changed(payloads.generate_order_payload, fulfilled_order)
+
+
+def test_order_lines_payload_not_changed(order_with_lines):
+    assert_payload_not_changed(
+        payloads.generate_order_lines_payload, order_with_lines.lines.all()
+    )
+
+
+def test_invoice_payload_not_changed(fulfilled_order):
+    invoice = fulfilled_order.invoices.first()
+    assert_payload_not_changed(payloads.generate_invoice_payload, invoice)
+
+
+def test_fulfillment_payload_not_changed(fulfilled_order):
+    fulfillment = fulfilled_order.fulfillments.first()
+    assert_payload_not_changed(payloads.generate_fulfillment_payload, fulfillment)
+
+
+@pytest.mark.parametrize("with_user", [True, False])
+def test_checkout_payload_not_changed(with_user, checkout_with_items, customer_user):
+    checkout_with_items.user = customer_user if with_user else None
+    assert_payload_not_changed(payloads.generate_checkout_payload, checkout_with_items)
+
+
+def test_customer_payload_not_changed(customer_user):
+    assert_payload_not_changed(payloads.generate_customer_payload, customer_user)
+
+
+def test_product_payload_not_changed(product, collection):
+    product.collections.add(collection)
+    assert_payload_not_changed(payloads.generate_product_payload, product)
+
+
+def test_product_deleted_payload_not_changed(product):
+    variant_ids = list(product.variants.values_list("id", flat=True))
+    assert_payload_not_changed(
+        payloads.generate_product_deleted_payload, product, variant_ids
+    )
+
+
+def test_page_payload_not_changed(page):
+    assert_payload_not_changed(payloads.generate_page_payload, page)
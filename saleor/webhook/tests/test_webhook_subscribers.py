@@ -0,0 +1,92 @@
+from unittest.mock import patch
+
+from django.core.cache.backends.locmem import LocMemCache
+
+from ..event_types import WebhookEventType
+from ..subscribers import (
+    fetch_subscribed_event_types,
+    get_subscribed_event_types,
+    invalidate_webhook_subscribers,
+    is_event_subscribed,
+)
+
+
+def test_fetch_subscribed_event_types_requires_app_permission(
+    webhook, permission_manage_orders
+):
+    # given
+    webhook.events.create(event_type=WebhookEventType.PRODUCT_CREATED)
+    webhook.app.permissions.add(permission_manage_orders)
+
+    # when
+    event_types = fetch_subscribed_event_types()
+
+    # then
+    assert event_types == {WebhookEventType.ORDER_CREATED}
+
+
+def test_fetch_subscribed_event_types_any_event(any_event_webhook):
+    # when
+    event_types = fetch_subscribed_event_types()
+
+    # then
+    assert event_types == set(WebhookEventType.PERMISSIONS)
+
+
+def test_fetch_subscribed_event_types_skips_inactive(
+    any_event_webhook, webhook, permission_manage_orders
+):
+    # given
+    any_event_webhook.is_active = False
+    any_event_webhook.save(update_fields=["is_active"])
+    webhook.app.permissions.add(permission_manage_orders)
+    webhook.app.is_active = False
+    webhook.app.save(update_fields=["is_active"])
+
+    # when
+    event_types = fetch_subscribed_event_types()
+
+    # then
+    assert event_types == set()
+
+
+def test_get_subscribed_event_types_cached(
+    webhook, permission_manage_orders, settings, django_assert_num_queries
+):
+    # given
+    settings.CACHE_WEBHOOK_SUBSCRIBERS = True
+    invalidate_webhook_subscribers()
+    assert not is_event_subscribed(WebhookEventType.ORDER_CREATED)
+    webhook.app.permissions.add(permission_manage_orders)
+
+    # when
+    with django_assert_num_queries(0):
+        cached_event_types = get_subscribed_event_types()
+    invalidate_webhook_subscribers()
+    refreshed_event_types = get_subscribed_event_types()
+
+    # then
+    assert cached_event_types == set()
+    assert refreshed_event_types == {WebhookEventType.ORDER_CREATED}
+
+
+def test_get_subscribed_event_types_invalidated_by_other_process(
+    webhook, permission_manage_orders, settings
+):
+    # given
+    settings.CACHE_WEBHOOK_SUBSCRIBERS = True
+    # Separate instances of the cache shared between processes
+    cache = LocMemCache("webhook-subscribers", {})
+    other_process_cache = LocMemCache("webhook-subscribers", {})
+    with patch("saleor.webhook.subscribers.cache", cache):
+        invalidate_webhook_subscribers()
+        assert not is_event_subscribed(WebhookEventType.ORDER_CREATED)
+
+    # when
+    webhook.app.permissions.add(permission_manage_orders)
+    with patch("saleor.webhook.subscribers.cache", other_process_cache):
+        invalidate_webhook_subscribers()
+
+    # then
+    with patch("saleor.webhook.subscribers.cache", cache):
+        assert is_event_subscribed(WebhookEventType.ORDER_CREATED)